@@ -9,11 +9,13 @@ from .echo_agent import EchoAgent
 from .code_agent import CodeAgent
 from .system_agent import SystemAgent
 from .orchestrator_agent import OrchestratorAgent
+from .capability_registry import CapabilityRegistry
 from .planner_agent import PlannerAgent
 from .main_assistant.main_assistant import MainAssistant
 from .agent_communication import (
     MessageType, 
     Message, 
+    OverflowPolicy,
     AgentCommunicator, 
     communicator,
     setup_communication_system,
@@ -28,10 +30,12 @@ __all__ = [
     'CodeAgent', 
     'SystemAgent',
     'OrchestratorAgent',
+    'CapabilityRegistry',
     'PlannerAgent',
     'MainAssistant',
     'MessageType',
     'Message',
+    'OverflowPolicy',
     'AgentCommunicator',
     'communicator',
     'setup_communication_system',
@@ -7,10 +7,13 @@ allowing agents to send requests to each other and share context.
 
 import uuid
 import time
+import heapq
 import logging
 import asyncio
+import itertools
+from collections import deque
 from enum import Enum
-from typing import Dict, List, Any, Optional, Union, Callable, Awaitable
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, Awaitable
 
 from .base import BaseAgent, AgentResponse
 
@@ -40,6 +43,9 @@ class Message:
         context: Optional context dictionary
         timestamp: Time when the message was created
         reference_id: Optional ID of a message this one responds to
+        priority: Delivery priority; higher values are delivered first
+        deadline: Optional absolute time (epoch seconds) after which the
+                  message is discarded instead of delivered
     """
     
     def __init__(
@@ -50,7 +56,9 @@ class Message:
         content: str,
         context: Optional[Dict] = None,
         message_id: Optional[str] = None,
-        reference_id: Optional[str] = None
+        reference_id: Optional[str] = None,
+        priority: int = 0,
+        deadline: Optional[float] = None
     ):
         """
         Initialize a new message.
@@ -63,6 +71,9 @@ class Message:
             context: Optional context dictionary
             message_id: Optional custom message ID (generated if None)
             reference_id: Optional ID of a message this one responds to
+            priority: Delivery priority; higher values are delivered first
+            deadline: Optional absolute time (epoch seconds) after which the
+                      message is no longer worth delivering
         """
         self.message_id = message_id or str(uuid.uuid4())
         self.sender_id = sender_id
@@ -72,6 +83,22 @@ class Message:
         self.context = context or {}
         self.timestamp = time.time()
         self.reference_id = reference_id
+        self.priority = priority
+        self.deadline = deadline
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Check whether the message's deadline has passed.
+        
+        Args:
+            now: Current timestamp (defaults to time.time())
+            
+        Returns:
+            True if the message has a deadline and it has passed
+        """
+        if self.deadline is None:
+            return False
+        return (time.time() if now is None else now) >= self.deadline
     
     def to_dict(self) -> Dict:
         """Convert the message to a dictionary."""
@@ -83,7 +110,9 @@ class Message:
             "content": self.content,
             "context": self.context,
             "timestamp": self.timestamp,
-            "reference_id": self.reference_id
+            "reference_id": self.reference_id,
+            "priority": self.priority,
+            "deadline": self.deadline
         }
     
     @classmethod
@@ -96,7 +125,9 @@ class Message:
             content=data["content"],
             context=data.get("context", {}),
             message_id=data.get("message_id"),
-            reference_id=data.get("reference_id")
+            reference_id=data.get("reference_id"),
+            priority=data.get("priority", 0),
+            deadline=data.get("deadline")
         )
     
     def create_response(self, content: str, context: Optional[Dict] = None) -> 'Message':
@@ -116,10 +147,200 @@ class Message:
             msg_type=MessageType.RESPONSE,
             content=content,
             context=context or {},
-            reference_id=self.message_id
+            reference_id=self.message_id,
+            priority=self.priority
         )
 
 
+class OverflowPolicy(Enum):
+    """What happens to a message sent to a full mailbox."""
+    BLOCK = "block"               # The sender waits for room (until the message's deadline)
+    DROP_OLDEST = "drop_oldest"   # The oldest queued message is discarded to make room
+    REJECT = "reject"             # The new message is refused
+
+
+class Mailbox:
+    """
+    Bounded priority queue of the messages waiting to be delivered to one agent.
+    
+    Messages are taken highest priority first, and in arrival order within
+    a priority.
+    
+    Attributes:
+        agent_id: ID of the receiving agent
+        max_concurrency: Maximum number of messages delivered to the agent at once
+        capacity: Maximum number of queued messages (0 for unbounded)
+        overflow: Policy applied when a message arrives at a full mailbox
+        active: Number of delivery workers currently draining the mailbox
+        delivered: Number of messages delivered so far
+    """
+    
+    def __init__(
+        self,
+        agent_id: str,
+        max_concurrency: int = 4,
+        capacity: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    ):
+        """
+        Initialize an empty mailbox.
+        
+        Args:
+            agent_id: ID of the receiving agent
+            max_concurrency: Maximum number of messages delivered to the agent at once
+            capacity: Maximum number of queued messages (0 for unbounded)
+            overflow: Policy applied when a message arrives at a full mailbox
+        """
+        self.agent_id = agent_id
+        self.max_concurrency = max(1, max_concurrency)
+        self.capacity = max(0, capacity)
+        self.overflow = overflow
+        self.active = 0
+        self.delivered = 0
+        # (-priority, arrival sequence, message) heap
+        self._messages: List[Tuple[int, int, Message]] = []
+        self._sequence = itertools.count()
+        self._space_waiters: deque = deque()
+    
+    def __len__(self) -> int:
+        """Get the number of queued messages."""
+        return len(self._messages)
+    
+    def is_full(self) -> bool:
+        """Whether a new message would exceed the capacity."""
+        return bool(self.capacity) and len(self._messages) >= self.capacity
+    
+    def put(self, message: Message) -> None:
+        """Queue a message (the capacity is enforced by the caller)."""
+        heapq.heappush(self._messages, (-message.priority, next(self._sequence), message))
+    
+    def peek_priority(self) -> int:
+        """Get the priority of the next message (0 if the mailbox is empty)."""
+        return -self._messages[0][0] if self._messages else 0
+    
+    def get(self) -> Optional[Message]:
+        """Take the most urgent message, or None if the mailbox is empty."""
+        if not self._messages:
+            return None
+        message = heapq.heappop(self._messages)[2]
+        self._wake_sender()
+        return message
+    
+    def pop_oldest(self) -> Optional[Message]:
+        """Remove the message that arrived first, whatever its priority."""
+        if not self._messages:
+            return None
+        index = min(range(len(self._messages)), key=lambda i: self._messages[i][1])
+        message = self._messages[index][2]
+        self._messages[index] = self._messages[-1]
+        self._messages.pop()
+        heapq.heapify(self._messages)
+        self._wake_sender()
+        return message
+    
+    def remove_expired(self, now: Optional[float] = None) -> List[Message]:
+        """
+        Remove the queued messages whose deadline has passed.
+        
+        Args:
+            now: Current timestamp (defaults to time.time())
+            
+        Returns:
+            The removed messages
+        """
+        now = time.time() if now is None else now
+        expired = [entry[2] for entry in self._messages if entry[2].is_expired(now)]
+        if expired:
+            self._messages = [entry for entry in self._messages if not entry[2].is_expired(now)]
+            heapq.heapify(self._messages)
+            for _ in expired:
+                self._wake_sender()
+        return expired
+    
+    async def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the mailbox has room for a message.
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if there is room, False if the timeout expired first
+        """
+        while self.is_full():
+            waiter = asyncio.get_running_loop().create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+    
+    def _wake_sender(self) -> None:
+        """Let one blocked sender retry after a message left the mailbox."""
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the mailbox."""
+        return {
+            "queued": len(self._messages),
+            "capacity": self.capacity,
+            "overflow": self.overflow.value,
+            "blocked_senders": sum(1 for waiter in self._space_waiters if not waiter.done()),
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "delivered": self.delivered
+        }
+
+
+class _PrioritySlots:
+    """
+    Counting semaphore that hands free slots to the most urgent waiter.
+    
+    Waiters are served by priority (highest first) and in arrival order
+    within a priority.
+    """
+    
+    def __init__(self, slots: int):
+        """
+        Initialize the semaphore.
+        
+        Args:
+            slots: Number of slots
+        """
+        self._free = slots
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+    
+    async def acquire(self, priority: int = 0) -> None:
+        """Wait for a slot."""
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot granted just before the cancellation goes to the next waiter
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        """Free a slot, granting it to the most urgent waiter if there is one."""
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)[2]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._free += 1
+
+
 class AgentCommunicator:
     """
     Manages communication between agents.
@@ -127,35 +348,127 @@ class AgentCommunicator:
     This class handles the routing and delivery of messages between agents,
     and maintains a registry of all active agents.
     
+    Every agent has its own mailbox. Each message is delivered by an
+    independent task, with at most max_concurrency deliveries per
+    receiver and max_in_flight across all receivers, so a slow agent only
+    holds up the messages addressed to it. Responses to pending requests
+    resolve the waiting future directly and never enter a mailbox.
+    
+    Mailboxes can be bounded, with an overflow policy deciding whether the
+    sender waits, the oldest message is dropped or the new one is refused.
+    Urgent messages are delivered first, both within a mailbox and when
+    mailboxes compete for a delivery slot. Messages whose deadline has
+    passed are discarded before they reach the agent, and a request that
+    is discarded answers its waiting sender with an error right away.
+    
     Attributes:
         agents: Dictionary of registered agents by ID
-        message_queue: Queue of pending messages
+        mailboxes: Pending messages by receiver ID
         logger: Logger instance
     """
     
-    def __init__(self):
-        """Initialize a new agent communicator."""
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        per_agent_concurrency: int = 4,
+        mailbox_capacity: int = 0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    ):
+        """
+        Initialize a new agent communicator.
+        
+        Args:
+            max_in_flight: Maximum number of messages being delivered at once; agents
+                           that send requests while processing one hold a slot
+                           while they wait, so keep it above the nesting depth
+            per_agent_concurrency: Default maximum number of messages delivered
+                                   to one agent at once
+            mailbox_capacity: Default maximum number of messages queued for one
+                              agent (0 for unbounded)
+            overflow_policy: Default policy for messages sent to a full mailbox
+        """
         self.agents: Dict[str, BaseAgent] = {}
-        self.message_queue = asyncio.Queue()
+        self.mailboxes: Dict[str, Mailbox] = {}
         self.logger = logging.getLogger("agent.communicator")
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_agent_concurrency = max(1, per_agent_concurrency)
+        self.mailbox_capacity = max(0, mailbox_capacity)
+        self.overflow_policy = overflow_policy
         self._running = False
         self._message_handlers: Dict[str, List[Callable]] = {}
         self._response_waiters: Dict[str, asyncio.Future] = {}
+        # Per-agent overrides of the mailbox defaults
+        self._mailbox_settings: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Optional[_PrioritySlots] = None
+        self._workers: Set[asyncio.Task] = set()
+        self._delivering = 0
+        self._stats = {
+            "sent": 0,
+            "delivered": 0,
+            "responses_short_circuited": 0,
+            "errors": 0,
+            "expired": 0,
+            "dropped": 0,
+            "rejected": 0
+        }
     
-    def register_agent(self, agent: BaseAgent) -> None:
+    def register_agent(
+        self,
+        agent: BaseAgent,
+        max_concurrency: Optional[int] = None,
+        mailbox_capacity: Optional[int] = None,
+        overflow_policy: Optional[OverflowPolicy] = None
+    ) -> None:
         """
         Register an agent with the communicator.
         
         Args:
             agent: The agent to register
+            max_concurrency: Maximum number of messages delivered to the agent
+                             at once (defaults to per_agent_concurrency)
+            mailbox_capacity: Maximum number of messages queued for the agent
+                              (defaults to mailbox_capacity)
+            overflow_policy: Policy for messages sent to the agent's full mailbox
+                             (defaults to overflow_policy)
         """
         if agent.agent_id in self.agents:
             self.logger.warning(f"Agent {agent.agent_id} is already registered")
             return
         
         self.agents[agent.agent_id] = agent
+        self.configure_mailbox(agent.agent_id, max_concurrency, mailbox_capacity, overflow_policy)
         self.logger.info(f"Agent {agent.agent_id} registered with communicator")
     
+    def configure_mailbox(
+        self,
+        agent_id: str,
+        max_concurrency: Optional[int] = None,
+        capacity: Optional[int] = None,
+        overflow_policy: Optional[OverflowPolicy] = None
+    ) -> None:
+        """
+        Override the mailbox settings of an agent (None keeps the current value).
+        
+        Args:
+            agent_id: ID of the agent
+            max_concurrency: Maximum number of concurrent deliveries
+            capacity: Maximum number of queued messages (0 for unbounded)
+            overflow_policy: Policy for messages sent to the full mailbox
+        """
+        settings = self._mailbox_settings.setdefault(agent_id, {})
+        if max_concurrency is not None:
+            settings["max_concurrency"] = max(1, max_concurrency)
+        if capacity is not None:
+            settings["capacity"] = max(0, capacity)
+        if overflow_policy is not None:
+            settings["overflow"] = overflow_policy
+        
+        mailbox = self.mailboxes.get(agent_id)
+        if mailbox is not None:
+            for name, value in settings.items():
+                setattr(mailbox, name, value)
+            self._schedule(mailbox)
+    
     def unregister_agent(self, agent_id: str) -> None:
         """
         Unregister an agent from the communicator.
@@ -168,30 +481,130 @@ class AgentCommunicator:
             self.logger.info(f"Agent {agent_id} unregistered from communicator")
     
     async def start(self) -> None:
-        """Start the message processing loop."""
+        """Start delivering messages, including those queued while stopped."""
         if self._running:
             return
         
         self._running = True
+        self._in_flight = _PrioritySlots(self.max_in_flight)
         self.logger.info("Agent communicator started")
         
-        # Start message processing loop
-        asyncio.create_task(self._process_messages())
+        for mailbox in list(self.mailboxes.values()):
+            self._schedule(mailbox)
     
-    async def stop(self) -> None:
-        """Stop the message processing loop."""
+    async def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop delivering messages.
+        
+        Deliveries in progress are given up to timeout seconds to finish and
+        are then cancelled; queued messages stay in their mailboxes until
+        the communicator is started again.
+        
+        Args:
+            timeout: Seconds to wait for deliveries in progress (None waits indefinitely)
+        """
         self._running = False
+        workers = list(self._workers)
+        if workers:
+            done, pending = await asyncio.wait(workers, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.logger.warning(f"Cancelled {len(pending)} message deliveries on shutdown")
         self.logger.info("Agent communicator stopped")
     
-    async def _process_messages(self) -> None:
-        """Process messages from the queue."""
-        while self._running:
-            try:
-                message = await self.message_queue.get()
-                await self._deliver_message(message)
-                self.message_queue.task_done()
-            except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
+    def _get_mailbox(self, agent_id: str) -> Mailbox:
+        """Get an agent's mailbox, creating it on first use."""
+        mailbox = self.mailboxes.get(agent_id)
+        if mailbox is None:
+            settings = self._mailbox_settings.get(agent_id, {})
+            mailbox = Mailbox(
+                agent_id,
+                max_concurrency=settings.get("max_concurrency", self.per_agent_concurrency),
+                capacity=settings.get("capacity", self.mailbox_capacity),
+                overflow=settings.get("overflow", self.overflow_policy)
+            )
+            self.mailboxes[agent_id] = mailbox
+        return mailbox
+    
+    def _schedule(self, mailbox: Mailbox) -> None:
+        """Start delivery workers for a mailbox, up to its concurrency limit."""
+        while self._running and mailbox.active < min(mailbox.max_concurrency, len(mailbox)):
+            mailbox.active += 1
+            task = asyncio.create_task(self._drain(mailbox))
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+    
+    async def _drain(self, mailbox: Mailbox) -> None:
+        """Deliver messages from a mailbox until it is empty or the communicator stops."""
+        try:
+            while self._running and len(mailbox):
+                await self._in_flight.acquire(mailbox.peek_priority())
+                try:
+                    message = mailbox.get() if self._running else None
+                    if message is None:
+                        break
+                    if message.is_expired():
+                        self._discard(message, "deadline_exceeded", "expired")
+                        continue
+                    self._delivering += 1
+                    try:
+                        await self._deliver_message(message)
+                    except Exception as e:
+                        self._stats["errors"] += 1
+                        self.logger.error(f"Error processing message: {e}")
+                    finally:
+                        self._delivering -= 1
+                    mailbox.delivered += 1
+                    self._stats["delivered"] += 1
+                finally:
+                    self._in_flight.release()
+        finally:
+            mailbox.active -= 1
+            # Forget mailboxes of receivers that are gone once they are drained
+            if not mailbox.active and not len(mailbox) and mailbox.agent_id not in self.agents:
+                self.mailboxes.pop(mailbox.agent_id, None)
+    
+    def _resolve_response(self, message: Message) -> bool:
+        """
+        Hand a response straight to the request waiting for it.
+        
+        Args:
+            message: The message to check
+            
+        Returns:
+            True if the message answered a pending request
+        """
+        if not message.reference_id:
+            return False
+        future = self._response_waiters.get(message.reference_id)
+        if future is None:
+            return False
+        if not future.done():
+            self.logger.info(f"Entregando respuesta para solicitud {message.reference_id} de {message.sender_id}")
+            future.set_result(message)
+        self._stats["responses_short_circuited"] += 1
+        return True
+    
+    def _discard(self, message: Message, reason: str, counter: str) -> None:
+        """
+        Drop a message without delivering it.
+        
+        A discarded request that someone is still waiting for is answered
+        with an error immediately, so the sender does not wait out its timeout.
+        
+        Args:
+            message: The message
+            reason: Why it is dropped (used as the error code)
+            counter: Statistics counter to increment
+        """
+        self._stats[counter] += 1
+        self.logger.warning(f"Discarding message {message.message_id} to {message.receiver_id}: {reason}")
+        if message.msg_type == MessageType.REQUEST and message.message_id in self._response_waiters:
+            error_msg = message.create_response(f"Message not delivered: {reason}", {"error": reason})
+            error_msg.msg_type = MessageType.ERROR
+            self._resolve_response(error_msg)
     
     async def _deliver_message(self, message: Message) -> None:
         """
@@ -202,12 +615,8 @@ class AgentCommunicator:
         """
         receiver_id = message.receiver_id
         
-        # Check if this is a response to a waiting request
-        if message.reference_id and message.reference_id in self._response_waiters:
-            future = self._response_waiters[message.reference_id]
-            if not future.done():
-                self.logger.info(f"Entregando respuesta para solicitud {message.reference_id} de {message.sender_id}")
-                future.set_result(message)
+        # A response whose request was still pending when it was queued
+        if self._resolve_response(message):
             return
         
         # Check if the recipient agent exists
@@ -231,9 +640,18 @@ class AgentCommunicator:
         
         # Si es un mensaje de solicitud, intenta procesar directamente primero
         if message.msg_type == MessageType.REQUEST:
+            # Last check before spending a model call on it
+            if message.is_expired():
+                self._discard(message, "deadline_exceeded", "expired")
+                return
+            
+            # The deadline travels in the context so nested requests inherit it
+            context = message.context
+            if message.deadline is not None and "deadline" not in context:
+                context = {**context, "deadline": message.deadline}
             try:
                 # Intentar procesar directamente con el agente para mejorar la confiabilidad
-                response = await agent.process(message.content, message.context)
+                response = await agent.process(message.content, context)
                 
                 # Crear y enviar la respuesta
                 response_msg = message.create_response(
@@ -244,7 +662,7 @@ class AgentCommunicator:
                 # Ajustar el tipo de mensaje según el estado de la respuesta
                 if response.status != "success":
                     response_msg.msg_type = MessageType.ERROR
-                    
+                
                 self.logger.info(f"Procesado directo exitoso, enviando respuesta a {message.sender_id}")
                 await self.send_message(response_msg)
                 return
@@ -264,15 +682,51 @@ class AgentCommunicator:
         else:
             self.logger.warning(f"No hay handlers registrados para {receiver_id}, mensaje no será procesado")
     
-    async def send_message(self, message: Message) -> None:
+    async def send_message(self, message: Message) -> bool:
         """
         Queue a message for delivery.
         
+        Responses to pending requests are handed to the waiting request
+        immediately; any other message goes to the receiver's mailbox. If
+        the mailbox is full, expired messages are purged first and then the
+        mailbox's overflow policy applies. Replies are always accepted,
+        since their number is bounded by the requests that were sent.
+        
         Args:
             message: The message to send
+            
+        Returns:
+            True if the message was queued or delivered, False if it was
+            refused or expired before it could be queued
         """
+        self._stats["sent"] += 1
+        if self._resolve_response(message):
+            return True
+        if message.is_expired():
+            self._discard(message, "deadline_exceeded", "expired")
+            return False
+        
+        mailbox = self._get_mailbox(message.receiver_id)
+        if mailbox.is_full() and not message.reference_id:
+            for expired in mailbox.remove_expired():
+                self._discard(expired, "deadline_exceeded", "expired")
+        
+        if mailbox.is_full() and not message.reference_id:
+            if mailbox.overflow == OverflowPolicy.REJECT:
+                self._discard(message, "mailbox_full", "rejected")
+                return False
+            if mailbox.overflow == OverflowPolicy.DROP_OLDEST:
+                self._discard(mailbox.pop_oldest(), "dropped_on_overflow", "dropped")
+            else:
+                timeout = None if message.deadline is None else message.deadline - time.time()
+                if not await mailbox.wait_for_space(timeout):
+                    self._discard(message, "deadline_exceeded", "expired")
+                    return False
+        
         self.logger.debug(f"Queuing message from {message.sender_id} to {message.receiver_id}")
-        await self.message_queue.put(message)
+        mailbox.put(message)
+        self._schedule(mailbox)
+        return True
     
     async def send_request(
         self, 
@@ -280,40 +734,61 @@ class AgentCommunicator:
         receiver_id: str, 
         content: str, 
         context: Optional[Dict] = None,
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        priority: int = 0,
+        deadline: Optional[float] = None
     ) -> Optional[Message]:
         """
         Send a request and wait for a response.
         
+        The request carries an absolute deadline, the earlier of now +
+        timeout and the given deadline (or the "deadline" of the context,
+        which is how a request made while handling another one inherits
+        it). Once the deadline passes the request is discarded instead of
+        being processed.
+        
         Args:
             sender_id: ID of the sending agent
             receiver_id: ID of the receiving agent
             content: Content of the request
             context: Optional context for the request
             timeout: Timeout in seconds for waiting for a response
-            
+            priority: Delivery priority; higher values are delivered first
+            deadline: Optional absolute time (epoch seconds) by which the
+                      response is needed
+                      
         Returns:
-            Response message or None if timed out
+            Response message, an error message if the request could not be
+            delivered, or None if timed out
         """
+        now = time.time()
+        if deadline is None and context:
+            deadline = context.get("deadline")
+        if deadline is not None:
+            timeout = min(timeout, max(0.0, deadline - now))
+        
         # Create and send the request message
         request = Message(
             sender_id=sender_id,
             receiver_id=receiver_id,
             msg_type=MessageType.REQUEST,
             content=content,
-            context=context
+            context=context,
+            priority=priority,
+            deadline=now + timeout
         )
         
         # Create a future to wait for the response
-        response_future = asyncio.Future()
+        response_future = asyncio.get_running_loop().create_future()
         self._response_waiters[request.message_id] = response_future
         
-        # Send the request
-        await self.send_message(request)
-        
         try:
-            # Wait for the response with timeout
-            response = await asyncio.wait_for(response_future, timeout)
+            # Send the request (a full mailbox may make this wait)
+            if not await self.send_message(request) and not response_future.done():
+                return None
+            
+            # Wait for the response until the deadline
+            response = await asyncio.wait_for(response_future, max(0.0, request.deadline - time.time()))
             return response
         except asyncio.TimeoutError:
             self.logger.warning(f"Request {request.message_id} timed out")
@@ -363,7 +838,23 @@ class AgentCommunicator:
             List of agent info dictionaries
         """
         return [agent.get_info() for agent in self.agents.values()]
-
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about message delivery.
+        
+        Returns:
+            Dictionary with the message counters, the number of deliveries in
+            progress and the state of every mailbox
+        """
+        return {
+            **self._stats,
+            "running": self._running,
+            "in_flight": self._delivering,
+            "queued": sum(len(mailbox) for mailbox in self.mailboxes.values()),
+            "mailboxes": {agent_id: mailbox.get_stats() for agent_id, mailbox in self.mailboxes.items()}
+        }
+    
     def find_agent(self, agent_id: str) -> Optional[Any]:
         """
         Encuentra un agente registrado por su ID.
@@ -404,7 +895,9 @@ async def send_agent_request(
     receiver_id: str, 
     content: str, 
     context: Optional[Dict] = None,
-    timeout: float = 30.0
+    timeout: float = 30.0,
+    priority: int = 0,
+    deadline: Optional[float] = None
 ) -> Optional[AgentResponse]:
     """
     Send a request from one agent to another and get the response.
@@ -418,7 +911,10 @@ async def send_agent_request(
         content: Content of the request
         context: Optional context for the request
         timeout: Timeout in seconds
-        
+        priority: Delivery priority; higher values are delivered first
+        deadline: Optional absolute time (epoch seconds) by which the response
+                  is needed; defaults to the "deadline" of the context, if any
+                  
     Returns:
         AgentResponse from the receiving agent or None if timed out
     """
@@ -427,7 +923,9 @@ async def send_agent_request(
         receiver_id=receiver_id,
         content=content,
         context=context,
-        timeout=timeout
+        timeout=timeout,
+        priority=priority,
+        deadline=deadline
     )
     
     if response is None:
@@ -224,29 +224,15 @@ class BaseAgent(ABC):
             meta_filter["agent_id"] = self.agent_id
         
         try:
-            # Try semantic search first
+            # Keyword and semantic matches are fused in a single hybrid search
             if query:
-                results = self.memory_manager.search_memories(
+                return self.memory_manager.search_memories(
                     query=query,
                     memory_type=memory_type,
                     limit=limit,
                     threshold=threshold,
                     metadata=meta_filter
                 )
-                
-                # If we got results, return them
-                if results and len(results) > 0:
-                    return results
-                    
-                # Otherwise, try keyword search as fallback
-                self.logger.debug(f"Semantic search returned no results, trying keyword search")
-                results = self.memory_manager.search_memories_by_keyword(
-                    keywords=query.split(),
-                    memory_type=memory_type,
-                    limit=limit,
-                    metadata=meta_filter
-                )
-                return results
             
             # If no query provided, get recent memories
             return self.memory_manager.get_recent_memories(
@@ -0,0 +1,485 @@
+"""
+Capability Registry module.
+
+This module provides the CapabilityRegistry class, which indexes the agents
+available for delegation by capability and keeps their live load and
+performance history, so the best agent for a task can be found without
+scanning every registered agent.
+"""
+
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Key of the heap holding every agent (for requests without capabilities)
+_ANY = None
+
+
+class CapabilityRegistry:
+    """
+    Inverted index from capabilities to agents, with weighted selection.
+    
+    Every agent has a record (a dictionary with its "capabilities",
+    "status", "last_used", "active_tasks", "max_concurrent_tasks",
+    "avg_latency", "success_rate" and task counts); the agents attribute
+    maps agent IDs to these records and can be read like the plain agent
+    dictionaries the agents keep.
+    
+    An agent's score is the weighted sum of how well its capabilities match
+    the request and of a base score made of its free capacity, its
+    historical latency and its success rate. Each capability keeps a heap
+    of its agents ordered by base score. The heaps are never searched
+    linearly: when an agent's load or history changes, a fresh entry is
+    pushed to the heaps of its capabilities and the old ones are skipped
+    as stale (the heaps are rebuilt once stale entries dominate). A lookup
+    walks the heaps of the requested capabilities best-first and stops as
+    soon as no agent left in them could beat the ones already found, so
+    it usually touches a handful of entries however many agents share a
+    capability.
+    """
+    
+    DEFAULT_WEIGHTS = {
+        "match": 1.0,
+        "load": 0.5,
+        "latency": 0.2,
+        "success": 0.3,
+        "preferred_agent": 0.25
+    }
+    
+    # Match score of an agent offering a related capability instead of the preferred one
+    RELATED_MATCH = 0.8
+    
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        latency_scale: float = 5.0,
+        history_factor: float = 0.3
+    ):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            weights: Weights of the score components ("match", "load",
+                     "latency", "success", "preferred_agent"); missing ones
+                     take the defaults
+            latency_scale: Average latency (s) at which the latency score halves
+            history_factor: Weight of the newest result in the moving
+                            averages of latency and success rate
+        """
+        self.weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.latency_scale = latency_scale
+        self.history_factor = history_factor
+        
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[Optional[str], Set[str]] = {_ANY: set()}
+        self._heaps: Dict[Optional[str], List[Tuple[float, int, int, str]]] = {_ANY: []}
+        self._order: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._sequence = itertools.count()
+    
+    # Registration and live state
+    
+    def register(
+        self,
+        agent_id: str,
+        capabilities: Iterable[str],
+        max_concurrent_tasks: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Register an agent, or update the capabilities of a registered one.
+        
+        Re-registering keeps the agent's load and history.
+        
+        Args:
+            agent_id: ID of the agent
+            capabilities: Capabilities the agent offers
+            max_concurrent_tasks: Number of tasks the agent may run at once
+            
+        Returns:
+            The agent's record
+        """
+        capabilities = list(dict.fromkeys(capabilities))
+        record = self.agents.get(agent_id)
+        if record is None:
+            record = {
+                "status": "idle",
+                "last_used": None,
+                "active_tasks": 0,
+                "avg_latency": None,
+                "success_rate": 1.0,
+                "completed_tasks": 0,
+                "failed_tasks": 0
+            }
+            self.agents[agent_id] = record
+            self._order[agent_id] = len(self._order)
+        else:
+            self._unindex(agent_id)
+        
+        record["capabilities"] = capabilities
+        record["max_concurrent_tasks"] = max(1, max_concurrent_tasks or 1)
+        
+        for capability in capabilities:
+            self._index.setdefault(capability, set()).add(agent_id)
+            self._heaps.setdefault(capability, [])
+        self._index[_ANY].add(agent_id)
+        self._reindex(agent_id)
+        return record
+    
+    def unregister(self, agent_id: str) -> bool:
+        """
+        Remove an agent from the registry.
+        
+        Args:
+            agent_id: ID of the agent
+            
+        Returns:
+            True if the agent was registered, False otherwise
+        """
+        if agent_id not in self.agents:
+            return False
+        self._unindex(agent_id)
+        self._index[_ANY].discard(agent_id)
+        self._versions.pop(agent_id, None)
+        del self.agents[agent_id]
+        return True
+    
+    def acquire(self, agent_id: str) -> None:
+        """
+        Count a task as started on an agent.
+        
+        Args:
+            agent_id: ID of the agent
+        """
+        record = self.agents.get(agent_id)
+        if record is None:
+            return
+        record["active_tasks"] += 1
+        record["status"] = "busy"
+        record["last_used"] = datetime.now().isoformat()
+        self._reindex(agent_id)
+    
+    def release(self, agent_id: str) -> None:
+        """
+        Count a task as finished on an agent; it turns idle after its last task.
+        
+        Args:
+            agent_id: ID of the agent
+        """
+        record = self.agents.get(agent_id)
+        if record is None:
+            return
+        record["active_tasks"] = max(0, record["active_tasks"] - 1)
+        if not record["active_tasks"] and record["status"] == "busy":
+            record["status"] = "idle"
+        self._reindex(agent_id)
+    
+    def set_status(self, agent_id: str, status: str) -> None:
+        """
+        Set an agent's status; "offline" agents are never selected.
+        
+        Args:
+            agent_id: ID of the agent
+            status: New status
+        """
+        record = self.agents.get(agent_id)
+        if record is None:
+            return
+        record["status"] = status
+        self._reindex(agent_id)
+    
+    def record_result(self, agent_id: str, latency: float, success: bool) -> None:
+        """
+        Add the outcome of a task to an agent's history.
+        
+        Args:
+            agent_id: ID of the agent
+            latency: How long the task took (s)
+            success: Whether the task succeeded
+        """
+        record = self.agents.get(agent_id)
+        if record is None:
+            return
+        factor = self.history_factor
+        if record["avg_latency"] is None:
+            record["avg_latency"] = latency
+        else:
+            record["avg_latency"] += factor * (latency - record["avg_latency"])
+        record["success_rate"] += factor * (float(success) - record["success_rate"])
+        record["completed_tasks" if success else "failed_tasks"] += 1
+        self._reindex(agent_id)
+    
+    def is_available(self, agent_id: str) -> bool:
+        """
+        Check whether an agent can take another task now.
+        
+        Args:
+            agent_id: ID of the agent
+            
+        Returns:
+            True if the agent is online and below its concurrency limit
+        """
+        record = self.agents.get(agent_id)
+        return (
+            record is not None
+            and record["status"] != "offline"
+            and record["active_tasks"] < record["max_concurrent_tasks"]
+        )
+    
+    # Lookup
+    
+    def agents_with(self, capability: str) -> List[str]:
+        """
+        Get the agents offering a capability, in registration order.
+        
+        Args:
+            capability: The capability
+            
+        Returns:
+            List of agent IDs
+        """
+        return sorted(self._index.get(capability, ()), key=self._order.__getitem__)
+    
+    def capabilities_containing(self, text: str) -> List[str]:
+        """
+        Get the registered capabilities whose name contains some text.
+        
+        This scans the distinct capability names, not the agents.
+        
+        Args:
+            text: The text to look for
+            
+        Returns:
+            List of capability names
+        """
+        return [
+            capability for capability, agent_ids in self._index.items()
+            if capability is not _ANY and agent_ids and text in capability
+        ]
+    
+    def select(
+        self,
+        capabilities: Iterable[str],
+        match_all: bool = False,
+        preferred: Optional[str] = None,
+        preferred_agent: Optional[str] = None,
+        available_only: bool = False,
+        exclude: Optional[Iterable[str]] = None
+    ) -> Optional[str]:
+        """
+        Select the best agent for a set of capabilities.
+        
+        Args:
+            capabilities: The requested capabilities (none means any agent)
+            match_all: Whether the match score is the fraction of the
+                       capabilities an agent offers (True) or whether
+                       offering any of them is a full match (False)
+            preferred: With match_all False, the capability that makes a
+                       full match; agents offering only the others get
+                       RELATED_MATCH
+            preferred_agent: Agent given the "preferred_agent" bonus
+            available_only: Whether to skip agents that are offline or at
+                            their concurrency limit
+            exclude: Agent IDs to leave out
+            
+        Returns:
+            The ID of the best agent, or None if no agent matches
+        """
+        ranked = self.rank(
+            capabilities, limit=1, match_all=match_all, preferred=preferred,
+            preferred_agent=preferred_agent, available_only=available_only, exclude=exclude
+        )
+        return ranked[0][0] if ranked else None
+    
+    def rank(
+        self,
+        capabilities: Iterable[str],
+        limit: int = 1,
+        match_all: bool = False,
+        preferred: Optional[str] = None,
+        preferred_agent: Optional[str] = None,
+        available_only: bool = False,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Get the best agents for a set of capabilities, with their scores.
+        
+        Args:
+            capabilities: The requested capabilities (none means any agent)
+            limit: Maximum number of agents to return
+            match_all: See select()
+            preferred: See select()
+            preferred_agent: See select()
+            available_only: See select()
+            exclude: Agent IDs to leave out
+            
+        Returns:
+            List of (agent ID, score) tuples, best first
+        """
+        requested = list(dict.fromkeys(capabilities))
+        excluded = set(exclude or ())
+        if limit <= 0:
+            return []
+        
+        match_weight = self.weights["match"]
+        if not requested:
+            streams = [(_ANY, 1.0)]
+        elif match_all:
+            streams = [(capability, 1.0) for capability in requested]
+        else:
+            streams = [
+                (capability, 1.0 if preferred is None or capability == preferred else self.RELATED_MATCH)
+                for capability in requested
+            ]
+        
+        def score(agent_id: str) -> float:
+            offered = self.agents[agent_id]["capabilities"]
+            if not requested:
+                match = 1.0
+            elif match_all:
+                match = sum(1 for capability in requested if capability in offered) / len(requested)
+            elif preferred is None or preferred in offered:
+                match = 1.0
+            else:
+                match = self.RELATED_MATCH
+            total = match_weight * match + self._base_score(agent_id)
+            if agent_id == preferred_agent:
+                total += self.weights["preferred_agent"]
+            return total
+        
+        def eligible(agent_id: str) -> bool:
+            return agent_id not in excluded and (
+                self.is_available(agent_id) if available_only
+                else self.agents[agent_id]["status"] != "offline"
+            )
+        
+        # Best results so far, as a min-heap of (score, -order, agent_id)
+        best: List[Tuple[float, int, str]] = []
+        seen: Set[str] = set()
+        
+        def consider(agent_id: str) -> None:
+            seen.add(agent_id)
+            if not eligible(agent_id):
+                return
+            entry = (score(agent_id), -self._order[agent_id], agent_id)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+        
+        # The preferred agent carries a bonus the stream bounds do not account for
+        if preferred_agent in self.agents and any(
+            preferred_agent in self._index.get(capability, ()) for capability, _ in streams
+        ):
+            consider(preferred_agent)
+        
+        # Best-first walk: always pull from the stream whose next agent could score highest
+        frontier: List[Tuple[float, int, str, Iterator[Tuple[str, float]], float]] = []
+        for position, (capability, stream_match) in enumerate(streams):
+            entries = self._iter_capability(capability)
+            first = next(entries, None)
+            if first is not None:
+                agent_id, base = first
+                frontier.append((-(match_weight * stream_match + base), position, agent_id, entries, stream_match))
+        heapq.heapify(frontier)
+        
+        while frontier:
+            neg_bound, position, agent_id, entries, stream_match = frontier[0]
+            if len(best) == limit and best[0][0] >= -neg_bound:
+                break
+            if agent_id not in seen:
+                consider(agent_id)
+            following = next(entries, None)
+            if following is None:
+                heapq.heappop(frontier)
+            else:
+                next_id, base = following
+                heapq.heapreplace(
+                    frontier, (-(match_weight * stream_match + base), position, next_id, entries, stream_match)
+                )
+        
+        return [(agent_id, total) for total, _, agent_id in sorted(best, reverse=True)]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the registry.
+        
+        Returns:
+            Dictionary with agent, capability and heap entry counts
+        """
+        return {
+            "agents": len(self.agents),
+            "capabilities": sum(1 for capability, agent_ids in self._index.items() if capability is not _ANY and agent_ids),
+            "busy_agents": sum(1 for record in self.agents.values() if record["active_tasks"]),
+            "heap_entries": sum(len(heap) for heap in self._heaps.values())
+        }
+    
+    # Index maintenance
+    
+    def _base_score(self, agent_id: str) -> float:
+        """Score an agent on free capacity, latency and success rate."""
+        record = self.agents[agent_id]
+        load = min(1.0, record["active_tasks"] / record["max_concurrent_tasks"])
+        latency = record["avg_latency"]
+        latency_score = 1.0 if latency is None else self.latency_scale / (self.latency_scale + latency)
+        return (
+            self.weights["load"] * (1.0 - load)
+            + self.weights["latency"] * latency_score
+            + self.weights["success"] * record["success_rate"]
+        )
+    
+    def _unindex(self, agent_id: str) -> None:
+        """Remove an agent from the capability index (its heap entries turn stale)."""
+        for capability in self.agents[agent_id].get("capabilities", []):
+            agent_ids = self._index.get(capability)
+            if agent_ids is not None:
+                agent_ids.discard(agent_id)
+    
+    def _reindex(self, agent_id: str) -> None:
+        """Push an agent's current base score to the heaps of its capabilities."""
+        version = next(self._sequence)
+        self._versions[agent_id] = version
+        entry = (-self._base_score(agent_id), self._order[agent_id], version, agent_id)
+        for capability in [*self.agents[agent_id]["capabilities"], _ANY]:
+            heap = self._heaps[capability]
+            heapq.heappush(heap, entry)
+            # Rebuild once stale entries outnumber the live ones
+            if len(heap) > 2 * len(self._index[capability]) + 8:
+                self._heaps[capability] = self._rebuild(capability)
+    
+    def _is_current(self, entry: Tuple[float, int, int, str], agent_ids: Set[str]) -> bool:
+        """Check whether a heap entry is the latest one of an agent still offering the capability."""
+        return self._versions.get(entry[3]) == entry[2] and entry[3] in agent_ids
+    
+    def _rebuild(self, capability: Optional[str]) -> List[Tuple[float, int, int, str]]:
+        """Build a heap holding only the current entry of each agent of a capability."""
+        agent_ids = self._index[capability]
+        heap = [entry for entry in self._heaps[capability] if self._is_current(entry, agent_ids)]
+        heapq.heapify(heap)
+        return heap
+    
+    def _iter_capability(self, capability: Optional[str]) -> Iterator[Tuple[str, float]]:
+        """
+        Yield the agents of a capability by decreasing base score.
+        
+        Stale entries at the top of the heap are dropped first; the rest
+        of the heap is walked without being modified, with a secondary heap
+        holding the positions whose parent was already yielded.
+        """
+        heap = self._heaps.get(capability)
+        agent_ids = self._index.get(capability, ())
+        while heap and not self._is_current(heap[0], agent_ids):
+            heapq.heappop(heap)
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, position = heapq.heappop(frontier)
+            if self._is_current(entry, agent_ids):
+                yield entry[3], -entry[0]
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
@@ -656,34 +656,16 @@ Alternativamente, puedes usar el EchoAgent o SystemAgent para tareas que no requ
                     if debug:
                         self.logger.info(f"DEBUG: Detectada palabra clave especial: {algo}")
             
-            # Inicializar memories como vacío
-            memories = []
-            
-            # Si encontramos palabras clave, hacer una búsqueda específica primero
-            if keywords:
-                for keyword in keywords:
-                    if debug:
-                        self.logger.info(f"DEBUG: Buscando memorias con palabra clave: {keyword}")
-                    keyword_memories = self.recall(
-                        query=keyword,
-                        memory_type="code_interaction",
-                        limit=5
-                    )
-                    if keyword_memories:
-                        if debug:
-                            self.logger.info(f"DEBUG: Encontradas {len(keyword_memories)} memorias con palabra clave '{keyword}'")
-                        memories = keyword_memories
-                        break
-            
-            # Si no encontramos con palabras clave o no hay palabras clave, hacer la búsqueda normal
-            if not keywords or not memories:
-                if debug:
-                    self.logger.info(f"DEBUG: Realizando búsqueda estándar por '{query}'")
-                memories = self.recall(
-                    query=query,
-                    memory_type="code_interaction",
-                    limit=5
-                )
+            # Una sola búsqueda híbrida de interacciones de código: la consulta
+            # más las palabras clave detectadas
+            recall_query = " ".join([query] + keywords)
+            if debug:
+                self.logger.info(f"DEBUG: Realizando búsqueda híbrida por '{recall_query}'")
+            memories = self.recall(
+                query=recall_query,
+                memory_type="code_interaction",
+                limit=5
+            )
             
             if memories:
                 if debug:
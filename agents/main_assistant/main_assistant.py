@@ -10,6 +10,7 @@ import logging
 from typing import Dict, List, Optional, Any
 
 from ..base import BaseAgent, AgentResponse
+from ..capability_registry import CapabilityRegistry
 
 class MainAssistant(BaseAgent):
     """
@@ -48,8 +49,9 @@ class MainAssistant(BaseAgent):
             
         super().__init__(agent_id, config)
         
-        # Track available specialized agents
-        self.specialized_agents = {}
+        # Track available specialized agents, indexed by capability
+        self.capability_registry = CapabilityRegistry()
+        self.specialized_agents = self.capability_registry.agents
         
         # Voice configuration
         self.default_voice = config.get("default_voice", "Carlos")
@@ -75,11 +77,7 @@ class MainAssistant(BaseAgent):
             agent_id: ID of the agent to register
             capabilities: List of capabilities the agent offers
         """
-        self.specialized_agents[agent_id] = {
-            "capabilities": capabilities,
-            "status": "idle",
-            "last_used": None
-        }
+        self.capability_registry.register(agent_id, capabilities)
         self.logger.info(f"Specialized agent {agent_id} registered with capabilities: {capabilities}")
     
     def get_capabilities(self) -> List[str]:
@@ -418,20 +416,14 @@ class MainAssistant(BaseAgent):
         if agent_type in type_to_id_map:
             return type_to_id_map[agent_type]
             
-        # Otherwise, search registered agents for matching capabilities
-        for agent_id, info in self.specialized_agents.items():
-            capabilities = info["capabilities"]
+        # Otherwise, look up registered agents with a capability matching the type
+        agent_id = self.capability_registry.select([agent_type])
+        if agent_id:
+            return agent_id
             
-            # Check if the agent has a capability matching the type
-            if agent_type in capabilities:
-                return agent_id
-                
-            # Check for partial matches
-            for capability in capabilities:
-                if agent_type in capability:
-                    return agent_id
-                    
-        return None
+        # Check for partial matches (scans capability names, not agents)
+        partial_matches = self.capability_registry.capabilities_containing(agent_type)
+        return self.capability_registry.select(partial_matches) if partial_matches else None
     
     def _get_system_capabilities_description(self) -> str:
         """
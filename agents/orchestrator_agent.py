@@ -6,6 +6,7 @@ agents to solve complex tasks by breaking them down into simpler subtasks.
 """
 
 import uuid
+import time
 import logging
 import asyncio
 from datetime import datetime
@@ -14,6 +15,8 @@ import re
 
 from .base import BaseAgent, AgentResponse
 from .agent_communication import communicator, send_agent_request
+from .workflow_executor import WorkflowExecutor
+from .capability_registry import CapabilityRegistry
 
 class OrchestratorAgent(BaseAgent):
     """
@@ -28,6 +31,7 @@ class OrchestratorAgent(BaseAgent):
     
     Attributes:
         available_agents: Dictionary of registered agents and their capabilities
+        capability_registry: Capability index over available_agents used for agent selection
         workflows: Dictionary of active workflows
         workflow_history: Dictionary of completed workflows
     """
@@ -42,8 +46,9 @@ class OrchestratorAgent(BaseAgent):
         """
         super().__init__(agent_id, config)
         
-        # Registry of available agents and their capabilities
-        self.available_agents: Dict[str, Dict] = {}
+        # Registry of available agents and their capabilities, indexed by capability
+        self.capability_registry = CapabilityRegistry(weights=config.get("agent_selection_weights"))
+        self.available_agents: Dict[str, Dict] = self.capability_registry.agents
         
         # Active workflows
         self.workflows: Dict[str, Dict] = {}
@@ -54,21 +59,38 @@ class OrchestratorAgent(BaseAgent):
         # Maximum number of concurrent tasks (can be configured)
         self.max_concurrent_tasks = config.get("max_concurrent_tasks", 3)
         
+        # Default number of steps a single agent may run at once
+        self.max_tasks_per_agent = config.get("max_tasks_per_agent", 1)
+        
+        # What a failed step does to the rest of a workflow: "fail_fast" or "continue"
+        self.workflow_error_policy = config.get("workflow_error_policy", "fail_fast")
+        
+        # Per-agent capacity, created on first use
+        self._agent_slots: Dict[str, asyncio.Semaphore] = {}
+        
         self.logger.info(f"Orchestrator agent initialized with {self.max_concurrent_tasks} concurrent tasks limit")
     
-    async def register_available_agent(self, agent_id: str, capabilities: List[str]) -> None:
+    async def register_available_agent(
+        self,
+        agent_id: str,
+        capabilities: List[str],
+        max_concurrent_tasks: Optional[int] = None
+    ) -> None:
         """
         Register an agent as available for task delegation.
         
         Args:
             agent_id: ID of the agent to register
             capabilities: List of capabilities the agent offers
+            max_concurrent_tasks: Number of workflow steps the agent may run at
+                                  once (defaults to max_tasks_per_agent)
         """
-        self.available_agents[agent_id] = {
-            "capabilities": capabilities,
-            "status": "idle",
-            "last_used": None
-        }
+        self.capability_registry.register(
+            agent_id,
+            capabilities,
+            max_concurrent_tasks=max_concurrent_tasks or self.max_tasks_per_agent
+        )
+        self._agent_slots.pop(agent_id, None)
         self.logger.info(f"Agent {agent_id} registered with capabilities: {capabilities}")
     
     async def process(self, query: str, context: Optional[Dict] = None) -> AgentResponse:
@@ -178,10 +200,8 @@ class OrchestratorAgent(BaseAgent):
         
         # Si el workflow viene de un PlannerAgent, identificar el planner para actualizaciones
         if from_planner:
-            for agent_id, agent_info in self.available_agents.items():
-                if "task_planning" in agent_info["capabilities"]:
-                    planner_id = agent_id
-                    break
+            planners = self.capability_registry.agents_with("task_planning")
+            planner_id = planners[0] if planners else None
         
         for i, step in enumerate(steps):
             self.logger.info(f"Executing workflow {workflow_id} step {i}: {step.get('description', 'Unknown')[:50]}...")
@@ -881,102 +901,33 @@ class OrchestratorAgent(BaseAgent):
         
         self.logger.info(f"Capacidades relevantes para '{task_type}': {relevant_capabilities}")
         
-        # 1. Filter agents by required capability
-        candidates = {}
-        for agent_id, info in self.available_agents.items():
-            agent_capabilities = info["capabilities"]
+        # 1. Look up the best agent offering one of the capabilities; offering
+        #    the task type itself counts as a full match, a related one as partial
+        registry = self.capability_registry
+        preferred_agent = context.get("preferred_agent")
+        ranked = registry.rank(
+            relevant_capabilities,
+            limit=1,
+            preferred=task_type if task_type in relevant_capabilities else None,
+            preferred_agent=preferred_agent
+        )
             
-            # Verificar si el agente tiene al menos una capacidad relevante
-            if any(cap in agent_capabilities for cap in relevant_capabilities):
-                candidates[agent_id] = {
-                    **info,
-                    "score": 0  # Initial score
-                }
-                self.logger.info(f"Agente candidato encontrado: {agent_id} con capacidades: {agent_capabilities}")
-        
-        if not candidates:
+        if not ranked:
             self.logger.warning(f"No agents available with capability matching: {relevant_capabilities}")
             
-            # Try fallback to generic capabilities
-            fallback_candidates = {}
-            for agent_id, info in self.available_agents.items():
-                # Try to find agents with general capabilities
-                if any(cap in info["capabilities"] for cap in ["general", "default", "echo"]):
-                    fallback_candidates[agent_id] = {
-                        **info,
-                        "score": 0,
-                        "is_fallback": True
-                    }
-            
-            if fallback_candidates:
-                self.logger.info(f"Found {len(fallback_candidates)} fallback agents")
-                candidates = fallback_candidates
-            else:
+            # 2. Try fallback to generic capabilities
+            ranked = registry.rank(["general", "default", "echo"], limit=1, preferred_agent=preferred_agent)
+            if not ranked:
                 self.logger.error("No suitable agents available, even for fallback")
                 return None
-        
-        # 2. Score candidates based on multiple factors
-        for agent_id, info in candidates.items():
-            score = 0
-            
-            # Base capability match score
-            capabilities = info["capabilities"]
-            
-            exact_match = task_type in capabilities
-            related_match = any(cap in capabilities for cap in relevant_capabilities)
-            
-            if exact_match:
-                score += 100  # Exact capability match
-            elif related_match:
-                score += 80   # Related capability match
-            elif "general" in capabilities:
-                score += 50   # General capability
-            
-            # Adjust score based on agent status
-            if info["status"] == "idle":
-                score += 30   # Available agent
-            else:
-                score -= 20   # Busy agent penalty
-            
-            # Consider history and context (hypothetical metrics)
-            if "success_rate" in info:
-                score += info["success_rate"] * 10  # Higher success rate is better
-            
-            # Task-specific adjustments
-            if task_type == "code" and any(cap in capabilities for cap in ["code_generation", "generate"]):
-                score += 15  # Bonus for code generation capability
-            
-            if task_type == "system" and any(cap in capabilities for cap in ["execute_command", "system"]):
-                score += 15  # Bonus for command execution capability
-            
-            # Context-specific requirements
-            if context.get("preferred_agent") == agent_id:
-                score += 25  # User preference bonus
-            
-            # Update the score
-            candidates[agent_id]["score"] = score
-            self.logger.info(f"Agente {agent_id} tiene puntuación: {score}")
+            self.logger.info(f"Falling back to generic agent {ranked[0][0]}")
         
         # 3. Select the best candidate
-        if not candidates:
-            return None
-        
-        # Sort by score in descending order
-        sorted_candidates = sorted(
-            candidates.items(),
-            key=lambda x: x[1]["score"],
-            reverse=True
-        )
-        
-        # Select the highest scoring agent
-        best_agent_id = sorted_candidates[0][0]
-        best_score = sorted_candidates[0][1]["score"]
-        
-        self.logger.info(f"Selected agent {best_agent_id} with score {best_score}")
+        best_agent_id, best_score = ranked[0]
+        self.logger.info(f"Selected agent {best_agent_id} with score {best_score:.2f}")
         
-        # Update agent status
-        self.available_agents[best_agent_id]["status"] = "busy"
-        self.available_agents[best_agent_id]["last_used"] = datetime.now().isoformat()
+        # Update agent load and status
+        registry.acquire(best_agent_id)
         
         return best_agent_id
     
@@ -984,13 +935,50 @@ class OrchestratorAgent(BaseAgent):
         """
         Mark an agent as idle after task completion.
         
+        An agent running several steps stays busy until the last one ends.
+        
         Args:
             agent_id: ID of the agent to release
         """
         if agent_id in self.available_agents:
-            self.available_agents[agent_id]["status"] = "idle"
+            self.capability_registry.release(agent_id)
             self.logger.debug(f"Agent {agent_id} released and marked as idle")
     
+    def _agent_slot(self, agent_id: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding how many workflow steps an agent runs at once.
+        
+        Args:
+            agent_id: ID of the agent
+            
+        Returns:
+            The agent's semaphore
+        """
+        slot = self._agent_slots.get(agent_id)
+        if slot is None:
+            capacity = self.available_agents.get(agent_id, {}).get("max_concurrent_tasks", self.max_tasks_per_agent)
+            slot = self._agent_slots[agent_id] = asyncio.Semaphore(max(1, capacity))
+        return slot
+    
+    @staticmethod
+    def _step_dependencies(step: Dict) -> List[int]:
+        """
+        Get the indices of the steps a workflow step depends on.
+        
+        Args:
+            step: The step dictionary ("depends_on" may be missing, a single
+                  index or a list of indices, as ints or numeric strings)
+                  
+        Returns:
+            List of step indices
+        """
+        dependencies = step.get("depends_on")
+        if dependencies is None or dependencies == "":
+            return []
+        if not isinstance(dependencies, (list, tuple, set)):
+            dependencies = [dependencies]
+        return [int(dep) for dep in dependencies]
+    
     async def _get_agent_status(self) -> Dict[str, List[str]]:
         """
         Get the current status of all registered agents.
@@ -1016,7 +1004,11 @@ class OrchestratorAgent(BaseAgent):
         Execute a previously planned workflow.
         
         This method executes the steps in a workflow, respecting dependencies
-        between steps and handling errors appropriately.
+        between steps and handling errors appropriately. Independent steps
+        run concurrently (up to max_concurrent_tasks, and up to each agent's
+        capacity); the workflow's "error_policy" (default
+        workflow_error_policy) decides whether a failure cancels the rest
+        ("fail_fast") or only skips the steps that depend on it ("continue").
         
         Args:
             workflow_id: ID of the workflow to execute
@@ -1039,81 +1031,62 @@ class OrchestratorAgent(BaseAgent):
         self.logger.info(f"Executing workflow {workflow_id} with {len(workflow['steps'])} steps")
         
         try:
-            # Process steps according to their dependencies
-            steps_to_execute = list(range(len(workflow["steps"])))
-            steps_completed = set()
-            steps_failed = set()
+            steps = workflow["steps"]
+            dependencies = [self._step_dependencies(step) for step in steps]
             
             # Keep track of results to pass to dependent steps
             step_results = {}
             
-            # Execute steps while there are steps remaining and no failures
-            while steps_to_execute and not steps_failed:
-                # Find steps that can be executed now (dependencies satisfied)
-                executable_steps = []
-                for step_idx in steps_to_execute[:]:
-                    step = workflow["steps"][step_idx]
+            async def run_step(step_idx: int) -> bool:
+                step = steps[step_idx]
+                step["status"] = "running"
+                workflow["current_step"] = step_idx
+                try:
+                    step_result = await self._execute_workflow_step(
+                        workflow_id=workflow_id,
+                        step_idx=step_idx,
+                        step=step,
+                        context=workflow["context"],
+                        previous_results=step_results
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error executing step {step_idx}: {str(e)}")
+                    step["status"] = "failed"
+                    step["error"] = str(e)
+                    return False
                     
-                    # Check if this step has dependencies
-                    dependencies = step.get("depends_on", [])
-                    if not dependencies and "depends_on" in step:
-                        dependencies = [step["depends_on"]]  # Convert scalar to list
+                # Store the result and mark the step
+                step_results[step_idx] = step_result
+                succeeded = step_result["status"] == "success"
+                step["status"] = "completed" if succeeded else "failed"
+                return succeeded
                     
-                    # If dependencies are empty or all satisfied, we can execute
-                    if (not dependencies or 
-                        all(dep_idx in steps_completed for dep_idx in dependencies)):
-                        executable_steps.append(step_idx)
-                        steps_to_execute.remove(step_idx)
-                
-                if not executable_steps:
-                    # We have a circular dependency or all steps require unsatisfied dependencies
-                    self.logger.error(f"Workflow {workflow_id} has circular dependencies or invalid dependencies")
-                    raise Exception("Circular dependencies detected in workflow")
+            # Ready steps run concurrently; dependents start as soon as their
+            # last prerequisite completes (raises ValueError on cycles)
+            executor = WorkflowExecutor(
+                dependencies,
+                run_step,
+                max_concurrent=self.max_concurrent_tasks,
+                error_policy=workflow.get("error_policy", self.workflow_error_policy),
+                logger=self.logger
+            )
+            outcome = await executor.run()
                 
-                # Execute the steps that are ready
-                # In this version, we execute sequentially - you can make this parallel if needed
-                for step_idx in executable_steps:
-                    workflow["current_step"] = step_idx
-                    step = workflow["steps"][step_idx]
-                    
-                    try:
-                        # Execute the step
-                        step_result = await self._execute_workflow_step(
-                            workflow_id=workflow_id,
-                            step_idx=step_idx,
-                            step=step,
-                            context=workflow["context"],
-                            previous_results=step_results
-                        )
-                        
-                        # Store the result
-                        step_results[step_idx] = step_result
-                        
-                        # Mark the step as completed
-                        step["status"] = "completed" if step_result["status"] == "success" else "failed"
-                        
-                        if step_result["status"] == "success":
-                            steps_completed.add(step_idx)
-                        else:
-                            steps_failed.add(step_idx)
-                            # Stop executing if a step fails
-                            break
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error executing step {step_idx}: {str(e)}")
-                        step["status"] = "failed"
-                        step["error"] = str(e)
-                        steps_failed.add(step_idx)
-                        break
+            steps_completed = outcome["completed"]
+            steps_failed = outcome["failed"]
+            for step_idx in outcome["skipped"]:
+                steps[step_idx]["status"] = "skipped"
+            for step_idx in outcome["cancelled"]:
+                steps[step_idx]["status"] = "cancelled"
             
             # Update workflow status based on execution results
             if steps_failed:
                 workflow["status"] = "failed"
-                failed_steps = [workflow["steps"][idx] for idx in steps_failed]
+                failed_steps = [workflow["steps"][idx] for idx in sorted(steps_failed)]
                 
-                failure_message = f"Workflow failed at step(s): {', '.join(str(idx) for idx in steps_failed)}\n"
+                failure_message = f"Workflow failed at step(s): {', '.join(str(idx) for idx in sorted(steps_failed))}\n"
                 if step_results and any(idx in step_results for idx in steps_failed):
-                    failure_details = [step_results[idx]["content"] for idx in steps_failed if idx in step_results]
+                    failure_details = [step_results[idx]["content"] for idx in sorted(steps_failed) if idx in step_results]
                     failure_message += f"Failure details: {'; '.join(failure_details)}"
                 
                 return AgentResponse(
@@ -1123,6 +1096,8 @@ class OrchestratorAgent(BaseAgent):
                         "workflow_id": workflow_id,
                         "failed_steps": failed_steps,
                         "completed_steps": len(steps_completed),
+                        "skipped_steps": sorted(outcome["skipped"]),
+                        "cancelled_steps": sorted(outcome["cancelled"]),
                         "total_steps": len(workflow["steps"])
                     }
                 )
@@ -1185,12 +1160,10 @@ class OrchestratorAgent(BaseAgent):
         self.logger.info(f"Executing workflow {workflow_id} step {step_idx}: {step_description[:50]}...")
         
         # Check if this step depends on previous steps
-        dependencies = step.get("depends_on", [])
-        if not isinstance(dependencies, list):
-            dependencies = [dependencies]  # Convert to list if it's a single value
+        dependencies = self._step_dependencies(step)
         
         # Ensure all dependencies are completed
-        missing_deps = [dep for dep in dependencies if str(dep) not in previous_results]
+        missing_deps = [dep for dep in dependencies if dep not in previous_results]
         if missing_deps:
             self.logger.warning(f"Step {step_idx} depends on uncompleted steps: {missing_deps}")
             return {
@@ -1229,23 +1202,29 @@ class OrchestratorAgent(BaseAgent):
         
         # Add relevant previous results
         for dep in dependencies:
-            dep_str = str(dep)
-            if dep_str in previous_results:
-                step_context[f"step_{dep}_result"] = previous_results[dep_str]["content"]
+            if dep in previous_results:
+                step_context[f"step_{dep}_result"] = previous_results[dep]["content"]
         
         # Execute the step by sending request to the agent
         try:
-            self.logger.info(f"Sending request to agent {agent_id} for step {step_idx}")
-            
-            response = await send_agent_request(
-                sender_id=self.agent_id,
-                receiver_id=agent_id,
-                content=step_prompt,
-                context=step_context
-            )
+            # Wait for the agent to have capacity for another step
+            async with self._agent_slot(agent_id):
+                self.logger.info(f"Sending request to agent {agent_id} for step {step_idx}")
             
-            # Release the agent after use
-            await self._release_agent(agent_id)
+                started = time.perf_counter()
+                response = await send_agent_request(
+                    sender_id=self.agent_id,
+                    receiver_id=agent_id,
+                    content=step_prompt,
+                    context=step_context
+                )
+                
+                # Feed the latency and success rate used in agent selection
+                self.capability_registry.record_result(
+                    agent_id,
+                    time.perf_counter() - started,
+                    response is not None and response.status != "error"
+                )
             
             if not response:
                 self.logger.error(f"No response from agent {agent_id} for step {step_idx}")
@@ -1255,6 +1234,15 @@ class OrchestratorAgent(BaseAgent):
                     "error": "no_response"
                 }
             
+            if response.status == "error":
+                self.logger.error(f"Agent {agent_id} failed step {step_idx}: {response.content}")
+                return {
+                    "status": "error",
+                    "content": response.content,
+                    "error": "agent_error",
+                    "agent_id": agent_id
+                }
+            
             # Update step status
             step["status"] = "completed"
             
@@ -1279,6 +1267,9 @@ class OrchestratorAgent(BaseAgent):
                 "error": str(e),
                 "agent_id": agent_id
             }
+        finally:
+            # Release the agent after use
+            await self._release_agent(agent_id)
     
     def _build_enhanced_step_prompt(self, step: Dict, previous_results: Dict, dependencies: List[int]) -> str:
         """
@@ -1905,41 +1896,12 @@ class OrchestratorAgent(BaseAgent):
         """
         self.logger.info(f"Seleccionando agente para capacidades {required_capabilities}")
         
-        best_agent_id = None
-        best_match_score = -1
-        
-        for agent_id, agent_info in self.available_agents.items():
-            # Skip agents that are not idle
-            if agent_info.get("status") != "idle":
-                continue
-            
-            # Calculate capability match score
-            agent_capabilities = set(agent_info.get("capabilities", []))
-            req_capabilities = set(required_capabilities)
-            
-            if not req_capabilities:
-                # If no specific capabilities required, any agent can do it
-                match_score = 1
-            else:
-                # Calculate match as proportion of required capabilities the agent has
-                if not agent_capabilities:
-                    match_score = 0
-                else:
-                    intersection = req_capabilities.intersection(agent_capabilities)
-                    match_score = len(intersection) / len(req_capabilities) if req_capabilities else 0
-            
-            # Consider agent's recent usage (prefer less recently used agents)
-            last_used = agent_info.get("last_used")
-            recency_bonus = 0.1 if last_used is None else 0
-            
-            # Final score
-            score = match_score + recency_bonus
-            
-            if score > best_match_score:
-                best_match_score = score
-                best_agent_id = agent_id
-        
-        return best_agent_id if best_match_score > 0 else None
+        # Agent offering the largest share of the capabilities, among those with free capacity
+        return self.capability_registry.select(
+            required_capabilities,
+            match_all=True,
+            available_only=True
+        )
     
     async def _update_planner_task_status(self, planner_id: str, plan_id: str, task_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None, agent_id: Optional[str] = None) -> None:
         """
@@ -5,4 +5,5 @@ This package provides components for decomposing complex tasks into simpler subt
 establishing dependencies between tasks, and creating execution plans.
 """
 
-from .task import Task, TaskStatus, TaskDependency, DependencyType 
\ No newline at end of file
+from .task import Task, TaskStatus, TaskDependency, DependencyType
+from .scheduler import PlanScheduler 
\ No newline at end of file
@@ -6,11 +6,12 @@ and other planning-related operations.
 """
 
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 
 from .task import Task, TaskDependency, DependencyType
 from .execution_plan import ExecutionPlan
+from ..capability_registry import CapabilityRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -133,7 +134,7 @@ class PlanningAlgorithms:
     @staticmethod
     def select_agent_for_task(
         task: Task, 
-        available_agents: Dict[str, Dict]
+        available_agents: Union[CapabilityRegistry, Dict[str, Dict]]
     ) -> Optional[str]:
         """
         Seleccionar el mejor agente para una tarea dada.
@@ -142,53 +143,32 @@ class PlanningAlgorithms:
         1. Capacidades requeridas de la tarea
         2. Capacidades ofrecidas por cada agente
         3. Estado actual y carga de cada agente
+        4. Latencia y tasa de éxito históricas de cada agente
         
         Args:
             task: La tarea a asignar
-            available_agents: Diccionario de agentes disponibles con capacidades
+            available_agents: Registro de capacidades de los agentes, o
+                              diccionario de agentes disponibles con capacidades
+                              (que se indexa en cada llamada)
             
         Returns:
             ID del agente seleccionado, o None si no se encuentra un agente adecuado
         """
-        best_agent_id = None
-        best_match_score = -1
-        
-        for agent_id, agent_info in available_agents.items():
-            # Omitir agentes que no están inactivos
-            if agent_info.get("status") != "idle":
-                continue
-            
-            # Calcular puntuación de coincidencia de capacidades
-            agent_capabilities = set(agent_info.get("capabilities", []))
-            required_capabilities = set(task.required_capabilities)
-            
-            if not required_capabilities:
-                # Si no se requieren capacidades específicas, cualquier agente puede hacerlo
-                match_score = 1
-            else:
-                # Calcular coincidencia como proporción de capacidades requeridas que tiene el agente
-                if not agent_capabilities:
-                    match_score = 0
-                else:
-                    intersection = required_capabilities.intersection(agent_capabilities)
-                    match_score = len(intersection) / len(required_capabilities)
-            
-            # Considerar uso reciente del agente (preferir agentes menos usados recientemente)
-            last_used = agent_info.get("last_used")
-            recency_bonus = 0.1 if last_used is None else 0
-            
-            # Puntuación final
-            score = match_score + recency_bonus
-            
-            if score > best_match_score:
-                best_match_score = score
-                best_agent_id = agent_id
-        
-        # Solo devolver un agente si coincide al menos con algunas capacidades
-        if best_match_score > 0:
-            return best_agent_id
-        else:
-            return None
+        registry = available_agents
+        if not isinstance(registry, CapabilityRegistry):
+            registry = CapabilityRegistry()
+            for agent_id, agent_info in available_agents.items():
+                registry.register(agent_id, agent_info.get("capabilities", []))
+                # Los agentes que no están inactivos no tienen capacidad libre
+                if agent_info.get("status") != "idle":
+                    registry.acquire(agent_id)
+        
+        # Proporción de capacidades requeridas que ofrece cada agente, entre los que tienen capacidad libre
+        return registry.select(
+            task.required_capabilities,
+            match_all=True,
+            available_only=True
+        )
     
     @staticmethod
     def create_execution_plan(
@@ -7,10 +7,11 @@ which are collections of tasks with dependencies.
 
 import uuid
 from enum import Enum
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Iterable, Union
 from datetime import datetime
 
-from .task import Task, TaskStatus, TaskDependency, DependencyType
+from .task import Task, TaskStatus, TaskDependency
+from .scheduler import PlanScheduler
 
 
 class PlanStatus(Enum):
@@ -55,6 +56,9 @@ class ExecutionPlan:
         self.status = PlanStatus.PENDING
         self.execution_order: List[str] = []  # Task IDs in execution order
         
+        # Dependency graph and ready queue, built on first use
+        self._scheduler: Optional[PlanScheduler] = None
+        
         # Timing information
         self.created_at = datetime.now()
         self.started_at = None
@@ -123,6 +127,7 @@ class ExecutionPlan:
             task: The task to add
         """
         self.tasks[task.task_id] = task
+        self._reset_scheduler()
     
     def add_dependency(self, dependency: TaskDependency) -> None:
         """
@@ -132,96 +137,90 @@ class ExecutionPlan:
             dependency: The dependency to add
         """
         self.dependencies.append(dependency)
+        self._reset_scheduler()
+    
+    def _reset_scheduler(self) -> None:
+        """Discard the scheduler, to be rebuilt on next use."""
+        if self._scheduler is not None:
+            self._scheduler.detach()
+            self._scheduler = None
+    
+    def get_scheduler(self) -> PlanScheduler:
+        """
+        Get the scheduler tracking this plan's dependency graph.
+        
+        The scheduler is built on first use and rebuilt after tasks or
+        dependencies are added. It follows task status changes, whether
+        made through update_task_status or directly on a task.
+        
+        Returns:
+            The plan's PlanScheduler
+            
+        Raises:
+            ValueError: If the dependencies form a cycle
+        """
+        if self._scheduler is None:
+            self._scheduler = PlanScheduler(self)
+        return self._scheduler
     
     def compute_execution_order(self) -> List[str]:
         """
         Compute a valid execution order for the tasks in this plan.
         
         This implements a topological sort algorithm to ensure that
-        tasks are executed only after their dependencies are met.
+        tasks are executed only after their dependencies are met. Among
+        the tasks that could come next, the one on the longest remaining
+        path (by estimated complexity) goes first.
         
         Returns:
             List of task IDs in execution order
-        """
-        # Build dependency graph
-        graph: Dict[str, List[str]] = {task_id: [] for task_id in self.tasks}
-        in_degree: Dict[str, int] = {task_id: 0 for task_id in self.tasks}
-        
-        for dep in self.dependencies:
-            if dep.dependency_type.value == "finish_to_start":
-                source = dep.source_task_id
-                target = dep.target_task_id
-                graph[source].append(target)
-                in_degree[target] += 1
-        
-        # Find all tasks with no dependencies
-        queue: List[str] = [task_id for task_id, count in in_degree.items() if count == 0]
-        
-        # Process queue
-        execution_order: List[str] = []
-        while queue:
-            current = queue.pop(0)
-            execution_order.append(current)
             
-            # Process all tasks that depend on the current task
-            for neighbor in graph[current]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-        
-        # Check for cycles
-        if len(execution_order) != len(self.tasks):
-            raise ValueError("Dependency cycle detected in the plan")
-        
+        Raises:
+            ValueError: If the dependencies form a cycle
+        """
+        execution_order = self.get_scheduler().priority_order()
         self.execution_order = execution_order
         return execution_order
     
-    def get_ready_tasks(self) -> List[Task]:
+    def get_critical_path(self) -> List[str]:
         """
-        Get tasks that are ready to be executed.
-        
-        A task is ready if:
-        1. It's in PENDING status
-        2. All its dependencies are satisfied
+        Get the chain of tasks that bounds how fast the plan can be executed.
         
         Returns:
-            List of ready tasks
+            List of task IDs on the critical path, in execution order
         """
-        ready_tasks = []
-        
-        for task_id, task in self.tasks.items():
-            if task.status == TaskStatus.PENDING and self._are_dependencies_met(task_id):
-                ready_tasks.append(task)
-        
-        return ready_tasks
+        return self.get_scheduler().critical_path()
     
-    def _are_dependencies_met(self, task_id: str) -> bool:
+    def estimate_makespan(
+        self,
+        agents: Union[Dict[str, Dict], Iterable[str]],
+        time_per_unit: float = 1.0
+    ) -> float:
         """
-        Check if all dependencies for a task are met.
+        Predict how long the plan takes when its tasks are spread over some agents.
         
         Args:
-            task_id: ID of the task to check
+            agents: Agent IDs, or a dictionary of agent information (with
+                    "capabilities" and optionally "speed") keyed by agent ID
+            time_per_unit: Time taken by a task of complexity 1.0
             
         Returns:
-            True if all dependencies are met, False otherwise
+            The predicted makespan
         """
-        for dep in self.dependencies:
-            if dep.target_task_id != task_id:
-                continue
-                
-            source_task = self.tasks.get(dep.source_task_id)
-            if not source_task:
-                continue
-                
-            # Check if dependency is satisfied based on type
-            if dep.dependency_type == DependencyType.FINISH_TO_START:
-                if source_task.status != TaskStatus.COMPLETED:
-                    return False
-            elif dep.dependency_type == DependencyType.START_TO_START:
-                if source_task.status == TaskStatus.PENDING:
-                    return False
+        return self.get_scheduler().simulate(agents, time_per_unit)
+    
+    def get_ready_tasks(self) -> List[Task]:
+        """
+        Get tasks that are ready to be executed.
+        
+        A task is ready if:
+        1. It's in PENDING status
+        2. All its dependencies are satisfied
         
-        return True
+        Returns:
+            List of ready tasks, those on the longest remaining path first
+        """
+        return self.get_scheduler().ready_tasks()
     
     def update_task_status(self, task_id: str, status: TaskStatus, 
                           result: Any = None, error: str = None) -> None:
@@ -252,10 +251,15 @@ class ExecutionPlan:
     
     def _update_plan_status(self) -> None:
         """Update the overall status of the plan based on task statuses."""
-        # Count tasks by status
-        status_counts = {status: 0 for status in TaskStatus}
-        for task in self.tasks.values():
-            status_counts[task.status] += 1
+        # Count tasks by status (the scheduler keeps the counts up to date
+        # once it has applied the changes since its last sync)
+        if self._scheduler is not None:
+            self._scheduler.sync()
+            status_counts = self._scheduler.status_counts
+        else:
+            status_counts = {status: 0 for status in TaskStatus}
+            for task in self.tasks.values():
+                status_counts[task.status] += 1
         
         # All tasks completed
         if status_counts[TaskStatus.COMPLETED] == len(self.tasks):
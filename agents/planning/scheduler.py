@@ -0,0 +1,405 @@
+"""
+Scheduler module for planning.
+
+This module provides the PlanScheduler class, which keeps the dependency
+graph of an execution plan in a form that can be updated incrementally,
+ranks tasks by their critical path and simulates their list scheduling
+over a set of agents to predict the makespan of the plan.
+"""
+
+import heapq
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .task import Task, TaskStatus, DependencyType
+
+logger = logging.getLogger(__name__)
+
+
+class PlanScheduler:
+    """
+    Critical-path-aware scheduling engine for an ExecutionPlan.
+    
+    The scheduler builds the successor lists (reverse adjacency) of the
+    plan once and keeps, for every task, a counter of the dependencies that
+    still hold it back. A finish-to-start dependency is satisfied once its
+    source completes, a start-to-start one once its source leaves the
+    pending state; the other dependency types do not gate the start of a
+    task. Status changes reported through on_status_change only touch the
+    successors of the task that changed, so tracking which tasks are ready
+    costs O(V + E) over a whole run instead of a scan of every dependency
+    per task. The scheduler listens to the status of every task, so
+    changes made directly on the tasks (Task.start_execution, complete and
+    fail) are recorded as they happen and applied by the next sync(), at
+    the same cost.
+    
+    Tasks are prioritised by their upward rank: the length, in estimated
+    complexity, of the longest path from the task to the end of the plan.
+    The ready queue hands out the task with the highest rank first, which
+    keeps the critical path moving, and schedule() uses the same ranks for
+    HEFT-style list scheduling over a set of agents.
+    """
+    
+    def __init__(self, plan: Any):
+        """
+        Build the dependency graph of a plan.
+        
+        Args:
+            plan: The ExecutionPlan to schedule (its tasks and dependencies)
+            
+        Raises:
+            ValueError: If the dependencies form a cycle
+        """
+        self.plan = plan
+        self._order: Dict[str, int] = {task_id: idx for idx, task_id in enumerate(plan.tasks)}
+        
+        # Reverse adjacency: source -> [(target, waits for finish)]
+        self._successors: Dict[str, List[Tuple[str, bool]]] = {task_id: [] for task_id in plan.tasks}
+        self._predecessors: Dict[str, List[Tuple[str, bool]]] = {task_id: [] for task_id in plan.tasks}
+        self._pending: Dict[str, int] = {task_id: 0 for task_id in plan.tasks}
+        
+        for dep in plan.dependencies:
+            if dep.dependency_type not in (DependencyType.FINISH_TO_START, DependencyType.START_TO_START):
+                continue
+            source, target = dep.source_task_id, dep.target_task_id
+            # Dependencies on tasks outside the plan never hold anything back
+            if source not in self._successors or target not in self._successors:
+                continue
+            waits_for_finish = dep.dependency_type == DependencyType.FINISH_TO_START
+            self._successors[source].append((target, waits_for_finish))
+            self._predecessors[target].append((source, waits_for_finish))
+        
+        self.topological_order = self._topological_sort()
+        self.ranks: Dict[str, float] = {}
+        self._compute_ranks()
+        
+        # Counters reflect the current task statuses
+        self.status_counts: Dict[TaskStatus, int] = {status: 0 for status in TaskStatus}
+        self._statuses: Dict[str, TaskStatus] = {}
+        self._started: Set[str] = set()
+        self._finished: Set[str] = set()
+        for task_id, task in plan.tasks.items():
+            self.status_counts[task.status] += 1
+            self._statuses[task_id] = task.status
+            started, finished = self._flags(task.status)
+            if started:
+                self._started.add(task_id)
+            if finished:
+                self._finished.add(task_id)
+        for task_id, predecessors in self._predecessors.items():
+            self._pending[task_id] = sum(
+                1 for source, waits_for_finish in predecessors
+                if source not in (self._finished if waits_for_finish else self._started)
+            )
+        
+        self._ready: Set[str] = set()
+        self._heap: List[Tuple[float, int, str]] = []
+        for task_id in plan.tasks:
+            self._refresh(task_id)
+        
+        # Tasks whose status changed since the last sync
+        self._changed: Set[str] = set()
+        for task in plan.tasks.values():
+            task.add_status_listener(self._on_task_changed)
+    
+    def detach(self) -> None:
+        """Stop listening to the status of the plan's tasks (once the scheduler is discarded)."""
+        for task in self.plan.tasks.values():
+            task.remove_status_listener(self._on_task_changed)
+        self._changed.clear()
+    
+    def _on_task_changed(self, task: Task, old_status: TaskStatus, new_status: TaskStatus) -> None:
+        """Record that a task changed status, to be applied by the next sync()."""
+        self._changed.add(task.task_id)
+    
+    @staticmethod
+    def _flags(status: TaskStatus) -> Tuple[bool, bool]:
+        """Get whether a status counts as started and as finished for dependents."""
+        return status != TaskStatus.PENDING, status == TaskStatus.COMPLETED
+    
+    def _priority(self, task_id: str) -> Tuple[float, int]:
+        """Get the sort key of a task: highest rank first, then plan order."""
+        return -self.ranks[task_id], self._order[task_id]
+    
+    def _topological_sort(self) -> List[str]:
+        """Order the tasks so every dependency comes before its dependents (Kahn's algorithm)."""
+        in_degree = {task_id: len(predecessors) for task_id, predecessors in self._predecessors.items()}
+        queue: Deque[str] = deque(task_id for task_id, count in in_degree.items() if count == 0)
+        order: List[str] = []
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for target, _ in self._successors[current]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+        
+        if len(order) != len(self._successors):
+            raise ValueError("Dependency cycle detected in the plan")
+        return order
+    
+    def _cost(self, task_id: str) -> float:
+        """Get the estimated cost of a task (its complexity, never negative)."""
+        return max(0.0, float(self.plan.tasks[task_id].estimated_complexity or 0.0))
+    
+    def _through(self, task_id: str, edge: Tuple[str, bool]) -> float:
+        """Get the rank a task would have if its longest path went through a successor."""
+        target, waits_for_finish = edge
+        return self._cost(task_id) + self.ranks[target] if waits_for_finish else self.ranks[target]
+    
+    def _compute_ranks(self) -> None:
+        """
+        Compute the upward rank of every task, in reverse topological order.
+        
+        The rank of a task is its own cost plus the largest rank among the
+        tasks waiting for it to finish; a task waiting only for it to start
+        can run alongside it, so it contributes its rank without the cost.
+        """
+        for task_id in reversed(self.topological_order):
+            self.ranks[task_id] = max(
+                [self._cost(task_id)] + [self._through(task_id, edge) for edge in self._successors[task_id]]
+            )
+    
+    def _refresh(self, task_id: str) -> None:
+        """Add a task to the ready set or remove it from it, according to its state."""
+        task = self.plan.tasks[task_id]
+        if task.status == TaskStatus.PENDING and self._pending[task_id] == 0:
+            if task_id not in self._ready:
+                self._ready.add(task_id)
+                heapq.heappush(self._heap, (*self._priority(task_id), task_id))
+        else:
+            self._ready.discard(task_id)
+    
+    def on_status_change(self, task_id: str, old_status: TaskStatus, new_status: TaskStatus) -> None:
+        """
+        Update the dependency counters after a task changed status.
+        
+        Args:
+            task_id: ID of the task that changed
+            old_status: Status before the change
+            new_status: Status after the change
+        """
+        if task_id not in self._successors:
+            return
+        
+        self.status_counts[old_status] -= 1
+        self.status_counts[new_status] += 1
+        self._statuses[task_id] = new_status
+        
+        was_started, was_finished = self._flags(old_status)
+        is_started, is_finished = self._flags(new_status)
+        start_delta = int(was_started) - int(is_started)
+        finish_delta = int(was_finished) - int(is_finished)
+        (self._started.add if is_started else self._started.discard)(task_id)
+        (self._finished.add if is_finished else self._finished.discard)(task_id)
+        
+        if start_delta or finish_delta:
+            for target, waits_for_finish in self._successors[task_id]:
+                delta = finish_delta if waits_for_finish else start_delta
+                if delta:
+                    self._pending[target] += delta
+                    self._refresh(target)
+        self._refresh(task_id)
+    
+    def sync(self, task_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Catch up with status changes made directly on the tasks.
+        
+        Each task's status is compared with the last one the scheduler saw
+        and any difference is applied as through on_status_change.
+        
+        Args:
+            task_ids: IDs of the tasks to check (None for the tasks that
+                     changed since the last sync)
+        """
+        if task_ids is None:
+            task_ids, self._changed = self._changed, set()
+        for task_id in task_ids:
+            seen = self._statuses.get(task_id)
+            if seen is None:
+                continue
+            status = self.plan.tasks[task_id].status
+            if status != seen:
+                self.on_status_change(task_id, seen, status)
+    
+    def ready_tasks(self) -> List[Task]:
+        """
+        Get the tasks that can start now, highest priority first.
+        
+        Returns:
+            List of ready tasks
+        """
+        self.sync()
+        return [self.plan.tasks[task_id] for task_id in sorted(self._ready, key=self._priority)]
+    
+    def pop_ready(self) -> Optional[Task]:
+        """
+        Take the highest-priority ready task off the ready queue.
+        
+        The task stays pending until its status is changed; it is only
+        handed out once, unless it becomes ready again.
+        
+        Returns:
+            The task, or None if no task is ready
+        """
+        self.sync()
+        while self._heap:
+            _, _, task_id = heapq.heappop(self._heap)
+            if task_id in self._ready:
+                self._ready.discard(task_id)
+                return self.plan.tasks[task_id]
+        return None
+    
+    def priority_order(self) -> List[str]:
+        """
+        Get a dependency-respecting order of all tasks that favours the critical path.
+        
+        Among the tasks whose dependencies are placed, the one with the
+        highest upward rank comes next (ties keep the plan order).
+        
+        Returns:
+            List of task IDs
+        """
+        in_degree = {task_id: len(predecessors) for task_id, predecessors in self._predecessors.items()}
+        heap = [(*self._priority(task_id), task_id) for task_id, count in in_degree.items() if count == 0]
+        heapq.heapify(heap)
+        order: List[str] = []
+        while heap:
+            _, _, current = heapq.heappop(heap)
+            order.append(current)
+            for target, _ in self._successors[current]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    heapq.heappush(heap, (*self._priority(target), target))
+        return order
+    
+    def critical_path(self) -> List[str]:
+        """
+        Get the chain of tasks that bounds the length of the plan.
+        
+        Returns:
+            List of task IDs, from the first task to the last
+        """
+        if not self.ranks:
+            return []
+        sources = [task_id for task_id, predecessors in self._predecessors.items() if not predecessors]
+        current = min(sources, key=self._priority)
+        path = [current]
+        while True:
+            # Follow a successor that the task's rank was computed through
+            on_path = [
+                target for target, waits_for_finish in self._successors[current]
+                if self._through(current, (target, waits_for_finish)) == self.ranks[current]
+            ]
+            if not on_path:
+                return path
+            current = min(on_path, key=self._priority)
+            path.append(current)
+    
+    def critical_path_length(self) -> float:
+        """
+        Get the estimated length of the critical path (a lower bound on the makespan).
+        
+        Returns:
+            The largest upward rank in the plan
+        """
+        return max(self.ranks.values(), default=0.0)
+    
+    def schedule(
+        self,
+        agents: Union[Dict[str, Dict], Iterable[str]],
+        time_per_unit: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Simulate list scheduling of the plan over a set of agents.
+        
+        Tasks are dispatched highest upward rank first, as soon as their
+        dependencies allow, each to the agent on which it would finish
+        earliest (HEFT without insertion). Agents run one task at a time;
+        a task takes estimated_complexity * time_per_unit divided by the
+        agent's "speed" (default 1.0). A task only goes to agents offering
+        one of its required capabilities, or to any agent if none does.
+        Statuses are not taken into account: the whole plan is simulated
+        from the start.
+        
+        Args:
+            agents: Agent IDs, or a dictionary of agent information (with
+                    "capabilities" and optionally "speed") keyed by agent ID
+            time_per_unit: Time taken by a task of complexity 1.0
+            
+        Returns:
+            Dictionary with the "assignments" (task ID -> agent_id, start,
+            finish), the predicted "makespan" and the "critical_path"
+            
+        Raises:
+            ValueError: If there are no agents
+        """
+        if not isinstance(agents, dict):
+            agents = {agent_id: {} for agent_id in agents}
+        if not agents:
+            raise ValueError("Cannot schedule a plan without agents")
+        
+        # Agents by capability, to find the candidates of a task without scanning every agent
+        by_capability: Dict[str, List[str]] = {}
+        for agent_id, info in agents.items():
+            for capability in info.get("capabilities", []):
+                by_capability.setdefault(capability, []).append(agent_id)
+        speeds = {agent_id: float(info.get("speed", 1.0)) or 1.0 for agent_id, info in agents.items()}
+        available_at = {agent_id: 0.0 for agent_id in agents}
+        
+        in_degree = {task_id: len(predecessors) for task_id, predecessors in self._predecessors.items()}
+        earliest_start = {task_id: 0.0 for task_id in in_degree}
+        heap = [(*self._priority(task_id), task_id) for task_id, count in in_degree.items() if count == 0]
+        heapq.heapify(heap)
+        
+        assignments: Dict[str, Dict[str, Any]] = {}
+        while heap:
+            _, _, task_id = heapq.heappop(heap)
+            task = self.plan.tasks[task_id]
+            
+            candidates = {
+                agent_id
+                for capability in task.required_capabilities
+                for agent_id in by_capability.get(capability, ())
+            } or agents.keys()
+            
+            best = None
+            for agent_id in candidates:
+                start = max(available_at[agent_id], earliest_start[task_id])
+                finish = start + self._cost(task_id) * time_per_unit / speeds[agent_id]
+                key = (finish, start, agent_id)
+                if best is None or key < best:
+                    best = key
+            finish, start, agent_id = best
+            
+            available_at[agent_id] = finish
+            assignments[task_id] = {"agent_id": agent_id, "start": start, "finish": finish}
+            
+            for target, waits_for_finish in self._successors[task_id]:
+                ready_at = finish if waits_for_finish else start
+                earliest_start[target] = max(earliest_start[target], ready_at)
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    heapq.heappush(heap, (*self._priority(target), target))
+        
+        makespan = max((entry["finish"] for entry in assignments.values()), default=0.0)
+        return {
+            "assignments": assignments,
+            "makespan": makespan,
+            "critical_path": self.critical_path(),
+            "critical_path_length": self.critical_path_length() * time_per_unit
+        }
+    
+    def simulate(self, agents: Union[Dict[str, Dict], Iterable[str]], time_per_unit: float = 1.0) -> float:
+        """
+        Predict how long the plan takes on a set of agents.
+        
+        Args:
+            agents: Agent IDs, or a dictionary of agent information keyed by agent ID
+            time_per_unit: Time taken by a task of complexity 1.0
+            
+        Returns:
+            The predicted makespan
+        """
+        return self.schedule(agents, time_per_unit)["makespan"]
@@ -6,7 +6,7 @@ and related concepts in the planning system.
 """
 
 from enum import Enum
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from datetime import datetime
 import uuid
 
@@ -60,8 +60,9 @@ class Task:
         self.required_capabilities = required_capabilities or []
         self.context = context or {}
         
-        # Execution state
-        self.status = TaskStatus.PENDING
+        # Execution state (status changes are reported to the listeners)
+        self._status_listeners: List[Callable[['Task', TaskStatus, TaskStatus], None]] = []
+        self._status = TaskStatus.PENDING
         self.assigned_agent = None
         self.result = None
         self.error = None
@@ -71,6 +72,38 @@ class Task:
         self.started_at = None
         self.completed_at = None
     
+    @property
+    def status(self) -> TaskStatus:
+        """Current status of the task."""
+        return self._status
+    
+    @status.setter
+    def status(self, status: TaskStatus) -> None:
+        old_status = self._status
+        self._status = status
+        if status != old_status:
+            for listener in list(self._status_listeners):
+                listener(self, old_status, status)
+    
+    def add_status_listener(self, listener: Callable[['Task', TaskStatus, TaskStatus], None]) -> None:
+        """
+        Register a function called with (task, old status, new status) whenever the status changes.
+        
+        Args:
+            listener: The function to call
+        """
+        self._status_listeners.append(listener)
+    
+    def remove_status_listener(self, listener: Callable[['Task', TaskStatus, TaskStatus], None]) -> None:
+        """
+        Unregister a status listener (nothing happens if it was not registered).
+        
+        Args:
+            listener: The function to remove
+        """
+        if listener in self._status_listeners:
+            self._status_listeners.remove(listener)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the task to a dictionary for serialization."""
         return {
@@ -0,0 +1,192 @@
+"""
+Workflow Executor module.
+
+This module provides the WorkflowExecutor class, which runs the steps of a
+workflow as a dependency graph, starting every step as soon as all of its
+prerequisites have completed.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+
+class WorkflowExecutor:
+    """
+    Concurrent executor for a DAG of workflow steps.
+    
+    Steps are identified by their index. Each step keeps a counter of the
+    prerequisites it is still waiting for and the list of steps that depend
+    on it, so finishing a step only touches its own dependents: the ones
+    whose counter drops to zero start right away, without waiting for the
+    other steps running alongside them. At most max_concurrent steps run at
+    once, which lets wide plans finish in close to the time of their
+    critical path.
+    
+    When a step fails, the "fail_fast" policy cancels the steps in progress
+    and starts no more; the "continue" policy skips only the steps that
+    depend on the failed one (directly or transitively) and keeps running
+    the independent branches.
+    """
+    
+    POLICIES = ("fail_fast", "continue")
+    
+    def __init__(
+        self,
+        dependencies: List[List[int]],
+        run_step: Callable[[int], Awaitable[bool]],
+        max_concurrent: int = 3,
+        error_policy: str = "fail_fast",
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the executor and validate the dependency graph.
+        
+        Args:
+            dependencies: For each step, the indices of the steps it depends on
+            run_step: Coroutine function running a step, returning True on success
+            max_concurrent: Maximum number of steps running at once
+            error_policy: "fail_fast" or "continue"
+            logger: Logger to use (defaults to this module's logger)
+            
+        Raises:
+            ValueError: If a dependency is out of range, the graph has a cycle
+                        or the policy is unknown
+        """
+        if error_policy not in self.POLICIES:
+            raise ValueError(f"Unknown error policy: {error_policy}")
+        
+        self.run_step = run_step
+        self.max_concurrent = max(1, max_concurrent)
+        self.error_policy = error_policy
+        self.logger = logger or logging.getLogger(__name__)
+        
+        count = len(dependencies)
+        self._pending = [0] * count
+        self._dependents: List[List[int]] = [[] for _ in range(count)]
+        for step_idx, prerequisites in enumerate(dependencies):
+            for dep_idx in set(prerequisites):
+                if not 0 <= dep_idx < count or dep_idx == step_idx:
+                    raise ValueError(f"Step {step_idx} has an invalid dependency: {dep_idx}")
+                self._pending[step_idx] += 1
+                self._dependents[dep_idx].append(step_idx)
+        
+        cycle = self._find_cycle()
+        if cycle:
+            raise ValueError(f"Circular dependencies detected in workflow between steps {cycle}")
+        
+        self.completed: Set[int] = set()
+        self.failed: Set[int] = set()
+        self.skipped: Set[int] = set()
+        self.cancelled: Set[int] = set()
+        self.running: Set[int] = set()
+    
+    def _find_cycle(self) -> List[int]:
+        """Get the steps that can never become ready (Kahn's algorithm), empty if none."""
+        pending = list(self._pending)
+        ready = deque(idx for idx, count in enumerate(pending) if count == 0)
+        reached = 0
+        while ready:
+            step_idx = ready.popleft()
+            reached += 1
+            for dependent in self._dependents[step_idx]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if reached == len(pending):
+            return []
+        return [idx for idx, count in enumerate(pending) if count > 0]
+    
+    def _skip_dependents(self, step_idx: int) -> None:
+        """Mark every step downstream of a failed step as skipped."""
+        stack = list(self._dependents[step_idx])
+        while stack:
+            dependent = stack.pop()
+            if dependent in self.skipped:
+                continue
+            self.skipped.add(dependent)
+            stack.extend(self._dependents[dependent])
+    
+    async def _run(self, step_idx: int) -> bool:
+        """Run a step, treating an exception as a failure."""
+        try:
+            return bool(await self.run_step(step_idx))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error executing step {step_idx}: {str(e)}")
+            return False
+    
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the workflow.
+        
+        Returns:
+            Dictionary with the sets of "completed", "failed", "skipped" and
+            "cancelled" step indices
+        """
+        ready: Deque[int] = deque(idx for idx, count in enumerate(self._pending) if count == 0)
+        tasks: Dict[asyncio.Task, int] = {}
+        stopping = False
+        
+        try:
+            while ready or tasks:
+                while ready and not stopping and len(tasks) < self.max_concurrent:
+                    step_idx = ready.popleft()
+                    self.running.add(step_idx)
+                    tasks[asyncio.create_task(self._run(step_idx))] = step_idx
+                
+                if not tasks:
+                    break
+                
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_idx = tasks.pop(task)
+                    self.running.discard(step_idx)
+                    
+                    if task.result():
+                        self.completed.add(step_idx)
+                        for dependent in self._dependents[step_idx]:
+                            self._pending[dependent] -= 1
+                            if self._pending[dependent] == 0 and dependent not in self.skipped:
+                                ready.append(dependent)
+                        continue
+                    
+                    self.failed.add(step_idx)
+                    self._skip_dependents(step_idx)
+                    if self.error_policy == "fail_fast" and not stopping:
+                        stopping = True
+                        self.logger.warning(f"Step {step_idx} failed, cancelling {len(tasks)} running step(s)")
+                        for other in tasks:
+                            other.cancel()
+                
+                if stopping:
+                    # Let the cancelled steps unwind before reporting
+                    for task, step_idx in list(tasks.items()):
+                        try:
+                            succeeded = await task
+                        except asyncio.CancelledError:
+                            self.cancelled.add(step_idx)
+                        else:
+                            (self.completed if succeeded else self.failed).add(step_idx)
+                        self.running.discard(step_idx)
+                    tasks.clear()
+                    break
+        finally:
+            # The caller itself was cancelled: do not leave steps running
+            for task in tasks:
+                task.cancel()
+        
+        # Steps that never started: downstream of a failure, or not reached after fail-fast
+        finished = self.completed | self.failed | self.cancelled
+        for step_idx in range(len(self._pending)):
+            if step_idx not in finished:
+                self.skipped.add(step_idx)
+        
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled
+        }
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Agent Communication Benchmark.
+
+Measures request throughput through the AgentCommunicator when one agent
+is much slower than the rest. With a single message in flight (the old
+serial delivery loop) every request waits behind the slow agent; with
+concurrent dispatch the fast agents keep answering. A second scenario
+sends a burst of short-deadline requests to one agent and counts how
+many model calls are spent on requests nobody is waiting for anymore.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add the project root to sys.path
+current_dir = Path(__file__).resolve().parent
+parent_dir = str(current_dir.parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from agents.base import BaseAgent, AgentResponse
+from agents.agent_communication import AgentCommunicator, OverflowPolicy
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger("communication_benchmark")
+
+
+class DelayAgent(BaseAgent):
+    """Agent that answers after a fixed delay, standing in for a model call."""
+    
+    def __init__(self, agent_id: str, delay: float):
+        super().__init__(agent_id, {"name": agent_id})
+        self.delay = delay
+        self.calls = 0
+    
+    async def process(self, query: str, context=None) -> AgentResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AgentResponse(content=f"{self.agent_id}: {query}")
+    
+    def get_capabilities(self):
+        return ["delay"]
+
+
+async def run(label: str, args, max_in_flight: int, per_agent_concurrency: int) -> None:
+    """Send a burst of requests and report how long the fast agents took."""
+    communicator = AgentCommunicator(max_in_flight=max_in_flight, per_agent_concurrency=per_agent_concurrency)
+    communicator.register_agent(DelayAgent("slow", args.slow_delay))
+    for i in range(args.agents):
+        communicator.register_agent(DelayAgent(f"fast{i}", args.delay))
+    await communicator.start()
+    
+    start = time.perf_counter()
+    slow = [
+        asyncio.create_task(communicator.send_request("bench", "slow", f"slow {i}", timeout=args.timeout))
+        for i in range(args.slow_requests)
+    ]
+    fast = await asyncio.gather(*[
+        communicator.send_request("bench", f"fast{i % args.agents}", f"request {i}", timeout=args.timeout)
+        for i in range(args.requests)
+    ])
+    fast_elapsed = time.perf_counter() - start
+    await asyncio.gather(*slow)
+    total_elapsed = time.perf_counter() - start
+    
+    answered = sum(1 for response in fast if response is not None)
+    print(
+        f"{label:<28} fast: {fast_elapsed:>6.2f} s ({answered}/{args.requests} answered, "
+        f"{answered / fast_elapsed:>7.1f} req/s)   total: {total_elapsed:>6.2f} s"
+    )
+    await communicator.stop()
+
+
+async def burst(label: str, args, capacity: int, policy: OverflowPolicy) -> None:
+    """Send more short-deadline requests to one agent than it can answer in time."""
+    communicator = AgentCommunicator(
+        per_agent_concurrency=1, mailbox_capacity=capacity, overflow_policy=policy
+    )
+    agent = DelayAgent("busy", args.delay)
+    communicator.register_agent(agent)
+    await communicator.start()
+    
+    responses = await asyncio.gather(*[
+        communicator.send_request("bench", "busy", f"burst {i}", timeout=args.burst_timeout)
+        for i in range(args.burst)
+    ])
+    # Let anything still queued drain
+    await asyncio.sleep(args.delay * 2)
+    
+    stats = communicator.get_stats()
+    answered = sum(1 for response in responses if response is not None and response.context.get("error") is None)
+    print(
+        f"{label:<28} answered: {answered:>4}/{args.burst}   model calls: {agent.calls:>4}   "
+        f"expired: {stats['expired']:>4}   dropped: {stats['dropped']:>4}   rejected: {stats['rejected']:>4}"
+    )
+    await communicator.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Agent communication benchmark")
+    parser.add_argument("--agents", type=int, default=10, help="Number of fast agents")
+    parser.add_argument("--requests", type=int, default=200, help="Requests sent to the fast agents")
+    parser.add_argument("--delay", type=float, default=0.05, help="Processing time of a fast agent (s)")
+    parser.add_argument("--slow-requests", type=int, default=2, help="Requests sent to the slow agent")
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="Processing time of the slow agent (s)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout (s)")
+    parser.add_argument("--burst", type=int, default=200, help="Requests in the burst scenario")
+    parser.add_argument("--burst-timeout", type=float, default=0.5, help="Timeout of the burst requests (s)")
+    parser.add_argument("--capacity", type=int, default=8, help="Mailbox capacity in the burst scenario")
+    args = parser.parse_args()
+    
+    await run("serial (1 in flight)", args, max_in_flight=1, per_agent_concurrency=1)
+    await run("1 per agent", args, max_in_flight=64, per_agent_concurrency=1)
+    await run("4 per agent", args, max_in_flight=64, per_agent_concurrency=4)
+    
+    print()
+    await burst("unbounded, deadlines", args, 0, OverflowPolicy.BLOCK)
+    await burst(f"capacity {args.capacity}, block", args, args.capacity, OverflowPolicy.BLOCK)
+    await burst(f"capacity {args.capacity}, drop oldest", args, args.capacity, OverflowPolicy.DROP_OLDEST)
+    await burst(f"capacity {args.capacity}, reject", args, args.capacity, OverflowPolicy.REJECT)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
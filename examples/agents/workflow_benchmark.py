@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Workflow Execution Benchmark.
+
+Runs a wide workflow (several independent chains joined by a final step)
+through the OrchestratorAgent with different concurrency limits. With one
+step at a time the workflow takes as long as all of its steps together;
+running ready steps concurrently brings it close to the length of the
+critical path (the longest chain).
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add the project root to sys.path
+current_dir = Path(__file__).resolve().parent
+parent_dir = str(current_dir.parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from agents.base import BaseAgent, AgentResponse
+from agents.agent_communication import communicator
+from agents.orchestrator_agent import OrchestratorAgent
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger("workflow_benchmark")
+
+
+class DelayAgent(BaseAgent):
+    """Agent that answers after a fixed delay, standing in for a model call."""
+    
+    def __init__(self, agent_id: str, delay: float):
+        super().__init__(agent_id, {"name": agent_id})
+        self.delay = delay
+    
+    async def process(self, query: str, context=None) -> AgentResponse:
+        await asyncio.sleep(self.delay)
+        return AgentResponse(content=f"{self.agent_id} done")
+    
+    def get_capabilities(self):
+        return ["echo"]
+
+
+def build_steps(chains: int, length: int):
+    """Build `chains` independent chains of `length` steps, plus a step joining them."""
+    steps = []
+    tails = []
+    for chain in range(chains):
+        for position in range(length):
+            step = {"description": f"chain {chain} step {position}", "agent_type": "echo"}
+            if position:
+                step["depends_on"] = [len(steps) - 1]
+            steps.append(step)
+        tails.append(len(steps) - 1)
+    steps.append({"description": "join results", "agent_type": "echo", "depends_on": tails})
+    return steps
+
+
+async def run(label: str, args, max_concurrent_tasks: int) -> None:
+    """Execute the workflow once and report the elapsed time."""
+    orchestrator = OrchestratorAgent(f"orchestrator_{max_concurrent_tasks}", {
+        "max_concurrent_tasks": max_concurrent_tasks
+    })
+    communicator.register_agent(orchestrator)
+    
+    steps = build_steps(args.chains, args.length)
+    orchestrator.workflows["bench"] = {
+        "id": "bench",
+        "original_task": "benchmark",
+        "context": {},
+        "steps": steps,
+        "current_step": 0,
+        "status": "planned",
+        "results": [],
+        "start_time": None,
+        "end_time": None
+    }
+    for i in range(args.agents):
+        await orchestrator.register_available_agent(f"worker{i}", ["echo"])
+    
+    start = time.perf_counter()
+    response = await orchestrator.execute_workflow("bench")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:>6.2f} s   ({response.status}, {len(steps)} steps)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Workflow execution benchmark")
+    parser.add_argument("--chains", type=int, default=6, help="Independent chains in the workflow")
+    parser.add_argument("--length", type=int, default=3, help="Steps per chain")
+    parser.add_argument("--agents", type=int, default=6, help="Worker agents")
+    parser.add_argument("--delay", type=float, default=0.1, help="Processing time of a step (s)")
+    args = parser.parse_args()
+    
+    for i in range(args.agents):
+        communicator.register_agent(DelayAgent(f"worker{i}", args.delay))
+    await communicator.start()
+    
+    steps = args.chains * args.length + 1
+    print(f"Critical path: {(args.length + 1) * args.delay:.2f} s   all steps serially: {steps * args.delay:.2f} s")
+    await run("1 step at a time", args, 1)
+    await run("3 concurrent steps", args, 3)
+    await run(f"{args.chains} concurrent steps", args, args.chains)
+    
+    await communicator.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
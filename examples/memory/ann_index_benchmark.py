@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+ANN Index Benchmark
+
+Compara el índice IVF aproximado con la búsqueda exacta (fuerza bruta) sobre
+embeddings sintéticos, midiendo recall@k y latencia para distintos valores de nprobe.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+
+# Añadir la ruta del proyecto al PATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_dir)
+
+from memory.processors.embedding_store import EmbeddingStore
+from memory.processors.ann_index import IVFIndex
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("ann_index_benchmark")
+
+
+def make_dataset(size: int, dim: int, n_topics: int, seed: int) -> np.ndarray:
+    """Generar embeddings agrupados en temas, parecidos a los de memorias reales."""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    labels = rng.integers(n_topics, size=size)
+    noise = rng.standard_normal((size, dim)).astype(np.float32) * 0.6
+    return topics[labels] + noise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recall/latencia del índice IVF")
+    parser.add_argument("--size", type=int, default=100000, help="Número de embeddings")
+    parser.add_argument("--dim", type=int, default=128, help="Dimensión de los embeddings")
+    parser.add_argument("--queries", type=int, default=200, help="Número de consultas")
+    parser.add_argument("--top-k", type=int, default=10, help="Resultados por consulta")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    vectors = make_dataset(args.size, args.dim, n_topics=max(16, args.size // 500), seed=args.seed)
+    queries = make_dataset(args.queries, args.dim, n_topics=max(16, args.size // 500), seed=args.seed + 1)
+    ids = [f"m{i}" for i in range(args.size)]
+    
+    exact = EmbeddingStore(args.dim)
+    exact.add_many(ids, vectors)
+    
+    start = time.perf_counter()
+    index = IVFIndex(args.dim, seed=args.seed)
+    index.add_many(ids, vectors)
+    build_seconds = time.perf_counter() - start
+    
+    # Resultados exactos como referencia
+    start = time.perf_counter()
+    truth = [set(i for i, _ in exact.search(q, args.top_k)) for q in queries]
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+    
+    print(f"Embeddings: {args.size} x {args.dim}, lists: {index.get_stats()['n_lists']}, "
+          f"build: {build_seconds:.2f}s")
+    print(f"Fuerza bruta: {exact_ms:.2f} ms/consulta")
+    print(f"{'nprobe':>8} {'recall@k':>10} {'ms/consulta':>12}")
+    
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found = [set(i for i, _ in index.search(q, args.top_k, nprobe=nprobe)) for q in queries]
+        elapsed_ms = (time.perf_counter() - start) / len(queries) * 1000
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(f"{nprobe:>8} {recall:>10.3f} {elapsed_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Clustering Benchmark
+
+Mide el tiempo y la calidad (pureza frente a los temas reales) del k-means
+mini-batch sobre embeddings sintéticos, tanto con fit() sobre todo el
+conjunto como con partial_fit() incremental por lotes.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+
+# Añadir la ruta del proyecto al PATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_dir)
+
+from memory.processors.clustering import MiniBatchKMeans
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("clustering_benchmark")
+
+
+def make_dataset(size: int, dim: int, n_topics: int, seed: int) -> tuple:
+    """Generar embeddings agrupados en temas, con el tema de cada uno."""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    labels = rng.integers(n_topics, size=size)
+    noise = rng.standard_normal((size, dim)).astype(np.float32) * 0.6
+    return topics[labels] + noise, labels
+
+
+def purity(labels: np.ndarray, truth: np.ndarray) -> float:
+    """Fracción de elementos que pertenecen al tema mayoritario de su cluster."""
+    return sum(np.bincount(truth[labels == c]).max() for c in np.unique(labels)) / len(truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de k-means mini-batch")
+    parser.add_argument("--size", type=int, default=100000, help="Número de embeddings")
+    parser.add_argument("--dim", type=int, default=768, help="Dimensión de los embeddings")
+    parser.add_argument("--clusters", type=int, default=32, help="Número de temas/clusters")
+    parser.add_argument("--chunk", type=int, default=5000, help="Tamaño de lote para partial_fit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    vectors, truth = make_dataset(args.size, args.dim, args.clusters, args.seed)
+    print(f"Embeddings: {args.size} x {args.dim}, temas: {args.clusters}")
+    print(f"{'modo':<14} {'segundos':>9} {'pureza':>8}")
+    
+    start = time.perf_counter()
+    labels = MiniBatchKMeans(n_clusters=args.clusters, seed=args.seed).fit_predict(vectors)
+    print(f"{'fit':<14} {time.perf_counter() - start:>9.2f} {purity(labels, truth):>8.3f}")
+    
+    start = time.perf_counter()
+    clusterer = MiniBatchKMeans(n_clusters=args.clusters, seed=args.seed)
+    for offset in range(0, args.size, args.chunk):
+        clusterer.partial_fit(vectors[offset:offset + args.chunk])
+    elapsed = time.perf_counter() - start
+    print(f"{'partial_fit':<14} {elapsed:>9.2f} {purity(clusterer.predict(vectors), truth):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Contention Benchmark
+
+Varios hilos comparten un MemoryManager, como los agentes que usan
+setup_memory(shared_memory_manager=...): unos guardan memorias
+(remember) y otros las consultan y las leen (recall). Compara el
+almacenamiento sin particionar con el particionado (ShardedStorage) con
+cerrojos de lectura/escritura y con mutex simples, y comprueba al final
+que no se ha perdido ninguna memoria.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+import threading
+
+# Añadir la ruta del proyecto al PATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_dir)
+
+from memory.core.memory_manager import MemoryManager
+from memory.storage.in_memory_storage import InMemoryStorage
+from memory.storage.sharded_storage import ShardedStorage
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("contention_benchmark")
+
+COMMON = "agente tarea memoria plan objetivo herramienta resultado error usuario archivo consulta modelo".split()
+WORDS = COMMON + [f"termino{i}" for i in range(2000)]
+TYPES = ["general", "conversation", "task", "fact"]
+
+
+def make_manager(storage, data_dir: str) -> MemoryManager:
+    """Crear un gestor sin cachés ni memorias especializadas, para medir el almacenamiento."""
+    config = {
+        "query_cache": {"enabled": False},
+        "use_long_term_memory": False,
+        "use_episodic_memory": False,
+        "use_semantic_memory": False
+    }
+    return MemoryManager(config=config, base_storage=storage, data_dir=data_dir)
+
+
+def writer(manager: MemoryManager, operations: int, seed: int, ids: list, errors: list) -> None:
+    """Guardar memorias (remember)."""
+    rng = random.Random(seed)
+    try:
+        for _ in range(operations):
+            content = " ".join(rng.choice(COMMON) for _ in range(4)) + " " + " ".join(rng.sample(WORDS, 4))
+            memory_id = manager.add_memory(
+                content, memory_type=rng.choice(TYPES), importance=rng.random(),
+                target_memories=[]
+            )
+            ids.append(memory_id)
+    except Exception as e:
+        errors.append(e)
+
+
+def reader(manager: MemoryManager, operations: int, seed: int, ids: list, errors: list) -> None:
+    """Consultar y leer memorias (recall)."""
+    rng = random.Random(seed)
+    system = manager.memory_system
+    try:
+        for i in range(operations):
+            if i % 4 == 0:
+                manager.query_memories(memory_type=rng.choice(TYPES), min_importance=0.99, limit=10)
+            elif i % 4 == 1:
+                manager.query_memories(content_query=rng.choice(WORDS[len(COMMON):]), limit=10)
+            elif ids:
+                system.get_memory(ids[rng.randrange(len(ids))])
+    except Exception as e:
+        errors.append(e)
+
+
+def run(label: str, storage, args, data_dir: str) -> None:
+    """Lanzar los hilos sobre un almacenamiento y mostrar el rendimiento."""
+    manager = make_manager(storage, data_dir)
+    ids: list = []
+    errors: list = []
+    
+    # Precarga para que las lecturas tengan algo que encontrar
+    writer(manager, args.preload, -1, ids, errors)
+    
+    threads = [
+        threading.Thread(target=writer, args=(manager, args.operations, i, ids, errors))
+        for i in range(args.writers)
+    ] + [
+        threading.Thread(target=reader, args=(manager, args.operations, 1000 + i, ids, errors))
+        for i in range(args.readers)
+    ]
+    
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    operations = (args.writers + args.readers) * args.operations
+    stored = storage.get_stats()["total"]
+    missing = len(ids) - stored
+    print(
+        f"{label:<24} {elapsed:>7.2f} s {operations / elapsed:>10.0f} op/s"
+        f"   memorias={stored} perdidas={missing} errores={len(errors)}"
+    )
+    if errors:
+        print(f"    primer error: {errors[0]!r}")
+    manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de contención con agentes concurrentes")
+    parser.add_argument("--writers", type=int, default=8, help="Hilos que guardan memorias")
+    parser.add_argument("--readers", type=int, default=8, help="Hilos que consultan memorias")
+    parser.add_argument("--operations", type=int, default=2000, help="Operaciones por hilo")
+    parser.add_argument("--preload", type=int, default=5000, help="Memorias iniciales")
+    parser.add_argument("--shards", type=int, default=8, help="Particiones del almacenamiento")
+    parser.add_argument("--data-dir", default=os.path.join(current_dir, "temp_memory_test"))
+    args = parser.parse_args()
+    
+    print(f"Hilos: {args.writers} escritores, {args.readers} lectores, {args.operations} operaciones cada uno")
+    run("InMemoryStorage", InMemoryStorage(), args, args.data_dir)
+    run("Sharded (RW locks)", ShardedStorage(num_shards=args.shards), args, args.data_dir)
+    run("Sharded (mutex)", ShardedStorage(num_shards=args.shards, read_write_locks=False), args, args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Memory Footprint Benchmark
+
+Compara la memoria ocupada por MemoryItem con el diseño anterior (objetos con
+__dict__ y dos datetime por elemento) frente al diseño compacto con __slots__,
+y frente al diseño compacto con los campos numéricos en columnas (MemoryColumns).
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import logging
+import tracemalloc
+from datetime import datetime
+
+# Añadir la ruta del proyecto al PATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_dir)
+
+from memory.core.memory_item import MemoryItem
+from memory.core.memory_columns import MemoryColumns
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("memory_footprint_benchmark")
+
+
+class LegacyMemoryItem:
+    """Diseño anterior de MemoryItem: atributos en __dict__ y timestamps datetime."""
+    
+    def __init__(self, content, memory_type="general", importance=0.5, metadata=None, id=None, created_at=None):
+        self.id = id or str(uuid.uuid4())
+        self.content = content
+        self.memory_type = memory_type
+        self.importance = max(0.0, min(1.0, importance))
+        self.metadata = metadata or {}
+        self.created_at = created_at or datetime.now()
+        self.last_accessed = self.created_at
+        self.access_count = 0
+
+
+def make_record(i: int) -> dict:
+    """Crear un registro serializado como los que se cargan de JSON/SQLite."""
+    now = datetime.now().isoformat()
+    return json.loads(json.dumps({
+        "id": str(uuid.uuid4()),
+        "content": f"mensaje {i}",
+        "memory_type": "short_term",
+        "importance": (i % 10) / 10,
+        "metadata": {"source": "user", "turn": i},
+        "created_at": now,
+        "last_accessed": now,
+        "access_count": 1
+    }))
+
+
+def load_legacy(data: dict) -> LegacyMemoryItem:
+    """Cargar un registro con el diseño anterior (equivalente al from_dict original)."""
+    item = LegacyMemoryItem(
+        content=data["content"],
+        memory_type=data["memory_type"],
+        importance=data["importance"],
+        metadata=data.get("metadata", {}),
+        id=data["id"],
+        created_at=datetime.fromisoformat(data["created_at"])
+    )
+    item.last_accessed = datetime.fromisoformat(data["last_accessed"])
+    item.access_count = data["access_count"]
+    return item
+
+
+def make_items(load, count: int, columns: MemoryColumns = None) -> list:
+    """Cargar elementos a partir de registros serializados."""
+    items = []
+    for i in range(count):
+        item = load(make_record(i))
+        if columns is not None:
+            columns.bind(item)
+        items.append(item)
+    return items
+
+
+def make_columnar(count: int) -> tuple:
+    """Cargar elementos compactos con sus campos numéricos en columnas."""
+    columns = MemoryColumns(initial_capacity=count)
+    return columns, make_items(MemoryItem.from_dict, count, columns)
+
+
+def measure(build) -> tuple:
+    """Medir la memoria retenida y el tiempo de construcción de un conjunto de elementos."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de MemoryItem")
+    parser.add_argument("--items", type=int, default=100000, help="Número de elementos")
+    args = parser.parse_args()
+    
+    layouts = [
+        ("__dict__ + datetime (anterior)", lambda: make_items(load_legacy, args.items)),
+        ("__slots__ + epoch float", lambda: make_items(MemoryItem.from_dict, args.items)),
+        ("__slots__ + MemoryColumns", lambda: make_columnar(args.items)),
+    ]
+    
+    print(f"Elementos: {args.items}")
+    print(f"{'diseño':<32} {'MB':>8} {'bytes/elem':>11} {'build s':>9}")
+    baseline = None
+    for name, build in layouts:
+        current, elapsed = measure(build)
+        baseline = baseline or current
+        print(f"{name:<32} {current / 1e6:>8.1f} {current / args.items:>11.0f} {elapsed:>9.2f}"
+              f"  ({current / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
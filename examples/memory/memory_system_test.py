@@ -17,6 +17,8 @@ import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
 import shutil
+import sqlite3
+import tempfile
 import random
 import uuid
 
@@ -42,6 +44,9 @@ try:
     from memory.core.memory_system import MemorySystem
     from memory.core.memory_item import MemoryItem
     from memory.storage.in_memory_storage import InMemoryStorage
+    from memory.storage.sharded_storage import ShardedStorage
+    from memory.storage.sqlite_pool import SQLiteConnectionPool, DEFAULT_PRAGMAS
+    from memory.types.long_term_memory import SQLiteStorage
     from memory.processors.embedder import Embedder
     from memory.processors.summarizer import Summarizer
 except ImportError as e:
@@ -616,6 +621,79 @@ class TestMemoryManagerAdvanced(MemoryTestCase):
             self.fail(f"Error al serializar/deserializar: {e}")
 
 
+class TestStorageDurability(unittest.TestCase):
+    """Pruebas de que las escrituras diferidas no se pierden."""
+    
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="memory_durability_"))
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_write_behind_keeps_batch_when_db_is_locked(self):
+        """Un commit en grupo fallido deja el lote en la cola para reintentarlo."""
+        db_path = str(self.temp_dir / "long_term.db")
+        pool = SQLiteConnectionPool(db_path, pragmas={**DEFAULT_PRAGMAS, "busy_timeout": 0})
+        storage = SQLiteStorage(db_path, pool=pool)
+        queue = storage.enable_write_behind(max_items=1000, max_delay_ms=60000)
+        memory = MemoryItem(content="Escrita con la base de datos bloqueada")
+        
+        locker = sqlite3.connect(db_path)
+        try:
+            locker.execute("BEGIN EXCLUSIVE")
+            self.assertTrue(storage.store(memory))
+            with self.assertRaises(sqlite3.OperationalError):
+                storage.flush()
+            stats = queue.get_stats()
+            self.assertEqual(stats["errors"], 1)
+            self.assertEqual(stats["pending"], 1)
+            self.assertEqual(stats["flushed"], 0)
+        finally:
+            locker.rollback()
+            locker.close()
+        
+        # Una vez liberado el bloqueo, el lote se escribe
+        retrieved = storage.retrieve(memory.id)
+        self.assertIsNotNone(retrieved)
+        self.assertEqual(retrieved.content, memory.content)
+        storage.close()
+    
+    def test_sharded_state_round_trip_keeps_links(self):
+        """Guardar y cargar el estado con almacenamiento particionado conserva los enlaces."""
+        manager = MemoryManager(
+            config={
+                "storage_shards": 4,
+                "use_long_term_memory": False,
+                "use_episodic_memory": False,
+                "use_semantic_memory": False
+            },
+            data_dir=self.temp_dir
+        )
+        source_id = manager.add_memory("Origen del enlace", memory_type="general")
+        target_id = manager.add_memory("Destino del enlace", memory_type="general")
+        self.assertTrue(manager.memory_system.link_memories(source_id, target_id, "related"))
+        
+        self.assertTrue(manager.save_state())
+        manager.load_state()
+        
+        related = manager.memory_system.get_related_memories(source_id)
+        self.assertEqual([memory.id for memory in related], [target_id])
+        
+        # Las memorias se guardan a medida que se consume la entrada
+        storage = ShardedStorage(num_shards=4, store_batch_size=2)
+        stored_ids = []
+        
+        def stream():
+            for i in range(5):
+                memory = MemoryItem(content=f"Memoria {i}")
+                stored_ids.append(memory.id)
+                if i >= 2:
+                    self.assertIsNotNone(storage.retrieve(stored_ids[i - 2]))
+                yield memory
+        
+        self.assertEqual(storage.store_many(stream()), 5)
+
+
 def run_tests():
     """Ejecuta todas las pruebas unitarias."""
     # Crear un ejecutor de pruebas que generará un informe detallado
@@ -626,6 +704,7 @@ def run_tests():
     suite.addTest(unittest.makeSuite(TestMemoryManagerQueries))
     suite.addTest(unittest.makeSuite(TestSpecializedMemorySystems))
     suite.addTest(unittest.makeSuite(TestMemoryManagerAdvanced))
+    suite.addTest(unittest.makeSuite(TestStorageDurability))
     
     # Ejecutar las pruebas
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Summarizer Benchmark
+
+Mide el tiempo del resumen extractivo (centroide TF-IDF y TextRank, con
+MMR) sobre miles de memorias sintéticas, en frío y con las frases ya
+analizadas en caché, y de un resumen enfocado en un tema.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+
+# Añadir la ruta del proyecto al PATH
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_dir)
+
+from memory.core.memory_item import MemoryItem
+from memory.processors.extractive import ExtractiveSummarizer
+from memory.processors.summarizer import MemorySummarizer
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("summarizer_benchmark")
+
+TOPICS = {
+    "python": "python listas diccionarios generadores decoradores tipos asyncio módulos".split(),
+    "cocina": "receta horno harina azúcar huevos mantequilla masa pastel".split(),
+    "viajes": "vuelo hotel maleta pasaporte playa museo tren mapa".split()
+}
+COMMON = "el la de que y en un una es por con para".split()
+
+
+def make_memories(count: int, vocabulary: int, seed: int) -> list:
+    """Generar memorias de varias frases sobre temas al azar."""
+    rng = random.Random(seed)
+    rare = [f"termino{i}" for i in range(vocabulary)]
+    memories = []
+    for _ in range(count):
+        words = TOPICS[rng.choice(list(TOPICS))]
+        sentences = [
+            " ".join(rng.choice(COMMON + words * 2 + rng.sample(rare, 3)) for _ in range(12)).capitalize() + "."
+            for _ in range(3)
+        ]
+        memories.append(MemoryItem(content=" ".join(sentences), importance=rng.random()))
+    return memories
+
+
+def timed(label: str, function) -> str:
+    """Ejecutar una función e imprimir lo que tarda."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<24} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del resumen extractivo")
+    parser.add_argument("--memories", type=int, default=5000, help="Número de memorias")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Términos poco frecuentes")
+    parser.add_argument("--length", type=int, default=500, help="Longitud máxima del resumen")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    memories = make_memories(args.memories, args.vocabulary, args.seed)
+    print(f"Memorias: {len(memories)}, frases: {3 * len(memories)}")
+    
+    for method in ("centroid", "textrank"):
+        summarizer = ExtractiveSummarizer(method=method)
+        timed(f"{method} (frío)", lambda: summarizer.summarize(memories, args.length))
+        timed(f"{method} (caché)", lambda: summarizer.summarize(memories, args.length))
+    
+    summary = timed("tema 'horno receta'", lambda: summarizer.summarize(memories, args.length, topic="horno receta"))
+    print(f"\n{summary}")
+    
+    # Las memorias estructuradas no tienen frases: se resumen por palabras clave
+    structured = [
+        MemoryItem(content={"task": "deploy python service", "status": "done"}),
+        MemoryItem(content={"receta": "pastel de horno", "tiempo": 40})
+    ]
+    topic_summary = MemorySummarizer().generate_topic_summary(structured, "python")
+    assert "deploy python service" in topic_summary, topic_summary
+    print(f"\n{topic_summary}")
+
+
+if __name__ == "__main__":
+    main()
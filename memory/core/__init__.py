@@ -8,6 +8,11 @@ and the MemoryManager class.
 
 from .memory_system import MemorySystem
 from .memory_item import MemoryItem
+from .memory_columns import MemoryColumns
+from .link_graph import LinkGraph
+from .consolidation import ConsolidationScheduler
+from .query_cache import QueryCache
 from .memory_manager import MemoryManager
 
-__all__ = ["MemorySystem", "MemoryItem", "MemoryManager"] 
\ No newline at end of file
+__all__ = ["MemorySystem", "MemoryItem", "MemoryColumns", "LinkGraph", "ConsolidationScheduler",
+           "QueryCache", "MemoryManager"] 
\ No newline at end of file
@@ -0,0 +1,349 @@
+"""
+Consolidation Module
+
+This module provides the ConsolidationScheduler class, which promotes
+short-term memories to long-term memory incrementally, in time-boxed
+slices that can run in a background thread.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .memory_item import MemoryItem
+
+logger = logging.getLogger(__name__)
+
+# Watermark of a memory that has already been promoted
+_PROMOTED = ("promoted",)
+
+
+class ConsolidationScheduler:
+    """
+    Budgeted scheduler for short-term to long-term consolidation.
+    
+    Every slice first scans the short-term memories, comparing each one's
+    importance, access count and last access with the high-water mark
+    recorded when it was last evaluated; only memories that changed (or
+    were never seen) become candidates. Candidates wait in a priority
+    queue ordered by importance x access count and are evaluated until
+    the slice's time budget runs out, and the ones that qualify are written
+    to long-term memory in batches. Memories that only need to age are
+    parked in a due-time heap instead of being re-evaluated every slice,
+    and promoted memories keep a terminal watermark, so no memory is
+    promoted twice.
+    
+    The promotion itself is delegated to a callback that receives each
+    batch of qualifying memories.
+    """
+    
+    # Promotion rules
+    PROMOTE_IMPORTANCE = 0.7
+    PROMOTE_ACCESS_COUNT = 3
+    AGED_IMPORTANCE = 0.4
+    AGE_SECONDS = 60 * 60 * 24  # 1 day
+    
+    def __init__(
+        self,
+        short_term: Any,
+        storage: Any,
+        promote: Callable[[List[MemoryItem]], bool],
+        interval_seconds: float = 5.0,
+        slice_ms: float = 10.0,
+        batch_size: int = 64,
+        scan_chunk: int = 256
+    ):
+        """
+        Initialize a new consolidation scheduler.
+        
+        Args:
+            short_term: The ShortTermMemory whose memories are consolidated
+            storage: The base storage holding the memories
+            promote: Callback writing a batch of memories to long-term memory,
+                    returning True on success
+            interval_seconds: Pause between background slices when idle
+            slice_ms: Time budget of a background slice, in milliseconds
+            batch_size: Number of memories written to long-term memory at once
+            scan_chunk: Minimum number of short-term memories scanned per slice
+        """
+        self.short_term = short_term
+        self.storage = storage
+        self.promote = promote
+        self.interval_seconds = interval_seconds
+        self.slice_seconds = slice_ms / 1000.0
+        self.batch_size = max(1, batch_size)
+        self.scan_chunk = max(1, scan_chunk)
+        
+        # Signature of each memory when it was last evaluated
+        self._watermarks: Dict[str, Tuple] = {}
+        # (-importance x access count, -importance, sequence, ID) max-heap of candidates;
+        # entries whose sequence no longer matches _queued are stale
+        self._candidates: List[Tuple[float, float, int, str]] = []
+        # Candidate ID -> (sequence, time it was queued)
+        self._queued: Dict[str, Tuple[int, float]] = {}
+        # (due timestamp, ID) heap of memories waiting to be old enough
+        self._deferred: List[Tuple[float, str]] = []
+        self._sequence = 0
+        
+        # Short-term IDs still to be scanned in the current pass
+        self._scan_ids: List[str] = []
+        self._scan_pos = 0
+        self._scan_seen: set = set()
+        
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self._stats = {
+            "slices": 0,
+            "scanned": 0,
+            "evaluated": 0,
+            "promoted": 0,
+            "batches": 0,
+            "max_lag_seconds": 0.0,
+            "last_slice_ms": 0.0
+        }
+    
+    @staticmethod
+    def _signature(memory: MemoryItem) -> Tuple[float, int, float]:
+        """Get the fields whose change makes a memory worth re-evaluating."""
+        return (memory.importance, memory.access_count, memory.accessed_timestamp)
+    
+    def evaluate(self, memory: MemoryItem, now: Optional[float] = None) -> Tuple[bool, Optional[float]]:
+        """
+        Apply the promotion rules to a memory.
+        
+        Args:
+            memory: The memory
+            now: Current timestamp (defaults to time.time())
+            
+        Returns:
+            (promote, revisit_at): whether to promote the memory now and, if
+            not, the timestamp at which it qualifies by age alone (or None)
+        """
+        now = time.time() if now is None else now
+        if memory.importance >= self.PROMOTE_IMPORTANCE or memory.access_count >= self.PROMOTE_ACCESS_COUNT:
+            return True, None
+        if memory.importance >= self.AGED_IMPORTANCE:
+            due = memory.created_timestamp + self.AGE_SECONDS
+            if now > due:
+                return True, None
+            return False, due
+        return False, None
+    
+    def _enqueue(self, memory: MemoryItem, now: float) -> None:
+        """Queue a memory for evaluation, replacing any earlier entry."""
+        self._sequence += 1
+        queued_at = self._queued.get(memory.id, (0, now))[1]
+        self._queued[memory.id] = (self._sequence, queued_at)
+        importance = memory.importance
+        heapq.heappush(
+            self._candidates,
+            (-importance * memory.access_count, -importance, self._sequence, memory.id)
+        )
+    
+    def _scan(self, deadline: Optional[float], now: float) -> None:
+        """
+        Queue the short-term memories that changed since their last evaluation.
+        
+        A pass over the short-term IDs can span several slices; at least
+        scan_chunk IDs are scanned per call. Watermarks of memories no longer
+        in short-term memory are dropped when a pass completes.
+        """
+        scanned = 0
+        while True:
+            if self._scan_pos >= len(self._scan_ids):
+                if self._scan_ids:
+                    # A full pass is done: forget what left short-term memory
+                    for memory_id in set(self._watermarks) - self._scan_seen:
+                        del self._watermarks[memory_id]
+                    self._scan_ids, self._scan_pos, self._scan_seen = [], 0, set()
+                    return
+                self._scan_ids = self.short_term.get_all_item_ids()
+                self._scan_pos = 0
+                if not self._scan_ids:
+                    self._watermarks.clear()
+                    return
+            
+            chunk = self._scan_ids[self._scan_pos:self._scan_pos + self.scan_chunk]
+            self._scan_pos += len(chunk)
+            self._scan_seen.update(chunk)
+            self._stats["scanned"] += len(chunk)
+            scanned += len(chunk)
+            
+            for memory in self.storage.retrieve_many(chunk):
+                watermark = self._watermarks.get(memory.id)
+                if watermark is _PROMOTED or memory.id in self._queued:
+                    continue
+                if watermark != self._signature(memory):
+                    self._enqueue(memory, now)
+            
+            if deadline is not None and time.perf_counter() >= deadline and scanned >= self.scan_chunk:
+                return
+    
+    def _release_due(self, now: float) -> None:
+        """Queue the deferred memories that are now old enough."""
+        tracked = self.short_term.memory_ids
+        while self._deferred and self._deferred[0][0] <= now:
+            _, memory_id = heapq.heappop(self._deferred)
+            if memory_id not in tracked or self._watermarks.get(memory_id) is _PROMOTED:
+                continue
+            memory = self.storage.retrieve(memory_id)
+            if memory is not None:
+                self._enqueue(memory, now)
+    
+    def _flush(self, batch: List[MemoryItem]) -> None:
+        """Write a batch of memories to long-term memory and mark them promoted."""
+        if not batch:
+            return
+        if self.promote(batch):
+            for memory in batch:
+                self._watermarks[memory.id] = _PROMOTED
+            self._stats["promoted"] += len(batch)
+            self._stats["batches"] += 1
+        else:
+            # Let the next scan pick them up again
+            for memory in batch:
+                self._watermarks.pop(memory.id, None)
+        batch.clear()
+    
+    def run_slice(self, budget_seconds: Optional[float] = None) -> int:
+        """
+        Run one consolidation slice.
+        
+        Args:
+            budget_seconds: Time budget of the slice (None runs until every
+                           pending candidate has been evaluated)
+                           
+        Returns:
+            The number of memories promoted
+        """
+        with self._run_lock:
+            started = time.perf_counter()
+            deadline = None if budget_seconds is None else started + budget_seconds
+            now = time.time()
+            promoted_before = self._stats["promoted"]
+            
+            try:
+                self._release_due(now)
+                # Leave at least half of the budget to evaluating candidates
+                self._scan(None if deadline is None else started + budget_seconds / 2, now)
+                
+                batch: List[MemoryItem] = []
+                tracked = self.short_term.memory_ids
+                while self._candidates:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+                    
+                    _, _, sequence, memory_id = heapq.heappop(self._candidates)
+                    queued = self._queued.get(memory_id)
+                    if queued is None or queued[0] != sequence:
+                        continue
+                    del self._queued[memory_id]
+                    
+                    memory = self.storage.retrieve(memory_id) if memory_id in tracked else None
+                    if memory is None or self._watermarks.get(memory_id) is _PROMOTED:
+                        continue
+                    
+                    lag = now - queued[1]
+                    if lag > self._stats["max_lag_seconds"]:
+                        self._stats["max_lag_seconds"] = lag
+                    self._stats["evaluated"] += 1
+                    
+                    promote, revisit_at = self.evaluate(memory, now)
+                    self._watermarks[memory_id] = self._signature(memory)
+                    if promote:
+                        batch.append(memory)
+                        if len(batch) >= self.batch_size:
+                            self._flush(batch)
+                    elif revisit_at is not None:
+                        heapq.heappush(self._deferred, (revisit_at, memory_id))
+                
+                self._flush(batch)
+            except Exception as e:
+                logger.error(f"Error consolidating memories: {e}")
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["slices"] += 1
+            self._stats["last_slice_ms"] = elapsed_ms
+            promoted = self._stats["promoted"] - promoted_before
+        
+        if promoted:
+            logger.debug(f"Consolidated {promoted} memories to long-term storage in {elapsed_ms:.1f}ms")
+        return promoted
+    
+    def run_until_idle(self) -> int:
+        """
+        Evaluate every changed short-term memory now, without a time budget.
+        
+        Returns:
+            The number of memories promoted
+        """
+        # A slice that resumes a partial scan only covers the IDs listed
+        # when that scan began, so follow it with a pass of its own
+        resumed = self._scan_pos > 0
+        promoted = self.run_slice()
+        if resumed:
+            promoted += self.run_slice()
+        return promoted
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start consolidating in a background thread."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MemoryConsolidation", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Consolidation scheduler started (slice={self.slice_seconds * 1000:.0f}ms, "
+            f"interval={self.interval_seconds}s)"
+        )
+    
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop the background thread.
+        
+        Args:
+            timeout: Maximum number of seconds to wait for the current slice
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Consolidation scheduler stopped")
+    
+    def _run(self) -> None:
+        """Background loop: one slice per interval, back to back while there is a backlog."""
+        while not self._stop_event.is_set():
+            self.run_slice(self.slice_seconds)
+            backlog = bool(self._candidates) or self._scan_pos < len(self._scan_ids)
+            # Leave the rest of the time to the foreground while catching up
+            self._stop_event.wait(self.slice_seconds if backlog else self.interval_seconds)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the scheduler.
+        
+        Returns:
+            A dictionary with the counters plus the current "backlog" (queued
+            candidates), "deferred" memories and "lag_seconds" (age of the
+            oldest queued candidate)
+        """
+        now = time.time()
+        queued_times = [queued_at for _, queued_at in list(self._queued.values())]
+        return {
+            **self._stats,
+            "running": self.is_running,
+            "backlog": len(queued_times),
+            "deferred": len(self._deferred),
+            "tracked": len(self._watermarks),
+            "lag_seconds": now - min(queued_times) if queued_times else 0.0
+        }
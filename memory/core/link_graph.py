@@ -0,0 +1,399 @@
+"""
+Link Graph Module
+
+This module provides the LinkGraph class, an adjacency-indexed directed
+graph of typed links between memories, with multi-hop traversal.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+_DIRECTIONS = ("out", "in", "both")
+
+
+class LinkGraph:
+    """
+    Directed multigraph of typed links between memory IDs.
+    
+    Edges are partitioned by link type, and every partition keeps both a
+    forward (source -> targets) and a reverse (target -> sources)
+    adjacency, so outgoing links, incoming links and all links of a node
+    are found without scanning the graph, and removing a node only touches
+    its own edges.
+    
+    Every operation holds an internal lock, so the graph can be shared by
+    threads; traversals (bfs, personalized_pagerank) lock per node visited
+    rather than for the whole walk.
+    """
+    
+    def __init__(self):
+        """Initialize an empty link graph."""
+        # link_type -> node -> neighbours
+        self._out: Dict[str, Dict[str, Set[str]]] = {}
+        self._in: Dict[str, Dict[str, Set[str]]] = {}
+        self._edge_count = 0
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        """Get the number of edges."""
+        return self._edge_count
+    
+    @staticmethod
+    def _add_adjacent(adjacency: Dict[str, Set[str]], node: str, neighbour: str) -> bool:
+        """Add a neighbour to a node's adjacency set."""
+        neighbours = adjacency.get(node)
+        if neighbours is None:
+            adjacency[node] = {neighbour}
+            return True
+        if neighbour in neighbours:
+            return False
+        neighbours.add(neighbour)
+        return True
+    
+    @staticmethod
+    def _remove_adjacent(adjacency: Dict[str, Set[str]], node: str, neighbour: str) -> bool:
+        """Remove a neighbour from a node's adjacency set, dropping empty sets."""
+        neighbours = adjacency.get(node)
+        if neighbours is None or neighbour not in neighbours:
+            return False
+        neighbours.discard(neighbour)
+        if not neighbours:
+            del adjacency[node]
+        return True
+    
+    def _types(self, link_type: Optional[str]) -> List[str]:
+        """Get the link types selected by a filter (None for all)."""
+        if link_type is None:
+            return list(self._out)
+        return [link_type] if link_type in self._out else []
+    
+    def add(self, source_id: str, target_id: str, link_type: str = "related") -> bool:
+        """
+        Add a link.
+        
+        Args:
+            source_id: The ID of the source memory
+            target_id: The ID of the target memory
+            link_type: The type of link
+            
+        Returns:
+            True if the link is new, False if it already existed
+        """
+        with self._lock:
+            if not self._add_adjacent(self._out.setdefault(link_type, {}), source_id, target_id):
+                return False
+            self._add_adjacent(self._in.setdefault(link_type, {}), target_id, source_id)
+            self._edge_count += 1
+            return True
+    
+    def add_many(self, edges: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Add several links.
+        
+        Args:
+            edges: (source_id, target_id, link_type) tuples
+            
+        Returns:
+            The number of new links
+        """
+        return sum(1 for source_id, target_id, link_type in edges if self.add(source_id, target_id, link_type))
+    
+    def remove(self, source_id: str, target_id: str, link_type: Optional[str] = None) -> bool:
+        """
+        Remove a link.
+        
+        Args:
+            source_id: The ID of the source memory
+            target_id: The ID of the target memory
+            link_type: The type of link to remove (None removes links of every type)
+            
+        Returns:
+            True if any link was removed, False otherwise
+        """
+        with self._lock:
+            removed = False
+            for lt in self._types(link_type):
+                if self._remove_adjacent(self._out[lt], source_id, target_id):
+                    self._remove_adjacent(self._in[lt], target_id, source_id)
+                    self._edge_count -= 1
+                    removed = True
+                    self._drop_type_if_empty(lt)
+            return removed
+    
+    def remove_node(self, memory_id: str) -> int:
+        """
+        Remove every link from or to a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            The number of links removed
+        """
+        with self._lock:
+            removed = 0
+            for lt in list(self._out):
+                forward, reverse = self._out[lt], self._in[lt]
+                for target_id in forward.pop(memory_id, ()):
+                    self._remove_adjacent(reverse, target_id, memory_id)
+                    removed += 1
+                for source_id in reverse.pop(memory_id, ()):
+                    # A self-link was already counted with the outgoing links
+                    if self._remove_adjacent(forward, source_id, memory_id):
+                        removed += 1
+                self._drop_type_if_empty(lt)
+            self._edge_count -= removed
+            return removed
+    
+    def _drop_type_if_empty(self, link_type: str) -> None:
+        """Forget a link type once it has no edges."""
+        if not self._out.get(link_type):
+            self._out.pop(link_type, None)
+            self._in.pop(link_type, None)
+    
+    def has_link(self, source_id: str, target_id: str, link_type: Optional[str] = None) -> bool:
+        """
+        Check whether a link exists.
+        
+        Args:
+            source_id: The ID of the source memory
+            target_id: The ID of the target memory
+            link_type: The type of link (None for any type)
+            
+        Returns:
+            True if the link exists, False otherwise
+        """
+        with self._lock:
+            return any(target_id in self._out[lt].get(source_id, ()) for lt in self._types(link_type))
+    
+    def neighbors(
+        self,
+        memory_id: str,
+        link_type: Optional[str] = None,
+        direction: str = "out"
+    ) -> Set[str]:
+        """
+        Get the memories linked to a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            link_type: The type of link to follow (None for all)
+            direction: "out" for link targets, "in" for link sources, "both" for either
+            
+        Returns:
+            The set of neighbouring memory IDs
+        """
+        if direction not in _DIRECTIONS:
+            raise ValueError(f"Invalid direction: {direction}")
+        
+        result: Set[str] = set()
+        with self._lock:
+            for lt in self._types(link_type):
+                if direction != "in":
+                    result.update(self._out[lt].get(memory_id, ()))
+                if direction != "out":
+                    result.update(self._in[lt].get(memory_id, ()))
+        return result
+    
+    def links_of(self, memory_id: str) -> Dict[str, Set[str]]:
+        """
+        Get the outgoing links of a memory grouped by link type.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            Mapping of link type to target IDs (copies)
+        """
+        with self._lock:
+            return {lt: set(forward[memory_id]) for lt, forward in self._out.items() if memory_id in forward}
+    
+    def degree(self, memory_id: str, link_type: Optional[str] = None, direction: str = "out") -> int:
+        """
+        Get the number of links of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            link_type: The type of link to count (None for all)
+            direction: "out", "in" or "both"
+            
+        Returns:
+            The number of links
+        """
+        with self._lock:
+            count = 0
+            for lt in self._types(link_type):
+                if direction != "in":
+                    count += len(self._out[lt].get(memory_id, ()))
+                if direction != "out":
+                    count += len(self._in[lt].get(memory_id, ()))
+            return count
+    
+    def edges(self, link_type: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+        """
+        Iterate over the links.
+        
+        The links are copied up front under the lock, so the iteration
+        sees a consistent snapshot and the graph may change meanwhile.
+        
+        Args:
+            link_type: The type of link to list (None for all)
+            
+        Yields:
+            (source_id, link_type, target_id) tuples
+        """
+        with self._lock:
+            snapshot = [
+                (source_id, lt, target_id)
+                for lt in self._types(link_type)
+                for source_id, targets in self._out[lt].items()
+                for target_id in targets
+            ]
+        yield from snapshot
+    
+    def link_types(self) -> List[str]:
+        """Get the link types in use."""
+        with self._lock:
+            return list(self._out)
+    
+    def bfs(
+        self,
+        start: Union[str, Iterable[str]],
+        max_depth: int = 2,
+        link_type: Optional[str] = None,
+        direction: str = "out",
+        limit: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Find the memories within a number of hops of one or more memories.
+        
+        Args:
+            start: The ID of the memory to start from, or several IDs
+            max_depth: Maximum number of hops
+            link_type: The type of link to follow (None for all)
+            direction: "out", "in" or "both"
+            limit: Optional maximum number of memories to return
+            
+        Returns:
+            Mapping of reached memory ID to its hop distance, nearest first
+            (the start memories are not included)
+        """
+        starts = [start] if isinstance(start, str) else list(start)
+        depths: Dict[str, int] = {}
+        seen = set(starts)
+        frontier = deque((start_id, 0) for start_id in starts)
+        
+        while frontier:
+            node, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
+            for neighbour in self.neighbors(node, link_type, direction):
+                if neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                depths[neighbour] = depth + 1
+                if limit is not None and len(depths) >= limit:
+                    return depths
+                frontier.append((neighbour, depth + 1))
+        
+        return depths
+    
+    def personalized_pagerank(
+        self,
+        seeds: Union[str, Iterable[str], Dict[str, float]],
+        alpha: float = 0.15,
+        epsilon: float = 1e-4,
+        link_type: Optional[str] = None,
+        direction: str = "both",
+        max_pushes: int = 100000
+    ) -> Dict[str, float]:
+        """
+        Approximate personalized PageRank around seed memories.
+        
+        Uses the local forward-push algorithm: probability mass flows from
+        the seeds to their neighbours and only nodes holding a significant
+        residual are expanded, so the work depends on the size of the
+        neighbourhood reached rather than on the size of the graph.
+        
+        Args:
+            seeds: A seed ID, an iterable of seed IDs, or a mapping of seed ID to weight
+            alpha: Teleport (restart) probability; higher values stay closer to the seeds
+            epsilon: Residual per link below which a node is not expanded
+            link_type: The type of link to follow (None for all)
+            direction: "out", "in" or "both"
+            max_pushes: Upper bound on the number of node expansions
+            
+        Returns:
+            Mapping of memory ID to its PageRank score (seeds included)
+        """
+        if isinstance(seeds, str):
+            seeds = {seeds: 1.0}
+        elif not isinstance(seeds, dict):
+            seeds = {seed: 1.0 for seed in seeds}
+        
+        total = sum(seeds.values())
+        if total <= 0:
+            return {}
+        
+        residual = {seed: weight / total for seed, weight in seeds.items()}
+        scores: Dict[str, float] = {}
+        queue = deque(residual)
+        queued = set(residual)
+        neighbour_cache: Dict[str, List[str]] = {}
+        pushes = 0
+        
+        while queue and pushes < max_pushes:
+            node = queue.popleft()
+            queued.discard(node)
+            mass = residual.pop(node, 0.0)
+            if mass <= 0:
+                continue
+            pushes += 1
+            
+            scores[node] = scores.get(node, 0.0) + alpha * mass
+            neighbours = neighbour_cache.get(node)
+            if neighbours is None:
+                neighbours = neighbour_cache[node] = list(self.neighbors(node, link_type, direction))
+            if not neighbours:
+                # Dangling node: the walk restarts, so its mass stays here
+                scores[node] += (1 - alpha) * mass
+                continue
+            
+            share = (1 - alpha) * mass / len(neighbours)
+            for neighbour in neighbours:
+                value = residual.get(neighbour, 0.0) + share
+                residual[neighbour] = value
+                if neighbour not in queued:
+                    degree = len(neighbour_cache[neighbour]) if neighbour in neighbour_cache \
+                        else self.degree(neighbour, link_type, direction)
+                    if value > epsilon * max(1, degree):
+                        queue.append(neighbour)
+                        queued.add(neighbour)
+        
+        return scores
+    
+    def clear(self) -> None:
+        """Remove every link."""
+        with self._lock:
+            self._out.clear()
+            self._in.clear()
+            self._edge_count = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the graph.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            return {
+                "edges": self._edge_count,
+                "link_types": {lt: sum(len(targets) for targets in forward.values()) for lt, forward in self._out.items()},
+                "nodes_with_links": len({node for forward in self._out.values() for node in forward} |
+                                        {node for reverse in self._in.values() for node in reverse})
+            }
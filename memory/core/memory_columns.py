@@ -0,0 +1,188 @@
+"""
+Memory Columns Module
+
+This module provides a struct-of-arrays store for the numeric fields of
+memory items, so large collections keep them in packed arrays instead of
+one boxed number per field and item.
+"""
+
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+from .memory_item import MemoryItem
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryColumns:
+    """
+    Packed columns holding the importance, access count and timestamps of
+    bound memory items.
+    
+    Binding an item moves its numeric fields into a row of the columns; the
+    item's properties then read and write that row. Released rows are
+    reused by later bindings. Because the fields are contiguous arrays,
+    range filters over many items run as single vectorized comparisons.
+    """
+    
+    def __init__(self, initial_capacity: int = 1024, growth_factor: float = 2.0):
+        """
+        Initialize a new column store.
+        
+        Args:
+            initial_capacity: Number of rows to preallocate
+            growth_factor: Factor by which capacity grows when the store is full
+        """
+        self.growth_factor = max(1.1, growth_factor)
+        capacity = max(1, initial_capacity)
+        
+        self.importance = np.zeros(capacity, dtype=np.float64)
+        self.access_count = np.zeros(capacity, dtype=np.int64)
+        self.created = np.zeros(capacity, dtype=np.float64)
+        self.accessed = np.zeros(capacity, dtype=np.float64)
+        self._live = np.zeros(capacity, dtype=bool)
+        
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._free: List[int] = []
+        self._size = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        """Get the number of bound items."""
+        return self._count
+    
+    @property
+    def capacity(self) -> int:
+        """Number of preallocated rows."""
+        return len(self.importance)
+    
+    def _grow(self) -> None:
+        """Enlarge every column by the growth factor."""
+        capacity = max(self.capacity + 1, int(self.capacity * self.growth_factor))
+        for name in ("importance", "access_count", "created", "accessed", "_live"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        self._ids.extend([None] * (capacity - len(self._ids)))
+    
+    def bind(self, memory: MemoryItem) -> bool:
+        """
+        Move the numeric fields of a memory item into the columns.
+        
+        Args:
+            memory: The memory item to bind
+            
+        Returns:
+            True if bound, False if the item already belongs to a column store
+        """
+        if memory._columns is not None:
+            return memory._columns is self
+        
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size >= self.capacity:
+                self._grow()
+            row = self._size
+            self._size += 1
+        
+        self.importance[row] = memory.importance
+        self.access_count[row] = memory.access_count
+        self.created[row] = memory.created_timestamp
+        self.accessed[row] = memory.accessed_timestamp
+        self._live[row] = True
+        self._ids[row] = memory.id
+        self._count += 1
+        
+        # Drop the item's own boxed values; its properties now read the row
+        memory._importance = memory._access_count = memory._created = memory._accessed = None
+        memory._columns = self
+        memory._row = row
+        return True
+    
+    def release(self, memory: MemoryItem) -> bool:
+        """
+        Move the numeric fields of a bound memory item back into the item.
+        
+        Args:
+            memory: The memory item to release
+            
+        Returns:
+            True if released, False if the item was not bound to this store
+        """
+        if memory._columns is not self:
+            return False
+        
+        row = memory._row
+        memory._unbind()
+        self._live[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+        self._count -= 1
+        return True
+    
+    def select(
+        self,
+        min_importance: Optional[float] = None,
+        max_importance: Optional[float] = None,
+        after_timestamp: Optional[float] = None,
+        before_timestamp: Optional[float] = None,
+        by_importance: bool = False
+    ) -> List[str]:
+        """
+        Get the IDs of bound items whose numeric fields fall in the given ranges.
+        
+        Args:
+            min_importance: Minimum importance value
+            max_importance: Maximum importance value
+            after_timestamp: Minimum creation time (epoch seconds)
+            before_timestamp: Maximum creation time (epoch seconds)
+            by_importance: Order the IDs by descending importance instead of by row
+            
+        Returns:
+            The matching memory IDs
+        """
+        size = self._size
+        mask = self._live[:size].copy()
+        if min_importance is not None:
+            mask &= self.importance[:size] >= min_importance
+        if max_importance is not None:
+            mask &= self.importance[:size] <= max_importance
+        if after_timestamp is not None:
+            mask &= self.created[:size] >= after_timestamp
+        if before_timestamp is not None:
+            mask &= self.created[:size] <= before_timestamp
+        
+        rows = np.flatnonzero(mask)
+        if by_importance:
+            rows = rows[np.argsort(-self.importance[rows], kind="stable")]
+        
+        ids = self._ids
+        return [ids[row] for row in rows.tolist()]
+    
+    def clear(self) -> None:
+        """Release the rows of every bound item (callers must unbind items first)."""
+        self._live[:] = False
+        self._ids = [None] * self.capacity
+        self._free = []
+        self._size = 0
+        self._count = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the column store.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        column_bytes = sum(
+            column.nbytes for column in (self.importance, self.access_count, self.created, self.accessed, self._live)
+        )
+        return {
+            "items": self._count,
+            "capacity": self.capacity,
+            "free_rows": len(self._free),
+            "column_bytes": int(column_bytes)
+        }
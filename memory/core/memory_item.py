@@ -1,12 +1,13 @@
 """
 Memory Item Module
 
-This module defines the MemoryItem class, which represents a single 
+This module defines the MemoryItem class, which represents a single
 memory item within the memory system.
 """
 
 import logging
 import json
+import sys
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 import uuid
@@ -14,14 +15,53 @@ import uuid
 logger = logging.getLogger(__name__)
 
 
+def _to_timestamp(value: datetime) -> float:
+    """Convert a datetime to epoch seconds (naive values are local time)."""
+    return value.timestamp()
+
+
+def _intern_keys(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a metadata dictionary with interned string keys.
+    
+    Args:
+        metadata: The metadata dictionary
+        
+    Returns:
+        A new dictionary whose string keys are interned
+    """
+    return {sys.intern(key) if type(key) is str else key: value for key, value in metadata.items()}
+
+
 class MemoryItem:
     """
     Represents a single memory item stored in the memory system.
     
     A memory item contains the actual content of the memory, along with
     metadata such as its type, importance, creation time, etc.
+    
+    Items use __slots__ and keep their timestamps as epoch floats, converted
+    to datetime only when created_at/last_accessed are read, and intern
+    their memory type. The numeric fields (importance, access count and
+    timestamps) can be moved into a MemoryColumns store to avoid one
+    boxed number per field and item.
     """
     
+    __slots__ = (
+        "id",
+        "content",
+        "memory_type",
+        "metadata",
+        "embedding",
+        "_importance",
+        "_access_count",
+        "_created",
+        "_accessed",
+        "_tz",
+        "_columns",
+        "_row"
+    )
+    
     def __init__(
         self,
         content: Any,
@@ -35,7 +75,7 @@ class MemoryItem:
         Initialize a new memory item.
         
         Args:
-            content: The content of the memory. Can be text, a dictionary, 
+            content: The content of the memory. Can be text, a dictionary,
                     or any serializable data.
             memory_type: The type of memory (e.g., "fact", "conversation", "task").
             importance: A value between 0 and 1 indicating the importance of the memory.
@@ -45,22 +85,139 @@ class MemoryItem:
         """
         self.id = id or str(uuid.uuid4())
         self.content = content
-        self.memory_type = memory_type
-        self.importance = max(0.0, min(1.0, importance))  # Clamp between 0 and 1
+        self.memory_type = sys.intern(memory_type) if type(memory_type) is str else memory_type
         self.metadata = metadata or {}
-        self.created_at = created_at or datetime.now()
-        self.last_accessed = self.created_at
-        self.access_count = 0
+        self.embedding = None
+        self._columns = None
+        self._row = -1
+        self._importance = max(0.0, min(1.0, importance))  # Clamp between 0 and 1
+        self._access_count = 0
+        
+        if created_at is None:
+            self._created = datetime.now().timestamp()
+            self._tz = None
+        else:
+            self._created = _to_timestamp(created_at)
+            self._tz = created_at.tzinfo
+        self._accessed = self._created
         
         logger.debug(f"Created memory item: {self.id} of type {memory_type}")
     
+    # Numeric fields, read from the bound column store if any
+    
+    @property
+    def importance(self) -> float:
+        """The importance of the memory (0-1)."""
+        if self._columns is not None:
+            return float(self._columns.importance[self._row])
+        return self._importance
+    
+    @importance.setter
+    def importance(self, value: float) -> None:
+        if self._columns is not None:
+            self._columns.importance[self._row] = value
+        else:
+            self._importance = value
+    
+    @property
+    def access_count(self) -> int:
+        """The number of times the memory has been accessed."""
+        if self._columns is not None:
+            return int(self._columns.access_count[self._row])
+        return self._access_count
+    
+    @access_count.setter
+    def access_count(self, value: int) -> None:
+        if self._columns is not None:
+            self._columns.access_count[self._row] = value
+        else:
+            self._access_count = value
+    
+    @property
+    def created_timestamp(self) -> float:
+        """The creation time as epoch seconds."""
+        if self._columns is not None:
+            return float(self._columns.created[self._row])
+        return self._created
+    
+    @property
+    def accessed_timestamp(self) -> float:
+        """The last access time as epoch seconds."""
+        if self._columns is not None:
+            return float(self._columns.accessed[self._row])
+        return self._accessed
+    
+    @property
+    def created_at(self) -> datetime:
+        """The creation time."""
+        return datetime.fromtimestamp(self.created_timestamp, self._tz)
+    
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self._tz = value.tzinfo
+        if self._columns is not None:
+            self._columns.created[self._row] = _to_timestamp(value)
+        else:
+            self._created = _to_timestamp(value)
+    
+    @property
+    def last_accessed(self) -> datetime:
+        """The time of the last access."""
+        return datetime.fromtimestamp(self.accessed_timestamp, self._tz)
+    
+    @last_accessed.setter
+    def last_accessed(self, value: datetime) -> None:
+        if self._columns is not None:
+            self._columns.accessed[self._row] = _to_timestamp(value)
+        else:
+            self._accessed = _to_timestamp(value)
+    
+    def _unbind(self) -> None:
+        """Copy the numeric fields back from the column store into the item."""
+        columns, row = self._columns, self._row
+        if columns is None:
+            return
+        self._importance = float(columns.importance[row])
+        self._access_count = int(columns.access_count[row])
+        self._created = float(columns.created[row])
+        self._accessed = float(columns.accessed[row])
+        self._columns = None
+        self._row = -1
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the state for copying and pickling, detached from any column store."""
+        return {
+            "id": self.id,
+            "content": self.content,
+            "memory_type": self.memory_type,
+            "metadata": self.metadata,
+            "embedding": self.embedding,
+            "_importance": self.importance,
+            "_access_count": self.access_count,
+            "_created": self.created_timestamp,
+            "_accessed": self.accessed_timestamp,
+            "_tz": self._tz
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._columns = None
+        self._row = -1
+    
     def access(self) -> None:
         """
         Record an access to this memory item.
         Updates the last_accessed timestamp and increments access_count.
         """
-        self.last_accessed = datetime.now()
-        self.access_count += 1
+        now = datetime.now().timestamp()
+        if self._columns is not None:
+            self._columns.accessed[self._row] = now
+            self._columns.access_count[self._row] += 1
+        else:
+            self._accessed = now
+            self._access_count += 1
         logger.debug(f"Accessed memory item: {self.id} (count: {self.access_count})")
     
     def update_importance(self, new_importance: float) -> None:
@@ -105,11 +262,14 @@ class MemoryItem:
         # Handle datetime strings
         created_at = datetime.fromisoformat(data["created_at"]) if "created_at" in data else None
         
+        # Deserialized keys are fresh strings; interning shares them across items
+        metadata = data.get("metadata") or {}
+        
         memory = cls(
             content=data["content"],
             memory_type=data["memory_type"],
             importance=data["importance"],
-            metadata=data.get("metadata", {}),
+            metadata=_intern_keys(metadata),
             id=data["id"],
             created_at=created_at
         )
@@ -133,4 +293,4 @@ class MemoryItem:
         if len(content_str) > 50:
             content_str = content_str[:50] + "..."
         
-        return f"Memory({self.id}, type={self.memory_type}, content={content_str})" 
\ No newline at end of file
+        return f"Memory({self.id}, type={self.memory_type}, content={content_str})"
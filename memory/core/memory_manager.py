@@ -9,21 +9,33 @@ different types of memory.
 import logging
 import json
 import os
-from typing import Dict, List, Any, Optional, Set, Tuple, Union, Type
+import sys
+import heapq
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple, Union, Type, Iterator
 from datetime import datetime
 import uuid
 from pathlib import Path
 
 from .memory_system import MemorySystem
 from .memory_item import MemoryItem
+from .consolidation import ConsolidationScheduler
+from .query_cache import QueryCache
 from ..storage.base_storage import BaseStorage
 from ..storage.in_memory_storage import InMemoryStorage
+from ..storage.sharded_storage import ShardedStorage
+from ..storage.text_index import content_to_text, tokenize
+from ..storage.snapshot import (
+    SnapshotWriter, DeltaLog, read_records, is_snapshot, infer_compression
+)
 from ..types.episodic_memory import EpisodicMemory
 from ..types.semantic_memory import SemanticMemory
 from ..types.short_term_memory import ShortTermMemory
 from ..types.long_term_memory import LongTermMemory
 from ..processors.embedder import Embedder
 from ..processors.summarizer import Summarizer
+from ..processors.hybrid_retriever import HybridRetriever
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +62,8 @@ class MemoryManager:
         
         Args:
             config: Configuration dictionary for memory systems
-            base_storage: Base storage system to use (if None, uses InMemoryStorage)
+            base_storage: Base storage system to use (if None, uses InMemoryStorage,
+                         or a thread-safe ShardedStorage when config "storage_shards" > 1)
             embedder: Embedder processor for vector embeddings
             summarizer: Summarizer processor for creating summaries
             data_dir: Directory to store persistent data (if None, uses in-memory only)
@@ -59,19 +72,79 @@ class MemoryManager:
         self.data_dir = Path(data_dir) if data_dir else None
         
         # Initialize base memory system
-        self.base_storage = base_storage or InMemoryStorage()
+        shards = self.config.get("storage_shards", 1)
+        if base_storage is not None:
+            self.base_storage = base_storage
+        elif shards > 1:
+            # Thread-safe mode for agents sharing this manager
+            self.base_storage = ShardedStorage(
+                num_shards=shards,
+                read_write_locks=self.config.get("read_write_locks", True),
+                columnar=self.config.get("columnar_storage", False)
+            )
+        else:
+            self.base_storage = InMemoryStorage(
+                columnar=self.config.get("columnar_storage", False)
+            )
         self.memory_system = MemorySystem(storage=self.base_storage)
         
         # Initialize processors
         self.embedder = embedder
         self.summarizer = summarizer
         
+        # Persist embeddings across restarts so memories are not re-embedded
+        if (
+            self.embedder and self.data_dir and
+            self.config.get("use_embedding_cache", True) and
+            hasattr(self.embedder, "enable_cache")
+        ):
+            self.embedder.enable_cache(self.data_dir / "embedding_cache")
+        
+        # Hybrid lexical + vector retrieval over the base storage
+        self.retriever = HybridRetriever(
+            self.base_storage,
+            self.embedder,
+            **self.config.get("hybrid_search", {})
+        )
+        
         # Initialize specialized memory systems
         self._initialize_specialized_memories()
         
         # Setup event listeners for cross-memory propagation
         self._setup_event_listeners()
         
+        # Persistence: saves/loads run one at a time, optionally in the background
+        self._persistence_lock = threading.Lock()
+        self._persistence_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Append-only log of the changes made since the last checkpoint
+        self._delta_log: Optional[DeltaLog] = None
+        if self.data_dir and self.config.get("delta_log", False):
+            self._delta_log = DeltaLog(self._delta_path(self._default_state_path()))
+            self.memory_system.journal = self._delta_log
+        
+        # Short-term -> long-term promotion, optionally in a background thread
+        consolidation_config = self.config.get("consolidation", {})
+        self.consolidation = ConsolidationScheduler(
+            self._specialized_memories["short_term"],
+            self.base_storage,
+            self._promote_memories,
+            interval_seconds=consolidation_config.get("interval_seconds", 5.0),
+            slice_ms=consolidation_config.get("slice_ms", 10.0),
+            batch_size=consolidation_config.get("batch_size", 64)
+        )
+        if consolidation_config.get("background", False) and "long_term" in self._specialized_memories:
+            self.consolidation.start()
+        
+        # Results of repeated queries, invalidated by the memory system's generations
+        cache_config = self.config.get("query_cache", {})
+        self.query_cache: Optional[QueryCache] = None
+        if cache_config.get("enabled", True):
+            self.query_cache = QueryCache(
+                capacity=cache_config.get("capacity", 256),
+                ttl_seconds=cache_config.get("ttl_seconds", 30.0)
+            )
+        
         logger.info(f"MemoryManager initialized with {len(self._specialized_memories)} specialized memory systems")
     
     def _initialize_specialized_memories(self):
@@ -97,7 +170,10 @@ class MemoryManager:
             self._specialized_memories["long_term"] = LongTermMemory(
                 memory_system=self.memory_system,
                 db_path=ltm_storage_path,
-                min_importance=ltm_config.get("min_importance", 0.3)
+                min_importance=ltm_config.get("min_importance", 0.3),
+                write_behind=ltm_config.get("write_behind", False),
+                flush_items=ltm_config.get("flush_items", 500),
+                flush_interval_ms=ltm_config.get("flush_interval_ms", 50.0)
             )
         
         # Episodic memory
@@ -179,6 +255,9 @@ class MemoryManager:
             metadata=metadata or {}
         )
         
+        # Make the memory reachable through semantic search
+        self._index_memories([memory_id])
+        
         # Determine target memory systems if not specified
         if target_memories is None:
             target_memories = self._determine_target_memories(memory_type, importance)
@@ -197,6 +276,27 @@ class MemoryManager:
         
         return memory_id
     
+    def _index_memories(self, memory_ids: List[str], refresh: bool = False) -> None:
+        """
+        Add memories to the embedder's nearest-neighbour index.
+        
+        Args:
+            memory_ids: IDs of the memories to index
+            refresh: Re-embed memories already indexed (after their content changed)
+        """
+        if not self.embedder:
+            return
+        
+        memories = [self.memory_system.storage.retrieve(memory_id) for memory_id in memory_ids]
+        memories = [memory for memory in memories if memory]
+        if not memories:
+            return
+        
+        try:
+            self.embedder.process_memories(memories, refresh=refresh)
+        except Exception as e:
+            logger.error(f"Error indexing memory embeddings: {e}")
+    
     def _determine_target_memories(self, memory_type: str, importance: float) -> List[str]:
         """
         Determine which specialized memory systems a memory should be added to.
@@ -338,7 +438,10 @@ class MemoryManager:
         Returns:
             The memory item if found, None otherwise
         """
-        return self.memory_system.get_memory(memory_id)
+        memory = self.memory_system.get_memory(memory_id)
+        if memory and "short_term" in self._specialized_memories:
+            self._specialized_memories["short_term"].touch(memory_id)
+        return memory
     
     def query_memories(
         self,
@@ -371,6 +474,41 @@ class MemoryManager:
         Returns:
             List of memory items matching the criteria
         """
+        filters = dict(
+            min_importance=min_importance,
+            max_importance=max_importance,
+            before_timestamp=before_timestamp,
+            after_timestamp=after_timestamp,
+            metadata_query=metadata_query,
+            limit=limit,
+            offset=offset
+        )
+        compute = lambda: self._query_memories(
+            memory_type=memory_type,
+            content_query=content_query,
+            target_memory_system=target_memory_system,
+            **filters
+        )
+        # Specialized systems change outside the base system's generations, so
+        # only base-system queries are cached
+        if target_memory_system is not None:
+            return compute()
+        return self._cached("query_memories", memory_type, compute, query=content_query, **filters)
+    
+    def _query_memories(
+        self,
+        memory_type: Optional[str] = None,
+        min_importance: Optional[float] = None,
+        max_importance: Optional[float] = None,
+        before_timestamp: Optional[datetime] = None,
+        after_timestamp: Optional[datetime] = None,
+        metadata_query: Optional[Dict[str, Any]] = None,
+        content_query: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        target_memory_system: Optional[str] = None
+    ) -> List[MemoryItem]:
+        """Run a query without the result cache (see query_memories)."""
         # Determine which memory system to query
         memory_sys = self.get_memory_system(target_memory_system)
         if not memory_sys:
@@ -383,6 +521,22 @@ class MemoryManager:
         if target_memory_system == "short_term":
             # Get all memories from short-term memory
             stm = self._specialized_memories["short_term"]
+            
+            # Keyword queries go through the full-text index, restricted to short-term IDs
+            if normalized_content_query:
+                return self._keyword_query(
+                    content_query=content_query,
+                    memory_type=memory_type,
+                    min_importance=min_importance,
+                    max_importance=max_importance,
+                    before_timestamp=before_timestamp,
+                    after_timestamp=after_timestamp,
+                    metadata_query=metadata_query,
+                    limit=limit,
+                    offset=offset,
+                    candidate_ids=set(stm.get_all_item_ids())
+                )
+            
             all_memories = []
             
             # Get all memories tracked in short-term memory
@@ -411,36 +565,25 @@ class MemoryManager:
                         if not match:
                             continue
                     
-                    # Check content query (substring search)
-                    if normalized_content_query:
-                        # Convertir el contenido a texto y normalizar
-                        if isinstance(memory.content, str):
-                            memory_content = memory.content.lower()
-                        elif isinstance(memory.content, dict):
-                            # Para diccionarios, convertimos a JSON string
-                            try:
-                                memory_content = json.dumps(memory.content, ensure_ascii=False).lower()
-                            except:
-                                memory_content = str(memory.content).lower()
-                        else:
-                            memory_content = str(memory.content).lower()
-                            
-                        if normalized_content_query not in memory_content:
-                            continue
-                    
                     all_memories.append(memory)
             
             # Sort by recency (newest first)
-            all_memories.sort(key=lambda m: m.created_at, reverse=True)
+            all_memories.sort(key=lambda m: m.created_timestamp, reverse=True)
             
             # Apply offset and limit
             return all_memories[offset:offset+limit]
         
         # Handle semantic search with embedder if content_query is provided
-        if content_query and self.embedder and hasattr(memory_sys, "semantic_search"):
+        if content_query and self.embedder and target_memory_system is None:
             try:
-                return memory_sys.semantic_search(
-                    query=content_query,
+                return self._semantic_query(
+                    content_query=content_query,
+                    memory_type=memory_type,
+                    min_importance=min_importance,
+                    max_importance=max_importance,
+                    before_timestamp=before_timestamp,
+                    after_timestamp=after_timestamp,
+                    metadata_query=metadata_query,
                     limit=limit,
                     offset=offset
                 )
@@ -448,59 +591,19 @@ class MemoryManager:
                 logger.error(f"Error in semantic search: {e}")
                 # Fall back to regular query
         
-        # Regular query through base memory system
+        # Keyword query through the base storage's full-text index
         if target_memory_system is None and normalized_content_query:
-            # Si estamos consultando el sistema base y tenemos una consulta de contenido
-            # realizamos una búsqueda manual sobre todas las memorias
-            all_memories = self.memory_system.get_all_memories(limit=1000)
-            filtered_memories = []
-            
-            for memory in all_memories:
-                # Aplicar otros filtros primero
-                if memory_type and memory.memory_type != memory_type:
-                    continue
-                if min_importance is not None and memory.importance < min_importance:
-                    continue
-                if max_importance is not None and memory.importance > max_importance:
-                    continue
-                if before_timestamp and memory.created_at > before_timestamp:
-                    continue
-                if after_timestamp and memory.created_at < after_timestamp:
-                    continue
-                
-                # Filtrar por metadata
-                if metadata_query:
-                    match = True
-                    for key, value in metadata_query.items():
-                        if key not in memory.metadata or memory.metadata[key] != value:
-                            match = False
-                            break
-                    if not match:
-                        continue
-                
-                # Filtrar por contenido
-                if normalized_content_query:
-                    # Convertir el contenido a texto y normalizar
-                    if isinstance(memory.content, str):
-                        memory_content = memory.content.lower()
-                    elif isinstance(memory.content, dict):
-                        try:
-                            memory_content = json.dumps(memory.content, ensure_ascii=False).lower()
-                        except:
-                            memory_content = str(memory.content).lower()
-                    else:
-                        memory_content = str(memory.content).lower()
-                        
-                    if normalized_content_query not in memory_content:
-                        continue
-                
-                filtered_memories.append(memory)
-            
-            # Ordenar por relevancia (ahora mismo sólo por fecha)
-            filtered_memories.sort(key=lambda m: m.created_at, reverse=True)
-            
-            # Aplicar offset y limit
-            return filtered_memories[offset:offset+limit]
+            return self._keyword_query(
+                content_query=content_query,
+                memory_type=memory_type,
+                min_importance=min_importance,
+                max_importance=max_importance,
+                before_timestamp=before_timestamp,
+                after_timestamp=after_timestamp,
+                metadata_query=metadata_query,
+                limit=limit,
+                offset=offset
+            )
         
         # Regular query using the memory system's query method
         return memory_sys.query_memories(
@@ -514,6 +617,339 @@ class MemoryManager:
             offset=offset
         )
     
+    def _semantic_query(
+        self,
+        content_query: str,
+        memory_type: Optional[str] = None,
+        min_importance: Optional[float] = None,
+        max_importance: Optional[float] = None,
+        before_timestamp: Optional[datetime] = None,
+        after_timestamp: Optional[datetime] = None,
+        metadata_query: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[MemoryItem]:
+        """
+        Query the base memory system through the embedder's index.
+        
+        Candidates are fetched in similarity order and the remaining filters
+        are applied to them. When the filters leave the page short, the index
+        is queried again for a larger candidate set, until the page is full
+        or the index has no more candidates. The query is embedded once for
+        all the passes. Once config "ann_index_min_size" memories (10000 by
+        default, None to always search exactly) have been embedded, the
+        embedder switches to an approximate nearest-neighbour index.
+        
+        Args:
+            content_query: Text to search for semantically
+            memory_type: Filter by memory type
+            min_importance: Minimum importance value
+            max_importance: Maximum importance value
+            before_timestamp: Filter for memories created before this time
+            after_timestamp: Filter for memories created after this time
+            metadata_query: Filter by metadata fields
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            
+        Returns:
+            List of memory items, most similar first
+        """
+        ann_min_size = self.config.get("ann_index_min_size", 10000)
+        if ann_min_size is not None and hasattr(self.embedder, "enable_ann_index"):
+            self.embedder.enable_ann_index(min_size=ann_min_size)
+        
+        query = content_query
+        if hasattr(self.embedder, "embed_query"):
+            query = self.embedder.embed_query(content_query)
+        
+        wanted = offset + limit
+        top_k = max(wanted * 4, 50)
+        while True:
+            candidates = self.embedder.search(
+                query,
+                top_k=top_k,
+                threshold=self.config.get("semantic_min_similarity", 0.0)
+            )
+            
+            results = []
+            for memory_id, _ in candidates:
+                memory = self.memory_system.storage.retrieve(memory_id)
+                if memory and self._matches_filters(
+                    memory, memory_type, min_importance, max_importance,
+                    before_timestamp, after_timestamp, metadata_query
+                ):
+                    results.append(memory)
+                    if len(results) >= wanted:
+                        break
+            
+            # Fewer candidates than asked for means the index is exhausted
+            if len(results) >= wanted or len(candidates) < top_k:
+                return results[offset:offset+limit]
+            top_k *= 4
+    
+    def _keyword_query(
+        self,
+        content_query: str,
+        memory_type: Optional[str] = None,
+        min_importance: Optional[float] = None,
+        max_importance: Optional[float] = None,
+        before_timestamp: Optional[datetime] = None,
+        after_timestamp: Optional[datetime] = None,
+        metadata_query: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        candidate_ids: Optional[Set[str]] = None
+    ) -> List[MemoryItem]:
+        """
+        Query the base memory system by keywords, best BM25 match first.
+        
+        Uses the base storage's full-text index when it has one; otherwise
+        (or for queries without any word) falls back to a substring scan.
+        
+        Args:
+            content_query: Free-text query
+            memory_type: Filter by memory type
+            min_importance: Minimum importance value
+            max_importance: Maximum importance value
+            before_timestamp: Filter for memories created before this time
+            after_timestamp: Filter for memories created after this time
+            metadata_query: Filter by metadata fields
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            candidate_ids: Optional set of memory IDs to restrict the search to
+            
+        Returns:
+            List of memory items matching the criteria
+        """
+        filters = (memory_type, min_importance, max_importance, before_timestamp, after_timestamp, metadata_query)
+        
+        if hasattr(self.base_storage, "search_text") and tokenize(content_query):
+            hits = self.base_storage.search_text(content_query, candidate_ids=candidate_ids)
+            results = []
+            for memory, _ in hits:
+                if self._matches_filters(memory, *filters):
+                    results.append(memory)
+                    if len(results) >= offset + limit:
+                        break
+            return results[offset:offset+limit]
+        
+        # Substring fallback over every memory, newest first
+        normalized_query = content_query.lower().strip()
+        if candidate_ids is not None:
+            memories = [m for m in (self.memory_system.storage.retrieve(i) for i in candidate_ids) if m]
+        else:
+            memories = self.memory_system.get_all_memories(limit=sys.maxsize)
+        
+        results = [
+            memory for memory in memories
+            if self._matches_filters(memory, *filters)
+            and normalized_query in content_to_text(memory.content).lower()
+        ]
+        results.sort(key=lambda m: m.created_timestamp, reverse=True)
+        return results[offset:offset+limit]
+    
+    @staticmethod
+    def _matches_filters(
+        memory: MemoryItem,
+        memory_type: Optional[str] = None,
+        min_importance: Optional[float] = None,
+        max_importance: Optional[float] = None,
+        before_timestamp: Optional[datetime] = None,
+        after_timestamp: Optional[datetime] = None,
+        metadata_query: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Check whether a memory satisfies the non-content query filters.
+        
+        Args:
+            memory: The memory item to check
+            memory_type: Filter by memory type
+            min_importance: Minimum importance value
+            max_importance: Maximum importance value
+            before_timestamp: Filter for memories created before this time
+            after_timestamp: Filter for memories created after this time
+            metadata_query: Filter by metadata fields
+            
+        Returns:
+            True if the memory passes every filter, False otherwise
+        """
+        if memory_type and memory.memory_type != memory_type:
+            return False
+        if min_importance is not None and memory.importance < min_importance:
+            return False
+        if max_importance is not None and memory.importance > max_importance:
+            return False
+        if before_timestamp and memory.created_at > before_timestamp:
+            return False
+        if after_timestamp and memory.created_at < after_timestamp:
+            return False
+        if metadata_query:
+            for key, value in metadata_query.items():
+                if key not in memory.metadata or memory.metadata[key] != value:
+                    return False
+        return True
+    
+    def hybrid_search(
+        self,
+        query: str,
+        memory_type: Optional[str] = None,
+        limit: int = 5,
+        threshold: float = 0.0,
+        metadata_query: Optional[Dict[str, Any]] = None,
+        min_importance: Optional[float] = None
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Find the memories most relevant to a query with hybrid retrieval.
+        
+        Keyword (BM25) and vector retrieval run concurrently and their
+        rankings are fused, boosted by importance and recency.
+        
+        Args:
+            query: Free-text query
+            memory_type: Filter by memory type
+            limit: Maximum number of results to return
+            threshold: Minimum similarity for vector matches
+            metadata_query: Filter by metadata fields
+            min_importance: Minimum importance value
+            
+        Returns:
+            List of (memory, score) tuples, most relevant first
+        """
+        return self._cached(
+            "hybrid_search",
+            memory_type,
+            lambda: self._hybrid_search(query, memory_type, limit, threshold, metadata_query, min_importance),
+            query=query,
+            limit=limit,
+            threshold=threshold,
+            metadata_query=metadata_query,
+            min_importance=min_importance
+        )
+    
+    def _hybrid_search(
+        self,
+        query: str,
+        memory_type: Optional[str],
+        limit: int,
+        threshold: float,
+        metadata_query: Optional[Dict[str, Any]],
+        min_importance: Optional[float]
+    ) -> List[Tuple[MemoryItem, float]]:
+        """Run a hybrid search without the result cache (see hybrid_search)."""
+        if not self.retriever.has_lexical and not self.retriever.has_vector:
+            memories = self._keyword_query(
+                content_query=query,
+                memory_type=memory_type,
+                min_importance=min_importance,
+                metadata_query=metadata_query,
+                limit=limit
+            )
+            return [(memory, 0.0) for memory in memories]
+        
+        filter_fn = None
+        if memory_type or metadata_query or min_importance is not None:
+            filter_fn = lambda memory: self._matches_filters(
+                memory, memory_type, min_importance, metadata_query=metadata_query
+            )
+        
+        return self.retriever.search(
+            query,
+            limit=limit,
+            filter_fn=filter_fn,
+            threshold=threshold or self.config.get("semantic_min_similarity", 0.0)
+        )
+    
+    def search_memories(
+        self,
+        query: str,
+        memory_type: Optional[str] = None,
+        limit: int = 5,
+        threshold: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[MemoryItem]:
+        """
+        Find the memories most relevant to a query.
+        
+        Args:
+            query: Free-text query
+            memory_type: Filter by memory type
+            limit: Maximum number of results to return
+            threshold: Minimum similarity for vector matches
+            metadata: Filter by metadata fields
+            
+        Returns:
+            List of memory items, most relevant first
+        """
+        results = self.hybrid_search(
+            query,
+            memory_type=memory_type,
+            limit=limit,
+            threshold=threshold,
+            metadata_query=metadata
+        )
+        return [memory for memory, _ in results]
+    
+    def get_recent_memories(
+        self,
+        memory_type: Optional[str] = None,
+        limit: int = 5,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[MemoryItem]:
+        """
+        Get the most recently created memories.
+        
+        Args:
+            memory_type: Filter by memory type
+            limit: Maximum number of results to return
+            metadata: Filter by metadata fields
+            
+        Returns:
+            List of memory items, newest first
+        """
+        def compute() -> List[MemoryItem]:
+            memories = self.memory_system.query_memories(
+                memory_type=memory_type,
+                metadata_query=metadata,
+                limit=sys.maxsize
+            )
+            return heapq.nlargest(limit, memories, key=lambda m: m.created_timestamp)
+        
+        return self._cached("get_recent_memories", memory_type, compute, limit=limit, metadata=metadata)
+    
+    def _cached(
+        self,
+        operation: str,
+        memory_type: Optional[str],
+        compute: Callable[[], List[Any]],
+        query: Optional[str] = None,
+        **params: Any
+    ) -> List[Any]:
+        """
+        Answer a query from the result cache, computing and caching it on a miss.
+        
+        Args:
+            operation: Name of the query method
+            memory_type: The memory type the query is restricted to (None for all);
+                        only writes to memories of this type invalidate the result
+            compute: Function running the query
+            query: Free-text query, if any
+            **params: The other query parameters
+            
+        Returns:
+            A new list with the results
+        """
+        if self.query_cache is None:
+            return compute()
+        
+        key = QueryCache.make_key(operation, query, memory_type=memory_type, **params)
+        # Read the generation first so a write made while computing invalidates the result
+        generation = self.memory_system.get_generation(memory_type)
+        results = self.query_cache.get(key, generation)
+        if results is None:
+            results = compute()
+            self.query_cache.put(key, generation, results)
+        return list(results)
+    
     def get_related_memories(
         self, 
         memory_id: str,
@@ -531,12 +967,52 @@ class MemoryManager:
             max_depth: Maximum depth for recursive search
             
         Returns:
-            List of related memory items
+            List of related memory items (nearest first when recursive)
         """
-        return self.memory_system.get_related_memories(
-            memory_id=memory_id,
-            link_type=link_type
-        )
+        if not recursive:
+            return self.memory_system.get_related_memories(
+                memory_id=memory_id,
+                link_type=link_type
+            )
+        
+        return [
+            memory for memory, _ in self.memory_system.get_memories_within(
+                memory_id,
+                max_hops=max_depth,
+                link_type=link_type
+            )
+        ]
+    
+    def rank_related_memories(
+        self,
+        memory_id: Union[str, List[str]],
+        limit: int = 10,
+        max_hops: Optional[int] = 2,
+        link_type: Optional[str] = None
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Rank the memories linked around one or more memories.
+        
+        Args:
+            memory_id: ID of the seed memory, or several IDs
+            limit: Maximum number of results to return
+            max_hops: Only consider memories within this many links (None for no limit)
+            link_type: Type of links to follow (or None for all)
+            
+        Returns:
+            List of (memory, score) tuples, scored by personalized PageRank
+            weighted by importance, best first
+        """
+        try:
+            return self.memory_system.rank_related_memories(
+                memory_id,
+                limit=limit,
+                max_hops=max_hops,
+                link_type=link_type
+            )
+        except Exception as e:
+            logger.error(f"Error ranking memories related to {memory_id}: {e}")
+            return []
     
     def summarize_memories(
         self,
@@ -643,47 +1119,113 @@ class MemoryManager:
         
         This method implements the memory consolidation process, moving
         memories from short-term to long-term based on access frequency,
-        importance, and other factors.
+        importance, and other factors. It runs the consolidation scheduler
+        to completion in the caller's thread; set the "consolidation"
+        config's "background" option (or call self.consolidation.start())
+        to have it run in time-boxed slices in the background instead.
         """
         # Only proceed if we have both short-term and long-term memory
         if "short_term" not in self._specialized_memories or "long_term" not in self._specialized_memories:
             logger.debug("Skipping memory consolidation: missing required memory systems")
             return
         
+        self.consolidation.run_until_idle()
+    
+    def _promote_memories(self, memories: List[MemoryItem]) -> bool:
+        """
+        Copy short-term memories to long-term memory and stop tracking them.
+        
+        Called by the consolidation scheduler with each batch of memories
+        that qualify for promotion.
+        
+        Args:
+            memories: The memories to promote
+            
+        Returns:
+            True if the batch was written, False otherwise
+        """
         stm = self._specialized_memories["short_term"]
         ltm = self._specialized_memories["long_term"]
         
-        # Get memories from short-term that need consolidation
-        stm_items = stm.get_all_item_ids()
+        entries = [
+            {
+                "content": memory.content,
+                "source": f"memory:{memory.id}",
+                "importance": memory.importance,
+                "metadata": memory.metadata
+            }
+            for memory in memories
+        ]
         
-        for memory_id in stm_items:
-            memory = self.memory_system.get_memory(memory_id)
-            if not memory:
-                continue
-            
-            # Check if memory should be consolidated to long-term memory
-            should_consolidate = (
-                # High importance memories are always consolidated
-                memory.importance >= 0.7 or
-                # Frequently accessed memories are consolidated
-                memory.access_count >= 3 or
-                # Old memories with some importance are consolidated
-                (
-                    memory.importance >= 0.4 and
-                    (datetime.now() - memory.created_at).total_seconds() > 60*60*24  # 1 day
+        # Tag each memory with its topic cluster, refining the clustering incrementally
+        if self.embedder and self.config.get("cluster_on_consolidation", True):
+            try:
+                labels = self.embedder.partial_fit_clusters(
+                    memories,
+                    num_clusters=self.config.get("memory_clusters", 8)
                 )
-            )
+                for entry, label in zip(entries, labels.tolist()):
+                    entry["metadata"] = {**(entry["metadata"] or {}), "cluster": label}
+            except Exception as e:
+                logger.error(f"Error clustering consolidated memories: {e}")
+        
+        # Persist the whole batch in a single transaction
+        try:
+            ltm.add_many(entries)
+        except Exception as e:
+            logger.error(f"Error writing consolidated memories to long-term memory: {e}")
+            return False
+        
+        for memory in memories:
+            stm.remove_item(memory.id)
+        
+        logger.debug(f"Consolidated {len(entries)} memories to long-term storage")
+        return True
+    
+    def get_memory_clusters(
+        self,
+        memory_type: Optional[str] = None,
+        num_clusters: Optional[int] = None,
+        top_n: int = 3,
+        refit: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Group memories by topic and describe each group.
+        
+        Memories are assigned to the clustering refined during consolidation;
+        it is fitted from scratch when there is none yet or refit is True.
+        
+        Args:
+            memory_type: Only cluster memories of this type
+            num_clusters: Number of clusters when fitting (defaults to the
+                         "memory_clusters" config value, 8)
+            top_n: Number of representative memories per cluster
+            refit: Whether to recompute the clusters from these memories
             
-            if should_consolidate:
-                logger.debug(f"Consolidating memory {memory_id} to long-term storage")
-                # Use add() method with the appropriate parameters
-                ltm.add(
-                    content=memory.content,
-                    source=f"memory:{memory_id}",
-                    importance=memory.importance,
-                    metadata=memory.metadata
+        Returns:
+            One dictionary per cluster, largest first, with its "size",
+            "centroid", "cohesion", "importance" and "representatives"
+            (the memories closest to the centroid)
+        """
+        if not self.embedder:
+            return []
+        
+        memories = self.memory_system.query_memories(memory_type=memory_type, limit=sys.maxsize)
+        if not memories:
+            return []
+        
+        try:
+            summaries = [] if refit else self.embedder.summarize_clusters(memories, top_n=top_n)
+            if not summaries:
+                labels = self.embedder.fit_clusters(
+                    memories,
+                    num_clusters=num_clusters or self.config.get("memory_clusters", 8)
                 )
-                stm.remove_item(memory_id)
+                summaries = self.embedder.summarize_clusters(memories, labels=labels, top_n=top_n)
+            return summaries
+        except Exception as e:
+            logger.error(f"Error clustering memories: {e}")
+            return []
     
     def forget_memory(self, memory_id: str) -> bool:
         """
@@ -702,9 +1244,32 @@ class MemoryManager:
             elif hasattr(memory_system, "remove_memory"):
                 memory_system.remove_memory(memory_id)
         
+        if self.embedder:
+            self.embedder.remove_memory(memory_id)
+        
         # Then remove from base memory system
         return self.memory_system.delete_memory(memory_id)
     
+    def close(self) -> None:
+        """Flush pending writes and release the resources of the memory subsystems."""
+        self.consolidation.stop()
+        self.retriever.close()
+        if self._persistence_executor is not None:
+            self._persistence_executor.shutdown(wait=True)
+            self._persistence_executor = None
+        if self._delta_log is not None:
+            self._delta_log.close()
+        for memory_type, memory_system in self._specialized_memories.items():
+            try:
+                if hasattr(memory_system, "stop"):
+                    memory_system.stop()
+                if hasattr(memory_system, "close"):
+                    memory_system.close()
+                elif hasattr(getattr(memory_system, "storage", None), "close"):
+                    memory_system.storage.close()
+            except Exception as e:
+                logger.error(f"Error closing {memory_type} memory: {e}")
+    
     def clear_short_term_memory(self) -> None:
         """Clear all items from short-term memory."""
         if "short_term" in self._specialized_memories:
@@ -712,57 +1277,104 @@ class MemoryManager:
     
     # Persistence Methods
     
-    def save_state(self, file_path: Optional[str] = None) -> bool:
+    def _default_state_path(self) -> Optional[Path]:
+        """Get the default state file path (inside data_dir)."""
+        return self.data_dir / "memory_state.json" if self.data_dir else None
+    
+    @staticmethod
+    def _delta_path(file_path: Union[str, Path]) -> Path:
+        """
+        Get the path of the delta log that follows a state file.
+        
+        Args:
+            file_path: Path of the state file
+            
+        Returns:
+            Path of the delta log
+        """
+        return Path(str(file_path) + ".delta")
+    
+    def _journal_for(self, file_path: Union[str, Path]) -> Optional[DeltaLog]:
+        """Get the delta log that follows a state file, if it is the one being logged."""
+        if self._delta_log is not None and self._delta_log.path == self._delta_path(file_path):
+            return self._delta_log
+        return None
+    
+    def save_state(self, file_path: Optional[str] = None, compression: Optional[str] = None) -> bool:
         """
         Save the current state of memory systems to a file.
         
+        The state is streamed as newline-delimited JSON records (a header,
+        one record per memory and per link, and an end record), in chunks,
+        to a temporary file that replaces the target once complete. When the
+        delta log is enabled, the save is a checkpoint: changes made from
+        now on go to a fresh log and the previous log is discarded once the
+        snapshot is written.
+        
         Args:
             file_path: Path to save the state to (or None to use default)
-            
+            compression: None, "gzip" or "zstd" (defaults to the file suffix,
+                        then the "snapshot_compression" config value)
+                        
         Returns:
             True if the state was saved successfully, False otherwise
         """
         if not file_path and self.data_dir:
-            file_path = self.data_dir / "memory_state.json"
+            file_path = self._default_state_path()
         
         if not file_path:
             logger.error("Cannot save state: no file path provided and no data directory set")
             return False
         
-        try:
-            # Get all memories
-            all_memories = self.memory_system.get_all_memories()
-            
-            # Convert to serializable format using to_dict() method
-            serialized_memories = []
-            for memory in all_memories:
-                try:
-                    serialized_memories.append(memory.to_dict())
-                except Exception as e:
-                    logger.warning(f"Error serializing memory {memory.id}: {e}")
-            
-            # Create state object
-            state = {
-                "memories": serialized_memories,
-                "timestamp": datetime.now().isoformat(),
-                "version": "1.0"
-            }
-            
-            # Save to file
-            with open(file_path, 'w') as f:
-                json.dump(state, f, indent=2)
-            
-            logger.info(f"Memory state saved to {file_path} ({len(all_memories)} memories)")
-            return True
+        compression = compression or infer_compression(file_path) or self.config.get("snapshot_compression")
+        journal = self._journal_for(file_path)
         
-        except Exception as e:
-            logger.error(f"Error saving memory state: {e}")
-            return False
+        with self._persistence_lock:
+            try:
+                if journal is not None:
+                    journal.rotate()
+                
+                skipped = 0
+                with SnapshotWriter(
+                    file_path,
+                    compression=compression,
+                    level=self.config.get("snapshot_compression_level")
+                ) as writer:
+                    for memory in self.memory_system.storage.iter_memories():
+                        try:
+                            writer.write("memory", memory.to_dict())
+                        except Exception as e:
+                            skipped += 1
+                            logger.warning(f"Error serializing memory {memory.id}: {e}")
+                    
+                    for source_id, link_type, target_id in self.memory_system.iter_links():
+                        writer.write("link", {"source": source_id, "target": target_id, "link_type": link_type})
+                
+                if journal is not None:
+                    journal.discard_previous()
+                
+                # Persist the nearest-neighbour index next to the state file
+                if self.embedder:
+                    self.embedder.save_index(self._index_path(file_path))
+                
+                logger.info(
+                    f"Memory state saved to {file_path} ({writer.counts.get('memory', 0)} memories, "
+                    f"{writer.counts.get('link', 0)} links, {skipped} skipped)"
+                )
+                return True
+            
+            except Exception as e:
+                logger.error(f"Error saving memory state: {e}")
+                return False
     
     def load_state(self, file_path: Optional[str] = None) -> bool:
         """
         Load a previously saved state into the memory system.
         
+        Snapshot records are streamed into the storage one at a time, then
+        any delta log following the snapshot is replayed. State files in
+        the legacy single-JSON-document format are still accepted.
+        
         Args:
             file_path: Path to load the state from (or None to use default)
             
@@ -770,75 +1382,239 @@ class MemoryManager:
             True if the state was loaded successfully, False otherwise
         """
         if not file_path and self.data_dir:
-            file_path = self.data_dir / "memory_state.json"
+            file_path = self._default_state_path()
         
         if not file_path or not os.path.exists(file_path):
             logger.error(f"Cannot load state: file does not exist: {file_path}")
             return False
         
-        try:
-            # Load state from file
-            with open(file_path, 'r') as f:
-                state = json.load(f)
+        with self._persistence_lock:
+            # Restoring must not be recorded as new changes
+            journal = self.memory_system.journal
+            self.memory_system.journal = None
+            try:
+                if is_snapshot(file_path):
+                    loaded_count = self._load_snapshot(file_path)
+                else:
+                    loaded_count = self._load_legacy_state(file_path)
+                if loaded_count is None:
+                    return False
+                
+                replayed = self._replay_delta_log(file_path)
+                # Loading writes to the storage directly, bypassing the counters
+                self.memory_system.mark_changed()
+                
+                logger.info(
+                    f"Loaded memory state from {file_path}: {loaded_count} memories, "
+                    f"{replayed} logged changes replayed"
+                )
+                return True
             
-            # Validate state format
-            if not isinstance(state, dict) or "memories" not in state:
-                logger.error(f"Invalid state format in {file_path}")
+            except Exception as e:
+                logger.error(f"Error loading memory state: {e}")
                 return False
+            finally:
+                self.memory_system.journal = journal
+    
+    def _load_snapshot(self, file_path: Union[str, Path]) -> int:
+        """
+        Stream a snapshot into the (cleared) memory system.
+        
+        Args:
+            file_path: Path of the snapshot
             
-            # Clear current memory system
-            self.memory_system.clear()
-            
-            # Load memories from state
-            memory_map = {}  # Map of old IDs to new IDs
-            loaded_count = 0
+        Returns:
+            The number of memories loaded
+        """
+        self.memory_system.clear()
+        # Links are written after every memory, so only they are held back
+        link_records: List[Dict[str, Any]] = []
+        
+        def memories() -> Iterator[MemoryItem]:
+            for record in read_records(file_path):
+                record_type = record.get("type")
+                if record_type == "memory":
+                    try:
+                        yield MemoryItem.from_dict(record)
+                    except Exception as e:
+                        logger.warning(f"Error loading memory: {e}")
+                elif record_type == "link":
+                    link_records.append(record)
+        
+        loaded_count = self.memory_system.storage.store_many(memories())
+        
+        # Both ends of every link are stored now
+        links = sum(
+            1 for record in link_records
+            if self.memory_system.restore_link(record["source"], record["target"], record["link_type"])
+        )
+        
+        # Restore the nearest-neighbour index, or rebuild it from the loaded memories
+        if self.embedder and not self.embedder.load_index(self._index_path(file_path)):
+            self._reindex_all()
+        
+        logger.debug(f"Restored {links} links from {file_path}")
+        return loaded_count
+    
+    def _load_legacy_state(self, file_path: Union[str, Path]) -> Optional[int]:
+        """
+        Load a state file written in the legacy single-JSON-document format.
+        
+        Args:
+            file_path: Path of the state file
             
+        Returns:
+            The number of memories loaded, or None if the file is invalid
+        """
+        with open(file_path, 'r') as f:
+            state = json.load(f)
+        
+        # Validate state format
+        if not isinstance(state, dict) or "memories" not in state:
+            logger.error(f"Invalid state format in {file_path}")
+            return None
+        
+        # Clear current memory system
+        self.memory_system.clear()
+        
+        def memories() -> Iterator[MemoryItem]:
             for memory_data in state["memories"]:
                 try:
-                    # Crear una nueva instancia de MemoryItem
-                    memory = MemoryItem(
-                        content=memory_data["content"],
-                        memory_type=memory_data["memory_type"],
-                        importance=memory_data["importance"],
-                        metadata=memory_data.get("metadata", {}),
-                        id=memory_data["id"],  # Mantener el mismo ID
-                    )
-                    
-                    # Establecer campos adicionales si existen
-                    if "created_at" in memory_data:
-                        memory.created_at = datetime.fromisoformat(memory_data["created_at"])
-                    if "last_accessed" in memory_data:
-                        memory.last_accessed = datetime.fromisoformat(memory_data["last_accessed"])
-                    if "access_count" in memory_data:
-                        memory.access_count = memory_data["access_count"]
-                    
-                    # Agregar la memoria al sistema directamente
-                    self.memory_system.storage.store(memory)
-                    memory_map[memory_data["id"]] = memory.id
-                    loaded_count += 1
-                    
+                    yield MemoryItem.from_dict(memory_data)
                 except Exception as e:
                     logger.warning(f"Error loading memory: {e}")
+        
+        loaded_count = self.memory_system.storage.store_many(memories())
+        
+        # Restore the nearest-neighbour index, or rebuild it from the loaded memories
+        if self.embedder and not self.embedder.load_index(self._index_path(file_path)):
+            self._reindex_all()
+        
+        # Load links (if present in state)
+        for source_id, links in state.get("links", {}).items():
+            for link_type, target_ids in links.items():
+                for target_id in target_ids:
+                    self.memory_system.restore_link(source_id, target_id, link_type)
+        
+        return loaded_count
+    
+    def _reindex_all(self, batch_size: int = 1000) -> None:
+        """
+        Rebuild the embedder's index from every stored memory, in batches.
+        
+        Embeddings of memories that are no longer stored are dropped first.
+        
+        Args:
+            batch_size: Number of memories embedded per batch
+        """
+        if hasattr(self.embedder, "clear_index"):
+            self.embedder.clear_index()
+        
+        batch = []
+        for memory in self.memory_system.storage.iter_memories():
+            batch.append(memory.id)
+            if len(batch) >= batch_size:
+                self._index_memories(batch)
+                batch = []
+        if batch:
+            self._index_memories(batch)
+    
+    def _replay_delta_log(self, file_path: Union[str, Path]) -> int:
+        """
+        Apply the changes logged after a snapshot.
+        
+        Args:
+            file_path: Path of the snapshot the log follows
+            
+        Returns:
+            The number of changes replayed
+        """
+        delta_path = self._delta_path(file_path)
+        paths = [p for p in (Path(str(delta_path) + ".prev"), delta_path) if p.exists()]
+        if not paths:
+            return 0
+        
+        journal = self._journal_for(file_path)
+        if journal is not None:
+            journal.flush()
+        
+        storage = self.memory_system.storage
+        to_index: Set[str] = set()
+        replayed = 0
+        
+        for path in paths:
+            for record in read_records(path):
+                op = record.get("op")
+                try:
+                    if op == "put":
+                        memory = MemoryItem.from_dict(record["memory"])
+                        storage.store(memory)
+                        to_index.add(memory.id)
+                    elif op == "delete":
+                        self.memory_system.delete_memory(record["id"])
+                        if self.embedder:
+                            self.embedder.remove_memory(record["id"])
+                        to_index.discard(record["id"])
+                    elif op == "link":
+                        self.memory_system.restore_link(record["source"], record["target"], record["link_type"])
+                    elif op == "unlink":
+                        self.memory_system.unlink_memories(record["source"], record["target"], record.get("link_type"))
+                    elif op == "clear":
+                        self.memory_system.clear()
+                        to_index.clear()
+                    else:
+                        continue
+                    replayed += 1
+                except Exception as e:
+                    logger.warning(f"Error replaying logged {op} from {path}: {e}")
+        
+        if self.embedder and to_index:
+            self._index_memories(list(to_index))
+        return replayed
+    
+    def _persistence_worker(self) -> ThreadPoolExecutor:
+        """Get the single background thread that runs saves and loads in order."""
+        if self._persistence_executor is None:
+            self._persistence_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MemoryPersistence")
+        return self._persistence_executor
+    
+    def save_state_async(self, file_path: Optional[str] = None, compression: Optional[str] = None) -> Future:
+        """
+        Save the state in a background thread (see save_state).
+        
+        Args:
+            file_path: Path to save the state to (or None to use default)
+            compression: None, "gzip" or "zstd"
             
-            # Load links (if present in state)
-            if "links" in state:
-                for source_id, links in state["links"].items():
-                    if source_id in memory_map:
-                        new_source_id = memory_map[source_id]
-                        for link_type, target_ids in links.items():
-                            for target_id in target_ids:
-                                if target_id in memory_map:
-                                    new_target_id = memory_map[target_id]
-                                    self.memory_system.link_memories(
-                                        new_source_id, new_target_id, link_type
-                                    )
-            
-            logger.info(f"Loaded memory state from {file_path}: {loaded_count} memories")
-            return True
+        Returns:
+            A future resolving to the result of save_state
+        """
+        return self._persistence_worker().submit(self.save_state, file_path, compression)
+    
+    def load_state_async(self, file_path: Optional[str] = None) -> Future:
+        """
+        Load a state in a background thread (see load_state).
+        
+        Args:
+            file_path: Path to load the state from (or None to use default)
             
-        except Exception as e:
-            logger.error(f"Error loading memory state: {e}")
-            return False
+        Returns:
+            A future resolving to the result of load_state
+        """
+        return self._persistence_worker().submit(self.load_state, file_path)
+    
+    @staticmethod
+    def _index_path(file_path: Union[str, Path]) -> Path:
+        """
+        Get the path of the nearest-neighbour index saved alongside a state file.
+        
+        Args:
+            file_path: Path of the state file
+            
+        Returns:
+            Path of the index file
+        """
+        return Path(file_path).with_suffix(".ann.npz")
     
     # Statistics and Diagnostics
     
@@ -858,6 +1634,9 @@ class MemoryManager:
             if hasattr(memory_system, "get_statistics"):
                 stats["specialized_systems"][memory_type] = memory_system.get_statistics()
         
+        stats["consolidation"] = self.consolidation.get_stats()
+        if self.query_cache is not None:
+            stats["query_cache"] = self.query_cache.get_stats()
         return stats
     
     def update_memory(
@@ -888,10 +1667,15 @@ class MemoryManager:
             return False
         
         # Actualizar directamente en el sistema de memoria base
-        return self.memory_system.update_memory(
+        updated = self.memory_system.update_memory(
             memory_id=memory_id,
             content=content,
             memory_type=memory_type,
             importance=importance,
             metadata=metadata
-        ) 
\ No newline at end of file
+        )
+        
+        # Un contenido nuevo necesita un embedding nuevo para la búsqueda semántica
+        if updated and content is not None:
+            self._index_memories([memory_id], refresh=True)
+        return updated
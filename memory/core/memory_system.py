@@ -6,12 +6,15 @@ central component for managing and retrieving memories.
 """
 
 import logging
+import heapq
 import json
-from typing import List, Dict, Any, Optional, Set, Tuple, Union
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator
 from datetime import datetime
 import uuid
 
 from .memory_item import MemoryItem
+from .link_graph import LinkGraph
 from ..storage.base_storage import BaseStorage
 from ..storage.in_memory_storage import InMemoryStorage
 
@@ -25,8 +28,18 @@ class MemorySystem:
     The MemorySystem serves as the core component of the memory architecture,
     providing a unified interface for working with memories regardless of
     their storage backend or memory type.
+    
+    Changes to a single memory (recording an access, updating it, deleting
+    it) run under one of a fixed set of striped locks picked by the memory
+    ID, so concurrent callers never interleave read-modify-write cycles on
+    the same memory while different memories proceed in parallel. Pair it
+    with a thread-safe backend such as ShardedStorage when several agents
+    share one memory system.
     """
     
+    # Number of striped per-memory locks
+    LOCK_STRIPES = 64
+    
     def __init__(self, storage: Optional[BaseStorage] = None):
         """
         Initialize a new memory system.
@@ -36,7 +49,20 @@ class MemorySystem:
                     If not provided, an InMemoryStorage is used.
         """
         self.storage = storage or InMemoryStorage()
-        self._memory_links: Dict[str, Dict[str, Set[str]]] = {}
+        # Typed links, indexed both ways so incoming links are found without a scan
+        self.links = LinkGraph()
+        
+        # Optional delta log (see storage.snapshot.DeltaLog) receiving every change
+        self.journal = None
+        
+        # Change counters, overall and per memory type, used to invalidate caches;
+        # the epoch advances on changes that may touch any type (clear, loads)
+        self.generation = 0
+        self._epoch = 0
+        self._type_generations: Dict[str, int] = {}
+        self._generation_lock = threading.Lock()
+        
+        self._stripes = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
         logger.info(f"Initialized MemorySystem with storage: {type(self.storage).__name__}")
     
     def add_memory(
@@ -69,8 +95,8 @@ class MemorySystem:
         # Store the memory
         self.storage.store(memory)
         
-        # Initialize link tracking for this memory
-        self._memory_links[memory.id] = {}
+        self._log("put", memory=memory.to_dict())
+        self.mark_changed(memory.memory_type)
         
         logger.debug(f"Added memory: {memory.id} (type: {memory_type}, importance: {importance})")
         return memory.id
@@ -85,10 +111,12 @@ class MemorySystem:
         Returns:
             The memory item if found, None otherwise.
         """
-        memory = self.storage.retrieve(memory_id)
+        with self._lock_for(memory_id):
+            memory = self.storage.retrieve(memory_id)
+            if memory:
+                memory.access()
+                self.storage.store(memory)  # Update the access count
         if memory:
-            memory.access()
-            self.storage.store(memory)  # Update the access count
             logger.debug(f"Retrieved memory: {memory_id} (access count: {memory.access_count})")
         else:
             logger.debug(f"Memory not found: {memory_id}")
@@ -116,26 +144,31 @@ class MemorySystem:
         Returns:
             True if the memory was updated, False if it couldn't be found.
         """
-        memory = self.get_memory(memory_id)
-        if not memory:
-            logger.warning(f"Cannot update non-existent memory: {memory_id}")
-            return False
-        
-        # Update the memory fields
-        if content is not None:
-            memory.content = content
-        
-        if memory_type is not None:
-            memory.memory_type = memory_type
-        
-        if importance is not None:
-            memory.importance = importance
-        
-        if metadata is not None:
-            memory.metadata.update(metadata)
-        
-        # Store the updated memory
-        self.storage.store(memory)
+        with self._lock_for(memory_id):
+            memory = self.get_memory(memory_id)
+            if not memory:
+                logger.warning(f"Cannot update non-existent memory: {memory_id}")
+                return False
+            
+            # Update the memory fields
+            if content is not None:
+                memory.content = content
+            
+            changed_types = {memory.memory_type}
+            if memory_type is not None:
+                memory.memory_type = memory_type
+                changed_types.add(memory.memory_type)
+            
+            if importance is not None:
+                memory.importance = importance
+            
+            if metadata is not None:
+                memory.metadata.update(metadata)
+            
+            # Store the updated memory
+            self.storage.store(memory)
+            self._log("put", memory=memory.to_dict())
+        self.mark_changed(*changed_types)
         logger.debug(f"Updated memory: {memory_id}")
         return True
     
@@ -149,24 +182,16 @@ class MemorySystem:
         Returns:
             True if the memory was deleted, False if it couldn't be found.
         """
-        # Remove any links to/from this memory
-        if memory_id in self._memory_links:
-            # Remove outgoing links
-            outgoing_links = self._memory_links.pop(memory_id)
+        with self._lock_for(memory_id):
+            # Remove any links to/from this memory
+            self.links.remove_node(memory_id)
             
-            # Remove incoming links
-            for other_id in self._memory_links:
-                for link_type in list(self._memory_links[other_id].keys()):
-                    if memory_id in self._memory_links[other_id][link_type]:
-                        self._memory_links[other_id][link_type].remove(memory_id)
-                        
-                        # Clean up empty link sets
-                        if not self._memory_links[other_id][link_type]:
-                            del self._memory_links[other_id][link_type]
-        
-        # Delete from storage
-        result = self.storage.delete(memory_id)
+            # Delete from storage
+            memory = self.storage.retrieve(memory_id)
+            result = self.storage.delete(memory_id)
         if result:
+            self._log("delete", id=memory_id)
+            self.mark_changed(memory.memory_type if memory is not None else None)
             logger.debug(f"Deleted memory: {memory_id}")
         else:
             logger.warning(f"Failed to delete memory: {memory_id}")
@@ -198,15 +223,9 @@ class MemorySystem:
             logger.warning(f"Cannot link non-existent memories: {source_id} -> {target_id}")
             return False
         
-        # Initialize link dicts if needed
-        if source_id not in self._memory_links:
-            self._memory_links[source_id] = {}
-        
-        if link_type not in self._memory_links[source_id]:
-            self._memory_links[source_id][link_type] = set()
-        
         # Add the link
-        self._memory_links[source_id][link_type].add(target_id)
+        self.links.add(source_id, target_id, link_type)
+        self._log("link", source=source_id, target=target_id, link_type=link_type)
         logger.debug(f"Linked memories: {source_id} -[{link_type}]-> {target_id}")
         return True
     
@@ -227,36 +246,95 @@ class MemorySystem:
         Returns:
             True if any links were removed, False otherwise.
         """
-        if source_id not in self._memory_links:
-            return False
-        
-        removed = False
-        
-        if link_type is None:
-            # Remove all links
-            for lt in list(self._memory_links[source_id].keys()):
-                if target_id in self._memory_links[source_id][lt]:
-                    self._memory_links[source_id][lt].remove(target_id)
-                    removed = True
-                    
-                    # Clean up empty link sets
-                    if not self._memory_links[source_id][lt]:
-                        del self._memory_links[source_id][lt]
-        elif link_type in self._memory_links[source_id]:
-            # Remove a specific link type
-            if target_id in self._memory_links[source_id][link_type]:
-                self._memory_links[source_id][link_type].remove(target_id)
-                removed = True
-                
-                # Clean up empty link sets
-                if not self._memory_links[source_id][link_type]:
-                    del self._memory_links[source_id][link_type]
+        removed = self.links.remove(source_id, target_id, link_type)
         
         if removed:
+            self._log("unlink", source=source_id, target=target_id, link_type=link_type)
             logger.debug(f"Unlinked memories: {source_id} -> {target_id}")
         
         return removed
     
+    def restore_link(self, source_id: str, target_id: str, link_type: str = "related") -> bool:
+        """
+        Recreate a link while restoring state, without recording accesses.
+        
+        Args:
+            source_id: The ID of the source memory.
+            target_id: The ID of the target memory.
+            link_type: The type of link.
+            
+        Returns:
+            True if the link was restored, False if either memory doesn't exist.
+        """
+        if self.storage.retrieve(source_id) is None or self.storage.retrieve(target_id) is None:
+            return False
+        self.links.add(source_id, target_id, link_type)
+        return True
+    
+    def iter_links(self) -> Iterator[Tuple[str, str, str]]:
+        """
+        Iterate over every link.
+        
+        Returns:
+            An iterator of (source_id, link_type, target_id) tuples
+        """
+        return self.links.edges()
+    
+    def mark_changed(self, *memory_types: Optional[str]) -> None:
+        """
+        Advance the generation counters after a change.
+        
+        Args:
+            *memory_types: The memory types whose memories changed (None, or
+                          no types at all, marks every type as changed)
+        """
+        with self._generation_lock:
+            self.generation += 1
+            if not memory_types or None in memory_types:
+                # Also covers types never written before (e.g. ones a load brings in)
+                self._epoch += 1
+                return
+            for memory_type in memory_types:
+                self._type_generations[memory_type] = self._type_generations.get(memory_type, 0) + 1
+    
+    def get_generation(self, memory_type: Optional[str] = None) -> int:
+        """
+        Get the generation counter of the memories a query reads.
+        
+        The counter changes whenever a memory is added, updated or deleted,
+        so a result computed at one generation is still valid while the
+        counter keeps that value. A type's counter is its own change count
+        plus the epoch, so both only ever make it grow.
+        
+        Args:
+            memory_type: The memory type the query is restricted to (None for all)
+            
+        Returns:
+            The generation counter
+        """
+        if memory_type is None:
+            return self.generation
+        return self._epoch + self._type_generations.get(memory_type, 0)
+    
+    def _lock_for(self, memory_id: str) -> threading.RLock:
+        """Get the striped lock guarding a memory ID."""
+        return self._stripes[hash(memory_id) % len(self._stripes)]
+    
+    def _log(self, op: str, **fields: Any) -> None:
+        """
+        Record a change in the journal, if one is attached.
+        
+        Args:
+            op: The operation name
+            **fields: The operation's fields
+        """
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(op, **fields)
+        except Exception as e:
+            logger.error(f"Error recording {op} in the delta log: {e}")
+    
     def get_related_memories(
         self,
         memory_id: str,
@@ -272,29 +350,90 @@ class MemorySystem:
         Returns:
             A list of memory items that are linked to the specified memory.
         """
-        if memory_id not in self._memory_links:
+        related_ids = self.links.neighbors(memory_id, link_type)
+        if not related_ids:
             return []
         
-        related_ids = set()
-        
-        if link_type is None:
-            # Get all related memories
-            for lt in self._memory_links[memory_id]:
-                related_ids.update(self._memory_links[memory_id][lt])
-        elif link_type in self._memory_links[memory_id]:
-            # Get memories related by a specific link type
-            related_ids = self._memory_links[memory_id][link_type]
-        
-        # Get the actual memory items
-        related_memories = []
-        for rid in related_ids:
-            memory = self.get_memory(rid)
-            if memory:
-                related_memories.append(memory)
+        # Fetch the linked memories in one call and record the accesses in another
+        related_memories = self.storage.retrieve_many(related_ids)
+        for memory in related_memories:
+            memory.access()
+        self.storage.store_many(related_memories)
         
         logger.debug(f"Found {len(related_memories)} related memories for {memory_id}")
         return related_memories
     
+    def get_memories_within(
+        self,
+        memory_id: Union[str, List[str]],
+        max_hops: int = 2,
+        link_type: Optional[str] = None,
+        direction: str = "out",
+        limit: Optional[int] = None
+    ) -> List[Tuple[MemoryItem, int]]:
+        """
+        Get the memories reachable within a number of links of a memory.
+        
+        Traversal only reads the link graph and the linked memories are then
+        fetched in one storage call; no accesses are recorded.
+        
+        Args:
+            memory_id: The ID of the memory to start from, or several IDs.
+            max_hops: Maximum number of links to follow.
+            link_type: The type of link to follow. If None, all link types are followed.
+            direction: "out" to follow links forward, "in" backward, "both" for either.
+            limit: Optional maximum number of memories to return.
+            
+        Returns:
+            (memory, hops) tuples, nearest first.
+        """
+        depths = self.links.bfs(memory_id, max_depth=max_hops, link_type=link_type, direction=direction, limit=limit)
+        return [(memory, depths[memory.id]) for memory in self.storage.retrieve_many(depths)]
+    
+    def rank_related_memories(
+        self,
+        memory_id: Union[str, List[str]],
+        limit: int = 10,
+        max_hops: Optional[int] = 2,
+        link_type: Optional[str] = None,
+        direction: str = "both",
+        alpha: float = 0.15,
+        importance_weight: float = 1.0
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Rank the memories around a memory by personalized PageRank and importance.
+        
+        Each candidate's PageRank score from the seed memories is multiplied
+        by (1 + importance_weight * importance), so well-connected and
+        important memories rank first. No accesses are recorded.
+        
+        Args:
+            memory_id: The ID of the seed memory, or several IDs.
+            limit: Maximum number of memories to return.
+            max_hops: Only rank memories within this many links of a seed (None for no limit).
+            link_type: The type of link to follow. If None, all link types are followed.
+            direction: "out" to follow links forward, "in" backward, "both" for either.
+            alpha: PageRank restart probability; higher values favour closer memories.
+            importance_weight: How strongly importance boosts the score.
+            
+        Returns:
+            (memory, score) tuples, best first.
+        """
+        seeds = [memory_id] if isinstance(memory_id, str) else list(memory_id)
+        scores = self.links.personalized_pagerank(seeds, alpha=alpha, link_type=link_type, direction=direction)
+        for seed in seeds:
+            scores.pop(seed, None)
+        
+        if max_hops is not None:
+            within = self.links.bfs(seeds, max_depth=max_hops, link_type=link_type, direction=direction)
+            scores = {mid: score for mid, score in scores.items() if mid in within}
+        
+        ranked = [
+            (memory, scores[memory.id] * (1 + importance_weight * memory.importance))
+            for memory in self.storage.retrieve_many(scores)
+        ]
+        return heapq.nlargest(limit, ranked, key=lambda pair: pair[1])
+    
     def query_memories(
         self,
         memory_type: Optional[str] = None,
@@ -366,7 +505,9 @@ class MemorySystem:
         Clear all memories from the system.
         """
         self.storage.clear()
-        self._memory_links = {}
+        self.links.clear()
+        self._log("clear")
+        self.mark_changed()
         logger.warning("Cleared all memories from the system")
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -386,12 +527,6 @@ class MemorySystem:
             else:
                 memory_types[memory.memory_type] = 1
         
-        # Count links
-        total_links = 0
-        for source_id in self._memory_links:
-            for link_type in self._memory_links[source_id]:
-                total_links += len(self._memory_links[source_id][link_type])
-        
         # Compute average importance
         if memories:
             avg_importance = sum(memory.importance for memory in memories) / len(memories)
@@ -401,6 +536,6 @@ class MemorySystem:
         return {
             "total_memories": len(memories),
             "memory_types": memory_types,
-            "total_links": total_links,
+            "total_links": len(self.links),
             "avg_importance": avg_importance
         } 
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Query Cache Module
+
+This module provides the QueryCache class, a bounded LRU/TTL cache of
+memory query results that is invalidated by the memory system's
+generation counters.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn a query parameter into a hashable, order-independent value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results with a time-to-live.
+    
+    Each entry records the generation of the data it was computed from
+    (see MemorySystem.get_generation); a lookup made at any other
+    generation is a miss, so a write invalidates exactly the entries
+    that could observe it without scanning the cache. The TTL bounds the
+    staleness of results that also depend on time (recency boosts,
+    short-term expiry).
+    """
+    
+    def __init__(self, capacity: int = 256, ttl_seconds: float = 30.0):
+        """
+        Initialize a new query cache.
+        
+        Args:
+            capacity: Maximum number of cached results
+            ttl_seconds: Lifetime of a cached result (0 or less disables expiry)
+        """
+        self.capacity = max(1, capacity)
+        self.ttl_seconds = ttl_seconds
+        
+        # key -> (generation, expiry timestamp, result)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "evictions": 0}
+    
+    def __len__(self) -> int:
+        """Get the number of cached results."""
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(operation: str, query: Optional[str] = None, **params: Any) -> Hashable:
+        """
+        Build the cache key of a query.
+        
+        The query text is whitespace-normalized and parameters are frozen
+        into a canonical form, so equivalent calls share an entry.
+        
+        Args:
+            operation: Name of the query method
+            query: Free-text query, if any
+            **params: The other query parameters
+            
+        Returns:
+            A hashable key
+        """
+        if query is not None:
+            query = " ".join(str(query).split())
+        return (operation, query, _freeze(params))
+    
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """
+        Get a cached result.
+        
+        Args:
+            key: The cache key (see make_key)
+            generation: The current generation of the data the query reads
+            
+        Returns:
+            The cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            
+            cached_generation, expires_at, result = entry
+            if cached_generation != generation:
+                del self._entries[key]
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+            if self.ttl_seconds > 0 and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return result
+    
+    def put(self, key: Hashable, generation: int, result: Any) -> None:
+        """
+        Cache a result.
+        
+        Args:
+            key: The cache key (see make_key)
+            generation: The generation read before the result was computed
+            result: The result
+        """
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+    
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                **self._stats
+            }
@@ -6,9 +6,21 @@ summarization, embedding generation, and relevance calculation.
 """
 
 from .summarizer import MemorySummarizer
+from .extractive import ExtractiveSummarizer
 from .embedder import MemoryEmbedder
+from .embedding_store import EmbeddingStore
+from .ann_index import IVFIndex
+from .embedding_cache import EmbeddingCache
+from .hybrid_retriever import HybridRetriever
+from .clustering import MiniBatchKMeans
 
 __all__ = [
     'MemorySummarizer',
-    'MemoryEmbedder'
+    'ExtractiveSummarizer',
+    'MemoryEmbedder',
+    'EmbeddingStore',
+    'IVFIndex',
+    'EmbeddingCache',
+    'HybridRetriever',
+    'MiniBatchKMeans'
 ] 
\ No newline at end of file
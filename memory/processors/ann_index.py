@@ -0,0 +1,400 @@
+"""
+Approximate Nearest-Neighbour Index Module
+
+This module provides an inverted-file (IVF) index for memory embeddings,
+written in pure NumPy, so semantic recall does not have to scan every
+stored embedding.
+"""
+
+import json
+import logging
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+
+from .embedding_store import EmbeddingStore, VectorLike
+from .clustering import kmeans_plusplus
+
+logger = logging.getLogger(__name__)
+
+
+def _spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = 10,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit vectors with k-means++ seeding and cosine-distance Lloyd steps.
+    
+    Args:
+        vectors: 2-D array of L2-normalized vectors
+        n_clusters: Number of centroids to compute
+        iterations: Number of Lloyd iterations
+        seed: Random seed for reproducible centroids
+        
+    Returns:
+        A (n_clusters, dim) array of L2-normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    
+    # k-means++ seeding on cosine distance
+    centroids = kmeans_plusplus(vectors, n_clusters, rng, spherical=True)
+    n_clusters = len(centroids)
+    
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        
+        # Re-seed empty clusters with random points
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = vectors[rng.integers(n, size=empty.size)]
+        
+        centroids = EmbeddingStore.normalize(sums)
+    
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index over L2-normalized embeddings.
+    
+    Embeddings are partitioned into lists around k-means centroids. A query
+    only scans the nprobe lists whose centroids are closest to it, trading a
+    little recall for latency. Until enough vectors have been added to train
+    the centroids the index behaves as an exact flat index.
+    
+    The index exposes the same add/remove/search interface as EmbeddingStore
+    so either can be plugged into MemoryEmbedder.
+    """
+    
+    def __init__(
+        self,
+        embedding_dim: Optional[int] = None,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_size: int = 1024,
+        retrain_factor: float = 4.0,
+        kmeans_iterations: int = 10,
+        seed: int = 0
+    ):
+        """
+        Initialize a new IVF index.
+        
+        Args:
+            embedding_dim: Dimension of the embedding vectors (inferred if not provided)
+            n_lists: Number of inverted lists (defaults to sqrt of the training size)
+            nprobe: Number of lists scanned per query (the recall/latency knob)
+            min_train_size: Number of vectors required before centroids are trained
+            retrain_factor: Retrain once the index grows by this factor since the last training
+            kmeans_iterations: Number of k-means iterations per training
+            seed: Random seed for reproducible training
+        """
+        self.embedding_dim = embedding_dim
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_factor = retrain_factor
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[EmbeddingStore] = [EmbeddingStore(embedding_dim)]
+        self._list_of: Dict[str, int] = {}
+        self._trained_size = 0
+    
+    def __len__(self) -> int:
+        """Get the number of indexed embeddings."""
+        return len(self._list_of)
+    
+    def __contains__(self, memory_id: str) -> bool:
+        """Check whether a memory ID is indexed."""
+        return memory_id in self._list_of
+    
+    @property
+    def is_trained(self) -> bool:
+        """Whether centroids have been trained."""
+        return self._centroids is not None
+    
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Get the list number of each (normalized) vector."""
+        if self._centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.argmax(vectors @ self._centroids.T, axis=1)
+    
+    def add(self, memory_id: str, embedding: VectorLike) -> None:
+        """
+        Add or replace the embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            embedding: The embedding vector
+        """
+        self.add_many([memory_id], [embedding])
+    
+    def add_many(self, memory_ids: Sequence[str], embeddings: Union[Sequence[VectorLike], np.ndarray]) -> None:
+        """
+        Add or replace the embeddings of several memories.
+        
+        Args:
+            memory_ids: The IDs of the memories
+            embeddings: One embedding per memory ID
+        """
+        if len(memory_ids) == 0:
+            return
+        
+        vectors = EmbeddingStore.normalize(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+        if self.embedding_dim is None:
+            self.embedding_dim = vectors.shape[1]
+        
+        # Replacing an embedding may move it to another list
+        for memory_id in memory_ids:
+            if memory_id in self._list_of:
+                self.remove(memory_id)
+        
+        assignments = self._assign(vectors)
+        for list_no in np.unique(assignments):
+            positions = np.flatnonzero(assignments == list_no)
+            list_ids = [memory_ids[p] for p in positions]
+            self._lists[list_no].add_many(list_ids, vectors[positions])
+            for memory_id in list_ids:
+                self._list_of[memory_id] = int(list_no)
+        
+        size = len(self._list_of)
+        if (not self.is_trained and size >= self.min_train_size) or (
+            self.is_trained and size >= self._trained_size * self.retrain_factor
+        ):
+            self.train()
+    
+    def remove(self, memory_id: str) -> bool:
+        """
+        Remove the embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            True if an embedding was removed, False if none was indexed
+        """
+        list_no = self._list_of.pop(memory_id, None)
+        if list_no is None:
+            return False
+        return self._lists[list_no].remove(memory_id)
+    
+    def clear(self) -> None:
+        """Remove all embeddings and forget the trained centroids."""
+        self._centroids = None
+        self._lists = [EmbeddingStore(self.embedding_dim)]
+        self._list_of.clear()
+        self._trained_size = 0
+    
+    def all_vectors(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Gather every indexed ID and (normalized) vector.
+        
+        Returns:
+            (memory IDs, matrix with one row per ID)
+        """
+        ids: List[str] = []
+        matrices = []
+        for inverted_list in self._lists:
+            if len(inverted_list):
+                ids.extend(inverted_list.ids)
+                matrices.append(inverted_list.matrix)
+        if not matrices:
+            return [], np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+        return ids, np.concatenate(matrices)
+    
+    def train(self) -> None:
+        """
+        Train centroids on the indexed vectors and redistribute the lists.
+        """
+        ids, vectors = self.all_vectors()
+        if not ids:
+            return
+        
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(ids))))
+        
+        # Train on a bounded sample, as is customary for IVF
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(ids), n_lists * 256)
+        sample = vectors if sample_size == len(ids) else vectors[rng.choice(len(ids), sample_size, replace=False)]
+        
+        self._centroids = _spherical_kmeans(sample, n_lists, self.kmeans_iterations, self.seed)
+        self._lists = [
+            EmbeddingStore(self.embedding_dim, initial_capacity=16)
+            for _ in range(len(self._centroids))
+        ]
+        self._list_of.clear()
+        self._trained_size = len(ids)
+        
+        assignments = self._assign(vectors)
+        for list_no in np.unique(assignments):
+            positions = np.flatnonzero(assignments == list_no)
+            list_ids = [ids[p] for p in positions]
+            self._lists[list_no].add_many(list_ids, vectors[positions])
+            for memory_id in list_ids:
+                self._list_of[memory_id] = int(list_no)
+        
+        logger.info(f"Trained IVF index: {len(ids)} vectors in {len(self._centroids)} lists")
+    
+    def search(
+        self,
+        query: VectorLike,
+        top_k: int = 5,
+        threshold: Optional[float] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the indexed embeddings most similar to a query.
+        
+        Args:
+            query: The query vector
+            top_k: Number of results to return
+            threshold: Optional minimum cosine similarity
+            nprobe: Number of lists to scan (defaults to the index setting)
+            
+        Returns:
+            List of (memory_id, similarity) tuples, most similar first
+        """
+        return self.search_batch([query], top_k=top_k, threshold=threshold, nprobe=nprobe)[0]
+    
+    def search_batch(
+        self,
+        queries: Union[Sequence[VectorLike], np.ndarray],
+        top_k: int = 5,
+        threshold: Optional[float] = None,
+        nprobe: Optional[int] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Find the most similar indexed embeddings for a batch of queries.
+        
+        Args:
+            queries: Query vectors, one per row
+            top_k: Number of results to return per query
+            threshold: Optional minimum cosine similarity
+            nprobe: Number of lists to scan (defaults to the index setting)
+            
+        Returns:
+            One list of (memory_id, similarity) tuples per query
+        """
+        queries = EmbeddingStore.normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        nprobe = min(nprobe or self.nprobe, len(self._lists))
+        
+        if self._centroids is None:
+            probes = np.zeros((len(queries), 1), dtype=np.int64)
+        else:
+            centroid_scores = queries @ self._centroids.T
+            probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+        
+        results = []
+        for query, query_probes in zip(queries, probes):
+            ids: List[str] = []
+            scores = []
+            for list_no in query_probes:
+                inverted_list = self._lists[list_no]
+                if len(inverted_list):
+                    ids.extend(inverted_list.ids)
+                    scores.append(inverted_list.matrix @ query)
+            
+            if not scores:
+                results.append([])
+                continue
+            
+            scores = np.concatenate(scores)
+            results.append([
+                (ids[position], score)
+                for position, score in EmbeddingStore.top_k(scores, top_k, threshold)
+            ])
+        
+        return results
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Persist the index (centroids, vectors and list assignments) to disk.
+        
+        Args:
+            path: Path of the .npz file to write
+        """
+        ids, vectors = self.all_vectors()
+        assignments = np.array([self._list_of[memory_id] for memory_id in ids], dtype=np.int64)
+        params = {
+            "embedding_dim": self.embedding_dim,
+            "n_lists": self.n_lists,
+            "nprobe": self.nprobe,
+            "min_train_size": self.min_train_size,
+            "retrain_factor": self.retrain_factor,
+            "kmeans_iterations": self.kmeans_iterations,
+            "seed": self.seed,
+            "trained_size": self._trained_size
+        }
+        
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array(json.dumps(params)),
+                centroids=self._centroids if self._centroids is not None else np.zeros((0, 0), dtype=np.float32),
+                vectors=vectors,
+                ids=np.array(ids, dtype=str),
+                assignments=assignments
+            )
+        logger.info(f"Saved IVF index with {len(ids)} vectors to {path}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'IVFIndex':
+        """
+        Load an index previously written with save().
+        
+        Args:
+            path: Path of the .npz file to read
+            
+        Returns:
+            The loaded IVFIndex
+        """
+        with np.load(path) as data:
+            params = json.loads(str(data["params"]))
+            trained_size = params.pop("trained_size")
+            index = cls(**params)
+            
+            centroids = data["centroids"]
+            vectors = data["vectors"]
+            ids = data["ids"].tolist()
+            assignments = data["assignments"]
+        
+        if centroids.size:
+            index._centroids = centroids
+            index._lists = [
+                EmbeddingStore(index.embedding_dim, initial_capacity=16)
+                for _ in range(len(centroids))
+            ]
+            index._trained_size = trained_size
+        
+        for list_no in np.unique(assignments):
+            positions = np.flatnonzero(assignments == list_no)
+            list_ids = [ids[p] for p in positions]
+            index._lists[list_no].add_many(list_ids, vectors[positions])
+            for memory_id in list_ids:
+                index._list_of[memory_id] = int(list_no)
+        
+        logger.info(f"Loaded IVF index with {len(ids)} vectors from {path}")
+        return index
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the index.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        list_sizes = [len(inverted_list) for inverted_list in self._lists]
+        return {
+            "size": len(self._list_of),
+            "trained": self.is_trained,
+            "n_lists": len(self._lists),
+            "nprobe": self.nprobe,
+            "max_list_size": max(list_sizes) if list_sizes else 0
+        }
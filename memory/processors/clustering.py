@@ -0,0 +1,416 @@
+"""
+Clustering Module
+
+This module provides a mini-batch k-means clusterer for memory embeddings,
+written in pure NumPy, with k-means++ seeding, incremental updates and
+per-cluster summaries.
+"""
+
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from .embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+# Number of rows scored against the centroids at once when predicting
+_PREDICT_CHUNK = 65536
+
+
+def kmeans_plusplus(
+    vectors: np.ndarray,
+    n_clusters: int,
+    rng: np.random.Generator,
+    spherical: bool = True
+) -> np.ndarray:
+    """
+    Pick initial centroids with greedy k-means++ seeding.
+    
+    Candidates for each new centroid are drawn with probability
+    proportional to their distance to the closest centroid picked so far,
+    and the one that most reduces the total distance is kept.
+    
+    Args:
+        vectors: 2-D array of vectors (L2-normalized if spherical)
+        n_clusters: Number of centroids to pick (at most the number of vectors)
+        rng: Random generator
+        spherical: Whether to use cosine distance instead of squared Euclidean distance
+        
+    Returns:
+        A (n_clusters, dim) float32 array of centroids
+    """
+    n = vectors.shape[0]
+    n_clusters = min(n_clusters, n)
+    trials = 2 + int(np.log(n_clusters)) if n_clusters > 1 else 1
+    
+    def distance_to(candidates: np.ndarray) -> np.ndarray:
+        """Distance of every vector to each candidate, shape (len(candidates), n)."""
+        if spherical:
+            return 1.0 - candidates @ vectors.T
+        return (
+            np.einsum("ij,ij->i", candidates, candidates)[:, None]
+            - 2.0 * (candidates @ vectors.T)
+            + np.einsum("ij,ij->i", vectors, vectors)[None, :]
+        )
+    
+    centroids = np.empty((n_clusters, vectors.shape[1]), dtype=np.float32)
+    centroids[0] = vectors[rng.integers(n)]
+    closest = np.maximum(distance_to(centroids[:1])[0], 0.0)
+    for i in range(1, n_clusters):
+        total = closest.sum()
+        if total > 0:
+            choices = rng.choice(n, size=trials, p=closest / total)
+        else:
+            choices = rng.integers(n, size=trials)
+        candidates = np.minimum(closest[None, :], np.maximum(distance_to(vectors[choices]), 0.0))
+        best = int(np.argmin(candidates.sum(axis=1)))
+        centroids[i] = vectors[choices[best]]
+        closest = candidates[best]
+    
+    return centroids
+
+
+class MiniBatchKMeans:
+    """
+    Mini-batch k-means over embedding vectors.
+    
+    Centroids are seeded with k-means++ on a sample and then refined with
+    small random batches, each centroid moving towards the mean of its
+    batch members with a learning rate that decays with the number of
+    vectors it has absorbed so far. The same update serves partial_fit, so
+    new memories can refine an existing clustering without refitting.
+    
+    In spherical mode (the default, matching the cosine similarity used
+    for embeddings) vectors are L2-normalized and centroids are kept on
+    the unit sphere.
+    """
+    
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        batch_size: int = 1024,
+        max_iter: int = 100,
+        tol: float = 1e-4,
+        seed: int = 0,
+        spherical: bool = True,
+        init_size: Optional[int] = None,
+        reassignment_ratio: float = 0.01
+    ):
+        """
+        Initialize a new clusterer.
+        
+        Args:
+            n_clusters: Number of clusters
+            batch_size: Number of vectors per mini-batch
+            max_iter: Maximum number of mini-batch steps in fit()
+            tol: Stop fit() once the average centroid shift per step falls below this
+            seed: Random seed; the same seed and data give the same clusters
+            spherical: Whether to cluster by cosine similarity (unit vectors)
+            init_size: Number of vectors sampled for k-means++ seeding
+                      (defaults to max(3 * batch_size, 10 * n_clusters))
+            reassignment_ratio: Centroids that absorbed less than this share of
+                               the busiest centroid's vectors are moved to
+                               poorly covered vectors during fit()
+        """
+        if n_clusters < 1:
+            raise ValueError("n_clusters must be at least 1")
+        
+        self.n_clusters = n_clusters
+        self.batch_size = max(1, batch_size)
+        self.max_iter = max(1, max_iter)
+        self.tol = tol
+        self.seed = seed
+        self.spherical = spherical
+        self.init_size = init_size or max(3 * self.batch_size, 10 * n_clusters)
+        self.reassignment_ratio = reassignment_ratio
+        
+        self.centroids: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self.n_steps = 0
+        self._rng = np.random.default_rng(seed)
+    
+    @property
+    def is_fitted(self) -> bool:
+        """Whether centroids have been computed."""
+        return self.centroids is not None
+    
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        """Convert input to a 2-D float32 array (normalized in spherical mode)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        return EmbeddingStore.normalize(vectors) if self.spherical else vectors
+    
+    def _assign(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assign vectors to their closest centroid.
+        
+        Returns:
+            The labels and, per vector, the cosine similarity (spherical) or
+            squared Euclidean distance to its centroid
+        """
+        if self.spherical:
+            similarities = vectors @ self.centroids.T
+            labels = np.argmax(similarities, axis=1)
+            return labels, similarities[np.arange(len(labels)), labels]
+        
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+        distances = (
+            np.einsum("ij,ij->i", vectors, vectors)[:, None]
+            - 2.0 * (vectors @ self.centroids.T)
+            + np.einsum("ij,ij->i", self.centroids, self.centroids)[None, :]
+        )
+        labels = np.argmin(distances, axis=1)
+        return labels, np.maximum(distances[np.arange(len(labels)), labels], 0.0)
+    
+    def _seed(self, vectors: np.ndarray) -> None:
+        """Seed centroids (or add missing ones) with k-means++ on a sample."""
+        missing = self.n_clusters - (0 if self.centroids is None else len(self.centroids))
+        if missing <= 0 or len(vectors) == 0:
+            return
+        
+        sample = vectors
+        if len(vectors) > self.init_size:
+            sample = vectors[self._rng.choice(len(vectors), self.init_size, replace=False)]
+        
+        if self.centroids is None:
+            self.centroids = kmeans_plusplus(sample, missing, self._rng, self.spherical)
+            self.counts = np.zeros(len(self.centroids), dtype=np.int64)
+            return
+        
+        # Too few vectors were seen to seed every cluster: seed the rest from
+        # the vectors farthest from the existing centroids
+        _, closeness = self._assign(sample)
+        order = np.argsort(closeness) if self.spherical else np.argsort(-closeness)
+        extra = sample[order[:missing]]
+        self.centroids = np.vstack([self.centroids, extra]).astype(np.float32)
+        self.counts = np.concatenate([self.counts, np.zeros(len(extra), dtype=np.int64)])
+    
+    def _step(self, batch: np.ndarray) -> float:
+        """
+        Move the centroids towards the mean of their batch members.
+        
+        Args:
+            batch: Prepared vectors
+            
+        Returns:
+            The mean centroid shift
+        """
+        labels, _ = self._assign(batch)
+        k = len(self.centroids)
+        batch_counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(self.centroids)
+        np.add.at(sums, labels, batch)
+        
+        touched = np.flatnonzero(batch_counts)
+        self.counts[touched] += batch_counts[touched]
+        # Per-centroid learning rate: share of its members that came from this batch
+        rates = (batch_counts[touched] / self.counts[touched]).astype(np.float32)[:, None]
+        means = sums[touched] / batch_counts[touched, None]
+        
+        previous = self.centroids[touched].copy()
+        updated = (1.0 - rates) * previous + rates * means
+        if self.spherical:
+            updated = EmbeddingStore.normalize(updated)
+        self.centroids[touched] = updated
+        self.n_steps += 1
+        
+        return float(np.linalg.norm(updated - previous, axis=1).sum() / k)
+    
+    def _reassign(self, batch: np.ndarray) -> int:
+        """
+        Move starved centroids onto the batch vectors their centroids cover worst.
+        
+        Args:
+            batch: Prepared vectors
+            
+        Returns:
+            The number of centroids moved
+        """
+        starved = np.flatnonzero(self.counts < self.reassignment_ratio * self.counts.max())
+        if starved.size == 0:
+            return 0
+        
+        _, closeness = self._assign(batch)
+        order = np.argsort(closeness) if self.spherical else np.argsort(-closeness)
+        targets = order[:starved.size]
+        starved = starved[:targets.size]
+        self.centroids[starved] = batch[targets]
+        # Count the moved centroids like average ones so they are not moved again at once
+        self.counts[starved] = max(1, int(np.median(self.counts)))
+        return int(starved.size)
+    
+    def fit(self, vectors: Any) -> "MiniBatchKMeans":
+        """
+        Cluster vectors from scratch.
+        
+        Args:
+            vectors: 2-D array (or sequence) of vectors
+            
+        Returns:
+            The clusterer itself
+        """
+        vectors = self._prepare(vectors)
+        self._rng = np.random.default_rng(self.seed)
+        self.centroids = None
+        self.counts = None
+        self.n_steps = 0
+        
+        n = len(vectors)
+        if n == 0:
+            return self
+        self._seed(vectors)
+        
+        batch_size = min(self.batch_size, n)
+        # Check for starved centroids a few times per pass over the data
+        reassign_every = max(1, n // (batch_size * 4))
+        smoothed = None
+        for step in range(self.max_iter):
+            batch = vectors[self._rng.choice(n, batch_size, replace=False)] if batch_size < n else vectors
+            shift = self._step(batch)
+            if self.reassignment_ratio > 0 and (step + 1) % reassign_every == 0 and self._reassign(batch):
+                smoothed = None
+                continue
+            # Smooth the shift over recent steps so one quiet batch does not stop early
+            smoothed = shift if smoothed is None else 0.7 * smoothed + 0.3 * shift
+            if smoothed < self.tol:
+                break
+        
+        logger.debug(f"Fitted {len(self.centroids)} clusters on {n} vectors in {self.n_steps} steps")
+        return self
+    
+    def partial_fit(self, vectors: Any) -> "MiniBatchKMeans":
+        """
+        Refine the clustering with new vectors.
+        
+        Args:
+            vectors: 2-D array (or sequence) of vectors
+            
+        Returns:
+            The clusterer itself
+        """
+        vectors = self._prepare(vectors)
+        if len(vectors) == 0:
+            return self
+        
+        self._seed(vectors)
+        for start in range(0, len(vectors), self.batch_size):
+            self._step(vectors[start:start + self.batch_size])
+        return self
+    
+    def predict(self, vectors: Any, return_scores: bool = False) -> Any:
+        """
+        Get the closest cluster of each vector.
+        
+        Args:
+            vectors: 2-D array (or sequence) of vectors
+            return_scores: Whether to also return the similarity (spherical)
+                          or squared distance to the assigned centroid
+                          
+        Returns:
+            The labels, or (labels, scores) if return_scores
+        """
+        if self.centroids is None:
+            raise RuntimeError("The clusterer has not been fitted")
+        
+        labels, scores = self._predict_prepared(self._prepare(vectors))
+        return (labels, scores) if return_scores else labels
+    
+    def _predict_prepared(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign prepared vectors to clusters in chunks, bounding the score matrix size."""
+        labels = np.empty(len(vectors), dtype=np.int64)
+        scores = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), _PREDICT_CHUNK):
+            chunk_labels, chunk_scores = self._assign(vectors[start:start + _PREDICT_CHUNK])
+            labels[start:start + len(chunk_labels)] = chunk_labels
+            scores[start:start + len(chunk_scores)] = chunk_scores
+        return labels, scores
+    
+    def fit_predict(self, vectors: Any) -> np.ndarray:
+        """
+        Cluster vectors from scratch and get the cluster of each.
+        
+        Args:
+            vectors: 2-D array (or sequence) of vectors
+            
+        Returns:
+            The labels
+        """
+        vectors = self._prepare(vectors)
+        self.fit(vectors)
+        if self.centroids is None:
+            return np.empty(0, dtype=np.int64)
+        return self._predict_prepared(vectors)[0]
+    
+    def summarize(
+        self,
+        vectors: Any,
+        ids: Sequence[Any],
+        labels: Optional[np.ndarray] = None,
+        top_n: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Describe each cluster by its size, cohesion and most central members.
+        
+        Args:
+            vectors: 2-D array (or sequence) of vectors
+            ids: Identifier of each vector (e.g. memory IDs)
+            labels: Precomputed labels (predicted if not provided)
+            top_n: Number of representatives per cluster
+            
+        Returns:
+            One dictionary per non-empty cluster, largest first, with keys
+            "cluster", "size", "centroid", "cohesion" (mean similarity, or
+            mean squared distance, to the centroid) and "representatives"
+            (IDs of the members closest to the centroid)
+        """
+        if self.centroids is None or len(ids) == 0:
+            return []
+        
+        vectors = self._prepare(vectors)
+        if labels is None:
+            labels, scores = self._predict_prepared(vectors)
+        else:
+            labels = np.asarray(labels)
+            if self.spherical:
+                scores = np.einsum("ij,ij->i", vectors, self.centroids[labels])
+            else:
+                offsets = vectors - self.centroids[labels]
+                scores = np.einsum("ij,ij->i", offsets, offsets)
+        
+        # Members of each cluster, most central first
+        closeness = -scores if self.spherical else scores
+        order = np.lexsort((closeness, labels))
+        sorted_labels = labels[order]
+        boundaries = np.flatnonzero(np.diff(sorted_labels)) + 1
+        
+        summaries = []
+        for members in np.split(order, boundaries):
+            cluster = int(labels[members[0]])
+            summaries.append({
+                "cluster": cluster,
+                "size": int(len(members)),
+                "centroid": self.centroids[cluster],
+                "cohesion": float(scores[members].mean()),
+                "representatives": [ids[i] for i in members[:top_n]]
+            })
+        
+        summaries.sort(key=lambda summary: summary["size"], reverse=True)
+        return summaries
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the clusterer.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        return {
+            "n_clusters": self.n_clusters,
+            "fitted_clusters": 0 if self.centroids is None else len(self.centroids),
+            "steps": self.n_steps,
+            "vectors_seen": 0 if self.counts is None else int(self.counts.sum()),
+            "spherical": self.spherical,
+            "seed": self.seed
+        }
@@ -5,11 +5,19 @@ This module provides functionality for generating vector embeddings for memories
 enabling semantic search and similarity-based retrieval.
 """
 
+import asyncio
+import inspect
 import logging
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable, Union, Tuple
 
 from ..core.memory_item import MemoryItem
+from .embedding_store import EmbeddingStore
+from .ann_index import IVFIndex
+from .embedding_cache import EmbeddingCache
+from .clustering import MiniBatchKMeans
 
 logger = logging.getLogger(__name__)
 
@@ -25,17 +33,50 @@ class MemoryEmbedder:
     def __init__(
         self,
         embedding_function: Callable[[str], List[float]],
-        embedding_dim: int = 768
+        embedding_dim: int = 768,
+        index: Optional[Any] = None,
+        cache: Optional[EmbeddingCache] = None,
+        name: Optional[str] = None,
+        batch_embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        batch_size: int = 64,
+        max_batch_tokens: int = 8000,
+        max_concurrency: int = 4
     ):
         """
         Initialize a new memory embedder.
         
         Args:
             embedding_function: Function that takes a string and returns a vector embedding
+                               (may be a coroutine function, e.g. a model's embed method)
             embedding_dim: Dimension of the embedding vectors
+            index: Optional nearest-neighbour index used by search() (e.g. an IVFIndex).
+                  If not provided, search() scans the exact embedding store.
+            cache: Optional persistent cache of embeddings keyed by content hash
+            name: Identity of the embedding model (e.g. "openai/text-embedding-3-small"),
+                 used to scope cached vectors; without it no persistent cache
+                 is attached by enable_cache
+            batch_embedding_function: Optional function (or coroutine function) that
+                                      embeds a list of strings in one call
+            batch_size: Maximum number of texts per batch call
+            max_batch_tokens: Approximate token budget per batch call
+            max_concurrency: Maximum number of batch calls in flight at once
         """
         self.embedding_function = embedding_function
         self.embedding_dim = embedding_dim
+        self.batch_embedding_function = batch_embedding_function
+        self.batch_size = max(1, batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.max_concurrency = max(1, max_concurrency)
+        self.name = name
+        self.cache = cache
+        
+        # Normalized embeddings of processed memories, one row per memory ID
+        self.store = EmbeddingStore(embedding_dim=embedding_dim)
+        self.index = index if index is not None else self.store
+        
+        # Incrementally trained clustering of processed memories (see partial_fit_clusters)
+        self.clusterer: Optional[MiniBatchKMeans] = None
+        
         logger.info(f"Initialized memory embedder with embedding_dim={embedding_dim}")
     
     def get_text_for_embedding(self, memory: MemoryItem) -> str:
@@ -69,6 +110,247 @@ class MemoryEmbedder:
         # For other types, convert to string
         return str(memory.content)
     
+    def enable_cache(self, cache_dir: Union[str, Path]) -> Optional[EmbeddingCache]:
+        """
+        Attach a persistent embedding cache stored in a directory.
+        
+        Cached vectors are only valid for the model that produced them, so
+        no cache is attached unless the embedder was given a name.
+        
+        Args:
+            cache_dir: Directory where the cache files are kept
+            
+        Returns:
+            The attached cache (an existing one is kept as is), or None
+            if the embedder has no model identity
+        """
+        if self.cache is None:
+            if not self.name:
+                logger.warning("Not caching embeddings: the embedder has no model name")
+                return None
+            self.cache = EmbeddingCache(cache_dir, self.embedding_dim, namespace=self.name)
+        return self.cache
+    
+    @staticmethod
+    def _run_async(coroutine: Any) -> Any:
+        """
+        Run a coroutine to completion from synchronous code.
+        
+        Args:
+            coroutine: The coroutine to run
+            
+        Returns:
+            The result of the coroutine
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Already inside an event loop: run on a private loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    def _call_embedding_function(self, text: str) -> List[float]:
+        """
+        Call the single-text embedding function, awaiting it if it is asynchronous.
+        
+        Args:
+            text: The text to embed
+            
+        Returns:
+            The embedding vector
+        """
+        embedding = self.embedding_function(text)
+        if inspect.isawaitable(embedding):
+            embedding = self._run_async(embedding)
+        return embedding
+    
+    def _embed_one(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a single text, logging failures.
+        
+        Args:
+            text: The text to embed
+            
+        Returns:
+            The embedding vector, or None if embedding failed
+        """
+        try:
+            return self._call_embedding_function(text)
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            return None
+    
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Roughly estimate the number of tokens of a text (~4 characters per token).
+        
+        Args:
+            text: The text to measure
+            
+        Returns:
+            The estimated token count
+        """
+        return len(text) // 4 + 1
+    
+    def _chunk_texts(self, texts: List[str]) -> List[List[str]]:
+        """
+        Split texts into batches bounded by count and token budget.
+        
+        A single text larger than the token budget gets a batch of its own.
+        
+        Args:
+            texts: The texts to split
+            
+        Returns:
+            Consecutive batches of texts, in order
+        """
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        
+        for text in texts:
+            tokens = self.estimate_tokens(text)
+            if current and (
+                len(current) >= self.batch_size or
+                current_tokens + tokens > self.max_batch_tokens
+            ):
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+            current.append(text)
+            current_tokens += tokens
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _check_batch(self, chunk: List[str], embeddings: Any) -> List[List[float]]:
+        """Validate that a batch call returned one embedding per text."""
+        embeddings = list(embeddings)
+        if len(embeddings) != len(chunk):
+            raise ValueError(f"Batch embedding returned {len(embeddings)} vectors for {len(chunk)} texts")
+        return embeddings
+    
+    def _embed_chunk(self, chunk: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed one batch with a synchronous batch function, falling back per text.
+        
+        Args:
+            chunk: The texts of the batch
+            
+        Returns:
+            One embedding (or None on failure) per text
+        """
+        try:
+            return self._check_batch(chunk, self.batch_embedding_function(chunk))
+        except Exception as e:
+            logger.warning(f"Batch embedding of {len(chunk)} texts failed, retrying one by one: {e}")
+            return [self._embed_one(text) for text in chunk]
+    
+    async def _embed_chunks_async(self, chunks: List[List[str]]) -> List[List[Optional[List[float]]]]:
+        """
+        Embed batches with an asynchronous batch function under a concurrency limit.
+        
+        Args:
+            chunks: The batches to embed
+            
+        Returns:
+            One list of embeddings per batch, in order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def embed_chunk(chunk: List[str]) -> List[Optional[List[float]]]:
+            async with semaphore:
+                try:
+                    return self._check_batch(chunk, await self.batch_embedding_function(chunk))
+                except Exception as e:
+                    logger.warning(f"Batch embedding of {len(chunk)} texts failed, retrying one by one: {e}")
+                
+                results = []
+                for text in chunk:
+                    try:
+                        embedding = self.embedding_function(text)
+                        if inspect.isawaitable(embedding):
+                            embedding = await embedding
+                        results.append(embedding)
+                    except Exception as e:
+                        logger.error(f"Error generating embedding: {e}")
+                        results.append(None)
+                return results
+        
+        return await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+    
+    def _embed_batched(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed texts through the batch function, running batches concurrently.
+        
+        Args:
+            texts: The distinct texts to embed
+            
+        Returns:
+            One embedding (or None on failure) per text, in order
+        """
+        chunks = self._chunk_texts(texts)
+        
+        if inspect.iscoroutinefunction(self.batch_embedding_function):
+            results = self._run_async(self._embed_chunks_async(chunks))
+        elif len(chunks) == 1 or self.max_concurrency == 1:
+            results = [self._embed_chunk(chunk) for chunk in chunks]
+        else:
+            workers = min(self.max_concurrency, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._embed_chunk, chunks))
+        
+        logger.debug(f"Embedded {len(texts)} texts in {len(chunks)} batches")
+        return [embedding for chunk_result in results for embedding in chunk_result]
+    
+    def _embed_texts(self, texts: List[str]) -> List[Union[List[float], np.ndarray]]:
+        """
+        Embed several texts, reusing cached vectors and embedding each distinct text once.
+        
+        Args:
+            texts: The texts to embed
+            
+        Returns:
+            One embedding per text, in order (a zero vector where embedding failed)
+        """
+        vectors: List[Any] = [None] * len(texts)
+        if self.cache is not None:
+            vectors = self.cache.get_many(texts)
+        
+        # Group the remaining positions by text so duplicates are embedded once
+        pending: Dict[str, List[int]] = {}
+        for position, (text, vector) in enumerate(zip(texts, vectors)):
+            if vector is None:
+                pending.setdefault(text, []).append(position)
+        
+        distinct = list(pending)
+        if self.batch_embedding_function is not None and distinct:
+            embeddings = self._embed_batched(distinct)
+        else:
+            embeddings = [self._embed_one(text) for text in distinct]
+        
+        computed_texts = []
+        computed_vectors = []
+        for text, embedding in zip(distinct, embeddings):
+            if embedding is None or len(embedding) == 0:
+                # Use a zero vector as fallback (never cached)
+                embedding = [0.0] * self.embedding_dim
+            else:
+                computed_texts.append(text)
+                computed_vectors.append(embedding)
+            
+            for position in pending[text]:
+                vectors[position] = embedding
+        
+        if self.cache is not None and computed_texts:
+            self.cache.put_many(computed_texts, computed_vectors)
+        
+        return vectors
+    
     def generate_embedding(self, memory: MemoryItem) -> List[float]:
         """
         Generate a vector embedding for a memory item.
@@ -79,16 +361,12 @@ class MemoryEmbedder:
         Returns:
             A vector embedding as a list of floats
         """
-        text = self.get_text_for_embedding(memory)
+        embedding = self._embed_texts([self.get_text_for_embedding(memory)])[0]
+        logger.debug(f"Generated embedding for memory {memory.id}")
         
-        try:
-            embedding = self.embedding_function(text)
-            logger.debug(f"Generated embedding for memory {memory.id}")
-            return embedding
-        except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            # Return a zero vector as fallback
-            return [0.0] * self.embedding_dim
+        if isinstance(embedding, np.ndarray):
+            return embedding.tolist()
+        return embedding
     
     def generate_embeddings(self, memories: List[MemoryItem]) -> Dict[str, List[float]]:
         """
@@ -100,11 +378,11 @@ class MemoryEmbedder:
         Returns:
             Dictionary mapping memory IDs to embeddings
         """
-        embeddings = {}
-        
-        for memory in memories:
-            embedding = self.generate_embedding(memory)
-            embeddings[memory.id] = embedding
+        texts = [self.get_text_for_embedding(memory) for memory in memories]
+        embeddings = {
+            memory.id: embedding
+            for memory, embedding in zip(memories, self._embed_texts(texts))
+        }
         
         logger.debug(f"Generated embeddings for {len(embeddings)} memories")
         return embeddings
@@ -136,7 +414,7 @@ class MemoryEmbedder:
         # Handle zero vectors
         if norm1 == 0 or norm2 == 0:
             return 0.0
-            
+        
         similarity = dot_product / (norm1 * norm2)
         
         # Ensure the result is between 0 and 1
@@ -144,6 +422,67 @@ class MemoryEmbedder:
         
         return similarity
     
+    def embed_query(self, query: Union[str, MemoryItem, List[float]]) -> List[float]:
+        """
+        Get the embedding for a similarity query (to search with it several times).
+        
+        Args:
+            query: Query string, memory item, or embedding vector
+            
+        Returns:
+            The query embedding
+        """
+        if isinstance(query, str):
+            return self._call_embedding_function(query)
+        elif isinstance(query, MemoryItem):
+            return self.generate_embedding(query)
+        return query
+    
+    def _rank_memories(
+        self,
+        query_embeddings: np.ndarray,
+        memories: List[MemoryItem],
+        top_k: int,
+        threshold: float
+    ) -> List[List[Tuple[MemoryItem, float]]]:
+        """
+        Rank memories against a batch of query embeddings.
+        
+        Args:
+            query_embeddings: 2-D array with one query embedding per row
+            memories: List of memory items to search through
+            top_k: Number of top results to return per query
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            One list of (memory, similarity) tuples per query
+        """
+        if not memories:
+            return [[] for _ in range(len(query_embeddings))]
+        
+        # Ensure all memories have a row in the embedding store
+        self.process_memories(memories)
+        rows = np.fromiter(
+            (self.store.row_of(memory.id) for memory in memories),
+            dtype=np.int64,
+            count=len(memories)
+        )
+        
+        queries = EmbeddingStore.normalize(query_embeddings)
+        if len(memories) * 4 < len(self.store):
+            # Small candidate set: only multiply against its own rows
+            scores = queries @ self.store.matrix[rows].T
+        else:
+            scores = (queries @ self.store.matrix.T)[:, rows]
+        
+        # Keep similarities in the [0, 1] range like calculate_similarity
+        np.clip(scores, 0.0, 1.0, out=scores)
+        
+        return [
+            [(memories[position], score) for position, score in EmbeddingStore.top_k(row_scores, top_k, threshold)]
+            for row_scores in scores
+        ]
+    
     def find_similar_memories(
         self,
         query: Union[str, MemoryItem, List[float]],
@@ -163,100 +502,305 @@ class MemoryEmbedder:
         Returns:
             List of (memory, similarity) tuples, sorted by similarity
         """
-        # Get the query embedding
-        if isinstance(query, str):
-            query_embedding = self.embedding_function(query)
-        elif isinstance(query, MemoryItem):
-            query_embedding = self.generate_embedding(query)
-        else:
-            query_embedding = query
-        
-        # Calculate similarities
-        results = []
+        query_embedding = np.asarray(self.embed_query(query), dtype=np.float32)
+        return self._rank_memories(query_embedding[np.newaxis, :], memories, top_k, threshold)[0]
+    
+    def find_similar_memories_batch(
+        self,
+        queries: List[Union[str, MemoryItem, List[float]]],
+        memories: List[MemoryItem],
+        top_k: int = 5,
+        threshold: float = 0.7
+    ) -> List[List[Tuple[MemoryItem, float]]]:
+        """
+        Find memories similar to each query of a batch with one matrix product.
         
-        for memory in memories:
-            # Generate embedding if not already present
-            if not hasattr(memory, 'embedding') or memory.embedding is None:
-                memory.embedding = self.generate_embedding(memory)
-            
-            # Calculate similarity
-            similarity = self.calculate_similarity(query_embedding, memory.embedding)
+        Args:
+            queries: Query strings, memory items, or embedding vectors
+            memories: List of memory items to search through
+            top_k: Number of top results to return per query
+            threshold: Minimum similarity threshold
             
-            # Add to results if above threshold
-            if similarity >= threshold:
-                results.append((memory, similarity))
+        Returns:
+            One list of (memory, similarity) tuples per query, sorted by similarity
+        """
+        if not queries:
+            return []
         
-        # Sort by similarity (highest first) and limit to top_k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        query_embeddings = np.asarray([self.embed_query(q) for q in queries], dtype=np.float32)
+        return self._rank_memories(query_embeddings, memories, top_k, threshold)
     
-    def process_memories(self, memories: List[MemoryItem]) -> None:
+    def process_memories(self, memories: List[MemoryItem], refresh: bool = False) -> None:
         """
         Process a batch of memories, generating embeddings for those without them.
         
         Args:
             memories: List of memory items to process
+            refresh: Re-embed every memory and replace its stored embedding
+                     (after its content changed)
         """
+        missing = [
+            memory for memory in memories
+            if refresh or not hasattr(memory, 'embedding') or memory.embedding is None
+        ]
+        if missing:
+            texts = [self.get_text_for_embedding(memory) for memory in missing]
+            for memory, embedding in zip(missing, self._embed_texts(texts)):
+                memory.embedding = embedding
+            logger.debug(f"Added embeddings to {len(missing)} memories")
+        
+        pending_ids = []
+        pending_embeddings = []
+        
         for memory in memories:
-            if not hasattr(memory, 'embedding') or memory.embedding is None:
-                memory.embedding = self.generate_embedding(memory)
-                logger.debug(f"Added embedding to memory {memory.id}")
+            if refresh or memory.id not in self.store:
+                pending_ids.append(memory.id)
+                pending_embeddings.append(memory.embedding)
+        
+        if pending_ids:
+            self.store.add_many(pending_ids, pending_embeddings)
+            if self.index is not self.store:
+                self.index.add_many(pending_ids, pending_embeddings)
+    
+    def remove_memory(self, memory_id: str) -> bool:
+        """
+        Drop the stored embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            True if an embedding was removed, False otherwise
+        """
+        if self.index is not self.store:
+            self.index.remove(memory_id)
+        return self.store.remove(memory_id)
+    
+    def clear_index(self) -> None:
+        """Drop every stored embedding, from both the embedding store and the index."""
+        if self.index is not self.store:
+            self.index.clear()
+        self.store.clear()
+    
+    def search(
+        self,
+        query: Union[str, MemoryItem, List[float]],
+        top_k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Search every processed memory through the configured index.
+        
+        Args:
+            query: Query string, memory item, or embedding vector
+            top_k: Number of top results to return
+            threshold: Optional minimum similarity
+            
+        Returns:
+            List of (memory_id, similarity) tuples, sorted by similarity
+        """
+        return self.index.search(self.embed_query(query), top_k=top_k, threshold=threshold)
+    
+    def enable_ann_index(self, min_size: int = 0, index: Optional[Any] = None) -> bool:
+        """
+        Switch search() from the exact embedding store to a nearest-neighbour index.
+        
+        Nothing changes if an index is already in use or fewer than
+        min_size memories have been processed, so this is cheap to call
+        before every search.
+        
+        Args:
+            min_size: Number of processed memories below which exact search is kept
+            index: The empty index to fill (an IVFIndex if not provided)
+            
+        Returns:
+            True if the index was switched, False otherwise
+        """
+        if self.index is not self.store or len(self.store) < min_size:
+            return False
+        
+        index = index if index is not None else IVFIndex(embedding_dim=self.embedding_dim)
+        index.add_many(self.store.ids, self.store.matrix)
+        self.index = index
+        logger.info(f"Switched semantic search to {type(index).__name__} over {len(self.store)} memories")
+        return True
+    
+    def save_index(self, path: Union[str, Path]) -> bool:
+        """
+        Persist the nearest-neighbour index if it supports it.
+        
+        Args:
+            path: Path to write the index to
+            
+        Returns:
+            True if the index was saved, False otherwise
+        """
+        if not hasattr(self.index, "save"):
+            return False
+        self.index.save(path)
+        return True
+    
+    def load_index(self, path: Union[str, Path]) -> bool:
+        """
+        Replace the nearest-neighbour index with one previously saved.
+        
+        The exact embedding store used for similarity ranking is replaced
+        too, with the loaded index's embeddings.
+        
+        Args:
+            path: Path to read the index from
+            
+        Returns:
+            True if the index was loaded, False otherwise
+        """
+        if not hasattr(self.index, "load") or not Path(path).exists():
+            return False
+        index = type(self.index).load(path)
+        if self.index is self.store:
+            self.store = self.index = index
+            return True
+        
+        ids, vectors = index.all_vectors()
+        self.store.clear()
+        self.store.add_many(ids, vectors)
+        self.index = index
+        return True
+    
+    def _embedding_matrix(self, memories: List[MemoryItem]) -> np.ndarray:
+        """
+        Get the normalized embeddings of memories as one matrix, embedding any that lack one.
+        
+        Args:
+            memories: The memories
+            
+        Returns:
+            A (len(memories), dim) float32 array
+        """
+        self.process_memories(memories)
+        rows = [self.store.row_of(memory.id) for memory in memories]
+        return self.store.matrix[rows]
+    
+    def fit_clusters(
+        self,
+        memories: List[MemoryItem],
+        num_clusters: int = 8,
+        seed: int = 0,
+        **options: Any
+    ) -> np.ndarray:
+        """
+        Cluster memories from scratch with mini-batch k-means.
+        
+        The fitted clusterer is kept, so later memories can be added with
+        partial_fit_clusters and described with summarize_clusters.
+        
+        Args:
+            memories: List of memory items to cluster
+            num_clusters: Number of clusters
+            seed: Random seed; the same seed and memories give the same clusters
+            **options: Further MiniBatchKMeans options (e.g. batch_size, max_iter)
+            
+        Returns:
+            The cluster of each memory
+        """
+        self.clusterer = MiniBatchKMeans(n_clusters=num_clusters, seed=seed, **options)
+        if not memories:
+            return np.empty(0, dtype=np.int64)
+        return self.clusterer.fit_predict(self._embedding_matrix(memories))
+    
+    def partial_fit_clusters(
+        self,
+        memories: List[MemoryItem],
+        num_clusters: int = 8,
+        seed: int = 0
+    ) -> np.ndarray:
+        """
+        Refine the clustering with new memories and get their clusters.
+        
+        Args:
+            memories: List of new memory items
+            num_clusters: Number of clusters, if no clustering exists yet
+            seed: Random seed, if no clustering exists yet
+            
+        Returns:
+            The cluster of each memory
+        """
+        if self.clusterer is None:
+            self.clusterer = MiniBatchKMeans(n_clusters=num_clusters, seed=seed)
+        if not memories:
+            return np.empty(0, dtype=np.int64)
+        
+        vectors = self._embedding_matrix(memories)
+        return self.clusterer.partial_fit(vectors).predict(vectors)
+    
+    def summarize_clusters(
+        self,
+        memories: List[MemoryItem],
+        labels: Optional[np.ndarray] = None,
+        top_n: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Describe the clusters formed by memories under the current clustering.
+        
+        Args:
+            memories: The memories to describe
+            labels: Their clusters, if already known
+            top_n: Number of representative memories per cluster
+            
+        Returns:
+            One dictionary per non-empty cluster, largest first, with the
+            cluster's "size", "centroid", "cohesion" (mean similarity to the
+            centroid), "importance" (mean importance of its memories) and
+            "representatives" (the memories closest to the centroid)
+        """
+        if self.clusterer is None or not self.clusterer.is_fitted or not memories:
+            return []
+        
+        positions = list(range(len(memories)))
+        summaries = self.clusterer.summarize(self._embedding_matrix(memories), positions, labels, top_n=len(memories))
+        
+        for summary in summaries:
+            members = summary.pop("representatives")
+            summary["importance"] = float(np.mean([memories[i].importance for i in members]))
+            summary["representatives"] = [memories[i] for i in members[:top_n]]
+        return summaries
     
     def create_memory_clusters(
         self,
         memories: List[MemoryItem],
         num_clusters: int = 5,
-        min_similarity: float = 0.7
+        min_similarity: Optional[float] = None,
+        seed: int = 0
     ) -> Dict[int, List[MemoryItem]]:
         """
         Cluster memories based on their embeddings.
         
+        Uses mini-batch k-means with k-means++ seeding, so the number of
+        clusters is fixed and the result is reproducible for a given seed.
+        
         Args:
             memories: List of memory items to cluster
-            num_clusters: Target number of clusters
-            min_similarity: Minimum similarity to assign to a cluster
+            num_clusters: Number of clusters
+            min_similarity: Optional minimum similarity to the cluster centroid;
+                           memories below it are returned under cluster -1
+            seed: Random seed
             
         Returns:
             Dictionary mapping cluster IDs to lists of memory items
         """
         if not memories:
             return {}
-            
-        # Ensure all memories have embeddings
-        self.process_memories(memories)
         
-        # Simple clustering algorithm (could be replaced with k-means or other approaches)
-        clusters = {}
-        remaining = memories.copy()
-        
-        # Start with random centers
-        import random
-        random.shuffle(remaining)
-        
-        centers = []
-        for i in range(min(num_clusters, len(remaining))):
-            center = remaining.pop(0)
-            centers.append(center)
-            clusters[i] = [center]
-        
-        # Assign remaining memories to closest cluster
-        for memory in remaining:
-            best_cluster = -1
-            best_similarity = min_similarity  # Must meet minimum similarity
-            
-            for i, center in enumerate(centers):
-                similarity = self.calculate_similarity(memory.embedding, center.embedding)
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_cluster = i
-            
-            if best_cluster >= 0:
-                clusters[best_cluster].append(memory)
-            else:
-                # Create a new cluster if no good match
-                new_cluster_id = len(clusters)
-                clusters[new_cluster_id] = [memory]
-                centers.append(memory)
+        vectors = self._embedding_matrix(memories)
+        clusterer = MiniBatchKMeans(n_clusters=num_clusters, seed=seed)
+        clusterer.fit(vectors)
+        labels, similarities = clusterer.predict(vectors, return_scores=True)
+        
+        if min_similarity is not None:
+            labels = np.where(similarities >= min_similarity, labels, -1)
+        
+        clusters: Dict[int, List[MemoryItem]] = {}
+        for memory, label in zip(memories, labels.tolist()):
+            clusters.setdefault(label, []).append(memory)
         
         logger.debug(f"Created {len(clusters)} memory clusters")
         return clusters
@@ -270,12 +814,13 @@ class Embedder:
     MemoryEmbedder class, using default settings suitable for most use cases.
     """
     
-    def __init__(self, embedding_dim: int = 768):
+    def __init__(self, embedding_dim: int = 768, index: Optional[Any] = None):
         """
         Initialize a new embedder with a default embedding function.
         
         Args:
             embedding_dim: Dimension of the embedding vectors
+            index: Optional nearest-neighbour index (e.g. an IVFIndex) for search()
         """
         # Create a simple default embedding function
         def default_embedding_function(text: str) -> List[float]:
@@ -303,7 +848,9 @@ class Embedder:
         # Initialize the full embedder with our default function
         self.embedder = MemoryEmbedder(
             embedding_function=default_embedding_function,
-            embedding_dim=embedding_dim
+            embedding_dim=embedding_dim,
+            index=index,
+            name="default-md5"
         )
         
         logger.info("Initialized Embedder with default embedding function")
@@ -340,11 +887,149 @@ class Embedder:
         results = self.embedder.find_similar_memories(query, memories, top_k=top_k)
         return [memory for memory, _ in results]
     
-    def process_memories(self, memories: List[MemoryItem]) -> None:
+    def process_memories(self, memories: List[MemoryItem], refresh: bool = False) -> None:
         """
         Process memories by adding embeddings to them.
         
         Args:
             memories: List of memory items to process
+            refresh: Re-embed memories whose content changed
+        """
+        self.embedder.process_memories(memories, refresh=refresh)
+    
+    def search(self, query: str, top_k: int = 5, threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Search every processed memory for the ones most similar to a query.
+        
+        Args:
+            query: Query string
+            top_k: Number of top results to return
+            threshold: Optional minimum similarity
+            
+        Returns:
+            List of (memory_id, similarity) tuples
+        """
+        return self.embedder.search(query, top_k=top_k, threshold=threshold)
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Get the embedding for a search query (to search with it several times).
+        
+        Args:
+            query: Query string
+            
+        Returns:
+            The query embedding
+        """
+        return self.embedder.embed_query(query)
+    
+    def enable_ann_index(self, min_size: int = 0, index: Optional[Any] = None) -> bool:
+        """
+        Switch search() to a nearest-neighbour index once enough memories are processed.
+        
+        Args:
+            min_size: Number of processed memories below which exact search is kept
+            index: The empty index to fill (an IVFIndex if not provided)
+            
+        Returns:
+            True if the index was switched, False otherwise
+        """
+        return self.embedder.enable_ann_index(min_size=min_size, index=index)
+    
+    def remove_memory(self, memory_id: str) -> bool:
+        """
+        Drop the embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            True if an embedding was removed, False otherwise
+        """
+        return self.embedder.remove_memory(memory_id)
+    
+    def clear_index(self) -> None:
+        """Drop the embeddings of every processed memory."""
+        self.embedder.clear_index()
+    
+    def save_index(self, path: Union[str, Path]) -> bool:
+        """
+        Persist the nearest-neighbour index if it supports it.
+        
+        Args:
+            path: Path to write the index to
+            
+        Returns:
+            True if the index was saved, False otherwise
+        """
+        return self.embedder.save_index(path)
+    
+    def load_index(self, path: Union[str, Path]) -> bool:
+        """
+        Load a previously saved nearest-neighbour index.
+        
+        Args:
+            path: Path to read the index from
+            
+        Returns:
+            True if the index was loaded, False otherwise
+        """
+        return self.embedder.load_index(path)
+    
+    def enable_cache(self, cache_dir: Union[str, Path]) -> Optional[EmbeddingCache]:
+        """
+        Attach a persistent embedding cache stored in a directory.
+        
+        Args:
+            cache_dir: Directory where the cache files are kept
+            
+        Returns:
+            The attached cache, or None without a model identity
+        """
+        return self.embedder.enable_cache(cache_dir)
+    
+    def fit_clusters(self, memories: List[MemoryItem], num_clusters: int = 8, seed: int = 0) -> np.ndarray:
+        """
+        Cluster memories from scratch.
+        
+        Args:
+            memories: List of memory items to cluster
+            num_clusters: Number of clusters
+            seed: Random seed
+            
+        Returns:
+            The cluster of each memory
+        """
+        return self.embedder.fit_clusters(memories, num_clusters=num_clusters, seed=seed)
+    
+    def partial_fit_clusters(self, memories: List[MemoryItem], num_clusters: int = 8) -> np.ndarray:
+        """
+        Refine the clustering with new memories.
+        
+        Args:
+            memories: List of new memory items
+            num_clusters: Number of clusters, if no clustering exists yet
+            
+        Returns:
+            The cluster of each memory
+        """
+        return self.embedder.partial_fit_clusters(memories, num_clusters=num_clusters)
+    
+    def summarize_clusters(
+        self,
+        memories: List[MemoryItem],
+        labels: Optional[np.ndarray] = None,
+        top_n: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Describe the clusters formed by memories.
+        
+        Args:
+            memories: The memories to describe
+            labels: Their clusters, if already known
+            top_n: Number of representative memories per cluster
+            
+        Returns:
+            One summary dictionary per non-empty cluster, largest first
         """
-        self.embedder.process_memories(memories) 
\ No newline at end of file
+        return self.embedder.summarize_clusters(memories, labels=labels, top_n=top_n)
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Embedding Cache Module
+
+This module provides a persistent, memory-mapped cache of embedding vectors
+keyed by content hash, so memories are not re-embedded after a restart and
+identical texts are only embedded once.
+"""
+
+import hashlib
+import logging
+import os
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Append-only on-disk cache of float32 embeddings keyed by content hash.
+    
+    Vectors live in a raw float32 file (one row per cached text) that is
+    memory-mapped read-only, so a warm start maps the file instead of
+    loading it. A sidecar file holds one content hash per line; the line
+    number is the row of the vector in the data file.
+    
+    Each cache file pair is scoped to one embedder identity and dimension,
+    so vectors from different models never mix.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        embedding_dim: int,
+        namespace: str
+    ):
+        """
+        Initialize (or reopen) an embedding cache.
+        
+        Args:
+            cache_dir: Directory where the cache files are kept
+            embedding_dim: Dimension of the cached vectors
+            namespace: Identity of the embedding model producing the vectors
+                       (e.g. "openai/text-embedding-3-small")
+            
+        Raises:
+            ValueError: If namespace is empty
+        """
+        if not namespace:
+            raise ValueError("An embedding cache needs the identity of the embedding model")
+        
+        self.cache_dir = Path(cache_dir)
+        self.embedding_dim = embedding_dim
+        self.namespace = namespace
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        scope = hashlib.sha1(f"{namespace}:{embedding_dim}".encode("utf-8")).hexdigest()[:16]
+        self.data_path = self.cache_dir / f"embeddings-{scope}-{embedding_dim}.f32"
+        self.keys_path = self.cache_dir / f"embeddings-{scope}-{embedding_dim}.keys"
+        
+        self._row_bytes = embedding_dim * np.dtype(np.float32).itemsize
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._map: Optional[np.memmap] = None
+        self._mapped_rows = 0
+        self._data_file = None
+        self._keys_file = None
+        self.hits = 0
+        self.misses = 0
+        
+        self._load()
+        
+        logger.info(
+            f"Initialized embedding cache at {self.data_path} "
+            f"({self._size} vectors, namespace={namespace})"
+        )
+    
+    def __len__(self) -> int:
+        """Get the number of cached vectors."""
+        return self._size
+    
+    def __contains__(self, text: str) -> bool:
+        """Check whether a vector is cached for a text."""
+        return self.key(text) in self._rows
+    
+    @staticmethod
+    def key(text: str) -> str:
+        """
+        Get the cache key of a text.
+        
+        Args:
+            text: The text being embedded
+            
+        Returns:
+            A hex content hash
+        """
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _load(self) -> None:
+        """Read the key sidecar and map the vector file."""
+        keys: List[str] = []
+        if self.keys_path.exists():
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                keys = f.read().split()
+        
+        data_rows = 0
+        if self.data_path.exists():
+            data_rows = os.path.getsize(self.data_path) // self._row_bytes
+        
+        # A crash between the two appends leaves the files out of step;
+        # only rows present in both are trusted and the tails are dropped
+        valid_rows = min(len(keys), data_rows)
+        if valid_rows < len(keys) or valid_rows < data_rows or (
+            self.data_path.exists() and os.path.getsize(self.data_path) != data_rows * self._row_bytes
+        ):
+            logger.warning(f"Truncating embedding cache {self.data_path} to {valid_rows} consistent rows")
+            with open(self.data_path, "ab") as f:
+                f.truncate(valid_rows * self._row_bytes)
+            with open(self.keys_path, "w", encoding="utf-8") as f:
+                f.write("".join(f"{k}\n" for k in keys[:valid_rows]))
+        
+        self._rows = {k: row for row, k in enumerate(keys[:valid_rows])}
+        self._size = valid_rows
+    
+    def _view(self) -> np.ndarray:
+        """Get a read-only mapped view covering every cached row."""
+        if self._map is None or self._mapped_rows < self._size:
+            if self._data_file is not None:
+                self._data_file.flush()
+            self._map = np.memmap(
+                self.data_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._size, self.embedding_dim)
+            )
+            self._mapped_rows = self._size
+        return self._map
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Get the cached vector of a text.
+        
+        Args:
+            text: The embedded text
+            
+        Returns:
+            A read-only view of the cached vector, or None on a miss
+        """
+        row = self._rows.get(self.key(text))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._view()[row]
+    
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Get the cached vectors of several texts.
+        
+        Args:
+            texts: The embedded texts
+            
+        Returns:
+            One read-only vector view (or None on a miss) per text
+        """
+        rows = [self._rows.get(self.key(text)) for text in texts]
+        found = sum(row is not None for row in rows)
+        self.hits += found
+        self.misses += len(rows) - found
+        if not found:
+            return [None] * len(rows)
+        
+        view = self._view()
+        return [None if row is None else view[row] for row in rows]
+    
+    def put(self, text: str, vector: Union[Sequence[float], np.ndarray]) -> None:
+        """
+        Cache the vector of a text.
+        
+        Args:
+            text: The embedded text
+            vector: Its embedding vector
+        """
+        self.put_many([text], [vector])
+    
+    def put_many(
+        self,
+        texts: Sequence[str],
+        vectors: Union[Sequence[Sequence[float]], np.ndarray]
+    ) -> None:
+        """
+        Cache the vectors of several texts with one append per file.
+        
+        Args:
+            texts: The embedded texts
+            vectors: One embedding vector per text
+        """
+        new_keys = []
+        new_vectors = []
+        for text, vector in zip(texts, vectors):
+            key = self.key(text)
+            if key in self._rows:
+                continue
+            vector = np.asarray(vector, dtype=np.float32)
+            if vector.shape != (self.embedding_dim,):
+                logger.warning(f"Not caching embedding with shape {vector.shape}")
+                continue
+            self._rows[key] = self._size + len(new_keys)
+            new_keys.append(key)
+            new_vectors.append(vector)
+        
+        if not new_keys:
+            return
+        
+        if self._data_file is None:
+            self._data_file = open(self.data_path, "ab")
+            self._keys_file = open(self.keys_path, "a", encoding="utf-8")
+        
+        # Vectors first, then keys, so a key never points at a missing row
+        self._data_file.write(np.stack(new_vectors).tobytes())
+        self._data_file.flush()
+        self._keys_file.write("".join(f"{k}\n" for k in new_keys))
+        self._keys_file.flush()
+        self._size += len(new_keys)
+    
+    def close(self) -> None:
+        """Flush and close the cache files."""
+        for f in (self._data_file, self._keys_file):
+            if f is not None:
+                f.close()
+        self._data_file = None
+        self._keys_file = None
+        self._map = None
+        self._mapped_rows = 0
+    
+    def __del__(self) -> None:
+        """Ensure the cache files are closed when the object is deleted."""
+        self.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        return {
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "namespace": self.namespace,
+            "path": str(self.data_path)
+        }
@@ -0,0 +1,341 @@
+"""
+Embedding Store Module
+
+This module provides a contiguous, vectorized store for memory embeddings,
+enabling similarity search over many memories with a single matrix product.
+"""
+
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+class EmbeddingStore:
+    """
+    Contiguous matrix of L2-normalized float32 embeddings keyed by memory ID.
+    
+    Rows are kept packed at the start of a preallocated matrix that grows in
+    amortized chunks, so cosine similarity against every stored embedding is
+    a single matrix-vector (or matrix-matrix) product.
+    """
+    
+    def __init__(
+        self,
+        embedding_dim: Optional[int] = None,
+        initial_capacity: int = 1024,
+        growth_factor: float = 2.0
+    ):
+        """
+        Initialize a new embedding store.
+        
+        Args:
+            embedding_dim: Dimension of the embedding vectors (inferred from the
+                          first vector added if not provided)
+            initial_capacity: Number of rows to preallocate
+            growth_factor: Factor by which capacity grows when the store is full
+        """
+        self.embedding_dim = embedding_dim
+        self.growth_factor = max(1.1, growth_factor)
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        
+        if embedding_dim is not None:
+            self._matrix = np.zeros((self._initial_capacity, embedding_dim), dtype=np.float32)
+    
+    def __len__(self) -> int:
+        """Get the number of stored embeddings."""
+        return self._size
+    
+    def __contains__(self, memory_id: str) -> bool:
+        """Check whether an embedding is stored for a memory ID."""
+        return memory_id in self._rows
+    
+    @property
+    def ids(self) -> List[str]:
+        """Memory IDs in row order."""
+        return list(self._ids)
+    
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the live (normalized) embedding rows."""
+        if self._matrix is None:
+            return np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+        return self._matrix[:self._size]
+    
+    def row_of(self, memory_id: str) -> Optional[int]:
+        """
+        Get the matrix row holding a memory's embedding.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            The row index, or None if the memory has no stored embedding
+        """
+        return self._rows.get(memory_id)
+    
+    def id_at(self, row: int) -> str:
+        """
+        Get the memory ID stored at a matrix row.
+        
+        Args:
+            row: The row index
+            
+        Returns:
+            The memory ID
+        """
+        return self._ids[row]
+    
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize vectors along the last axis (zero vectors stay zero).
+        
+        Args:
+            vectors: A 1-D vector or 2-D matrix of vectors
+            
+        Returns:
+            A float32 array of unit-length vectors
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def _ensure_matrix(self, dim: int) -> None:
+        """Allocate the matrix on first use and validate vector dimensions."""
+        if self.embedding_dim is None:
+            self.embedding_dim = dim
+        
+        if dim != self.embedding_dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: expected {self.embedding_dim}, got {dim}"
+            )
+        
+        if self._matrix is None:
+            self._matrix = np.zeros((self._initial_capacity, dim), dtype=np.float32)
+    
+    def _reserve(self, extra_rows: int) -> None:
+        """Grow the matrix so that extra_rows more embeddings fit."""
+        required = self._size + extra_rows
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        
+        new_capacity = capacity
+        while new_capacity < required:
+            new_capacity = int(new_capacity * self.growth_factor) + 1
+        
+        grown = np.zeros((new_capacity, self.embedding_dim), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        logger.debug(f"Grew embedding store capacity from {capacity} to {new_capacity}")
+    
+    def add(self, memory_id: str, embedding: VectorLike) -> int:
+        """
+        Add or replace the embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            embedding: The embedding vector
+            
+        Returns:
+            The row index of the stored embedding
+        """
+        return self.add_many([memory_id], [embedding])[0]
+    
+    def add_many(self, memory_ids: Sequence[str], embeddings: Union[Sequence[VectorLike], np.ndarray]) -> List[int]:
+        """
+        Add or replace the embeddings of several memories at once.
+        
+        Args:
+            memory_ids: The IDs of the memories
+            embeddings: One embedding per memory ID (list of vectors or 2-D array)
+            
+        Returns:
+            The row index of each stored embedding
+        """
+        if len(memory_ids) == 0:
+            return []
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(memory_ids):
+            raise ValueError("Expected one embedding vector per memory ID")
+        
+        self._ensure_matrix(vectors.shape[1])
+        vectors = self.normalize(vectors)
+        
+        new_ids = [memory_id for memory_id in dict.fromkeys(memory_ids) if memory_id not in self._rows]
+        self._reserve(len(new_ids))
+        
+        for memory_id in new_ids:
+            self._rows[memory_id] = self._size
+            self._ids.append(memory_id)
+            self._size += 1
+        
+        rows = [self._rows[memory_id] for memory_id in memory_ids]
+        self._matrix[rows] = vectors
+        return rows
+    
+    def get(self, memory_id: str) -> Optional[np.ndarray]:
+        """
+        Get the normalized embedding of a memory.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            A copy of the embedding, or None if not stored
+        """
+        row = self._rows.get(memory_id)
+        if row is None:
+            return None
+        return self._matrix[row].copy()
+    
+    def remove(self, memory_id: str) -> bool:
+        """
+        Remove the embedding of a memory.
+        
+        The last row is moved into the freed slot, so removal is O(1) but
+        does not preserve row order.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            True if an embedding was removed, False if none was stored
+        """
+        row = self._rows.pop(memory_id, None)
+        if row is None:
+            return False
+        
+        last = self._size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        
+        self._ids.pop()
+        self._matrix[last] = 0.0
+        self._size -= 1
+        return True
+    
+    def clear(self) -> None:
+        """Remove all stored embeddings (capacity is kept)."""
+        if self._matrix is not None:
+            self._matrix[:self._size] = 0.0
+        self._size = 0
+        self._ids.clear()
+        self._rows.clear()
+    
+    def scores(self, queries: Union[VectorLike, np.ndarray]) -> np.ndarray:
+        """
+        Compute cosine similarity between queries and every stored embedding.
+        
+        Args:
+            queries: A single query vector or a 2-D matrix of query vectors
+            
+        Returns:
+            A (n,) array for a single query, or a (batch, n) array for a batch
+        """
+        queries = self.normalize(queries)
+        if self._size == 0:
+            return np.zeros(queries.shape[:-1] + (0,), dtype=np.float32)
+        return queries @ self.matrix.T
+    
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int, threshold: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Select the top-k positions of a score vector without a full sort.
+        
+        Ties are broken by position, matching a stable descending sort.
+        
+        Args:
+            scores: 1-D array of scores
+            k: Number of results to keep
+            threshold: Optional minimum score
+            
+        Returns:
+            List of (position, score) tuples, highest score first
+        """
+        if k <= 0 or scores.size == 0:
+            return []
+        
+        candidates = np.arange(scores.size)
+        if threshold is not None:
+            candidates = np.flatnonzero(scores >= threshold)
+        
+        if candidates.size > k:
+            kth = np.argpartition(-scores[candidates], k - 1)[:k]
+            cutoff = scores[candidates[kth]].min()
+            # Keep every candidate tied with the cutoff so ordering stays stable
+            candidates = candidates[scores[candidates] >= cutoff]
+        
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        selected = candidates[order]
+        return [(int(position), float(scores[position])) for position in selected]
+    
+    def search(
+        self,
+        query: VectorLike,
+        top_k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the stored embeddings most similar to a query.
+        
+        Args:
+            query: The query vector
+            top_k: Number of results to return
+            threshold: Optional minimum cosine similarity
+            
+        Returns:
+            List of (memory_id, similarity) tuples, most similar first
+        """
+        return self.search_batch([query], top_k=top_k, threshold=threshold)[0]
+    
+    def search_batch(
+        self,
+        queries: Union[Sequence[VectorLike], np.ndarray],
+        top_k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Find the most similar stored embeddings for a batch of queries.
+        
+        Args:
+            queries: Query vectors, one per row
+            top_k: Number of results to return per query
+            threshold: Optional minimum cosine similarity
+            
+        Returns:
+            One list of (memory_id, similarity) tuples per query
+        """
+        scores = self.scores(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        return [
+            [(self._ids[row], score) for row, score in self.top_k(row_scores, top_k, threshold)]
+            for row_scores in scores
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the store.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        return {
+            "size": self._size,
+            "capacity": capacity,
+            "embedding_dim": self.embedding_dim,
+            "matrix_bytes": 0 if self._matrix is None else int(self._matrix.nbytes)
+        }
@@ -0,0 +1,558 @@
+"""
+Extractive Summarization Module
+
+This module provides an extractive summarizer for memories, written in
+pure NumPy: sentences are turned into a sparse TF-IDF matrix, scored by
+centroid similarity or TextRank, and picked with maximal marginal
+relevance (MMR) so the summary does not repeat itself.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.memory_item import MemoryItem
+from ..storage.text_index import content_to_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries: end punctuation followed by a capitalized word, or line breaks
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+(?=[\"'¿¡(\[]?[A-ZÀ-Þ0-9])|\s*\n\s*")
+
+_METHODS = ("centroid", "textrank")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split a text into sentences.
+    
+    Args:
+        text: The text to split
+        
+    Returns:
+        The non-empty sentences, in order
+    """
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+class _SentenceMatrix:
+    """
+    Sparse TF-IDF matrix of the sentences of a set of memories (CSR layout).
+    
+    Row i holds the L2-normalized TF-IDF weights of sentence i in
+    data[indptr[i]:indptr[i + 1]], over the column IDs in the same slice of
+    indices. Columns only cover the terms these sentences use: column j is
+    the vocabulary term terms[j].
+    """
+    
+    __slots__ = ("sentences", "owners", "indptr", "indices", "terms", "data", "idf", "rows")
+    
+    def __init__(
+        self,
+        sentences: List[str],
+        owners: np.ndarray,
+        lengths: np.ndarray,
+        term_ids: np.ndarray,
+        counts: np.ndarray
+    ):
+        self.sentences = sentences
+        self.owners = owners
+        self.indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.terms, indices = np.unique(term_ids, return_inverse=True)
+        self.indices = indices.astype(np.int64, copy=False)
+        self.rows = np.repeat(np.arange(len(lengths)), lengths)
+        
+        # Smoothed IDF over the sentences and sublinear TF
+        df = np.bincount(self.indices, minlength=len(self.terms))
+        self.idf = (np.log((1.0 + len(lengths)) / (1.0 + df)) + 1.0).astype(np.float32)
+        data = (1.0 + np.log(counts.astype(np.float32))) * self.idf[indices]
+        norms = np.sqrt(np.add.reduceat(data * data, self.indptr[:-1]))
+        self.data = data / np.repeat(norms, lengths)
+    
+    def __len__(self) -> int:
+        return len(self.sentences)
+    
+    def column_of(self, term_id: int) -> Optional[int]:
+        """Get the column of a vocabulary term, or None if no sentence uses it."""
+        column = int(np.searchsorted(self.terms, term_id))
+        if column < len(self.terms) and self.terms[column] == term_id:
+            return column
+        return None
+    
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Similarity of every sentence to a dense column vector."""
+        return np.add.reduceat(self.data * vector[self.indices], self.indptr[:-1])
+    
+    def dense_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Get some rows as a dense matrix over the terms they use."""
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        terms, columns = np.unique(self.indices[positions], return_inverse=True)
+        matrix = np.zeros((len(rows), len(terms)), dtype=np.float32)
+        matrix[np.repeat(np.arange(len(rows)), lengths), columns] = self.data[positions]
+        return matrix
+
+
+class ExtractiveSummarizer:
+    """
+    Extractive summarizer over the sentences of memories.
+    
+    Each memory is split into sentences and tokenized once; the term
+    counts of its sentences are cached per memory (and invalidated when
+    its content changes), so summarizing the same memories again only
+    costs the vectorized scoring. Terms are dropped from the vocabulary
+    once no cached memory uses them, and their IDs are reused. Sentences are scored either by their
+    similarity to the TF-IDF centroid of all sentences (optionally blended
+    with their similarity to a topic) or by TextRank over a sparse
+    sentence-similarity graph, then picked with MMR.
+    """
+    
+    def __init__(
+        self,
+        method: str = "centroid",
+        mmr_lambda: float = 0.7,
+        importance_weight: float = 0.5,
+        cache_size: int = 10000,
+        damping: float = 0.85,
+        max_df: float = 0.1,
+        max_graph_pairs: int = 500000,
+        pool_size: int = 64
+    ):
+        """
+        Initialize a new extractive summarizer.
+        
+        Args:
+            method: Default scoring method, "centroid" or "textrank"
+            mmr_lambda: Trade-off between relevance (1.0) and diversity (0.0) when picking sentences
+            importance_weight: How much a memory's importance boosts its sentences
+            cache_size: Maximum number of memories whose sentences are cached
+            damping: TextRank damping factor
+            max_df: Terms in more than this fraction of the sentences do not link
+                   sentences in the TextRank graph
+            max_graph_pairs: Upper bound on the term co-occurrences used to build the graph
+            pool_size: Number of best-scored sentences MMR picks from
+        """
+        if method not in _METHODS:
+            raise ValueError(f"Invalid summarization method: {method}")
+        
+        self.method = method
+        self.mmr_lambda = mmr_lambda
+        self.importance_weight = importance_weight
+        self.cache_size = max(1, cache_size)
+        self.damping = damping
+        self.max_df = max_df
+        self.max_graph_pairs = max_graph_pairs
+        self.pool_size = max(1, pool_size)
+        
+        # Term -> ID, shared by every cached memory
+        self._vocabulary: Dict[str, int] = {}
+        # ID -> term (None once freed), cached memories using each ID, and freed IDs
+        self._terms: List[Optional[str]] = []
+        self._term_refs: List[int] = []
+        self._free_ids: List[int] = []
+        # Content text -> (sentences, nnz per sentence, term IDs, term counts)
+        self._cache: "OrderedDict[Any, Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+    
+    def _analyze(self, content: Any) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the sentences of a memory's content and their term counts, from the cache if possible.
+        
+        Entries are keyed by the content itself, so an edited memory is
+        analyzed again and memories with the same content share an entry.
+        The cache is not trimmed here (see _evict), so the term IDs of the
+        memories being summarized cannot be freed and reused meanwhile.
+        
+        Args:
+            content: The memory content
+            
+        Returns:
+            (sentences, nnz per sentence, term IDs, term counts); sentences
+            without any word are left out
+        """
+        text = content_to_text(content)
+        structured = not isinstance(content, str)
+        key = ("structured", text) if structured else text
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+        
+        self._stats["misses"] += 1
+        # Structured content is kept whole rather than split on its punctuation
+        candidates = [text] if structured else split_sentences(text)
+        vocabulary = self._vocabulary
+        sentences, lengths, term_ids, term_counts = [], [], [], []
+        for sentence in candidates:
+            counts: Dict[int, int] = {}
+            for token in tokenize(sentence):
+                term_id = vocabulary.get(token)
+                if term_id is None:
+                    term_id = self._new_term(token)
+                counts[term_id] = counts.get(term_id, 0) + 1
+            if counts:
+                sentences.append(sentence)
+                lengths.append(len(counts))
+                term_ids.extend(counts)
+                term_counts.extend(counts.values())
+        
+        entry = (
+            sentences,
+            np.array(lengths, dtype=np.int64),
+            np.array(term_ids, dtype=np.int64),
+            np.array(term_counts, dtype=np.int32)
+        )
+        self._cache[key] = entry
+        for term_id in np.unique(entry[2]):
+            self._term_refs[term_id] += 1
+        return entry
+    
+    def _new_term(self, token: str) -> int:
+        """Add a term to the vocabulary, reusing a freed ID if there is one."""
+        if self._free_ids:
+            term_id = self._free_ids.pop()
+            self._terms[term_id] = token
+        else:
+            term_id = len(self._terms)
+            self._terms.append(token)
+            self._term_refs.append(0)
+        self._vocabulary[token] = term_id
+        return term_id
+    
+    def _evict(self) -> None:
+        """Trim the cache to cache_size, freeing the terms no cached memory uses anymore."""
+        while len(self._cache) > self.cache_size:
+            _, (_, _, term_ids, _) = self._cache.popitem(last=False)
+            for term_id in np.unique(term_ids).tolist():
+                self._term_refs[term_id] -= 1
+                if not self._term_refs[term_id]:
+                    del self._vocabulary[self._terms[term_id]]
+                    self._terms[term_id] = None
+                    self._free_ids.append(term_id)
+    
+    def _build_matrix(self, memories: Sequence[MemoryItem]) -> Optional[_SentenceMatrix]:
+        """Build the TF-IDF matrix of the sentences of some memories (caller holds the lock and evicts after)."""
+        sentences: List[str] = []
+        positions, sentence_counts, lengths, indices, counts = [], [], [], [], []
+        for position, memory in enumerate(memories):
+            memory_sentences, memory_lengths, memory_indices, memory_counts = self._analyze(memory.content)
+            if not memory_sentences:
+                continue
+            sentences.extend(memory_sentences)
+            positions.append(position)
+            sentence_counts.append(len(memory_sentences))
+            lengths.append(memory_lengths)
+            indices.append(memory_indices)
+            counts.append(memory_counts)
+        
+        if not sentences:
+            return None
+        return _SentenceMatrix(
+            sentences,
+            np.repeat(np.array(positions, dtype=np.int64), sentence_counts),
+            np.concatenate(lengths),
+            np.concatenate(indices),
+            np.concatenate(counts)
+        )
+    
+    def _topic_vector(self, matrix: _SentenceMatrix, topic: str) -> Optional[np.ndarray]:
+        """Get the normalized TF-IDF vector of a topic, or None if it has no known term."""
+        vector = np.zeros(len(matrix.idf), dtype=np.float32)
+        for token in tokenize(topic):
+            term_id = self._vocabulary.get(token)
+            column = matrix.column_of(term_id) if term_id is not None else None
+            if column is not None:
+                vector[column] += matrix.idf[column]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def _centroid_scores(self, matrix: _SentenceMatrix) -> np.ndarray:
+        """Score every sentence by its cosine similarity to the centroid of all sentences."""
+        centroid = np.bincount(matrix.indices, weights=matrix.data, minlength=len(matrix.idf))
+        norm = np.linalg.norm(centroid)
+        return matrix.dot(centroid / norm) if norm > 0 else np.zeros(len(matrix))
+    
+    def _similarity_graph(self, matrix: _SentenceMatrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the sparse cosine-similarity graph of the sentences.
+        
+        Similarities are accumulated term by term over the postings of the
+        terms shared by at most max_df of the sentences, rarest terms first,
+        until max_graph_pairs co-occurrences have been used.
+        
+        Returns:
+            (sources, targets, weights) of the edges, one per shared term
+        """
+        n = len(matrix)
+        order = np.argsort(matrix.indices, kind="stable")
+        terms = matrix.indices[order]
+        rows = matrix.rows[order]
+        weights = matrix.data[order]
+        
+        starts = np.flatnonzero(np.r_[True, terms[1:] != terms[:-1]])
+        sizes = np.diff(np.r_[starts, len(terms)])
+        # Terms in a single sentence link nothing; very common ones link everything
+        keep = (sizes >= 2) & (sizes <= max(2, int(self.max_df * n)))
+        starts, sizes = starts[keep], sizes[keep]
+        by_size = np.argsort(sizes, kind="stable")
+        starts, sizes = starts[by_size], sizes[by_size]
+        budget = np.searchsorted(np.cumsum(sizes * sizes), self.max_graph_pairs, side="right")
+        starts, sizes = starts[:budget], sizes[:budget]
+        if not len(sizes):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        
+        # Every ordered pair of postings of each term, without Python loops
+        entry_group = np.repeat(np.arange(len(sizes)), sizes)
+        entries = np.repeat(starts, sizes) + (np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes))
+        left = np.repeat(entries, sizes[entry_group])
+        block_starts = np.cumsum(sizes[entry_group]) - sizes[entry_group]
+        offsets = np.arange(len(left)) - np.repeat(block_starts, sizes[entry_group])
+        right = np.repeat(starts[entry_group], sizes[entry_group]) + offsets
+        
+        sources, targets = rows[left], rows[right]
+        distinct = sources != targets
+        sources, targets = sources[distinct], targets[distinct]
+        products = (weights[left] * weights[right])[distinct]
+        
+        # Pairs sharing several terms stay as parallel edges; their weights add up
+        # in the bincounts of the power iteration, so they are never merged
+        return sources, targets, products
+    
+    def _textrank_scores(self, matrix: _SentenceMatrix, tol: float = 1e-5, max_iter: int = 100) -> np.ndarray:
+        """Score every sentence with TextRank (weighted PageRank) on the similarity graph."""
+        n = len(matrix)
+        sources, targets, weights = self._similarity_graph(matrix)
+        out_weight = np.bincount(sources, weights=weights, minlength=n)
+        dangling = out_weight == 0
+        transition = weights / np.where(dangling, 1.0, out_weight)[sources]
+        
+        scores = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(targets, weights=transition * scores[sources], minlength=n).astype(np.float64)
+            # The rank of sentences without links is spread evenly
+            spread += scores[dangling].sum() / n
+            updated = (1.0 - self.damping) / n + self.damping * spread
+            if np.abs(updated - scores).sum() < tol:
+                scores = updated
+                break
+            scores = updated
+        return scores
+    
+    def _mmr(
+        self,
+        matrix: _SentenceMatrix,
+        scores: np.ndarray,
+        max_length: int,
+        max_sentences: Optional[int]
+    ) -> List[int]:
+        """
+        Pick sentences by maximal marginal relevance within a length budget.
+        
+        Only the best-scored sentences with a positive score are considered
+        (pool_size of them, or four times as many as are expected to fit),
+        so the pairwise similarities stay small and dense.
+        
+        Returns:
+            The indices of the picked sentences, in the order they were picked
+        """
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        
+        limit = max_sentences or len(candidates)
+        if max_sentences is None:
+            sample = candidates[np.argsort(-scores[candidates], kind="stable")[:self.pool_size]]
+            mean_length = np.mean([len(matrix.sentences[i]) for i in sample])
+            expected = int(np.ceil(max_length / max(mean_length, 1.0)))
+        else:
+            expected = max_sentences
+        pool_size = min(len(candidates), max(self.pool_size, 4 * expected))
+        if pool_size < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], pool_size - 1)[:pool_size]]
+        pool = candidates[np.argsort(-scores[candidates], kind="stable")]
+        lengths = np.fromiter((len(matrix.sentences[i]) for i in pool), dtype=np.int64, count=len(pool))
+        
+        top = scores[pool].max()
+        relevance = scores[pool] / top if top > 0 else scores[pool]
+        vectors = matrix.dense_rows(pool)
+        similarity = vectors @ vectors.T
+        
+        picked: List[int] = []
+        redundancy = np.zeros(len(pool))
+        available = lengths <= max_length
+        remaining = max_length
+        while len(picked) < limit and available.any():
+            gain = np.where(available, self.mmr_lambda * relevance - (1 - self.mmr_lambda) * redundancy, -np.inf)
+            best = int(np.argmax(gain))
+            picked.append(int(pool[best]))
+            remaining -= lengths[best] + (1 if len(picked) > 1 else 0)
+            # Drop what no longer fits, counting the separator before it
+            available &= lengths + 1 <= remaining
+            available[best] = False
+            np.maximum(redundancy, similarity[best], out=redundancy)
+        
+        # Nothing fits whole: keep the best sentence, to be truncated by the caller
+        return picked or [int(pool[0])]
+    
+    def _rank(
+        self,
+        memories: Sequence[MemoryItem],
+        topic: Optional[str],
+        method: Optional[str],
+        topic_weight: float,
+        boost: Optional[Sequence[float]] = None
+    ) -> Tuple[Optional[_SentenceMatrix], Optional[np.ndarray]]:
+        """Build the sentence matrix of some memories and score its sentences (see rank_sentences)."""
+        method = method or self.method
+        if method not in _METHODS:
+            raise ValueError(f"Invalid summarization method: {method}")
+        
+        with self._lock:
+            try:
+                matrix = self._build_matrix(memories)
+                if matrix is None:
+                    return None, None
+                # Topic terms are looked up before their IDs can be freed
+                topic_vector = self._topic_vector(matrix, topic) if topic else None
+            finally:
+                self._evict()
+            
+            scores = self._textrank_scores(matrix) if method == "textrank" else self._centroid_scores(matrix)
+            top = scores.max()
+            if top > 0:
+                scores = scores / top
+            
+            if topic:
+                relevance = matrix.dot(topic_vector) if topic_vector is not None else np.zeros(len(matrix))
+                on_topic = relevance > 0
+                if boost is not None:
+                    on_topic |= np.asarray(boost, dtype=np.float64)[matrix.owners] > 1.0
+                scores = np.where(on_topic, topic_weight * relevance + (1 - topic_weight) * scores, 0.0)
+        
+        if self.importance_weight:
+            importance = np.array([memory.importance for memory in memories], dtype=np.float64)
+            scores = scores * (1.0 + self.importance_weight * importance[matrix.owners])
+        if boost is not None:
+            scores = scores * np.asarray(boost, dtype=np.float64)[matrix.owners]
+        return matrix, scores
+    
+    def rank_sentences(
+        self,
+        memories: Sequence[MemoryItem],
+        topic: Optional[str] = None,
+        method: Optional[str] = None,
+        topic_weight: float = 0.7,
+        boost: Optional[Sequence[float]] = None
+    ) -> Optional[Tuple[List[str], np.ndarray, np.ndarray]]:
+        """
+        Score every sentence of some memories.
+        
+        Args:
+            memories: The memories
+            topic: Optional topic the sentences should be about; sentences
+                  sharing no term with it score 0
+            method: "centroid" or "textrank" (defaults to the summarizer's method)
+            topic_weight: Share of the score given to similarity with the topic
+            boost: Optional score multiplier per memory; with a topic, sentences
+                  of memories boosted above 1 are kept even if they share no
+                  term with it (e.g. memories tagged with the topic)
+                  
+        Returns:
+            (sentences, scores, owners) where owners[i] is the position in
+            memories of the memory sentence i comes from, or None if the
+            memories have no text
+        """
+        matrix, scores = self._rank(memories, topic, method, topic_weight, boost)
+        if matrix is None:
+            return None
+        return matrix.sentences, scores, matrix.owners
+    
+    def select(
+        self,
+        memories: Sequence[MemoryItem],
+        max_length: int = 500,
+        topic: Optional[str] = None,
+        method: Optional[str] = None,
+        max_sentences: Optional[int] = None,
+        boost: Optional[Sequence[float]] = None
+    ) -> List[Tuple[str, int, float]]:
+        """
+        Pick the sentences that best summarize some memories.
+        
+        Args:
+            memories: The memories to summarize
+            max_length: Maximum total length of the picked sentences (one
+                       separator character between sentences included)
+            topic: Optional topic to focus on
+            method: "centroid" or "textrank" (defaults to the summarizer's method)
+            max_sentences: Optional maximum number of sentences
+            boost: Optional score multiplier per memory (see rank_sentences)
+            
+        Returns:
+            (sentence, memory position, score) tuples in reading order: by
+            memory position, then by position within the memory
+        """
+        matrix, scores = self._rank(memories, topic, method, 0.7, boost)
+        if matrix is None:
+            return []
+        
+        picked = sorted(self._mmr(matrix, scores, max_length, max_sentences))
+        return [(matrix.sentences[i], int(matrix.owners[i]), float(scores[i])) for i in picked]
+    
+    def summarize(
+        self,
+        memories: Sequence[MemoryItem],
+        max_length: int = 500,
+        topic: Optional[str] = None,
+        method: Optional[str] = None,
+        separator: str = " "
+    ) -> str:
+        """
+        Summarize some memories with their most representative sentences.
+        
+        Args:
+            memories: The memories to summarize
+            max_length: Maximum length of the summary
+            topic: Optional topic to focus on
+            method: "centroid" or "textrank" (defaults to the summarizer's method)
+            separator: String placed between sentences
+            
+        Returns:
+            The summary (empty if the memories have no text or none matches the topic)
+        """
+        picked = self.select(memories, max_length=max_length, topic=topic, method=method)
+        summary = separator.join(sentence for sentence, _, _ in picked)
+        return summary if len(summary) <= max_length else summary[:max_length - 3] + "..."
+    
+    def clear_cache(self) -> None:
+        """Forget the cached sentences and vocabulary."""
+        with self._lock:
+            self._cache.clear()
+            self._vocabulary.clear()
+            self._terms.clear()
+            self._term_refs.clear()
+            self._free_ids.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the summarizer.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            return {
+                "method": self.method,
+                "cached_memories": len(self._cache),
+                "vocabulary_size": len(self._vocabulary),
+                **self._stats
+            }
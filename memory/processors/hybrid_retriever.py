@@ -0,0 +1,215 @@
+"""
+Hybrid Retriever Module
+
+This module provides hybrid memory retrieval that combines lexical (BM25)
+and vector similarity search with reciprocal rank fusion, boosted by
+memory importance and recency.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple
+
+from ..core.memory_item import MemoryItem
+
+logger = logging.getLogger(__name__)
+
+
+class HybridRetriever:
+    """
+    Hybrid lexical + vector retriever over a memory storage.
+    
+    Both retrievers run concurrently over their own indexes (the storage's
+    full-text index and the embedder's nearest-neighbour index). Their
+    rankings are fused with weighted reciprocal rank fusion:
+    
+        rrf(m) = sum_i weight_i / (rrf_k + rank_i(m))
+        
+    and the fused score is boosted by the memory's importance and an
+    exponential recency decay:
+    
+        score(m) = rrf(m) * (1 + importance_weight * importance
+                               + recency_weight * 0.5 ** (age / half_life))
+    """
+    
+    def __init__(
+        self,
+        storage: Any,
+        embedder: Optional[Any] = None,
+        rrf_k: int = 60,
+        lexical_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        importance_weight: float = 0.3,
+        recency_weight: float = 0.2,
+        recency_half_life_hours: float = 72.0,
+        candidate_multiplier: int = 4,
+        min_candidates: int = 50
+    ):
+        """
+        Initialize a new hybrid retriever.
+        
+        Args:
+            storage: Memory storage; lexical retrieval uses its search_text() if present
+            embedder: Optional embedder; vector retrieval uses its search() if present
+            rrf_k: Rank offset of reciprocal rank fusion (damps the top ranks)
+            lexical_weight: Weight of the lexical ranking in the fusion
+            vector_weight: Weight of the vector ranking in the fusion
+            importance_weight: Boost given to a memory with importance 1.0
+            recency_weight: Boost given to a memory created just now
+            recency_half_life_hours: Age at which the recency boost halves
+            candidate_multiplier: Candidates fetched per retriever, as a multiple of the limit
+            min_candidates: Minimum number of candidates fetched per retriever
+        """
+        self.storage = storage
+        self.embedder = embedder
+        self.rrf_k = rrf_k
+        self.lexical_weight = lexical_weight
+        self.vector_weight = vector_weight
+        self.importance_weight = importance_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life_hours = recency_half_life_hours
+        self.candidate_multiplier = max(1, candidate_multiplier)
+        self.min_candidates = max(1, min_candidates)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        logger.info(
+            f"Initialized hybrid retriever (lexical={self.has_lexical}, vector={self.has_vector}, rrf_k={rrf_k})"
+        )
+    
+    @property
+    def has_lexical(self) -> bool:
+        """Whether the storage supports lexical retrieval."""
+        return hasattr(self.storage, "search_text")
+    
+    @property
+    def has_vector(self) -> bool:
+        """Whether an embedder is available for vector retrieval."""
+        return self.embedder is not None and hasattr(self.embedder, "search")
+    
+    def _lexical(
+        self,
+        query: str,
+        count: Optional[int],
+        candidate_ids: Optional[Set[str]]
+    ) -> List[Tuple[MemoryItem, float]]:
+        """Rank memories by BM25 (any query word may match)."""
+        return self.storage.search_text(query, limit=count, match_all=False, candidate_ids=candidate_ids)
+    
+    def _vector(self, query: str, count: int, threshold: Optional[float]) -> List[Tuple[MemoryItem, float]]:
+        """Rank memories by embedding similarity."""
+        results = []
+        for memory_id, similarity in self.embedder.search(query, top_k=count, threshold=threshold):
+            memory = self.storage.retrieve(memory_id)
+            if memory is not None:
+                results.append((memory, similarity))
+        return results
+    
+    def _boost(self, memory: MemoryItem, now: float) -> float:
+        """Get the importance/recency multiplier of a memory."""
+        age_hours = max(0.0, (now - memory.created_timestamp) / 3600.0)
+        recency = 0.5 ** (age_hours / self.recency_half_life_hours) if self.recency_half_life_hours > 0 else 0.0
+        return 1.0 + self.importance_weight * memory.importance + self.recency_weight * recency
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filter_fn: Optional[Callable[[MemoryItem], bool]] = None,
+        candidate_ids: Optional[Set[str]] = None,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Retrieve the memories most relevant to a query in a single pass.
+        
+        Args:
+            query: The free-text query
+            limit: Maximum number of results
+            filter_fn: Optional predicate every returned memory must satisfy
+            candidate_ids: Optional set of memory IDs to restrict the search to
+            threshold: Optional minimum cosine similarity for vector matches
+                      (lexical matches are not affected)
+                      
+        Returns:
+            List of (memory, score) tuples, most relevant first
+        """
+        if not query or limit <= 0:
+            return []
+        
+        count = max(limit * self.candidate_multiplier, self.min_candidates)
+        restricted = filter_fn is not None or candidate_ids is not None
+        
+        tasks: Dict[str, Callable[[], List[Tuple[MemoryItem, float]]]] = {}
+        if self.has_lexical:
+            # BM25 only touches postings, so filtered searches rank every match
+            lexical_count = None if restricted else count
+            tasks["lexical"] = lambda: self._lexical(query, lexical_count, candidate_ids)
+        if self.has_vector:
+            vector_count = count * 4 if restricted else count
+            tasks["vector"] = lambda: self._vector(query, vector_count, threshold)
+        
+        rankings = self._run(tasks)
+        
+        weights = {"lexical": self.lexical_weight, "vector": self.vector_weight}
+        fused: Dict[str, float] = {}
+        memories: Dict[str, MemoryItem] = {}
+        
+        for name, results in rankings.items():
+            rank = 0
+            for memory, _ in results:
+                if candidate_ids is not None and memory.id not in candidate_ids:
+                    continue
+                if filter_fn is not None and not filter_fn(memory):
+                    continue
+                rank += 1
+                fused[memory.id] = fused.get(memory.id, 0.0) + weights[name] / (self.rrf_k + rank)
+                memories[memory.id] = memory
+        
+        now = time.time()
+        scored = [
+            (memories[memory_id], score * self._boost(memories[memory_id], now))
+            for memory_id, score in fused.items()
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0].id))
+        
+        logger.debug(
+            f"Hybrid search fused {', '.join(f'{len(r)} {n}' for n, r in rankings.items())} "
+            f"candidates into {len(scored)} results"
+        )
+        return scored[:limit]
+    
+    def _run(self, tasks: Dict[str, Callable[[], List[Tuple[MemoryItem, float]]]]) -> Dict[str, List[Tuple[MemoryItem, float]]]:
+        """
+        Run the retrievers concurrently, dropping any that fail.
+        
+        Args:
+            tasks: Retriever callables by name
+            
+        Returns:
+            The ranking produced by each retriever that succeeded
+        """
+        if len(tasks) > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="HybridRetriever")
+            futures = {name: self._executor.submit(task) for name, task in tasks.items()}
+            outcomes = {}
+            for name, future in futures.items():
+                try:
+                    outcomes[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error in {name} retrieval: {e}")
+            return outcomes
+        
+        outcomes = {}
+        for name, task in tasks.items():
+            try:
+                outcomes[name] = task()
+            except Exception as e:
+                logger.error(f"Error in {name} retrieval: {e}")
+        return outcomes
+    
+    def close(self) -> None:
+        """Shut down the retrieval worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
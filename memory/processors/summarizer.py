@@ -9,6 +9,7 @@ import logging
 from typing import List, Dict, Any, Optional, Callable
 
 from ..core.memory_item import MemoryItem
+from .extractive import ExtractiveSummarizer
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +20,27 @@ class MemorySummarizer:
     
     This class provides functionality to summarize individual memories or
     collections of memories, either using built-in rules or an external
-    summarization model.
+    summarization model. Collections are summarized extractively (see
+    ExtractiveSummarizer): the most representative, non-redundant
+    sentences across all the memories are kept.
     """
     
-    def __init__(self, external_summarizer: Optional[Callable] = None):
+    def __init__(
+        self,
+        external_summarizer: Optional[Callable] = None,
+        extractive: Optional[ExtractiveSummarizer] = None
+    ):
         """
         Initialize a new memory summarizer.
         
         Args:
             external_summarizer: Optional external summarization function that takes text
                                 and returns a summary
+            extractive: Extractive summarizer for collections of memories (a
+                       centroid-based one is created if None)
         """
         self.external_summarizer = external_summarizer
+        self.extractive = extractive or ExtractiveSummarizer()
         logger.info(f"Initialized memory summarizer with external_summarizer={external_summarizer is not None}")
     
     def summarize_memory(self, memory: MemoryItem, max_length: int = 100) -> str:
@@ -95,7 +105,7 @@ class MemorySummarizer:
             # For list content, summarize the first few items
             if not memory.content:
                 return "[]"
-                
+            
             item_summaries = []
             remaining_length = max_length - 5  # Reserve space for "[...]"
             
@@ -162,7 +172,12 @@ class MemorySummarizer:
                 logger.error(f"Error using external summarizer: {e}")
                 # Fall back to basic summarization
         
-        # For multiple memories, summarize each one briefly and combine
+        # Keep the most representative sentences across all the memories
+        summary = self._extractive_summary(memories, max_total_length, include_metadata)
+        if summary is not None:
+            return summary
+        
+        # Without any text to extract from, summarize each memory briefly and combine
         memory_summaries = []
         remaining_length = max_total_length - 50  # Reserve space for intro and connector text
         
@@ -201,6 +216,66 @@ class MemorySummarizer:
         
         return intro + "\n".join(memory_summaries)
     
+    def _extractive_summary(
+        self,
+        memories: List[MemoryItem],
+        max_total_length: int,
+        include_metadata: bool,
+        topic: Optional[str] = None,
+        boost: Optional[List[float]] = None
+    ) -> Optional[str]:
+        """
+        Summarize memories with their best sentences, one per line.
+        
+        Args:
+            memories: List of memory items to summarize
+            max_total_length: Maximum total length of the summary
+            include_metadata: Whether to add each sentence's memory importance
+            topic: Optional topic to focus on
+            boost: Optional score multiplier per memory
+            
+        Returns:
+            The summary with its intro line, or None if no sentence was picked
+        """
+        # Structured contents read better through summarize_memory
+        if not any(isinstance(memory.content, str) for memory in memories):
+            return None
+        
+        # Reserve space for the intro line
+        budget = max_total_length - 50
+        try:
+            picked = self.extractive.select(
+                memories,
+                max_length=budget,
+                topic=topic,
+                boost=boost
+            )
+        except Exception as e:
+            logger.error(f"Error in extractive summarization: {e}")
+            return None
+        if not picked:
+            return None
+        
+        lines = []
+        used = 0
+        for sentence, position, _ in picked:
+            if include_metadata:
+                sentence += f" [importance: {memories[position].importance:.2f}]"
+            if used + len(sentence) > budget:
+                if lines:
+                    break
+                # A single sentence longer than the whole budget is cut short
+                sentence = sentence[:max(budget-3, 0)] + "..."
+            lines.append(sentence)
+            used += len(sentence) + 1
+        
+        covered = len({position for _, position, _ in picked[:len(lines)]})
+        if covered == len(memories):
+            intro = f"Summary of {len(memories)} memories:\n"
+        else:
+            intro = f"Summary of {covered} out of {len(memories)} memories:\n"
+        return intro + "\n".join(lines)
+    
     def generate_topic_summary(self, memories: List[MemoryItem], topic: str, max_length: int = 200) -> str:
         """
         Generate a summary of memories related to a specific topic.
@@ -216,55 +291,77 @@ class MemorySummarizer:
         if not memories:
             return f"No memories found related to '{topic}'."
         
-        # Filter memories that might be related to the topic
+        # Memories tagged or categorized with the topic count even if their text does not mention it
         topic_keywords = topic.lower().split()
-        relevant_memories = []
-        
+        boost = []
         for memory in memories:
-            memory_text = self.summarize_memory(memory, max_length=200).lower()
-            relevance_score = 0
-            
-            # Simple keyword matching for relevance
-            for keyword in topic_keywords:
-                if keyword in memory_text:
-                    relevance_score += 1
-            
-            # If memory has metadata with tags or categories, check those too
-            if hasattr(memory, 'metadata') and memory.metadata:
-                if isinstance(memory.metadata.get('tags'), list):
-                    for tag in memory.metadata['tags']:
-                        if any(keyword in str(tag).lower() for keyword in topic_keywords):
-                            relevance_score += 2
-                
-                if isinstance(memory.metadata.get('category'), str):
-                    if any(keyword in memory.metadata['category'].lower() for keyword in topic_keywords):
-                        relevance_score += 2
+            weight = 1.0
+            metadata = memory.metadata or {}
+            tags = metadata.get('tags')
+            if isinstance(tags, list) and any(
+                keyword in str(tag).lower() for tag in tags for keyword in topic_keywords
+            ):
+                weight += 1.0
+            category = metadata.get('category')
+            if isinstance(category, str) and any(keyword in category.lower() for keyword in topic_keywords):
+                weight += 1.0
+            boost.append(weight)
+        
+        topic_intro = f"Summary of information related to '{topic}':\n"
+        summary = self._extractive_summary(
+            memories,
+            max_length - len(topic_intro) + 50,
+            include_metadata=False,
+            topic=topic,
+            boost=boost
+        )
+        if summary is None:
+            # Without any text to extract from, fall back to keyword matching
+            summary = self._keyword_topic_summary(memories, topic_keywords, boost, max_length)
+            if summary is None:
+                return f"No memories found related to '{topic}'."
+        
+        # Replace the generic intro with a topic-focused one
+        return topic_intro + summary.split('\n', 1)[1]
+    
+    def _keyword_topic_summary(
+        self,
+        memories: List[MemoryItem],
+        topic_keywords: List[str],
+        boost: List[float],
+        max_length: int
+    ) -> Optional[str]:
+        """
+        Summarize the memories whose brief summaries mention the topic keywords.
+        
+        Args:
+            memories: List of memory items to summarize
+            topic_keywords: Lowercased topic keywords
+            boost: Score multiplier per memory from its tags and category
+            max_length: Maximum length of the summary
             
-            # If the memory seems relevant, include it
+        Returns:
+            The summary with its intro line, or None if no memory is related
+        """
+        relevant_memories = []
+        for memory, weight in zip(memories, boost):
+            memory_text = self.summarize_memory(memory, max_length=200).lower()
+            # Each matching tag or category counts as two keyword matches
+            relevance_score = sum(1 for keyword in topic_keywords if keyword in memory_text)
+            relevance_score += 2 * (weight - 1.0)
             if relevance_score > 0:
                 relevant_memories.append((memory, relevance_score))
         
-        # If no relevant memories found, return a message
         if not relevant_memories:
-            return f"No memories found related to '{topic}'."
+            return None
         
-        # Sort by relevance score (highest first)
+        # Take the 5 most relevant memories
         relevant_memories.sort(key=lambda x: x[1], reverse=True)
-        relevant_memories = [m for m, _ in relevant_memories]
-        
-        # Generate a summary focusing on the topic
-        summary = self.summarize_memories(
-            memories=relevant_memories[:5],  # Take the top 5 most relevant
+        return self.summarize_memories(
+            memories=[m for m, _ in relevant_memories[:5]],
             max_total_length=max_length,
             include_metadata=False
         )
-        
-        # Replace the generic intro with a topic-focused one
-        summary_lines = summary.split('\n')
-        topic_intro = f"Summary of information related to '{topic}':\n"
-        summary = topic_intro + '\n'.join(summary_lines[1:])
-        
-        return summary
 
 
 class Summarizer:
@@ -277,38 +374,16 @@ class Summarizer:
     
     def __init__(self):
         """Initialize a new summarizer with default settings."""
-        # Create a simple default summarization function
+        extractive = ExtractiveSummarizer()
+        
         def default_summarizer(text: str) -> str:
-            """Simple summarization function that extracts the first few sentences."""
-            # Split text into sentences (simple approach)
-            sentences = []
-            for part in text.split('. '):
-                # Handle abbreviations like "Dr." or "U.S.A."
-                if part and part[-1].isalpha():
-                    sentences.append(part + '.')
-                elif part:
-                    sentences.append(part)
-            
-            # Calculate summary length based on text size
-            if len(text) < 500:
-                summary_sentences = min(2, len(sentences))
-            elif len(text) < 1000:
-                summary_sentences = min(3, len(sentences))
-            else:
-                summary_sentences = min(4, len(sentences))
-                
-            # Create summary
-            if sentences:
-                summary = ' '.join(sentences[:summary_sentences])
-                if len(summary) > 200:
-                    summary = summary[:197] + "..."
-                return summary
-            else:
-                return text[:200] + "..." if len(text) > 200 else text
+            """Extract the most representative sentences of a text, within 200 characters."""
+            return extractive.summarize([MemoryItem(content=text)], max_length=200) or text[:200]
         
         # Initialize the full summarizer with our default function
         self.summarizer = MemorySummarizer(
-            external_summarizer=default_summarizer
+            external_summarizer=default_summarizer,
+            extractive=extractive
         )
         
         logger.info("Initialized Summarizer with default summarization function")
@@ -8,5 +8,11 @@ storage technologies.
 
 from .base_storage import BaseStorage
 from .in_memory_storage import InMemoryStorage
+from .sharded_storage import ShardedStorage, ReadWriteLock
+from .sqlite_pool import SQLiteConnectionPool
+from .write_behind import WriteBehindQueue
+from .text_index import InvertedIndex
+from .snapshot import SnapshotWriter, DeltaLog
 
-__all__ = ["BaseStorage", "InMemoryStorage"] 
\ No newline at end of file
+__all__ = ["BaseStorage", "InMemoryStorage", "ShardedStorage", "ReadWriteLock", "SQLiteConnectionPool",
+           "WriteBehindQueue", "InvertedIndex", "SnapshotWriter", "DeltaLog"] 
\ No newline at end of file
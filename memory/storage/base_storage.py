@@ -6,7 +6,7 @@ storage backends must implement.
 """
 
 import abc
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import logging
 
 # This is a forward reference to avoid circular imports
@@ -91,4 +91,57 @@ class BaseStorage(abc.ABC):
         Returns:
             True if cleared successfully, False otherwise
         """
-        pass 
\ No newline at end of file
+        pass 
+    
+    def retrieve_many(self, memory_ids: Iterable[str]) -> List[MemoryItem]:
+        """
+        Retrieve several memory items by their IDs.
+        
+        Backends can override this with a bulk path; the default retrieves
+        the items one at a time.
+        
+        Args:
+            memory_ids: The IDs of the memories to retrieve
+            
+        Returns:
+            The memory items found, in the order of the IDs (missing IDs are skipped)
+        """
+        memories = []
+        for memory_id in memory_ids:
+            memory = self.retrieve(memory_id)
+            if memory is not None:
+                memories.append(memory)
+        return memories
+    
+    def store_many(self, memories: Iterable[MemoryItem]) -> int:
+        """
+        Store several memory items.
+        
+        Backends can override this with a bulk path; the default stores
+        the items one at a time.
+        
+        Args:
+            memories: The memory items to store (any iterable, consumed once)
+            
+        Returns:
+            The number of items stored
+        """
+        return sum(1 for memory in memories if self.store(memory))
+    
+    def iter_memories(self, batch_size: int = 1000) -> Iterator[MemoryItem]:
+        """
+        Iterate over every stored memory item without loading them all at once.
+        
+        Args:
+            batch_size: Number of items fetched per query
+            
+        Yields:
+            The stored memory items
+        """
+        offset = 0
+        while True:
+            batch = self.query({}, limit=batch_size, offset=offset)
+            if not batch:
+                return
+            yield from batch
+            offset += len(batch)
@@ -0,0 +1,285 @@
+"""
+Fact Cache Module
+
+This module provides the in-process structures that keep hot semantic
+facts out of SQLite: an LRU cache of the facts stored under a subject
+(and predicate), and a prefix trie over subjects for autocompletion.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (subject, predicate) with predicate None for "every predicate of the subject"
+CacheKey = Tuple[str, Optional[str]]
+
+
+class FactCache:
+    """
+    LRU cache of the facts stored under a subject or (subject, predicate).
+    
+    Each entry holds every fact under its key, ordered by confidence, so
+    any confidence threshold, limit or offset can be answered from it.
+    Keys whose fact count exceeds max_facts_per_key are not cached. The
+    owner invalidates a subject's entries whenever one of its facts is
+    written or deleted. Cached facts are shared, so readers must copy
+    them before handing them out.
+    """
+    
+    def __init__(self, capacity: int = 1024, max_facts_per_key: int = 64):
+        """
+        Initialize a new fact cache.
+        
+        Args:
+            capacity: Maximum number of cached keys
+            max_facts_per_key: Largest number of facts cached under one key
+        """
+        self.capacity = max(1, capacity)
+        self.max_facts_per_key = max(1, max_facts_per_key)
+        
+        self._entries: "OrderedDict[CacheKey, List[Any]]" = OrderedDict()
+        self._keys_by_subject: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+    
+    def __len__(self) -> int:
+        """Get the number of cached keys."""
+        return len(self._entries)
+    
+    def get(self, subject: str, predicate: Optional[str] = None) -> Optional[List[Any]]:
+        """
+        Get the cached facts of a key.
+        
+        Args:
+            subject: The subject
+            predicate: The predicate (None for every predicate of the subject)
+            
+        Returns:
+            The facts, highest confidence first (possibly empty), or None on a miss
+        """
+        key = (subject, predicate)
+        with self._lock:
+            facts = self._entries.get(key)
+            if facts is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return facts
+    
+    def put(self, subject: str, predicate: Optional[str], facts: List[Any]) -> bool:
+        """
+        Cache every fact of a key.
+        
+        Args:
+            subject: The subject
+            predicate: The predicate (None for every predicate of the subject)
+            facts: All the facts under the key, highest confidence first
+            
+        Returns:
+            True if cached, False if the key has too many facts
+        """
+        if len(facts) > self.max_facts_per_key:
+            return False
+        
+        key = (subject, predicate)
+        with self._lock:
+            self._entries[key] = facts
+            self._entries.move_to_end(key)
+            self._keys_by_subject.setdefault(subject, set()).add(key)
+            
+            while len(self._entries) > self.capacity:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget_key(evicted)
+                self._stats["evictions"] += 1
+        return True
+    
+    def _forget_key(self, key: CacheKey) -> None:
+        """Remove a key from the subject index (caller holds the lock)."""
+        keys = self._keys_by_subject.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_subject[key[0]]
+    
+    def invalidate_subject(self, subject: str) -> None:
+        """
+        Drop every cached key of a subject.
+        
+        Args:
+            subject: The subject
+        """
+        with self._lock:
+            for key in self._keys_by_subject.pop(subject, ()):
+                self._entries.pop(key, None)
+                self._stats["invalidations"] += 1
+    
+    def clear(self) -> None:
+        """Drop every cached key."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_subject.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "keys": len(self._entries),
+                "capacity": self.capacity,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                **self._stats
+            }
+
+
+class _TrieNode:
+    """Node of a SubjectTrie."""
+    
+    __slots__ = ("children", "subjects", "size")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Subjects whose normalized form ends here, with their fact counts
+        self.subjects: Dict[str, int] = {}
+        # Number of distinct subjects in this subtree
+        self.size = 0
+
+
+class SubjectTrie:
+    """
+    Prefix trie over fact subjects, for autocomplete-style lookups.
+    
+    Subjects are matched case-insensitively and reported with their
+    original spelling. Each subject is reference-counted by the number of
+    facts stored under it, so it disappears with its last fact.
+    """
+    
+    def __init__(self):
+        """Initialize an empty trie."""
+        self._root = _TrieNode()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        """Get the number of distinct subjects."""
+        return self._root.size
+    
+    def __contains__(self, subject: str) -> bool:
+        """Check whether a subject has facts."""
+        node = self._find(subject.casefold())
+        return node is not None and subject in node.subjects
+    
+    def _find(self, key: str) -> Optional[_TrieNode]:
+        """Get the node of a normalized key, if any."""
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+    
+    def add(self, subject: str, count: int = 1) -> None:
+        """
+        Record facts under a subject.
+        
+        Args:
+            subject: The subject
+            count: The number of facts added
+        """
+        with self._lock:
+            path = [self._root]
+            for char in subject.casefold():
+                path.append(path[-1].children.setdefault(char, _TrieNode()))
+            
+            node = path[-1]
+            if subject not in node.subjects:
+                node.subjects[subject] = 0
+                for visited in path:
+                    visited.size += 1
+            node.subjects[subject] += count
+    
+    def remove(self, subject: str, count: int = 1) -> None:
+        """
+        Forget facts under a subject, dropping the subject with its last fact.
+        
+        Args:
+            subject: The subject
+            count: The number of facts removed
+        """
+        key = subject.casefold()
+        with self._lock:
+            path = [self._root]
+            for char in key:
+                child = path[-1].children.get(char)
+                if child is None:
+                    return
+                path.append(child)
+            
+            node = path[-1]
+            if subject not in node.subjects:
+                return
+            node.subjects[subject] -= count
+            if node.subjects[subject] > 0:
+                return
+            
+            del node.subjects[subject]
+            for visited in path:
+                visited.size -= 1
+            # Prune the branch that no longer leads to any subject
+            for depth in range(len(path) - 1, 0, -1):
+                if path[depth].size:
+                    break
+                del path[depth - 1].children[key[depth - 1]]
+    
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Get the subjects starting with a prefix, in alphabetical order.
+        
+        Only the branches needed to fill the limit are visited.
+        
+        Args:
+            prefix: The prefix (case-insensitive)
+            limit: Maximum number of subjects to return
+            
+        Returns:
+            The matching subjects
+        """
+        results: List[str] = []
+        with self._lock:
+            start = self._find(prefix.casefold())
+            if start is None or limit <= 0:
+                return results
+            
+            stack = [start]
+            while stack and len(results) < limit:
+                node = stack.pop()
+                results.extend(sorted(node.subjects)[:limit - len(results)])
+                # Push in reverse so children are visited in order
+                for char in sorted(node.children, reverse=True):
+                    stack.append(node.children[char])
+        return results
+    
+    def count(self, prefix: str = "") -> int:
+        """
+        Count the subjects starting with a prefix.
+        
+        Args:
+            prefix: The prefix (case-insensitive)
+            
+        Returns:
+            The number of matching subjects
+        """
+        node = self._find(prefix.casefold())
+        return node.size if node is not None else 0
+    
+    def clear(self) -> None:
+        """Remove every subject."""
+        with self._lock:
+            self._root = _TrieNode()
@@ -6,16 +6,28 @@ interface for storing memory items in RAM.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import heapq
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterable, Iterator
 
 from .base_storage import BaseStorage
+from .text_index import InvertedIndex, content_to_text
 
 # This is a forward reference
 MemoryItem = Any
 
 logger = logging.getLogger(__name__)
 
+# Sentinels used to build bisect keys that sort before/after every real entry
+_SEQ_MIN = -1
+_SEQ_MAX = float("inf")
+
+# In columnar mode, an importance and a time range are intersected with one
+# vectorized pass over the columns once both ranges cover more than this
+# fraction of the stored items (walking either index would visit them one by one)
+_COLUMNAR_SCAN_FRACTION = 1 / 32
+
 
 class InMemoryStorage(BaseStorage):
     """
@@ -24,12 +36,174 @@ class InMemoryStorage(BaseStorage):
     This storage backend keeps all memory items in RAM, which makes it
     fast but not persistent across restarts. It's suitable for short-lived
     applications or for testing purposes.
+    
+    Secondary indexes are maintained incrementally on every store/delete so
+    that queries never have to scan the whole table:
+    
+    - a hash index from memory_type to memory IDs
+    - sorted lists on importance (descending) and created_at
+    - an inverted index from hashable metadata (key, value) pairs to memory IDs
+    - a BM25-ranked inverted index over the words of each memory's content
+    
+    Creation times are indexed as epoch floats so stored items never need
+    their timestamps materialized as datetime objects.
     """
     
-    def __init__(self):
-        """Initialize a new in-memory storage backend."""
+    def __init__(self, columnar: bool = False, sequence: Optional[Iterator[int]] = None):
+        """
+        Initialize a new in-memory storage backend.
+        
+        Args:
+            columnar: Whether to keep the numeric fields of stored items in a
+                     shared MemoryColumns store instead of in each item (wide
+                     importance and time range queries then run vectorized)
+            sequence: Source of insertion sequence numbers, shared by storages
+                     whose results are merged (defaults to a private counter)
+        """
         self._memories: Dict[str, MemoryItem] = {}
-        logger.info("Initialized in-memory storage")
+        
+        # Insertion sequence per memory, used as a stable tie-breaker
+        self._seq: Dict[str, int] = {}
+        self._sequence = sequence if sequence is not None else itertools.count()
+        
+        # Snapshot of the indexed values of each memory, needed to unindex it
+        # even if the object was mutated in place before being stored again
+        self._indexed: Dict[str, Tuple[str, float, float, Tuple[Tuple[str, Any], ...]]] = {}
+        
+        # Secondary indexes
+        self._type_index: Dict[str, Set[str]] = {}
+        self._importance_index: List[Tuple[float, int, str]] = []  # (-importance, seq, id)
+        self._created_index: List[Tuple[float, int, str]] = []  # (created timestamp, seq, id)
+        self._metadata_index: Dict[Tuple[str, Any], Set[str]] = {}
+        
+        # Full-text index; content is reindexed only when its indexed text changes
+        self._text_index = InvertedIndex()
+        self._indexed_text: Dict[str, str] = {}
+        
+        # Optional struct-of-arrays store for the numeric fields of items
+        self._columns = None
+        if columnar:
+            from ..core.memory_columns import MemoryColumns
+            self._columns = MemoryColumns()
+        
+        logger.info(f"Initialized in-memory storage (columnar={columnar})")
+    
+    # Index maintenance
+    
+    @staticmethod
+    def _metadata_pairs(metadata: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Get the hashable (key, value) pairs of a metadata dictionary.
+        
+        Args:
+            metadata: The metadata dictionary
+            
+        Returns:
+            A tuple of indexable (key, value) pairs
+        """
+        if not metadata:
+            return ()
+        
+        pairs = []
+        for key, value in metadata.items():
+            try:
+                hash(value)
+            except TypeError:
+                # Unhashable values (lists, dicts) are matched by scanning candidates
+                continue
+            pairs.append((key, value))
+        return tuple(pairs)
+    
+    def _index(self, memory: MemoryItem, pending: Optional[Tuple[List, List]] = None) -> None:
+        """
+        Add a memory item to all secondary indexes.
+        
+        Args:
+            memory: The memory item to index
+            pending: Optional (importance, created) lists collecting the sorted
+                    index entries, to be merged in bulk instead of inserted
+        """
+        memory_id = memory.id
+        seq = self._seq[memory_id]
+        pairs = self._metadata_pairs(memory.metadata)
+        
+        self._type_index.setdefault(memory.memory_type, set()).add(memory_id)
+        if pending is None:
+            insort(self._importance_index, (-memory.importance, seq, memory_id))
+            insort(self._created_index, (memory.created_timestamp, seq, memory_id))
+        else:
+            pending[0].append((-memory.importance, seq, memory_id))
+            pending[1].append((memory.created_timestamp, seq, memory_id))
+        for pair in pairs:
+            self._metadata_index.setdefault(pair, set()).add(memory_id)
+        
+        self._indexed[memory_id] = (memory.memory_type, memory.importance, memory.created_timestamp, pairs)
+    
+    def _unindex(self, memory_id: str) -> None:
+        """
+        Remove a memory item from all secondary indexes.
+        
+        Args:
+            memory_id: The ID of the memory to unindex
+        """
+        snapshot = self._indexed.pop(memory_id, None)
+        if snapshot is None:
+            return
+        
+        memory_type, importance, created_at, pairs = snapshot
+        seq = self._seq[memory_id]
+        
+        type_ids = self._type_index.get(memory_type)
+        if type_ids is not None:
+            type_ids.discard(memory_id)
+            if not type_ids:
+                del self._type_index[memory_type]
+        
+        self._remove_sorted(self._importance_index, (-importance, seq, memory_id))
+        self._remove_sorted(self._created_index, (created_at, seq, memory_id))
+        
+        for pair in pairs:
+            pair_ids = self._metadata_index.get(pair)
+            if pair_ids is not None:
+                pair_ids.discard(memory_id)
+                if not pair_ids:
+                    del self._metadata_index[pair]
+    
+    @staticmethod
+    def _remove_sorted(index: List[Tuple], entry: Tuple) -> None:
+        """
+        Remove an entry from a sorted index list.
+        
+        Args:
+            index: The sorted list
+            entry: The exact entry to remove
+        """
+        position = bisect_left(index, entry)
+        if position < len(index) and index[position] == entry:
+            del index[position]
+    
+    def _needs_reindex(self, memory: MemoryItem) -> bool:
+        """
+        Check whether the indexed values of a stored memory have changed.
+        
+        Args:
+            memory: The memory item being stored
+            
+        Returns:
+            True if the memory must be reindexed, False otherwise
+        """
+        snapshot = self._indexed.get(memory.id)
+        if snapshot is None:
+            return True
+        
+        return snapshot != (
+            memory.memory_type,
+            memory.importance,
+            memory.created_timestamp,
+            self._metadata_pairs(memory.metadata)
+        )
+    
+    # BaseStorage interface
     
     def store(self, memory: MemoryItem) -> bool:
         """
@@ -41,10 +215,86 @@ class InMemoryStorage(BaseStorage):
         Returns:
             True if stored successfully, False otherwise
         """
-        self._memories[memory.id] = memory
+        self._store(memory)
         logger.debug(f"Stored memory: {memory.id}")
         return True
     
+    def store_many(self, memories: Iterable[MemoryItem]) -> int:
+        """
+        Store several memory items, merging their sorted index entries in bulk.
+        
+        New items are appended to the sorted indexes and each index is sorted
+        once at the end, instead of paying one list insertion per item.
+        
+        Args:
+            memories: The memory items to store (any iterable, consumed once)
+            
+        Returns:
+            The number of items stored
+        """
+        pending: Tuple[List, List] = ([], [])
+        batch_ids: Set[str] = set()
+        count = 0
+        for memory in memories:
+            if memory.id in batch_ids:
+                # A repeated item must find its earlier entries in the sorted indexes
+                self._merge_pending(pending)
+                batch_ids.clear()
+            batch_ids.add(memory.id)
+            self._store(memory, pending)
+            count += 1
+        
+        self._merge_pending(pending)
+        logger.debug(f"Stored {count} memories")
+        return count
+    
+    def _merge_pending(self, pending: Tuple[List, List]) -> None:
+        """
+        Merge collected entries into the sorted indexes.
+        
+        Args:
+            pending: The (importance, created) entry lists, emptied afterwards
+        """
+        if not pending[0]:
+            return
+        for index, entries in ((self._importance_index, pending[0]), (self._created_index, pending[1])):
+            index.extend(entries)
+            index.sort()
+            entries.clear()
+    
+    def _store(self, memory: MemoryItem, pending: Optional[Tuple[List, List]] = None) -> None:
+        """
+        Store a memory item and update the indexes.
+        
+        Args:
+            memory: The memory item to store
+            pending: Optional lists collecting sorted index entries (see _index)
+        """
+        memory_id = memory.id
+        
+        if memory_id not in self._seq:
+            self._seq[memory_id] = next(self._sequence)
+        
+        # Compared by value, so content edited in place is reindexed too
+        text = content_to_text(memory.content)
+        if self._indexed_text.get(memory_id) != text:
+            self._text_index.add(memory_id, text)
+            self._indexed_text[memory_id] = text
+        
+        if self._columns is not None:
+            previous = self._memories.get(memory_id)
+            if previous is not None and previous is not memory:
+                self._columns.release(previous)
+            self._columns.bind(memory)
+        
+        # Re-storing an unchanged item (e.g. after an access) skips reindexing
+        if self._needs_reindex(memory):
+            self._unindex(memory_id)
+            self._memories[memory_id] = memory
+            self._index(memory, pending)
+        else:
+            self._memories[memory_id] = memory
+    
     def retrieve(self, memory_id: str) -> Optional[MemoryItem]:
         """
         Retrieve a memory item by its ID.
@@ -62,6 +312,19 @@ class InMemoryStorage(BaseStorage):
             logger.debug(f"Memory not found: {memory_id}")
         return memory
     
+    def retrieve_many(self, memory_ids: Iterable[str]) -> List[MemoryItem]:
+        """
+        Retrieve several memory items by their IDs.
+        
+        Args:
+            memory_ids: The IDs of the memories to retrieve
+            
+        Returns:
+            The memory items found, in the order of the IDs (missing IDs are skipped)
+        """
+        memories = self._memories
+        return [memories[memory_id] for memory_id in memory_ids if memory_id in memories]
+    
     def delete(self, memory_id: str) -> bool:
         """
         Delete a memory item.
@@ -73,7 +336,13 @@ class InMemoryStorage(BaseStorage):
             True if deleted successfully, False otherwise
         """
         if memory_id in self._memories:
+            self._unindex(memory_id)
+            self._text_index.remove(memory_id)
+            self._indexed_text.pop(memory_id, None)
+            if self._columns is not None:
+                self._columns.release(self._memories[memory_id])
             del self._memories[memory_id]
+            del self._seq[memory_id]
             logger.debug(f"Deleted memory: {memory_id}")
             return True
         else:
@@ -81,7 +350,7 @@ class InMemoryStorage(BaseStorage):
             return False
     
     def query(
-        self, 
+        self,
         query: Dict[str, Any],
         limit: int = 100,
         offset: int = 0
@@ -89,6 +358,13 @@ class InMemoryStorage(BaseStorage):
         """
         Query for memory items matching the given criteria.
         
+        The most selective index is used to produce the candidate set, the
+        remaining criteria are checked per candidate, and only the requested
+        page is materialized (with a bounded heap when candidates are not
+        already in importance order). In columnar mode, a query whose
+        importance and time ranges are both wide gets its candidates from a
+        single vectorized selection over the columns instead.
+        
         Args:
             query: A dictionary of query parameters
             limit: Maximum number of results to return
@@ -97,70 +373,183 @@ class InMemoryStorage(BaseStorage):
         Returns:
             A list of memory items matching the query
         """
-        results = []
+        page_end = offset + limit
+        if limit <= 0 or page_end <= 0:
+            return []
         
-        # Get all memories as a starting point
-        all_memories = list(self._memories.values())
+        # Importance range over the (-importance, seq, id) index
+        imp_lo, imp_hi = 0, len(self._importance_index)
+        if "max_importance" in query:
+            imp_lo = bisect_left(self._importance_index, (-query["max_importance"], _SEQ_MIN))
+        if "min_importance" in query:
+            imp_hi = bisect_right(self._importance_index, (-query["min_importance"], _SEQ_MAX))
         
-        # Apply filters
-        filtered_memories = all_memories
+        # Creation time range over the (created_at, seq, id) index
+        created_lo, created_hi = 0, len(self._created_index)
+        if "after_timestamp" in query:
+            created_lo = bisect_left(self._created_index, (query["after_timestamp"].timestamp(), _SEQ_MIN))
+        if "before_timestamp" in query:
+            created_hi = bisect_right(self._created_index, (query["before_timestamp"].timestamp(), _SEQ_MAX))
         
-        # Filter by memory type
+        # Hash-based candidate sets
+        id_sets: List[Set[str]] = []
         if "memory_type" in query:
-            filtered_memories = [
-                m for m in filtered_memories 
-                if m.memory_type == query["memory_type"]
-            ]
+            id_sets.append(self._type_index.get(query["memory_type"], set()))
         
-        # Filter by importance (min)
-        if "min_importance" in query:
-            filtered_memories = [
-                m for m in filtered_memories 
-                if m.importance >= query["min_importance"]
-            ]
+        metadata_query = query.get("metadata") or {}
+        for pair in self._metadata_pairs(metadata_query):
+            id_sets.append(self._metadata_index.get(pair, set()))
         
-        # Filter by importance (max)
-        if "max_importance" in query:
-            filtered_memories = [
-                m for m in filtered_memories 
-                if m.importance <= query["max_importance"]
-            ]
+        # Pick the smallest candidate source
+        imp_size = max(0, imp_hi - imp_lo)
+        created_size = max(0, created_hi - created_lo)
+        smallest_set = min(id_sets, key=len) if id_sets else None
         
-        # Filter by creation timestamp (before)
-        if "before_timestamp" in query:
-            before = query["before_timestamp"]
-            filtered_memories = [
-                m for m in filtered_memories 
-                if m.created_at <= before
-            ]
+        if smallest_set is not None and len(smallest_set) < min(imp_size, created_size):
+            # Intersect smallest-first so the working set only ever shrinks
+            candidates = smallest_set
+            for other_set in sorted(id_sets, key=len):
+                if other_set is not smallest_set:
+                    candidates = candidates & other_set
+            results = self._top_by_importance(candidates, query, page_end)
+        elif self._columns is not None and self._columnar_scan_pays(imp_size, created_size):
+            selected = self._columns.select(
+                min_importance=query.get("min_importance"),
+                max_importance=query.get("max_importance"),
+                after_timestamp=query["after_timestamp"].timestamp() if "after_timestamp" in query else None,
+                before_timestamp=query["before_timestamp"].timestamp() if "before_timestamp" in query else None,
+                by_importance=True
+            )
+            results = []
+            memories = self._memories
+            for memory_id in selected:
+                if all(memory_id in s for s in id_sets):
+                    memory = memories[memory_id]
+                    if self._matches(memory, query):
+                        # Keep going past a full page only to collect items tied with its last one
+                        if len(results) >= page_end and memory.importance < results[-1].importance:
+                            break
+                        results.append(memory)
+            seq = self._seq
+            results.sort(key=lambda m: (-m.importance, seq[m.id]))
+        elif created_size < imp_size:
+            created_index = self._created_index
+            candidates = (
+                created_index[i][2] for i in range(created_lo, created_hi)
+                if all(created_index[i][2] in s for s in id_sets)
+            )
+            results = self._top_by_importance(candidates, query, page_end)
+        else:
+            # Walk the importance index in order and stop once the page is full
+            results = []
+            importance_index = self._importance_index
+            for i in range(imp_lo, imp_hi):
+                memory_id = importance_index[i][2]
+                if all(memory_id in s for s in id_sets):
+                    memory = self._memories[memory_id]
+                    if self._matches(memory, query):
+                        results.append(memory)
+                        if len(results) >= page_end:
+                            break
         
-        # Filter by creation timestamp (after)
-        if "after_timestamp" in query:
-            after = query["after_timestamp"]
-            filtered_memories = [
-                m for m in filtered_memories 
-                if m.created_at >= after
-            ]
+        paginated_memories = results[offset:page_end]
+        logger.debug(f"Query returned {len(paginated_memories)} results")
+        return paginated_memories
+    
+    def _columnar_scan_pays(self, imp_size: int, created_size: int) -> bool:
+        """
+        Check whether both range filters of a query are too wide to walk an index.
         
-        # Filter by metadata
-        if "metadata" in query:
-            metadata_query = query["metadata"]
-            filtered_memories = [
-                m for m in filtered_memories 
-                if all(
-                    k in m.metadata and m.metadata[k] == v
-                    for k, v in metadata_query.items()
-                )
-            ]
+        Args:
+            imp_size: Number of items in the importance range
+            created_size: Number of items in the creation time range
+            
+        Returns:
+            True if the query restricts both ranges and each still covers a
+            large fraction of the stored items
+        """
+        total = len(self._memories)
+        if imp_size >= total or created_size >= total:
+            return False
+        return min(imp_size, created_size) > total * _COLUMNAR_SCAN_FRACTION
+    
+    def search_text(
+        self,
+        text: str,
+        limit: Optional[int] = None,
+        match_all: bool = True,
+        candidate_ids: Optional[Set[str]] = None,
+        stats: Optional[Tuple[int, int, Dict[str, int]]] = None
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Find memories whose content matches a keyword query, ranked by BM25.
         
-        # Sort by importance (highest first)
-        filtered_memories.sort(key=lambda m: m.importance, reverse=True)
+        Args:
+            text: The free-text query
+            limit: Maximum number of results (None for all matches)
+            match_all: Whether every query word must appear (AND) or any (OR)
+            candidate_ids: Optional set of memory IDs to restrict the search to
+            stats: Collection statistics to score with (see InvertedIndex.collection_stats)
+            
+        Returns:
+            List of (memory, score) tuples, best match first
+        """
+        hits = self._text_index.search(
+            text, limit=limit, match_all=match_all, candidates=candidate_ids, stats=stats
+        )
+        return [(self._memories[memory_id], score) for memory_id, score in hits]
+    
+    def _top_by_importance(
+        self,
+        candidate_ids: Iterable[str],
+        query: Dict[str, Any],
+        count: int
+    ) -> List[MemoryItem]:
+        """
+        Select the most important candidates that match a query.
         
-        # Apply pagination
-        paginated_memories = filtered_memories[offset:offset + limit]
+        Args:
+            candidate_ids: IDs of the candidate memories
+            query: The query the candidates must match
+            count: Number of results to keep
+            
+        Returns:
+            Up to count matching memories, highest importance first
+        """
+        seq = self._seq
+        matches = (
+            self._memories[memory_id] for memory_id in candidate_ids
+            if self._matches(self._memories[memory_id], query)
+        )
+        return heapq.nsmallest(count, matches, key=lambda m: (-m.importance, seq[m.id]))
+    
+    @staticmethod
+    def _matches(memory: MemoryItem, query: Dict[str, Any]) -> bool:
+        """
+        Check whether a memory item satisfies every criterion of a query.
         
-        logger.debug(f"Query returned {len(paginated_memories)} results")
-        return paginated_memories
+        Args:
+            memory: The memory item to check
+            query: A dictionary of query parameters
+            
+        Returns:
+            True if the memory matches, False otherwise
+        """
+        if "memory_type" in query and memory.memory_type != query["memory_type"]:
+            return False
+        if "min_importance" in query and memory.importance < query["min_importance"]:
+            return False
+        if "max_importance" in query and memory.importance > query["max_importance"]:
+            return False
+        if "before_timestamp" in query and memory.created_timestamp > query["before_timestamp"].timestamp():
+            return False
+        if "after_timestamp" in query and memory.created_timestamp < query["after_timestamp"].timestamp():
+            return False
+        if "metadata" in query:
+            for k, v in query["metadata"].items():
+                if k not in memory.metadata or memory.metadata[k] != v:
+                    return False
+        return True
     
     def clear(self) -> bool:
         """
@@ -170,7 +559,19 @@ class InMemoryStorage(BaseStorage):
             True if cleared successfully, False otherwise
         """
         count = len(self._memories)
+        if self._columns is not None:
+            for memory in self._memories.values():
+                self._columns.release(memory)
+            self._columns.clear()
         self._memories.clear()
+        self._seq.clear()
+        self._indexed.clear()
+        self._type_index.clear()
+        self._importance_index.clear()
+        self._created_index.clear()
+        self._metadata_index.clear()
+        self._text_index.clear()
+        self._indexed_text.clear()
         logger.warning(f"Cleared {count} memories from in-memory storage")
         return True
     
@@ -181,14 +582,33 @@ class InMemoryStorage(BaseStorage):
         Returns:
             A dictionary of statistics
         """
-        memory_types = {}
-        for memory in self._memories.values():
-            if memory.memory_type in memory_types:
-                memory_types[memory.memory_type] += 1
-            else:
-                memory_types[memory.memory_type] = 1
+        memory_types = {
+            memory_type: len(memory_ids)
+            for memory_type, memory_ids in self._type_index.items()
+        }
         
         return {
             "total": len(self._memories),
-            "memory_types": memory_types
-        } 
\ No newline at end of file
+            "memory_types": memory_types,
+            "text_index": self._text_index.get_stats(),
+            "columns": self._columns.get_stats() if self._columns is not None else None
+        }
+    
+    def iter_memories(self, batch_size: int = 1000) -> Iterator[MemoryItem]:
+        """
+        Iterate over every stored memory item.
+        
+        The IDs are copied up front (one reference per item), so the
+        storage can keep changing while the iteration is in progress;
+        items deleted in the meantime are skipped.
+        
+        Args:
+            batch_size: Unused; kept for interface compatibility
+            
+        Yields:
+            The stored memory items, in insertion order
+        """
+        for memory_id in list(self._memories):
+            memory = self._memories.get(memory_id)
+            if memory is not None:
+                yield memory
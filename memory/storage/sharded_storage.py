@@ -0,0 +1,413 @@
+"""
+Sharded Storage Module
+
+This module provides a thread-safe in-memory storage backend that spreads
+memory items over several InMemoryStorage shards, each guarded by its own
+lock, so concurrent agents sharing a MemoryManager only contend when they
+touch the same shard.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterable, Iterator
+
+from .base_storage import BaseStorage
+from .in_memory_storage import InMemoryStorage
+
+# This is a forward reference
+MemoryItem = Any
+
+logger = logging.getLogger(__name__)
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring readers-writer lock.
+    
+    Any number of readers may hold the lock at once; a writer holds it
+    alone. Once a writer is waiting, new readers wait too, so a steady
+    stream of readers cannot starve writers. The lock is not reentrant.
+    """
+    
+    def __init__(self):
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    
+    def acquire_read(self) -> None:
+        """Acquire the lock for reading."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+    
+    def release_read(self) -> None:
+        """Release a read hold."""
+        with self._condition:
+            self._readers -= 1
+            # Only writers wait for the readers to drain
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+    
+    def acquire_write(self) -> None:
+        """Acquire the lock for writing."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+    
+    def release_write(self) -> None:
+        """Release the write hold."""
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading within a with block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing within a with block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _MutexLock:
+    """Plain mutex with the ReadWriteLock interface (readers exclude each other too)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+    
+    def acquire_read(self) -> None:
+        self._lock.acquire()
+    
+    def release_read(self) -> None:
+        self._lock.release()
+    
+    acquire_write = acquire_read
+    release_write = release_read
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._lock:
+            yield
+    
+    write = read
+
+
+class ShardedStorage(BaseStorage):
+    """
+    Thread-safe in-memory storage partitioned by memory ID.
+    
+    Each memory lives in the shard picked by the hash of its ID. Single-item
+    operations lock only that shard (readers share it, writers hold it
+    alone), so callers working on different memories rarely wait for each
+    other. Queries and iteration lock every shard for reading, in a fixed
+    order, for as long as they collect their candidates, so they see one
+    consistent snapshot of the whole storage while writers are only held
+    back for that short collection step.
+    
+    The shards draw insertion sequence numbers from one shared counter,
+    and keyword search scores every shard with the summed collection
+    statistics, so results merged across shards are ranked exactly like a
+    single InMemoryStorage ranks them.
+    """
+    
+    def __init__(
+        self,
+        num_shards: int = 8,
+        read_write_locks: bool = True,
+        columnar: bool = False,
+        store_batch_size: int = 1024
+    ):
+        """
+        Initialize a new sharded storage backend.
+        
+        Args:
+            num_shards: Number of partitions (and locks)
+            read_write_locks: Whether readers of a shard may proceed together
+                             (ReadWriteLock) or exclude each other (plain mutex)
+            columnar: Whether shards keep numeric fields in MemoryColumns stores
+            store_batch_size: Number of items store_many buffers before storing them
+        """
+        self.num_shards = max(1, num_shards)
+        self.store_batch_size = max(1, store_batch_size)
+        sequence = itertools.count()
+        self._shards = [InMemoryStorage(columnar=columnar, sequence=sequence) for _ in range(self.num_shards)]
+        lock_type = ReadWriteLock if read_write_locks else _MutexLock
+        self._locks = [lock_type() for _ in range(self.num_shards)]
+        
+        logger.info(f"Initialized sharded storage ({self.num_shards} shards, read_write_locks={read_write_locks})")
+    
+    def _shard_of(self, memory_id: str) -> int:
+        """Get the index of the shard holding a memory ID."""
+        return hash(memory_id) % self.num_shards
+    
+    @contextmanager
+    def _read_all(self) -> Iterator[None]:
+        """Hold every shard for reading, acquired in shard order to avoid deadlocks."""
+        acquired = 0
+        try:
+            for lock in self._locks:
+                lock.acquire_read()
+                acquired += 1
+            yield
+        finally:
+            for lock in reversed(self._locks[:acquired]):
+                lock.release_read()
+    
+    def _group(self, memory_ids: Iterable[str]) -> Dict[int, List[str]]:
+        """Group memory IDs by shard."""
+        groups: Dict[int, List[str]] = {}
+        for memory_id in memory_ids:
+            groups.setdefault(self._shard_of(memory_id), []).append(memory_id)
+        return groups
+    
+    # BaseStorage interface
+    
+    def store(self, memory: MemoryItem) -> bool:
+        """
+        Store a memory item.
+        
+        Args:
+            memory: The memory item to store
+            
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        index = self._shard_of(memory.id)
+        with self._locks[index].write():
+            return self._shards[index].store(memory)
+    
+    def store_many(self, memories: Iterable[MemoryItem]) -> int:
+        """
+        Store several memory items, taking each shard's lock once per batch.
+        
+        Items are grouped by shard and stored every store_batch_size items
+        as the input is consumed, so a streamed input is never held whole.
+        
+        Args:
+            memories: The memory items to store (any iterable, consumed once)
+            
+        Returns:
+            The number of items stored
+        """
+        groups: Dict[int, List[MemoryItem]] = {}
+        buffered = 0
+        count = 0
+        for memory in memories:
+            groups.setdefault(self._shard_of(memory.id), []).append(memory)
+            buffered += 1
+            if buffered >= self.store_batch_size:
+                count += self._store_groups(groups)
+                groups = {}
+                buffered = 0
+        return count + self._store_groups(groups)
+    
+    def _store_groups(self, groups: Dict[int, List[MemoryItem]]) -> int:
+        """Store items grouped by shard index, locking each shard once."""
+        count = 0
+        for index in sorted(groups):
+            with self._locks[index].write():
+                count += self._shards[index].store_many(groups[index])
+        return count
+    
+    def retrieve(self, memory_id: str) -> Optional[MemoryItem]:
+        """
+        Retrieve a memory item by its ID.
+        
+        Args:
+            memory_id: The ID of the memory to retrieve
+            
+        Returns:
+            The memory item if found, None otherwise
+        """
+        index = self._shard_of(memory_id)
+        with self._locks[index].read():
+            return self._shards[index].retrieve(memory_id)
+    
+    def retrieve_many(self, memory_ids: Iterable[str]) -> List[MemoryItem]:
+        """
+        Retrieve several memory items by their IDs.
+        
+        Args:
+            memory_ids: The IDs of the memories to retrieve
+            
+        Returns:
+            The memory items found, in the order of the IDs (missing IDs are skipped)
+        """
+        memory_ids = list(memory_ids)
+        found: Dict[str, MemoryItem] = {}
+        for index, shard_ids in self._group(memory_ids).items():
+            with self._locks[index].read():
+                for memory in self._shards[index].retrieve_many(shard_ids):
+                    found[memory.id] = memory
+        return [found[memory_id] for memory_id in memory_ids if memory_id in found]
+    
+    def delete(self, memory_id: str) -> bool:
+        """
+        Delete a memory item.
+        
+        Args:
+            memory_id: The ID of the memory to delete
+            
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        index = self._shard_of(memory_id)
+        with self._locks[index].write():
+            return self._shards[index].delete(memory_id)
+    
+    def query(
+        self,
+        query: Dict[str, Any],
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[MemoryItem]:
+        """
+        Query for memory items matching the given criteria.
+        
+        Every shard answers the first offset + limit matches of the query
+        from its own indexes, and the shard results are merged by
+        importance (then insertion order).
+        
+        Args:
+            query: A dictionary of query parameters
+            limit: Maximum number of results to return
+            offset: Starting offset for pagination
+            
+        Returns:
+            A list of memory items matching the query
+        """
+        page_end = offset + limit
+        if limit <= 0 or page_end <= 0:
+            return []
+        
+        ranked: List[List[Tuple[float, int, MemoryItem]]] = []
+        with self._read_all():
+            for shard in self._shards:
+                seq = shard._seq
+                ranked.append([
+                    (-memory.importance, seq[memory.id], memory)
+                    for memory in shard.query(query, limit=page_end)
+                ])
+        
+        merged = heapq.merge(*ranked, key=lambda entry: entry[:2])
+        return [memory for _, _, memory in itertools.islice(merged, offset, page_end)]
+    
+    def search_text(
+        self,
+        text: str,
+        limit: Optional[int] = None,
+        match_all: bool = True,
+        candidate_ids: Optional[Set[str]] = None
+    ) -> List[Tuple[MemoryItem, float]]:
+        """
+        Find memories whose content matches a keyword query, ranked by BM25.
+        
+        Args:
+            text: The free-text query
+            limit: Maximum number of results (None for all matches)
+            match_all: Whether every query word must appear (AND) or any (OR)
+            candidate_ids: Optional set of memory IDs to restrict the search to
+            
+        Returns:
+            List of (memory, score) tuples, best match first
+        """
+        hits: List[Tuple[MemoryItem, float]] = []
+        with self._read_all():
+            # Score with the statistics of the whole collection, not each shard's
+            n_docs, total_length, frequencies = 0, 0, {}
+            for shard in self._shards:
+                shard_docs, shard_length, shard_frequencies = shard._text_index.collection_stats(text)
+                n_docs += shard_docs
+                total_length += shard_length
+                for term, count in shard_frequencies.items():
+                    frequencies[term] = frequencies.get(term, 0) + count
+            stats = (n_docs, total_length, frequencies)
+            
+            for shard in self._shards:
+                hits.extend(shard.search_text(
+                    text, limit=limit, match_all=match_all, candidate_ids=candidate_ids, stats=stats
+                ))
+        
+        # Same order as InvertedIndex.search: score, then ID
+        hits.sort(key=lambda hit: (hit[1], hit[0].id), reverse=True)
+        return hits if limit is None else hits[:limit]
+    
+    def clear(self) -> bool:
+        """
+        Clear all memory items from storage.
+        
+        Returns:
+            True if cleared successfully, False otherwise
+        """
+        for lock, shard in zip(self._locks, self._shards):
+            with lock.write():
+                shard.clear()
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the storage.
+        
+        Returns:
+            A dictionary of statistics, with the per-shard item counts under "shards"
+        """
+        with self._read_all():
+            shard_stats = [shard.get_stats() for shard in self._shards]
+        
+        memory_types: Dict[str, int] = {}
+        for stats in shard_stats:
+            for memory_type, count in stats["memory_types"].items():
+                memory_types[memory_type] = memory_types.get(memory_type, 0) + count
+        
+        return {
+            "total": sum(stats["total"] for stats in shard_stats),
+            "memory_types": memory_types,
+            "shards": [stats["total"] for stats in shard_stats],
+            "text_index": {
+                key: sum(stats["text_index"][key] for stats in shard_stats)
+                for key in ("documents", "terms", "tokens")
+            }
+        }
+    
+    def iter_memories(self, batch_size: int = 1000) -> Iterator[MemoryItem]:
+        """
+        Iterate over a consistent snapshot of every stored memory item.
+        
+        References to the items are collected while every shard is held
+        for reading, so the iteration reflects a single point in time and
+        later writes neither show up in it nor break it.
+        
+        Args:
+            batch_size: Unused; kept for interface compatibility
+            
+        Yields:
+            The stored memory items, in insertion order
+        """
+        with self._read_all():
+            snapshot = [
+                (shard._seq[memory_id], memory)
+                for shard in self._shards
+                for memory_id, memory in shard._memories.items()
+            ]
+        snapshot.sort(key=lambda entry: entry[0])
+        for _, memory in snapshot:
+            yield memory
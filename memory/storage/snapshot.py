@@ -0,0 +1,376 @@
+"""
+Snapshot Module
+
+This module provides the streaming snapshot format used to persist memory
+state: newline-delimited JSON records written and read one at a time,
+optionally framed with gzip or zstd, plus an append-only delta log of the
+changes made between two full snapshots.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
+
+from .write_behind import WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = "2.0"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+PathLike = Union[str, Path]
+
+
+def infer_compression(path: PathLike) -> Optional[str]:
+    """
+    Get the compression implied by a file name.
+    
+    Args:
+        path: The file path
+        
+    Returns:
+        "gzip" for .gz files, "zstd" for .zst files, None otherwise
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gz":
+        return "gzip"
+    if suffix in (".zst", ".zstd"):
+        return "zstd"
+    return None
+
+
+def detect_compression(path: PathLike) -> Optional[str]:
+    """
+    Get the compression of an existing file from its magic bytes.
+    
+    Args:
+        path: The file path
+        
+    Returns:
+        "gzip", "zstd" or None for plain text
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if magic == _ZSTD_MAGIC:
+        return "zstd"
+    return None
+
+
+def _zstandard() -> Any:
+    """Import the optional zstandard package."""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression requires the 'zstandard' package")
+
+
+def open_text(path: PathLike, mode: str, compression: Optional[str] = None, level: Optional[int] = None) -> IO[str]:
+    """
+    Open a text stream, optionally through a compressor.
+    
+    Args:
+        path: The file path
+        mode: "r" to read, "w" to write or "a" to append
+        compression: None, "gzip" or "zstd"
+        level: Optional compression level
+        
+    Returns:
+        A UTF-8 text stream
+    """
+    if compression is None:
+        return open(path, mode, encoding="utf-8", newline="\n")
+    
+    if compression == "gzip":
+        return gzip.open(
+            path, mode + "t", encoding="utf-8", newline="\n",
+            compresslevel=6 if level is None else level
+        )
+    
+    if compression == "zstd":
+        zstandard = _zstandard()
+        raw = open(path, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            stream = compressor.stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+    
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+class SnapshotWriter:
+    """
+    Streaming writer of a full snapshot.
+    
+    Records are serialized one at a time and written in chunks of roughly
+    chunk_size characters. The snapshot is written to a temporary file that
+    replaces the target only once the end record has been written, so a
+    crash never leaves a truncated snapshot in place.
+    """
+    
+    def __init__(
+        self,
+        path: PathLike,
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+        chunk_size: int = 1 << 20
+    ):
+        """
+        Initialize a new snapshot writer.
+        
+        Args:
+            path: Path of the snapshot file
+            compression: None, "gzip" or "zstd"
+            level: Optional compression level
+            chunk_size: Approximate number of characters buffered per write
+        """
+        self.path = Path(path)
+        self.compression = compression
+        self.level = level
+        self.chunk_size = max(1, chunk_size)
+        self.counts: Dict[str, int] = {}
+        
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._stream: Optional[IO[str]] = None
+        self._buffer: List[str] = []
+        self._buffered = 0
+    
+    def __enter__(self) -> "SnapshotWriter":
+        """Open the temporary file and write the header record."""
+        if self.path.parent:
+            os.makedirs(self.path.parent, exist_ok=True)
+        self._stream = open_text(self._tmp_path, "w", self.compression, self.level)
+        self._write_line({
+            "type": "header",
+            "version": SNAPSHOT_VERSION,
+            "timestamp": datetime.now().isoformat()
+        })
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Finish the snapshot, or discard it if the block raised."""
+        if exc_type is None:
+            self._write_line({"type": "end", "counts": self.counts})
+            self._flush_buffer()
+            self._stream.close()
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._stream.close()
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+    
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        """Serialize a record into the write buffer."""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self.chunk_size:
+            self._flush_buffer()
+    
+    def _flush_buffer(self) -> None:
+        """Write the buffered chunk to the stream."""
+        if self._buffer:
+            self._stream.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+    
+    def write(self, record_type: str, data: Dict[str, Any]) -> None:
+        """
+        Write one record.
+        
+        Args:
+            record_type: The record type (e.g. "memory" or "link")
+            data: The record fields
+        """
+        record = {"type": record_type}
+        record.update(data)
+        self._write_line(record)
+        self.counts[record_type] = self.counts.get(record_type, 0) + 1
+
+
+def read_records(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a snapshot or delta log, one at a time.
+    
+    The compression is detected from the file contents. A truncated last
+    line (e.g. from a crash while appending) is skipped.
+    
+    Args:
+        path: Path of the file
+        
+    Yields:
+        The decoded records, in file order
+    """
+    with open_text(path, "r", detect_compression(path)) as stream:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable record at {path}:{line_number}")
+
+
+def is_snapshot(path: PathLike) -> bool:
+    """
+    Check whether a file is a streaming snapshot (as opposed to a legacy JSON state).
+    
+    Args:
+        path: Path of the file
+        
+    Returns:
+        True if the first record is a snapshot header, False otherwise
+    """
+    try:
+        with open_text(path, "r", detect_compression(path)) as stream:
+            first = json.loads(stream.readline())
+        return isinstance(first, dict) and first.get("type") == "header"
+    except (ValueError, OSError):
+        return False
+
+
+class DeltaLog:
+    """
+    Append-only log of the changes made since the last full snapshot.
+    
+    Each change is one JSON line. Lines go through a write-behind queue
+    and are appended in groups, once flush_records are pending or once the
+    oldest has waited flush_interval_ms (and on flush()/close()), so logging
+    does not cost one write per change and a crash loses at most the last
+    few milliseconds of changes. Replaying the log over the snapshot it
+    follows restores the latest state; every operation is idempotent, so
+    changes that also made it into the snapshot are harmless to replay.
+    """
+    
+    def __init__(self, path: PathLike, flush_records: int = 256, flush_interval_ms: float = 50.0):
+        """
+        Initialize a new delta log.
+        
+        Args:
+            path: Path of the log file
+            flush_records: Number of buffered records that triggers a write
+            flush_interval_ms: Maximum time a record may stay buffered
+        """
+        self.path = Path(path)
+        self.flush_records = max(1, flush_records)
+        self._lock = threading.Lock()
+        self._records = 0
+        
+        if self.path.parent:
+            os.makedirs(self.path.parent, exist_ok=True)
+        
+        self._queue = WriteBehindQueue(
+            self._write,
+            max_items=self.flush_records,
+            max_delay_ms=flush_interval_ms,
+            name="DeltaLog"
+        )
+    
+    def __len__(self) -> int:
+        """Get the number of records logged since the log was last reset."""
+        return self._records
+    
+    def append(self, op: str, **fields: Any) -> None:
+        """
+        Log a change.
+        
+        Args:
+            op: The operation ("put", "delete", "link", "unlink" or "clear")
+            **fields: The operation's fields
+        """
+        fields["op"] = op
+        line = json.dumps(fields, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        self._queue.put(line)
+        with self._lock:
+            self._records += 1
+    
+    def _write(self, lines: List[str]) -> None:
+        """Append a batch of lines to the file."""
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8", newline="\n") as f:
+                f.write("".join(lines))
+    
+    def flush(self) -> None:
+        """Append every buffered record to the file."""
+        self._queue.flush()
+    
+    def rotate(self) -> Optional[Path]:
+        """
+        Start a new log, keeping the previous one until the next checkpoint is written.
+        
+        Returns:
+            Path of the rotated log, or None if nothing was logged
+        """
+        self._queue.flush()
+        with self._lock:
+            self._records = 0
+            previous = self.previous_path
+            if not self.path.exists():
+                return previous if previous.exists() else None
+            
+            if previous.exists():
+                # The last checkpoint failed: keep every change since the one before
+                with open(self.path, "rb") as src, open(previous, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, previous)
+            return previous
+    
+    @property
+    def previous_path(self) -> Path:
+        """Path of the log rotated out by the checkpoint in progress (or a failed one)."""
+        return self.path.with_name(self.path.name + ".prev")
+    
+    def discard_previous(self) -> None:
+        """Delete the rotated log once the checkpoint covering it has been written."""
+        try:
+            os.remove(self.previous_path)
+        except FileNotFoundError:
+            pass
+    
+    def reset(self) -> None:
+        """Drop every logged change (both the current and the rotated log)."""
+        self._queue.flush()
+        with self._lock:
+            self._records = 0
+            for path in (self.path, self.previous_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    def close(self) -> None:
+        """Flush buffered records and stop the background writer."""
+        self._queue.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the log.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        pending = len(self._queue)
+        return {
+            "path": str(self.path),
+            "records": self._records,
+            "pending": pending,
+            "bytes": self.path.stat().st_size if self.path.exists() else 0
+        }
@@ -0,0 +1,245 @@
+"""
+SQLite Connection Pool Module
+
+This module provides a thread-local SQLite connection pool shared by the
+SQLite-backed memory stores, so connections (and their prepared statement
+caches) are reused instead of being reopened on every call.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pragmas applied to every pooled connection. WAL lets readers proceed while a
+# writer commits, and synchronous=NORMAL only syncs on checkpoints in WAL mode.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,        # Negative values are KiB: ~16 MB page cache
+    "mmap_size": 268435456,      # 256 MB of memory-mapped I/O
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000
+}
+
+
+class SQLiteConnectionPool:
+    """
+    Pool of SQLite connections with one connection per thread.
+    
+    Each thread reuses its own long-lived connection, so the per-connection
+    statement cache turns repeated queries into prepared statement reuse.
+    Connections opened by threads that have since exited are closed the
+    next time a connection is opened, and a connection closed directly by
+    a caller is replaced on its thread's next request.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        pragmas: Optional[Dict[str, Any]] = None,
+        cached_statements: int = 256
+    ):
+        """
+        Initialize a new connection pool.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            pragmas: Pragmas to apply to each connection (defaults to DEFAULT_PRAGMAS)
+            cached_statements: Number of prepared statements cached per connection
+        """
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements
+        
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[weakref.ref, sqlite3.Connection]] = []
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        # Each connection is only used by the thread that opened it; the
+        # check is disabled so close_all() can close it from any thread
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the connection of the calling thread, opening it on first use.
+        
+        Returns:
+            A configured SQLite connection
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.in_transaction
+                return conn
+            except sqlite3.ProgrammingError:
+                # Closed outside the pool: replace it
+                logger.debug(f"Replacing closed pooled SQLite connection to {self.db_path}")
+        
+        stale = conn
+        conn = self._open()
+        self._local.conn = conn
+        
+        with self._lock:
+            alive = []
+            for thread_ref, other in self._connections:
+                thread = thread_ref()
+                if other is stale:
+                    continue
+                if thread is None or not thread.is_alive():
+                    other.close()
+                else:
+                    alive.append((thread_ref, other))
+            alive.append((weakref.ref(threading.current_thread()), conn))
+            self._connections = alive
+        
+        logger.debug(f"Opened pooled SQLite connection to {self.db_path}")
+        return conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run statements in a single transaction on the calling thread's connection.
+        
+        Commits when the block exits normally and rolls back if it raises.
+        
+        Yields:
+            A cursor on the pooled connection
+        """
+        conn = self.connection()
+        with conn:
+            yield conn.cursor()
+    
+    def execute(self, sql: str, params: Any = ()) -> sqlite3.Cursor:
+        """
+        Execute a statement on the calling thread's connection.
+        
+        Args:
+            sql: The SQL statement
+            params: Statement parameters
+            
+        Returns:
+            The cursor holding the results
+        """
+        return self.connection().execute(sql, params)
+    
+    def create_fts_index(
+        self,
+        table: str,
+        columns: Dict[str, str],
+        name: Optional[str] = None,
+        tokenizer: str = "unicode61 remove_diacritics 2"
+    ) -> bool:
+        """
+        Create an FTS5 full-text index over a table, kept in sync by triggers.
+        
+        The index is a standalone FTS5 table named "<table>_fts" whose rowids
+        mirror the source table's. Each indexed column is computed from the
+        source row by an SQL expression in which "{row}" stands for the row
+        alias, so stored values (e.g. JSON) can be turned into plain text.
+        The index is filled from existing rows when it is first created.
+        
+        Args:
+            table: Name of the source table
+            columns: Mapping of FTS column name to the SQL expression computing it
+            name: Name of the FTS5 table (defaults to "<table>_fts")
+            tokenizer: FTS5 tokenizer, e.g. "trigram" for substring search
+            
+        Returns:
+            True if the index is available, False if FTS5 (or JSON1) is not
+        """
+        fts_table = name or f"{table}_fts"
+        names = ", ".join(columns)
+        
+        def values(row: str) -> str:
+            return ", ".join(expression.format(row=row) for expression in columns.values())
+        
+        changed = " OR ".join(
+            f"({expression.format(row='old')}) IS NOT ({expression.format(row='new')})"
+            for expression in columns.values()
+        )
+        
+        conn = self.connection()
+        try:
+            with conn:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+                ).fetchone()
+                
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} "
+                    f"USING fts5({names}, tokenize='{tokenizer}')"
+                )
+                conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts_table}(rowid, {names}) VALUES (new.rowid, {values("new")});
+                END
+                ''')
+                conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN
+                    DELETE FROM {fts_table} WHERE rowid = old.rowid;
+                END
+                ''')
+                conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE ON {table}
+                WHEN {changed} BEGIN
+                    DELETE FROM {fts_table} WHERE rowid = old.rowid;
+                    INSERT INTO {fts_table}(rowid, {names}) VALUES (new.rowid, {values("new")});
+                END
+                ''')
+                
+                if not exists:
+                    conn.execute(
+                        f"INSERT INTO {fts_table}(rowid, {names}) "
+                        f"SELECT rowid, {values(table)} FROM {table}"
+                    )
+            
+            logger.debug(f"Full-text index {fts_table} ready on {table} ({names})")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search unavailable for {table}, using substring search: {e}")
+            return False
+    
+    def close_all(self) -> None:
+        """Close every connection opened by the pool."""
+        with self._lock:
+            for _, conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled SQLite connection: {e}")
+            self._connections = []
+        self._local = threading.local()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the pool.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            open_connections = len(self._connections)
+        return {
+            "db_path": self.db_path,
+            "open_connections": open_connections,
+            "pragmas": dict(self.pragmas)
+        }
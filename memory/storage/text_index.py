@@ -0,0 +1,301 @@
+"""
+Text Index Module
+
+This module provides keyword search helpers shared by the storage backends:
+a tokenizer compatible with SQLite's FTS5 unicode61 tokenizer, an in-process
+BM25-ranked inverted index, FTS5 query building and match highlighting.
+"""
+
+import json
+import logging
+import math
+import re
+import heapq
+import unicodedata
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def content_to_text(content: Any) -> str:
+    """
+    Get the searchable text of a memory's content.
+    
+    Args:
+        content: The memory content (string, dict, list or any other value)
+        
+    Returns:
+        The text to index
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, (dict, list)):
+        try:
+            return json.dumps(content, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return str(content)
+    return str(content)
+
+
+def normalize_token(token: str) -> str:
+    """
+    Normalize a token the way FTS5's unicode61 tokenizer (remove_diacritics 2) does.
+    
+    Args:
+        token: The raw token
+        
+    Returns:
+        The lowercased token without diacritics
+    """
+    token = token.lower()
+    if token.isascii():
+        return token
+    decomposed = unicodedata.normalize("NFKD", token)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into normalized word tokens.
+    
+    Args:
+        text: The text to tokenize
+        
+    Returns:
+        The list of tokens, in order
+    """
+    if text.isascii():
+        # ASCII text has no diacritics, so lowercasing it whole is enough
+        return _TOKEN_RE.findall(text.lower())
+    return [normalize_token(match) for match in _TOKEN_RE.findall(text)]
+
+
+def build_fts_query(text: str, match_all: bool = True) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    
+    Every token is quoted, so user input can never be parsed as FTS5 syntax.
+    
+    Args:
+        text: The free-text query
+        match_all: Whether every token must match (AND) or any token (OR)
+        
+    Returns:
+        The MATCH expression, or None if the text has no tokens
+    """
+    terms = list(dict.fromkeys(tokenize(text)))
+    if not terms:
+        return None
+    separator = " " if match_all else " OR "
+    return separator.join(f'"{term}"' for term in terms)
+
+
+def highlight(text: str, query: str, start: str = "[", end: str = "]") -> str:
+    """
+    Mark the words of a text that match query tokens.
+    
+    Args:
+        text: The text to highlight
+        query: The query whose tokens are marked
+        start: Marker inserted before each match
+        end: Marker inserted after each match
+        
+    Returns:
+        The text with matching words wrapped in the markers
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return text
+    return _TOKEN_RE.sub(
+        lambda match: f"{start}{match.group(0)}{end}" if normalize_token(match.group(0)) in terms else match.group(0),
+        text
+    )
+
+
+class InvertedIndex:
+    """
+    In-process inverted index with Okapi BM25 ranking.
+    
+    Postings map each term to the documents containing it and the term's
+    frequency there, so a query only touches the documents sharing one of
+    its terms instead of scanning every stored text.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize a new inverted index.
+        
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self._doc_lengths)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        """Check whether a document is indexed."""
+        return doc_id in self._doc_lengths
+    
+    def add(self, doc_id: str, text: str) -> None:
+        """
+        Index (or reindex) the text of a document.
+        
+        Args:
+            doc_id: The document ID
+            text: The document text
+        """
+        self.remove(doc_id)
+        
+        tokens = tokenize(text)
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        
+        self._doc_terms[doc_id] = frequencies
+        self._doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+    
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document from the index.
+        
+        Args:
+            doc_id: The document ID
+            
+        Returns:
+            True if the document was indexed, False otherwise
+        """
+        frequencies = self._doc_terms.pop(doc_id, None)
+        if frequencies is None:
+            return False
+        
+        for term in frequencies:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+    
+    def clear(self) -> None:
+        """Remove every document from the index."""
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+    
+    def collection_stats(self, query: str) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Get the collection statistics BM25 uses to score a query.
+        
+        Statistics of several indexes can be summed and passed to search,
+        so that partitioned indexes score exactly like a single one.
+        
+        Args:
+            query: The free-text query
+            
+        Returns:
+            (document count, total document length, document frequency of each query term)
+        """
+        frequencies = {term: len(self._postings.get(term, ())) for term in tokenize(query)}
+        return len(self._doc_lengths), self._total_length, frequencies
+    
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        match_all: bool = True,
+        candidates: Optional[Set[str]] = None,
+        stats: Optional[Tuple[int, int, Dict[str, int]]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the documents matching a query, ranked by BM25.
+        
+        Args:
+            query: The free-text query
+            limit: Maximum number of results (None for all matches)
+            match_all: Whether every query token must appear (AND) or any (OR)
+            candidates: Optional set of document IDs to restrict the search to
+            stats: Collection statistics to score with (see collection_stats);
+                  defaults to this index's own
+                  
+        Returns:
+            List of (doc_id, score) tuples, best match first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or (limit is not None and limit <= 0):
+            return []
+        
+        postings = [self._postings.get(term, {}) for term in terms]
+        if match_all:
+            if any(not p for p in postings):
+                return []
+            # Intersect smallest-first so the working set only ever shrinks
+            ordered = sorted(postings, key=len)
+            matched = set(ordered[0])
+            for p in ordered[1:]:
+                matched.intersection_update(p.keys())
+        else:
+            matched = set()
+            for p in postings:
+                matched.update(p.keys())
+        
+        if candidates is not None:
+            matched &= candidates
+        if not matched:
+            return []
+        
+        if stats is None:
+            n_docs, total_length = len(self._doc_lengths), self._total_length
+            frequencies = [len(p) for p in postings]
+        else:
+            n_docs, total_length, term_frequencies = stats
+            frequencies = [term_frequencies.get(term, 0) for term in terms]
+        avg_length = total_length / n_docs if n_docs else 0.0
+        idfs = [math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)) for df in frequencies]
+        
+        k1, b = self.k1, self.b
+        lengths = self._doc_lengths
+        
+        def score(doc_id: str) -> float:
+            norm = k1 * (1.0 - b + b * lengths[doc_id] / avg_length) if avg_length else k1
+            total = 0.0
+            for idf, p in zip(idfs, postings):
+                frequency = p.get(doc_id)
+                if frequency:
+                    total += idf * frequency * (k1 + 1.0) / (frequency + norm)
+            return total
+        
+        scored: Iterable[Tuple[str, float]] = ((doc_id, score(doc_id)) for doc_id in matched)
+        key = lambda item: (item[1], item[0])
+        if limit is None or limit >= len(matched):
+            return sorted(scored, key=key, reverse=True)
+        return heapq.nlargest(limit, scored, key=key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the index.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._postings),
+            "tokens": self._total_length
+        }
@@ -0,0 +1,230 @@
+"""
+Write-Behind Queue Module
+
+This module provides a write-behind queue that buffers writes and commits
+them in groups, trading a short delay for far fewer transactions.
+"""
+
+import atexit
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Queues still alive at interpreter exit are flushed by _flush_all_queues
+_live_queues: "weakref.WeakSet[WriteBehindQueue]" = weakref.WeakSet()
+
+
+class WriteBehindQueue:
+    """
+    Buffer of pending writes committed in groups by a background thread.
+    
+    Items are handed to a flush function in insertion order, either once
+    max_items are pending or once the oldest pending item has waited
+    max_delay_ms. Flushes are serialized, so after flush() returns every
+    item put before the call has been written.
+    
+    A batch the flush function fails on is put back at the head of the
+    queue, never dropped: the background thread retries it with
+    exponential backoff, and flush() and close() raise the error if they
+    cannot write it either.
+    """
+    
+    def __init__(
+        self,
+        flush_function: Callable[[List[Any]], Any],
+        max_items: int = 500,
+        max_delay_ms: float = 50.0,
+        name: str = "WriteBehindQueue",
+        retry_delay_ms: float = 100.0,
+        max_retry_delay_ms: float = 5000.0
+    ):
+        """
+        Initialize a new write-behind queue.
+        
+        Args:
+            flush_function: Function that writes a batch of items
+            max_items: Number of pending items that triggers a flush
+            max_delay_ms: Maximum time an item may wait before being flushed
+            name: Name of the background flush thread
+            retry_delay_ms: Time the background thread waits before retrying
+                           a failed batch, doubled after each further failure
+            max_retry_delay_ms: Upper bound on the time between retries
+        """
+        self.flush_function = flush_function
+        self.max_items = max(1, max_items)
+        self.max_delay = max(0.0, max_delay_ms) / 1000.0
+        self.retry_delay = max(0.0, retry_delay_ms) / 1000.0
+        self.max_retry_delay = max(self.retry_delay, max_retry_delay_ms / 1000.0)
+        
+        self._pending: List[Any] = []
+        self._oldest: float = 0.0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        # Consecutive failed flushes, and when the background thread may retry
+        self._failures = 0
+        self._retry_at: float = 0.0
+        self._stats: Dict[str, int] = {"enqueued": 0, "flushed": 0, "batches": 0, "errors": 0}
+        
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+        self._thread.start()
+        _live_queues.add(self)
+    
+    def __len__(self) -> int:
+        """Get the number of pending items."""
+        return len(self._pending)
+    
+    def put(self, item: Any) -> None:
+        """
+        Queue an item for writing.
+        
+        Args:
+            item: The item to write
+        """
+        self.put_many([item])
+    
+    def put_many(self, items: Sequence[Any]) -> None:
+        """
+        Queue several items for writing.
+        
+        Args:
+            items: The items to write, in order
+        """
+        if not items:
+            return
+        
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(items)
+            self._stats["enqueued"] += len(items)
+            self._condition.notify()
+    
+    def _take(self) -> List[Any]:
+        """Remove and return every pending item (caller holds the condition)."""
+        batch = self._pending
+        self._pending = []
+        return batch
+    
+    def _write(self, batch: List[Any]) -> Optional[Exception]:
+        """
+        Hand a batch to the flush function (caller holds the flush lock).
+        
+        Returns:
+            None if the batch was written, or the error if it was put back
+            at the head of the queue
+        """
+        if not batch:
+            return None
+        try:
+            self.flush_function(batch)
+        except Exception as e:
+            with self._condition:
+                self._pending[:0] = batch
+                self._oldest = time.monotonic()
+                self._failures += 1
+                backoff = self.retry_delay * 2 ** (self._failures - 1)
+                self._retry_at = self._oldest + min(backoff, self.max_retry_delay)
+                self._stats["errors"] += 1
+            logger.error(f"Error flushing {len(batch)} queued writes (kept for retry): {e}")
+            return e
+        
+        with self._condition:
+            self._failures = 0
+            self._stats["flushed"] += len(batch)
+            self._stats["batches"] += 1
+        return None
+    
+    def _run(self) -> None:
+        """Background loop flushing batches when they are full or old enough."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+                    now = time.monotonic()
+                    if self._failures and now < self._retry_at:
+                        # Back off before retrying a failed batch
+                        self._condition.wait(self._retry_at - now)
+                        continue
+                    if len(self._pending) >= self.max_items:
+                        break
+                    remaining = self._oldest + self.max_delay - now
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                # close() writes whatever is left
+                if self._closed:
+                    return
+            
+            with self._flush_lock:
+                with self._condition:
+                    batch = self._take()
+                self._write(batch)
+    
+    def flush(self) -> None:
+        """
+        Write every pending item now, waiting for any flush in progress.
+        
+        Raises:
+            Exception: The flush function's error, if it fails; the items
+                       stay queued
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = self._take()
+            error = self._write(batch)
+        if error is not None:
+            raise error
+    
+    def close(self) -> None:
+        """
+        Flush pending items and stop the background thread.
+        
+        Raises:
+            Exception: The flush function's error, if the last items cannot
+                       be written; they stay queued and close() can be
+                       called again
+        """
+        with self._condition:
+            if self._closed and not self._pending:
+                return
+            stopping = not self._closed
+            self._closed = True
+            self._condition.notify()
+        
+        if stopping and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5.0)
+        self.flush()
+        _live_queues.discard(self)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the queue.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            stats["failures"] = self._failures
+        return stats
+
+
+@atexit.register
+def _flush_all_queues() -> None:
+    """Flush every live write-behind queue at interpreter shutdown."""
+    for queue in list(_live_queues):
+        try:
+            queue.close()
+        except Exception as e:
+            logger.error(f"Error flushing write-behind queue at shutdown: {e}")
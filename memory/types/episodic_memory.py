@@ -7,18 +7,27 @@ of related events or experiences with temporal context.
 
 import logging
 import json
-import os
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator
 from datetime import datetime, timedelta
-import sqlite3
 from uuid import uuid4
 
 from ..core.memory_system import MemorySystem
 from ..core.memory_item import MemoryItem
 from ..storage.in_memory_storage import InMemoryStorage
+from ..storage.sqlite_pool import SQLiteConnectionPool
+from ..storage.text_index import build_fts_query
 
 logger = logging.getLogger(__name__)
 
+# Columns of the episodes table, in the order _row_to_episode expects them
+_EPISODE_COLUMNS = (
+    "{e}id, {e}title, {e}description, {e}importance, {e}created_at, "
+    "{e}last_accessed, {e}access_count, {e}metadata, {e}is_active"
+)
+
+# Maximum number of episode IDs bound in one IN (...) query
+_IN_BATCH = 500
+
 
 class Episode:
     """
@@ -56,7 +65,7 @@ class Episode:
         self.metadata = metadata or {}
         self.memory_ids = []  # IDs of memories in this episode
         self.is_active = True  # Whether this episode is currently active
-        
+    
     def add_memory(self, memory_id: str) -> None:
         """
         Add a memory to this episode.
@@ -66,7 +75,7 @@ class Episode:
         """
         if memory_id not in self.memory_ids:
             self.memory_ids.append(memory_id)
-            
+    
     def access(self) -> None:
         """
         Record an access to this episode.
@@ -74,7 +83,7 @@ class Episode:
         """
         self.last_accessed = datetime.now()
         self.access_count += 1
-        
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the episode to a dictionary for serialization.
@@ -128,27 +137,39 @@ class EpisodicStorage:
     Storage backend for episodic memories.
     
     This class provides persistent storage for episodes and their
-    associated memories using SQLite.
+    associated memories using SQLite, with connections drawn from a
+    thread-local pool.
+    
+    Listing fetches the memory IDs of a whole page of episodes in one
+    query, paging through every episode uses keyset pagination over an
+    index matching the listing order, and substring search over titles
+    and descriptions goes through a trigram full-text index.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        pool: Optional[SQLiteConnectionPool] = None,
+        substring_index: bool = True
+    ):
         """
         Initialize a new episodic storage backend.
         
         Args:
             db_path: Path to the SQLite database file
+            pool: Optional connection pool to share (one is created if not provided)
+            substring_index: Whether to keep a trigram index for substring search
         """
         self.db_path = db_path
+        self.pool = pool or SQLiteConnectionPool(db_path)
+        self.substring_index = substring_index
         self._initialize_db()
     
     def _initialize_db(self) -> None:
         """
         Initialize the SQLite database with the necessary tables.
         """
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.connection()
         cursor = conn.cursor()
         
         # Create episodes table
@@ -180,13 +201,109 @@ class EpisodicStorage:
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_episode_importance ON episodes(importance)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_episode_active ON episodes(is_active)')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_episode_order ON episodes(importance, last_accessed, id)'
+        )
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_episode_memories_memory ON episode_memories(memory_id)')
         
         conn.commit()
-        conn.close()
+        
+        # Full-text index over episode titles and descriptions
+        self.fts_enabled = self.pool.create_fts_index(
+            "episodes", {"title": "{row}.title", "description": "{row}.description"}
+        )
+        
+        # Trigram index for substring matches (e.g. partial words)
+        self.trigram_enabled = self.substring_index and self.pool.create_fts_index(
+            "episodes", {"title": "{row}.title", "description": "{row}.description"},
+            name="episodes_trigram", tokenizer="trigram"
+        )
         
         logger.info(f"Initialized episodic storage at {self.db_path}")
     
+    @staticmethod
+    def _row_to_episode(row: Tuple, memory_ids: List[str]) -> Episode:
+        """
+        Build an episode from an episodes row (see _EPISODE_COLUMNS).
+        
+        Args:
+            row: The row
+            memory_ids: The IDs of the episode's memories
+            
+        Returns:
+            The episode
+        """
+        return Episode.from_dict({
+            "id": row[0],
+            "title": row[1],
+            "description": row[2],
+            "importance": row[3],
+            "created_at": row[4],
+            "last_accessed": row[5],
+            "access_count": row[6],
+            "metadata": json.loads(row[7]) if row[7] else {},
+            "is_active": bool(row[8]),
+            "memory_ids": memory_ids
+        })
+    
+    @staticmethod
+    def _fetch_memory_ids(cursor: Any, episode_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the memory IDs of several episodes with one query per batch of episodes.
+        
+        Args:
+            cursor: The cursor to query with
+            episode_ids: The IDs of the episodes
+            
+        Returns:
+            Mapping of episode ID to its memory IDs, in the order they were added
+        """
+        memory_ids: Dict[str, List[str]] = {episode_id: [] for episode_id in episode_ids}
+        for start in range(0, len(episode_ids), _IN_BATCH):
+            batch = episode_ids[start:start + _IN_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            cursor.execute(
+                f"SELECT episode_id, memory_id FROM episode_memories "
+                f"WHERE episode_id IN ({placeholders}) ORDER BY rowid",
+                batch
+            )
+            for episode_id, memory_id in cursor.fetchall():
+                memory_ids[episode_id].append(memory_id)
+        return memory_ids
+    
+    def _rows_to_episodes(self, cursor: Any, rows: List[Tuple], include_memory_ids: bool = True) -> List[Episode]:
+        """
+        Build the episodes of a page of rows, fetching their memory IDs together.
+        
+        Args:
+            cursor: The cursor to query with
+            rows: The episode rows (see _EPISODE_COLUMNS)
+            include_memory_ids: Whether to load the memory IDs (left empty otherwise)
+            
+        Returns:
+            The episodes, in row order
+        """
+        memory_ids = self._fetch_memory_ids(cursor, [row[0] for row in rows]) if include_memory_ids else {}
+        return [self._row_to_episode(row, memory_ids.get(row[0], [])) for row in rows]
+    
+    @staticmethod
+    def _filter_sql(active_only: bool, min_importance: float, alias: str = "") -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE conditions shared by listing and search.
+        
+        Args:
+            active_only: Whether to only include active episodes
+            min_importance: Minimum importance threshold
+            alias: Table alias prefix (e.g. "e.")
+            
+        Returns:
+            The SQL conditions and their parameters
+        """
+        sql = f"{alias}importance >= ?"
+        if active_only:
+            sql += f" AND {alias}is_active = 1"
+        return sql, [min_importance]
+    
     def store_episode(self, episode: Episode) -> bool:
         """
         Store an episode in the database.
@@ -198,41 +315,44 @@ class EpisodicStorage:
             True if stored successfully, False on error
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Store episode
-            cursor.execute('''
-            INSERT OR REPLACE INTO episodes
-            (id, title, description, importance, created_at, last_accessed, 
-             access_count, metadata, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                episode.id,
-                episode.title,
-                episode.description,
-                episode.importance,
-                episode.created_at.isoformat(),
-                episode.last_accessed.isoformat(),
-                episode.access_count,
-                json.dumps(episode.metadata),
-                1 if episode.is_active else 0
-            ))
-            
-            # Store memory associations
-            # First, delete any existing associations
-            cursor.execute('DELETE FROM episode_memories WHERE episode_id = ?', (episode.id,))
-            
-            # Then insert the current associations
-            now = datetime.now().isoformat()
-            for memory_id in episode.memory_ids:
+            with self.pool.transaction() as cursor:
+                # Store episode
                 cursor.execute('''
+                INSERT INTO episodes
+                (id, title, description, importance, created_at, last_accessed, 
+                 access_count, metadata, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    importance = excluded.importance,
+                    created_at = excluded.created_at,
+                    last_accessed = excluded.last_accessed,
+                    access_count = excluded.access_count,
+                    metadata = excluded.metadata,
+                    is_active = excluded.is_active
+                ''', (
+                    episode.id,
+                    episode.title,
+                    episode.description,
+                    episode.importance,
+                    episode.created_at.isoformat(),
+                    episode.last_accessed.isoformat(),
+                    episode.access_count,
+                    json.dumps(episode.metadata),
+                    1 if episode.is_active else 0
+                ))
+                
+                # Store memory associations
+                # First, delete any existing associations
+                cursor.execute('DELETE FROM episode_memories WHERE episode_id = ?', (episode.id,))
+                
+                # Then insert the current associations
+                now = datetime.now().isoformat()
+                cursor.executemany('''
                 INSERT INTO episode_memories (episode_id, memory_id, added_at)
                 VALUES (?, ?, ?)
-                ''', (episode.id, memory_id, now))
-            
-            conn.commit()
-            conn.close()
+                ''', [(episode.id, memory_id, now) for memory_id in episode.memory_ids])
             
             logger.debug(f"Stored episode in database: {episode.id}")
             return True
@@ -251,48 +371,19 @@ class EpisodicStorage:
             The episode if found, None otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self.pool.connection().cursor()
             
-            # Get episode
-            cursor.execute('''
-            SELECT id, title, description, importance, created_at, 
-                   last_accessed, access_count, metadata, is_active
-            FROM episodes
-            WHERE id = ?
-            ''', (episode_id,))
+            cursor.execute(
+                f"SELECT {_EPISODE_COLUMNS.format(e='')} FROM episodes WHERE id = ?",
+                (episode_id,)
+            )
             
             row = cursor.fetchone()
             if not row:
                 logger.debug(f"Episode not found in database: {episode_id}")
-                conn.close()
                 return None
             
-            # Convert row to episode
-            episode_data = {
-                "id": row[0],
-                "title": row[1],
-                "description": row[2],
-                "importance": row[3],
-                "created_at": row[4],
-                "last_accessed": row[5],
-                "access_count": row[6],
-                "metadata": json.loads(row[7]) if row[7] else {},
-                "is_active": bool(row[8])
-            }
-            
-            # Get memory IDs for this episode
-            cursor.execute('''
-            SELECT memory_id FROM episode_memories
-            WHERE episode_id = ?
-            ''', (episode_id,))
-            
-            memory_ids = [r[0] for r in cursor.fetchall()]
-            episode_data["memory_ids"] = memory_ids
-            
-            conn.close()
-            
-            episode = Episode.from_dict(episode_data)
+            episode = self._rows_to_episodes(cursor, [row])[0]
             logger.debug(f"Retrieved episode from database: {episode_id}")
             return episode
         except Exception as e:
@@ -304,69 +395,36 @@ class EpisodicStorage:
         active_only: bool = False,
         min_importance: float = 0.0,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        include_memory_ids: bool = True
     ) -> List[Episode]:
         """
         List episodes from the database.
         
+        The memory IDs of the whole page are fetched with a single query.
+        For walking through many episodes, iter_episodes avoids the cost
+        of large offsets.
+        
         Args:
             active_only: Whether to only include active episodes
             min_importance: Minimum importance threshold
             limit: Maximum number of episodes to return
             offset: Starting offset for pagination
+            include_memory_ids: Whether to load each episode's memory IDs
             
         Returns:
-            A list of episodes
+            A list of episodes, most important (then most recently accessed) first
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Build query
-            query = '''
-            SELECT id, title, description, importance, created_at, 
-                   last_accessed, access_count, metadata, is_active
-            FROM episodes
-            WHERE importance >= ?
-            '''
-            params = [min_importance]
-            
-            if active_only:
-                query += " AND is_active = 1"
-            
-            query += " ORDER BY importance DESC, last_accessed DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-            
-            # Execute query
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            episodes = []
-            for row in rows:
-                episode_data = {
-                    "id": row[0],
-                    "title": row[1],
-                    "description": row[2],
-                    "importance": row[3],
-                    "created_at": row[4],
-                    "last_accessed": row[5],
-                    "access_count": row[6],
-                    "metadata": json.loads(row[7]) if row[7] else {},
-                    "is_active": bool(row[8])
-                }
-                
-                # Get memory IDs for this episode
-                cursor.execute('''
-                SELECT memory_id FROM episode_memories
-                WHERE episode_id = ?
-                ''', (episode_data["id"],))
-                
-                memory_ids = [r[0] for r in cursor.fetchall()]
-                episode_data["memory_ids"] = memory_ids
-                
-                episodes.append(Episode.from_dict(episode_data))
+            cursor = self.pool.connection().cursor()
             
-            conn.close()
+            where, params = self._filter_sql(active_only, min_importance)
+            cursor.execute(
+                f"SELECT {_EPISODE_COLUMNS.format(e='')} FROM episodes WHERE {where} "
+                f"ORDER BY importance DESC, last_accessed DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            )
+            episodes = self._rows_to_episodes(cursor, cursor.fetchall(), include_memory_ids)
             
             logger.debug(f"Listed {len(episodes)} episodes from database")
             return episodes
@@ -374,6 +432,182 @@ class EpisodicStorage:
             logger.error(f"Error listing episodes from database: {e}")
             return []
     
+    def iter_episodes(
+        self,
+        active_only: bool = False,
+        min_importance: float = 0.0,
+        batch_size: int = 500,
+        include_memory_ids: bool = True
+    ) -> Iterator[Episode]:
+        """
+        Iterate over every matching episode, one page at a time.
+        
+        Pages continue after the last row of the previous page (keyset
+        pagination on the listing order) instead of using OFFSET, so each
+        page costs the same however deep into the listing it is.
+        
+        Args:
+            active_only: Whether to only include active episodes
+            min_importance: Minimum importance threshold
+            batch_size: Number of episodes fetched per query
+            include_memory_ids: Whether to load each episode's memory IDs
+            
+        Yields:
+            Episodes, most important (then most recently accessed) first
+        """
+        where, params = self._filter_sql(active_only, min_importance)
+        base = f"SELECT {_EPISODE_COLUMNS.format(e='')} FROM episodes WHERE {where}"
+        order = " ORDER BY importance DESC, last_accessed DESC, id DESC LIMIT ?"
+        after = " AND (importance, last_accessed, id) < (?, ?, ?)"
+        last: Optional[Tuple] = None
+        
+        while True:
+            try:
+                cursor = self.pool.connection().cursor()
+                if last is None:
+                    cursor.execute(base + order, params + [batch_size])
+                else:
+                    cursor.execute(base + after + order, params + list(last) + [batch_size])
+                rows = cursor.fetchall()
+                episodes = self._rows_to_episodes(cursor, rows, include_memory_ids)
+            except Exception as e:
+                logger.error(f"Error iterating over episodes in database: {e}")
+                return
+            
+            yield from episodes
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1][3], rows[-1][5], rows[-1][0])
+    
+    def count_episodes(self, active_only: bool = False, min_importance: float = 0.0) -> int:
+        """
+        Count episodes in the database.
+        
+        Args:
+            active_only: Whether to only count active episodes
+            min_importance: Minimum importance threshold
+            
+        Returns:
+            The number of matching episodes
+        """
+        try:
+            where, params = self._filter_sql(active_only, min_importance)
+            return self.pool.execute(f"SELECT COUNT(*) FROM episodes WHERE {where}", params).fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting episodes in database: {e}")
+            return 0
+    
+    def search_episodes_text(
+        self,
+        text: str,
+        active_only: bool = False,
+        min_importance: float = 0.0,
+        limit: int = 10,
+        match_all: bool = True
+    ) -> List[Tuple[Episode, float, str]]:
+        """
+        Find episodes whose title or description matches a keyword query.
+        
+        Requires the FTS5 index (see fts_enabled).
+        
+        Args:
+            text: The free-text query
+            active_only: Whether to only include active episodes
+            min_importance: Minimum importance threshold
+            limit: Maximum number of episodes to return
+            match_all: Whether every query word must appear (AND) or any (OR)
+            
+        Returns:
+            List of (episode, score, highlighted_title_and_description) tuples,
+            best match first. Matching words are wrapped in [brackets].
+        """
+        match = build_fts_query(text, match_all=match_all)
+        if match is None or not self.fts_enabled:
+            return []
+        
+        try:
+            cursor = self.pool.connection().cursor()
+            
+            # bm25() is lower-is-better, so it is negated into a score
+            where, params = self._filter_sql(active_only, min_importance, alias="e.")
+            query = f'''
+            SELECT {_EPISODE_COLUMNS.format(e='e.')},
+                   bm25(episodes_fts),
+                   highlight(episodes_fts, 0, '[', ']') || ': ' || highlight(episodes_fts, 1, '[', ']')
+            FROM episodes_fts JOIN episodes e ON e.rowid = episodes_fts.rowid
+            WHERE episodes_fts MATCH ? AND {where}
+            ORDER BY bm25(episodes_fts) LIMIT ?
+            '''
+            rows = cursor.execute(query, [match] + params + [limit]).fetchall()
+            
+            episodes = self._rows_to_episodes(cursor, rows)
+            results = [(episode, -row[9], row[10]) for episode, row in zip(episodes, rows)]
+            
+            logger.debug(f"Full-text search matched {len(results)} episodes")
+            return results
+        except Exception as e:
+            logger.error(f"Error in full-text search of episodes: {e}")
+            return []
+    
+    def search_episodes_substring(
+        self,
+        text: str,
+        active_only: bool = False,
+        min_importance: float = 0.0,
+        limit: int = 10
+    ) -> List[Episode]:
+        """
+        Find episodes whose title or description contains a string (case-insensitive).
+        
+        Strings of three or more characters are looked up in the trigram
+        index; shorter ones (or all strings, without the index) fall back
+        to a LIKE scan. Either way the limit is applied by the query.
+        
+        Args:
+            text: The string to look for
+            active_only: Whether to only include active episodes
+            min_importance: Minimum importance threshold
+            limit: Maximum number of episodes to return
+            
+        Returns:
+            List of matching episodes, most important (then most recently accessed) first
+        """
+        text = text.strip()
+        if not text:
+            return []
+        
+        try:
+            cursor = self.pool.connection().cursor()
+            where, params = self._filter_sql(active_only, min_importance, alias="e.")
+            
+            if self.trigram_enabled and len(text) >= 3:
+                # A quoted phrase matches the string as a substring of either column
+                phrase = '"' + text.replace('"', '""') + '"'
+                query = f'''
+                SELECT {_EPISODE_COLUMNS.format(e='e.')}
+                FROM episodes_trigram JOIN episodes e ON e.rowid = episodes_trigram.rowid
+                WHERE episodes_trigram MATCH ? AND {where}
+                '''
+                params = [phrase] + params
+            else:
+                pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                query = f'''
+                SELECT {_EPISODE_COLUMNS.format(e='e.')}
+                FROM episodes e
+                WHERE (e.title LIKE ? ESCAPE '\\' OR e.description LIKE ? ESCAPE '\\') AND {where}
+                '''
+                params = [pattern, pattern] + params
+            
+            query += " ORDER BY e.importance DESC, e.last_accessed DESC, e.id DESC LIMIT ?"
+            rows = cursor.execute(query, params + [limit]).fetchall()
+            episodes = self._rows_to_episodes(cursor, rows)
+            
+            logger.debug(f"Substring search matched {len(episodes)} episodes")
+            return episodes
+        except Exception as e:
+            logger.error(f"Error in substring search of episodes: {e}")
+            return []
+    
     def delete_episode(self, episode_id: str) -> bool:
         """
         Delete an episode from the database.
@@ -385,15 +619,10 @@ class EpisodicStorage:
             True if deleted successfully, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete episode (will cascade to episode_memories due to foreign key)
-            cursor.execute('DELETE FROM episodes WHERE id = ?', (episode_id,))
-            deleted = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as cursor:
+                # Delete episode (will cascade to episode_memories due to foreign key)
+                cursor.execute('DELETE FROM episodes WHERE id = ?', (episode_id,))
+                deleted = cursor.rowcount > 0
             
             if deleted:
                 logger.debug(f"Deleted episode from database: {episode_id}")
@@ -416,16 +645,12 @@ class EpisodicStorage:
             List of episode IDs
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            cursor = self.pool.execute('''
             SELECT episode_id FROM episode_memories
             WHERE memory_id = ?
             ''', (memory_id,))
             
             episode_ids = [r[0] for r in cursor.fetchall()]
-            conn.close()
             
             return episode_ids
         except Exception as e:
@@ -440,20 +665,19 @@ class EpisodicStorage:
             True if cleared successfully, False on error
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM episode_memories')
-            cursor.execute('DELETE FROM episodes')
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as cursor:
+                cursor.execute('DELETE FROM episode_memories')
+                cursor.execute('DELETE FROM episodes')
             
             logger.warning("Cleared all episodes from database")
             return True
         except Exception as e:
             logger.error(f"Error clearing episodes from database: {e}")
             return False
+    
+    def close(self) -> None:
+        """Close the pooled database connections."""
+        self.pool.close_all()
 
 
 class EpisodicMemory:
@@ -498,7 +722,7 @@ class EpisodicMemory:
         episodes = self.storage.list_episodes(active_only=True)
         for episode in episodes:
             self._active_episodes[episode.id] = episode
-            
+        
         if len(self._active_episodes) > self.max_active_episodes:
             logger.warning(
                 f"Found {len(self._active_episodes)} active episodes, "
@@ -747,27 +971,47 @@ class EpisodicMemory:
         Returns:
             List of matching episodes
         """
-        # Get all episodes that meet the criteria
-        episodes = self.storage.list_episodes(
+        # Ranked keyword search through the full-text index when available
+        if self.storage.fts_enabled and build_fts_query(query) is not None:
+            results = self.storage.search_episodes_text(
+                query,
+                active_only=active_only,
+                min_importance=min_importance,
+                limit=limit
+            )
+            if results:
+                return [episode for episode, _, _ in results]
+        
+        # Substring match (e.g. partial words), limited in the query itself
+        return self.storage.search_episodes_substring(
+            query,
             active_only=active_only,
             min_importance=min_importance,
-            limit=1000  # Get a lot, we'll filter and limit later
+            limit=limit
         )
+    
+    def iter_episodes(
+        self,
+        active_only: bool = False,
+        min_importance: float = 0.0,
+        batch_size: int = 500
+    ) -> Iterator[Episode]:
+        """
+        Iterate over every episode without loading them all at once.
         
-        # Filter by query
-        query = query.lower()
-        matching_episodes = []
-        
-        for episode in episodes:
-            if (query in episode.title.lower() or
-                query in episode.description.lower()):
-                matching_episodes.append(episode)
-                
-                # Stop if we've reached the limit
-                if len(matching_episodes) >= limit:
-                    break
-        
-        return matching_episodes
+        Args:
+            active_only: Whether to only include active episodes
+            min_importance: Minimum importance threshold
+            batch_size: Number of episodes fetched per query
+            
+        Yields:
+            Episodes, most important (then most recently accessed) first
+        """
+        return self.storage.iter_episodes(
+            active_only=active_only,
+            min_importance=min_importance,
+            batch_size=batch_size
+        )
     
     def delete_episode(self, episode_id: str) -> bool:
         """
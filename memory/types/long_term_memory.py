@@ -7,42 +7,91 @@ memories persistently and provides methods for retrieval and management.
 
 import logging
 import json
-import os
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Tuple
 from datetime import datetime
-import sqlite3
 
 from ..core.memory_system import MemorySystem
 from ..core.memory_item import MemoryItem
+from ..storage.sqlite_pool import SQLiteConnectionPool
+from ..storage.write_behind import WriteBehindQueue
+from ..storage.text_index import build_fts_query, content_to_text, highlight
 
 logger = logging.getLogger(__name__)
 
+# Plain text of a JSON-encoded content column, used to fill the full-text index:
+# string content is decoded, and containers contribute their keys and values
+MEMORY_TEXT_SQL = """CASE WHEN json_valid({row}.content) THEN (
+    SELECT group_concat(
+        CASE WHEN typeof(key) = 'text' THEN key || coalesce(' ' || atom, '') ELSE atom END, ' '
+    ) FROM json_tree({row}.content)
+) ELSE {row}.content END"""
+
 
 class SQLiteStorage:
     """
     SQLite storage backend for long-term memories.
     
     This class provides persistent storage for memory items using SQLite.
+    Connections come from a thread-local pool, so each thread reuses one
+    connection and its prepared statements across calls.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         """
         Initialize a new SQLite storage backend.
         
         Args:
             db_path: Path to the SQLite database file
+            pool: Optional connection pool to share (one is created if not provided)
         """
         self.db_path = db_path
+        self.pool = pool or SQLiteConnectionPool(db_path)
+        self._write_queue: Optional[WriteBehindQueue] = None
         self._initialize_db()
     
+    # An upsert rather than INSERT OR REPLACE, so the row keeps its rowid and
+    # the full-text index triggers see an UPDATE instead of a silent delete
+    _INSERT_SQL = '''
+    INSERT INTO memories
+    (id, content, source, memory_type, importance, created_at, last_accessed, 
+     access_count, metadata, related_memories)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        content = excluded.content,
+        source = excluded.source,
+        memory_type = excluded.memory_type,
+        importance = excluded.importance,
+        created_at = excluded.created_at,
+        last_accessed = excluded.last_accessed,
+        access_count = excluded.access_count,
+        metadata = excluded.metadata,
+        related_memories = excluded.related_memories
+    '''
+    
+    @staticmethod
+    def _to_row(memory: MemoryItem) -> tuple:
+        """Convert a memory item to the row stored in the memories table."""
+        # Obtener source de los metadatos o usar un valor por defecto
+        source = memory.metadata.get("source", "unknown")
+        
+        return (
+            memory.id,
+            json.dumps(memory.content, ensure_ascii=False),
+            source,  # Usar el source obtenido de los metadatos
+            memory.memory_type,
+            memory.importance,
+            memory.created_at.isoformat(),
+            memory.last_accessed.isoformat(),
+            memory.access_count,
+            json.dumps(memory.metadata),
+            json.dumps(getattr(memory, 'related_memories', []))
+        )
+    
     def _initialize_db(self) -> None:
         """
         Initialize the SQLite database with the necessary tables.
         """
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.connection()
         cursor = conn.cursor()
         
         # Create memories table
@@ -77,7 +126,9 @@ class SQLiteStorage:
         ''')
         
         conn.commit()
-        conn.close()
+        
+        # Full-text index over memory content
+        self.fts_enabled = self.pool.create_fts_index("memories", {"content": MEMORY_TEXT_SQL})
         
         logger.info(f"Initialized SQLite database at {self.db_path}")
     
@@ -91,37 +142,14 @@ class SQLiteStorage:
         Returns:
             True if stored successfully, False on error
         """
+        if self._write_queue is not None:
+            self._write_queue.put(memory)
+            return True
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Obtener source de los metadatos o usar un valor por defecto
-            source = memory.metadata.get("source", "unknown")
-            
-            # Convert memory to row format
-            row = (
-                memory.id,
-                json.dumps(memory.content),
-                source,  # Usar el source obtenido de los metadatos
-                memory.memory_type,
-                memory.importance,
-                memory.created_at.isoformat(),
-                memory.last_accessed.isoformat(),
-                memory.access_count,
-                json.dumps(memory.metadata),
-                json.dumps(getattr(memory, 'related_memories', []))
-            )
-            
             # Insert or replace
-            cursor.execute('''
-            INSERT OR REPLACE INTO memories
-            (id, content, source, memory_type, importance, created_at, last_accessed, 
-             access_count, metadata, related_memories)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', row)
-            
-            conn.commit()
-            conn.close()
+            with self.pool.transaction() as cursor:
+                cursor.execute(self._INSERT_SQL, self._to_row(memory))
             
             logger.debug(f"Stored memory in SQLite: {memory.id}")
             return True
@@ -129,6 +157,83 @@ class SQLiteStorage:
             logger.error(f"Error storing memory in SQLite: {e}")
             return False
     
+    def store_many(self, memories: List[MemoryItem]) -> int:
+        """
+        Store several memory items in a single transaction.
+        
+        With write-behind enabled the items are queued and committed with the
+        next group commit instead.
+        
+        Args:
+            memories: The memory items to store
+            
+        Returns:
+            The number of memories stored or queued (0 on error)
+        """
+        if self._write_queue is not None:
+            self._write_queue.put_many(memories)
+            return len(memories)
+        return self._write_many(memories)
+    
+    def _write_many(self, memories: List[MemoryItem], raise_errors: bool = False) -> int:
+        """
+        Insert or replace memory items with one executemany in one transaction.
+        
+        Args:
+            memories: The memory items to write
+            raise_errors: Re-raise a failed transaction instead of logging it
+            
+        Returns:
+            The number of memories written (0 on error)
+        """
+        if not memories:
+            return 0
+        
+        try:
+            rows = [self._to_row(memory) for memory in memories]
+            with self.pool.transaction() as cursor:
+                cursor.executemany(self._INSERT_SQL, rows)
+            
+            logger.debug(f"Stored {len(rows)} memories in SQLite")
+            return len(rows)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Error storing memories in SQLite: {e}")
+            return 0
+    
+    def _commit_batch(self, memories: List[MemoryItem]) -> None:
+        """Group-commit a write-behind batch, raising on failure so the queue keeps it."""
+        self._write_many(memories, raise_errors=True)
+    
+    def enable_write_behind(self, max_items: int = 500, max_delay_ms: float = 50.0) -> WriteBehindQueue:
+        """
+        Buffer store() calls and group-commit them in the background.
+        
+        Reads, deletes and clears flush pending writes first, so callers
+        always see their own writes.
+        
+        Args:
+            max_items: Number of pending writes that triggers a commit
+            max_delay_ms: Maximum time a write may stay pending
+            
+        Returns:
+            The write-behind queue (an existing one is kept as is)
+        """
+        if self._write_queue is None:
+            self._write_queue = WriteBehindQueue(
+                self._commit_batch,
+                max_items=max_items,
+                max_delay_ms=max_delay_ms,
+                name="SQLiteStorage-WriteBehind"
+            )
+        return self._write_queue
+    
+    def flush(self) -> None:
+        """Commit any writes still pending in the write-behind queue."""
+        if self._write_queue is not None:
+            self._write_queue.flush()
+    
     def retrieve(self, memory_id: str) -> Optional[MemoryItem]:
         """
         Retrieve a memory item from the SQLite database.
@@ -140,10 +245,8 @@ class SQLiteStorage:
             The memory item if found, None otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            self.flush()
+            cursor = self.pool.execute('''
             SELECT id, content, source, memory_type, importance, created_at, 
                    last_accessed, access_count, metadata, related_memories
             FROM memories
@@ -151,7 +254,6 @@ class SQLiteStorage:
             ''', (memory_id,))
             
             row = cursor.fetchone()
-            conn.close()
             
             if not row:
                 logger.debug(f"Memory not found in SQLite: {memory_id}")
@@ -191,18 +293,14 @@ class SQLiteStorage:
             True if deleted successfully, False on error
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            DELETE FROM memories
-            WHERE id = ?
-            ''', (memory_id,))
-            
-            deleted = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            self.flush()
+            with self.pool.transaction() as cursor:
+                cursor.execute('''
+                DELETE FROM memories
+                WHERE id = ?
+                ''', (memory_id,))
+                
+                deleted = cursor.rowcount > 0
             
             if deleted:
                 logger.debug(f"Deleted memory from SQLite: {memory_id}")
@@ -226,10 +324,8 @@ class SQLiteStorage:
             A list of memory items
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            self.flush()
+            cursor = self.pool.execute('''
             SELECT id, content, source, memory_type, importance, created_at, 
                    last_accessed, access_count, metadata, related_memories
             FROM memories
@@ -238,7 +334,6 @@ class SQLiteStorage:
             ''', (limit, offset))
             
             rows = cursor.fetchall()
-            conn.close()
             
             memories = []
             for row in rows:
@@ -272,15 +367,11 @@ class SQLiteStorage:
             True if cleared successfully, False on error
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM memories')
-            
-            count = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            self.flush()
+            with self.pool.transaction() as cursor:
+                cursor.execute('DELETE FROM memories')
+                
+                count = cursor.rowcount
             
             logger.warning(f"Cleared {count} memories from SQLite database")
             return True
@@ -300,9 +391,7 @@ class SQLiteStorage:
             A list of memory items matching the query
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            self.flush()
             # Build SQL query
             sql_parts = ["SELECT id, content, source, memory_type, importance, created_at, " 
                         "last_accessed, access_count, metadata, related_memories "
@@ -339,10 +428,7 @@ class SQLiteStorage:
             
             # Execute query
             sql = " ".join(sql_parts)
-            cursor.execute(sql, params)
-            
-            rows = cursor.fetchall()
-            conn.close()
+            rows = self.pool.execute(sql, params).fetchall()
             
             memories = []
             for row in rows:
@@ -368,6 +454,90 @@ class SQLiteStorage:
             logger.error(f"Error searching memories in SQLite: {e}")
             return []
     
+    @staticmethod
+    def _from_row(row: Tuple) -> MemoryItem:
+        """Convert a row of the memories table to a memory item."""
+        metadata = json.loads(row[8]) if row[8] else {}
+        metadata["source"] = row[2]
+        return MemoryItem.from_dict({
+            "id": row[0],
+            "content": json.loads(row[1]),
+            "memory_type": row[3],
+            "importance": row[4],
+            "metadata": metadata,
+            "created_at": row[5],
+            "last_accessed": row[6],
+            "access_count": row[7]
+        })
+    
+    def search_text(
+        self,
+        text: str,
+        limit: int = 10,
+        memory_type: Optional[str] = None,
+        match_all: bool = True
+    ) -> List[Tuple[MemoryItem, float, str]]:
+        """
+        Find memories whose content matches a keyword query, ranked by BM25.
+        
+        Uses the FTS5 index when available and falls back to a substring scan.
+        
+        Args:
+            text: The free-text query
+            limit: Maximum number of results
+            memory_type: Optional memory type filter
+            match_all: Whether every query word must appear (AND) or any (OR)
+            
+        Returns:
+            List of (memory, score, highlighted_text) tuples, best match first.
+            Matching words are wrapped in [brackets] in highlighted_text.
+        """
+        try:
+            self.flush()
+            columns = (
+                "m.id, m.content, m.source, m.memory_type, m.importance, m.created_at, "
+                "m.last_accessed, m.access_count, m.metadata, m.related_memories"
+            )
+            
+            if not self.fts_enabled:
+                sql = f"SELECT {columns} FROM memories m WHERE m.content LIKE ?"
+                params: List[Any] = [f"%{text.strip()}%"]
+                if memory_type is not None:
+                    sql += " AND m.memory_type = ?"
+                    params.append(memory_type)
+                sql += " ORDER BY m.created_at DESC LIMIT ?"
+                params.append(limit)
+                
+                results = []
+                for row in self.pool.execute(sql, params).fetchall():
+                    memory = self._from_row(row)
+                    results.append((memory, 0.0, highlight(content_to_text(memory.content), text)))
+                return results
+            
+            match = build_fts_query(text, match_all=match_all)
+            if match is None:
+                return []
+            
+            # bm25() is lower-is-better, so it is negated into a score
+            sql = f'''
+            SELECT {columns}, bm25(memories_fts), highlight(memories_fts, 0, '[', ']')
+            FROM memories_fts JOIN memories m ON m.rowid = memories_fts.rowid
+            WHERE memories_fts MATCH ?
+            '''
+            params = [match]
+            if memory_type is not None:
+                sql += " AND m.memory_type = ?"
+                params.append(memory_type)
+            sql += " ORDER BY bm25(memories_fts) LIMIT ?"
+            params.append(limit)
+            
+            rows = self.pool.execute(sql, params).fetchall()
+            logger.debug(f"Full-text search matched {len(rows)} memories in SQLite")
+            return [(self._from_row(row[:10]), -row[10], row[11]) for row in rows]
+        except Exception as e:
+            logger.error(f"Error in full-text search of memories in SQLite: {e}")
+            return []
+    
     def count(self) -> int:
         """
         Count the number of memory items in the SQLite database.
@@ -376,18 +546,18 @@ class SQLiteStorage:
             The number of memory items
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT COUNT(*) FROM memories')
-            count = cursor.fetchone()[0]
-            
-            conn.close()
-            
-            return count
+            self.flush()
+            return self.pool.execute('SELECT COUNT(*) FROM memories').fetchone()[0]
         except Exception as e:
             logger.error(f"Error counting memories in SQLite: {e}")
             return 0
+    
+    def close(self) -> None:
+        """Flush pending writes and close the pooled database connections."""
+        if self._write_queue is not None:
+            self._write_queue.close()
+            self._write_queue = None
+        self.pool.close_all()
 
 
 class LongTermMemory:
@@ -402,7 +572,10 @@ class LongTermMemory:
         self,
         memory_system: MemorySystem,
         db_path: str = "data/memory/long_term.db",
-        min_importance: float = 0.7
+        min_importance: float = 0.7,
+        write_behind: bool = False,
+        flush_items: int = 500,
+        flush_interval_ms: float = 50.0
     ):
         """
         Initialize a new long-term memory.
@@ -411,11 +584,17 @@ class LongTermMemory:
             memory_system: The central memory system to integrate with
             db_path: Path to the SQLite database file
             min_importance: Minimum importance threshold for memories to be stored
+            write_behind: Whether to group-commit writes in the background
+            flush_items: Number of pending writes that triggers a commit
+            flush_interval_ms: Maximum time a write may stay pending
         """
         self.memory_system = memory_system
         self.storage = SQLiteStorage(db_path)
         self.min_importance = min_importance
         
+        if write_behind:
+            self.storage.enable_write_behind(max_items=flush_items, max_delay_ms=flush_interval_ms)
+        
         # Instead of registering with the memory system, we'll use our storage directly
         
         logger.info(
@@ -449,7 +628,7 @@ class LongTermMemory:
         # Include source in metadata
         full_metadata = metadata or {}
         full_metadata["source"] = source
-            
+        
         # Creamos directamente la memoria en el sistema base
         memory_id = self.memory_system.add_memory(
             content=content,
@@ -467,6 +646,49 @@ class LongTermMemory:
         
         return memory_id
     
+    def add_many(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several items to long-term memory, persisting them in one transaction.
+        
+        Args:
+            entries: One dictionary per memory with "content" and "source" keys and
+                    optional "importance" (default 0.8) and "metadata" keys
+                    
+        Returns:
+            The IDs of the created memories, in order
+        """
+        memory_ids = []
+        memories = []
+        
+        for entry in entries:
+            full_metadata = dict(entry.get("metadata") or {})
+            full_metadata["source"] = entry["source"]
+            
+            memory_id = self.memory_system.add_memory(
+                content=entry["content"],
+                memory_type="long_term",
+                importance=max(entry.get("importance", 0.8), self.min_importance),
+                metadata=full_metadata
+            )
+            memory_ids.append(memory_id)
+            
+            memory = self.memory_system.storage.retrieve(memory_id)
+            if memory:
+                memories.append(memory)
+        
+        self.storage.store_many(memories)
+        
+        logger.debug(f"Added {len(memory_ids)} memories to long-term memory")
+        return memory_ids
+    
+    def flush(self) -> None:
+        """Commit any writes still pending in the write-behind queue."""
+        self.storage.flush()
+    
+    def close(self) -> None:
+        """Flush pending writes and close the storage."""
+        self.storage.close()
+    
     def promote_from_short_term(self, memory_id: str, new_importance: Optional[float] = None) -> Optional[str]:
         """
         Promote a memory from short-term to long-term storage.
@@ -483,7 +705,7 @@ class LongTermMemory:
         if not original:
             logger.warning(f"Cannot promote unknown memory: {memory_id}")
             return None
-            
+        
         if original.memory_type != "short_term":
             logger.warning(f"Can only promote short-term memories, got: {original.memory_type}")
             return None
@@ -552,6 +774,19 @@ class LongTermMemory:
         # Use the storage backend to search
         return self.storage.search(query, limit=limit)
     
+    def search_text(self, text: str, limit: int = 10) -> List[Tuple[MemoryItem, float, str]]:
+        """
+        Search long-term memories by keywords, ranked by BM25.
+        
+        Args:
+            text: The free-text query
+            limit: Maximum number of memories to return
+            
+        Returns:
+            List of (memory, score, highlighted_text) tuples, best match first
+        """
+        return self.storage.search_text(text, limit=limit, memory_type="long_term")
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the long-term memory.
@@ -561,11 +796,11 @@ class LongTermMemory:
         """
         try:
             # Get all memories tracked in long-term memory
-            conn = sqlite3.connect(self.storage.db_path)
-            cursor = conn.cursor()
+            self.storage.flush()
+            cursor = self.storage.pool.connection().cursor()
             
             # Count total memories
-            cursor.execute('SELECT COUNT(*) FROM memories WHERE memory_type = "long_term"')
+            cursor.execute("SELECT COUNT(*) FROM memories WHERE memory_type = 'long_term'")
             total_count = cursor.fetchone()[0] or 0
             
             # Get count by source
@@ -577,8 +812,6 @@ class LongTermMemory:
             
             source_counts = {row[0]: row[1] for row in cursor.fetchall()}
             
-            conn.close()
-            
             return {
                 "total_memories": total_count,
                 "sources": source_counts
@@ -5,16 +5,20 @@ This module provides the SemanticMemory class for storing factual knowledge
 and concepts in a structured format that enables semantic search and retrieval.
 """
 
+import copy
 import logging
 import json
-import sqlite3
 import os
-from typing import Dict, List, Any, Optional, Set, Tuple, Union
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Hashable
 from datetime import datetime
 import uuid
 
 from ..core.memory_system import MemorySystem
 from ..core.memory_item import MemoryItem
+from ..storage.sqlite_pool import SQLiteConnectionPool
+from ..storage.fact_cache import FactCache, SubjectTrie
+from ..storage.text_index import build_fts_query
 
 logger = logging.getLogger(__name__)
 
@@ -65,12 +69,12 @@ class Fact:
         self.created_at = created_at or datetime.now()
         self.last_accessed = last_accessed or self.created_at
         self.access_count = access_count
-        
+    
     def access(self) -> None:
         """Record an access to this fact, updating last_accessed and access_count."""
         self.last_accessed = datetime.now()
         self.access_count += 1
-        
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the fact to a dictionary for serialization."""
         return {
@@ -113,7 +117,7 @@ class Fact:
             obj_str = json.dumps(self.object, ensure_ascii=False)
         elif isinstance(self.object, (list, tuple)):
             obj_str = str(self.object)
-            
+        
         return f"{self.subject} {self.predicate} {obj_str}"
 
 
@@ -122,21 +126,50 @@ class SemanticStorage:
     Storage backend for semantic memory using SQLite.
     
     Provides persistent storage for facts with efficient querying capabilities.
+    Each thread gets its own pooled connection, so the storage can be used
+    from worker threads as well as the one that created it.
+    
+    Lookups by subject (and predicate) are served from a write-through LRU
+    cache that store_fact, delete_fact and clear invalidate, and access
+    bookkeeping is buffered and written in batches so that reading a fact
+    does not cost a write.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        pool: Optional[SQLiteConnectionPool] = None,
+        cache_size: int = 1024,
+        max_cached_facts: int = 64,
+        access_flush_size: int = 256
+    ):
         """
         Initialize the semantic storage.
         
         Args:
             db_path: Path to the SQLite database file
+            pool: Optional connection pool to share (one is created if not provided)
+            cache_size: Number of (subject, predicate) keys kept in the fact cache (0 disables it)
+            max_cached_facts: Largest number of facts cached under one key
+            access_flush_size: Number of buffered fact accesses that triggers a write
         """
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
+        self.pool = pool or SQLiteConnectionPool(db_path)
+        self.cache = FactCache(cache_size, max_cached_facts) if cache_size > 0 else None
+        self.access_flush_size = max(1, access_flush_size)
+        
+        self._pending_access: Dict[str, Fact] = {}
+        self._access_lock = threading.Lock()
+        self._subjects: Optional[SubjectTrie] = None
+        self._subjects_lock = threading.Lock()
         self._init_db()
         logger.info(f"Initialized semantic storage at {db_path}")
     
+    @property
+    def conn(self):
+        """The pooled connection of the calling thread."""
+        return self.pool.connection()
+    
     def _init_db(self) -> None:
         """Initialize the database schema if it doesn't exist."""
         cursor = self.conn.cursor()
@@ -165,6 +198,11 @@ class SemanticStorage:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_id ON facts(memory_id)')
         
         self.conn.commit()
+        
+        # Full-text index over fact subjects and objects
+        self.fts_enabled = self.pool.create_fts_index(
+            "facts", {"subject": "{row}.subject", "object": "{row}.object"}
+        )
     
     def store_fact(self, fact: Fact) -> bool:
         """
@@ -188,11 +226,25 @@ class SemanticStorage:
             object_str = str(fact.object)
         
         try:
+            row = cursor.execute('SELECT subject FROM facts WHERE id = ?', (fact.id,)).fetchone()
+            old_subject = row[0] if row else None
+            
             cursor.execute('''
-            INSERT OR REPLACE INTO facts
+            INSERT INTO facts
             (id, subject, predicate, object, object_type, confidence, source, memory_id, 
              created_at, last_accessed, access_count)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                subject = excluded.subject,
+                predicate = excluded.predicate,
+                object = excluded.object,
+                object_type = excluded.object_type,
+                confidence = excluded.confidence,
+                source = excluded.source,
+                memory_id = excluded.memory_id,
+                created_at = excluded.created_at,
+                last_accessed = excluded.last_accessed,
+                access_count = excluded.access_count
             ''', (
                 fact.id,
                 fact.subject,
@@ -208,6 +260,7 @@ class SemanticStorage:
             ))
             
             self.conn.commit()
+            self._fact_changed(old_subject, fact.subject)
             return True
         except Exception as e:
             logger.error(f"Error storing fact: {e}")
@@ -224,6 +277,7 @@ class SemanticStorage:
         Returns:
             The fact if found, None otherwise
         """
+        self.flush_accesses()
         cursor = self.conn.cursor()
         
         cursor.execute('SELECT * FROM facts WHERE id = ?', (fact_id,))
@@ -268,6 +322,59 @@ class SemanticStorage:
             access_count=access_count
         )
     
+    def _fact_changed(self, old_subject: Optional[str], new_subject: Optional[str]) -> None:
+        """
+        Invalidate the cache and update the subject trie after a write.
+        
+        Args:
+            old_subject: The subject the fact had before (None for a new fact)
+            new_subject: The subject the fact has now (None once deleted)
+        """
+        for subject in {old_subject, new_subject} - {None}:
+            if self.cache is not None:
+                self.cache.invalidate_subject(subject)
+        
+        if self._subjects is not None and old_subject != new_subject:
+            if old_subject is not None:
+                self._subjects.remove(old_subject)
+            if new_subject is not None:
+                self._subjects.add(new_subject)
+    
+    def record_accesses(self, facts: List[Fact]) -> None:
+        """
+        Persist the access count and time of facts that were just accessed.
+        
+        The writes are buffered and applied together once access_flush_size
+        facts are pending (or on flush_accesses), so reads stay read-only.
+        
+        Args:
+            facts: The accessed facts (already updated with Fact.access)
+        """
+        with self._access_lock:
+            for fact in facts:
+                self._pending_access[fact.id] = fact
+            if len(self._pending_access) < self.access_flush_size:
+                return
+        self.flush_accesses()
+    
+    def flush_accesses(self) -> None:
+        """Write every buffered fact access in one transaction."""
+        with self._access_lock:
+            if not self._pending_access:
+                return
+            pending = list(self._pending_access.values())
+            self._pending_access = {}
+        
+        try:
+            with self.pool.transaction() as cursor:
+                cursor.executemany(
+                    'UPDATE facts SET last_accessed = ?, access_count = ? WHERE id = ?',
+                    [(fact.last_accessed.isoformat(), fact.access_count, fact.id) for fact in pending]
+                )
+            logger.debug(f"Recorded accesses of {len(pending)} facts")
+        except Exception as e:
+            logger.error(f"Error recording fact accesses: {e}")
+    
     def delete_fact(self, fact_id: str) -> bool:
         """
         Delete a fact by its ID.
@@ -281,8 +388,14 @@ class SemanticStorage:
         cursor = self.conn.cursor()
         
         try:
+            row = cursor.execute('SELECT subject FROM facts WHERE id = ?', (fact_id,)).fetchone()
             cursor.execute('DELETE FROM facts WHERE id = ?', (fact_id,))
             self.conn.commit()
+            
+            with self._access_lock:
+                self._pending_access.pop(fact_id, None)
+            if row:
+                self._fact_changed(row[0], None)
             return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting fact: {e}")
@@ -316,6 +429,16 @@ class SemanticStorage:
         Returns:
             A list of facts matching the criteria
         """
+        # Subject (and predicate) lookups are answered from the cache
+        if (self.cache is not None and subject is not None and object_ is None
+                and source is None and memory_id is None):
+            facts = self._cached_facts(subject, predicate)
+            if facts is not None:
+                if min_confidence is not None:
+                    facts = [fact for fact in facts if fact.confidence >= min_confidence]
+                # Callers get their own copies, so editing one leaves the cache intact
+                return [copy.deepcopy(fact) for fact in facts[offset:offset + limit]]
+        
         cursor = self.conn.cursor()
         
         query = 'SELECT * FROM facts WHERE 1=1'
@@ -358,6 +481,122 @@ class SemanticStorage:
         
         return [self._row_to_fact(row) for row in rows]
     
+    def _cached_facts(self, subject: str, predicate: Optional[str]) -> Optional[List[Fact]]:
+        """
+        Get every fact of a subject (and predicate) through the cache.
+        
+        Args:
+            subject: The subject
+            predicate: The predicate (None for all)
+            
+        Returns:
+            The facts, highest confidence first, or None if there are too many to cache
+        """
+        facts = self.cache.get(subject, predicate)
+        if facts is not None:
+            return facts
+        
+        query = 'SELECT * FROM facts WHERE subject = ?'
+        params: List[Any] = [subject]
+        if predicate is not None:
+            query += ' AND predicate = ?'
+            params.append(predicate)
+        query += ' ORDER BY confidence DESC LIMIT ?'
+        params.append(self.cache.max_facts_per_key + 1)
+        
+        facts = [self._row_to_fact(row) for row in self.conn.execute(query, params).fetchall()]
+        if not self.cache.put(subject, predicate, facts):
+            return None
+        return facts
+    
+    def complete_subjects(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Get the subjects starting with a prefix (case-insensitive), in alphabetical order.
+        
+        The subject trie is built from the database on first use and kept
+        up to date by every write afterwards.
+        
+        Args:
+            prefix: The prefix to complete
+            limit: Maximum number of subjects to return
+            
+        Returns:
+            The matching subjects
+        """
+        if self._subjects is None:
+            with self._subjects_lock:
+                if self._subjects is None:
+                    trie = SubjectTrie()
+                    for subject, count in self.conn.execute(
+                        'SELECT subject, COUNT(*) FROM facts GROUP BY subject'
+                    ):
+                        trie.add(subject, count)
+                    self._subjects = trie
+        return self._subjects.complete(prefix, limit)
+    
+    def search_facts_text(
+        self,
+        text: str,
+        min_confidence: Optional[float] = None,
+        limit: int = 10,
+        match_all: bool = True
+    ) -> List[Tuple[Fact, float, str]]:
+        """
+        Find facts whose subject or object matches a keyword query, ranked by BM25.
+        
+        Falls back to a substring scan when FTS5 is unavailable.
+        
+        Args:
+            text: The free-text query
+            min_confidence: Filter by minimum confidence
+            limit: Maximum number of results to return
+            match_all: Whether every query word must appear (AND) or any (OR)
+            
+        Returns:
+            List of (fact, score, highlighted_text) tuples, best match first.
+            Matching words are wrapped in [brackets] in highlighted_text.
+        """
+        cursor = self.conn.cursor()
+        
+        if not self.fts_enabled:
+            pattern = f"%{text.strip()}%"
+            query = 'SELECT * FROM facts WHERE (subject LIKE ? OR object LIKE ?)'
+            params: List[Any] = [pattern, pattern]
+            if min_confidence is not None:
+                query += ' AND confidence >= ?'
+                params.append(min_confidence)
+            query += ' ORDER BY confidence DESC LIMIT ?'
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            return [
+                (fact, 0.0, f"{fact.subject} {fact.predicate} {fact.object}")
+                for fact in (self._row_to_fact(row) for row in cursor.fetchall())
+            ]
+        
+        match = build_fts_query(text, match_all=match_all)
+        if match is None:
+            return []
+        
+        # bm25() is lower-is-better, so it is negated into a score
+        query = '''
+        SELECT f.*, bm25(facts_fts),
+               highlight(facts_fts, 0, '[', ']') || ' ' || f.predicate || ' ' || highlight(facts_fts, 1, '[', ']')
+        FROM facts_fts JOIN facts f ON f.rowid = facts_fts.rowid
+        WHERE facts_fts MATCH ?
+        '''
+        params = [match]
+        
+        if min_confidence is not None:
+            query += ' AND f.confidence >= ?'
+            params.append(min_confidence)
+        
+        query += ' ORDER BY bm25(facts_fts) LIMIT ?'
+        params.append(limit)
+        
+        cursor.execute(query, params)
+        return [(self._row_to_fact(row[:11]), -row[11], row[12]) for row in cursor.fetchall()]
+    
     def clear(self) -> bool:
         """
         Clear all facts from the database.
@@ -370,6 +609,13 @@ class SemanticStorage:
         try:
             cursor.execute('DELETE FROM facts')
             self.conn.commit()
+            
+            with self._access_lock:
+                self._pending_access = {}
+            if self.cache is not None:
+                self.cache.clear()
+            if self._subjects is not None:
+                self._subjects.clear()
             return True
         except Exception as e:
             logger.error(f"Error clearing facts: {e}")
@@ -377,13 +623,20 @@ class SemanticStorage:
             return False
     
     def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Write buffered fact accesses and close the pooled database connections."""
+        pool = getattr(self, "pool", None)
+        if pool is not None:
+            if getattr(self, "_pending_access", None):
+                if os.path.exists(self.db_path):
+                    self.flush_accesses()
+                else:
+                    # The database was deleted (e.g. a temporary directory cleaned up)
+                    logger.debug(f"Dropping {len(self._pending_access)} fact accesses: {self.db_path} no longer exists")
+                    self._pending_access = {}
+            pool.close_all()
     
     def __del__(self) -> None:
-        """Ensure the database connection is closed when the object is deleted."""
+        """Ensure the database connections are closed when the object is deleted."""
         self.close()
 
 
@@ -566,14 +819,29 @@ class SemanticMemory:
             offset=offset
         )
         
-        # Update access information
+        # Update access information (written in batches by the storage)
         for fact in facts:
             fact.access()
-            self.storage.store_fact(fact)
+        self.storage.record_accesses(facts)
         
         logger.debug(f"Query returned {len(facts)} facts")
         return facts
     
+    def search_facts(self, text: str, limit: int = 10) -> List[Tuple[Fact, float, str]]:
+        """
+        Search facts by keywords in their subject or object, ranked by BM25.
+        
+        Args:
+            text: The free-text query
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of (fact, score, highlighted_text) tuples, best match first
+        """
+        results = self.storage.search_facts_text(text, min_confidence=self.min_confidence, limit=limit)
+        logger.debug(f"Keyword search returned {len(results)} facts")
+        return results
+    
     def get_facts_about(
         self,
         subject: str,
@@ -661,14 +929,34 @@ class SemanticMemory:
         
         return result
     
-    def check_conflicts(
+    @staticmethod
+    def _object_key(object_: Any) -> Hashable:
+        """
+        Get a hashable key under which equal fact objects group together.
+        
+        Args:
+            object_: The fact object
+            
+        Returns:
+            The object itself if hashable, its canonical JSON otherwise
+        """
+        try:
+            hash(object_)
+            return object_
+        except TypeError:
+            return ("json", json.dumps(object_, ensure_ascii=False, sort_keys=True, default=str))
+    
+    def group_conflicting_facts(
         self,
         subject: str,
         predicate: str,
         confidence_threshold: float = 0.5
-    ) -> List[Tuple[Fact, Fact]]:
+    ) -> List[List[Fact]]:
         """
-        Check for conflicting facts about a subject.
+        Group the facts about a subject and predicate by their object value.
+        
+        Facts are grouped in a single pass by hashing their objects, so the
+        cost is linear in the number of facts.
         
         Args:
             subject: The subject to check for conflicts
@@ -676,7 +964,8 @@ class SemanticMemory:
             confidence_threshold: Minimum confidence for facts to be considered
             
         Returns:
-            A list of tuples containing pairs of conflicting facts
+            One list of facts per distinct object, the group with the most
+            confident fact first; empty if all facts agree
         """
         facts = self.query_facts(
             subject=subject,
@@ -684,14 +973,42 @@ class SemanticMemory:
             min_confidence=confidence_threshold
         )
         
-        conflicts = []
+        groups: Dict[Hashable, List[Fact]] = {}
+        for fact in facts:
+            groups.setdefault(self._object_key(fact.object), []).append(fact)
+        
+        if len(groups) < 2:
+            return []
+        # Facts arrive highest confidence first, so group order follows the best fact
+        return list(groups.values())
+    
+    def check_conflicts(
+        self,
+        subject: str,
+        predicate: str,
+        confidence_threshold: float = 0.5
+    ) -> List[Tuple[Fact, Fact]]:
+        """
+        Check for conflicting facts about a subject.
+        
+        Facts are grouped by object value first (see group_conflicting_facts),
+        so only facts from different groups are paired and no time is spent
+        comparing facts that agree.
+        
+        Args:
+            subject: The subject to check for conflicts
+            predicate: The predicate to check for conflicts
+            confidence_threshold: Minimum confidence for facts to be considered
+            
+        Returns:
+            A list of tuples containing pairs of conflicting facts
+        """
+        groups = self.group_conflicting_facts(subject, predicate, confidence_threshold)
         
-        # If we have more than one fact with the same subject and predicate
-        # but different objects, we have a conflict
-        for i in range(len(facts)):
-            for j in range(i + 1, len(facts)):
-                if facts[i].object != facts[j].object:
-                    conflicts.append((facts[i], facts[j]))
+        conflicts = []
+        for i, group in enumerate(groups):
+            for other in groups[i + 1:]:
+                conflicts.extend((fact, other_fact) for fact in group for other_fact in other)
         
         return conflicts
     
@@ -786,6 +1103,35 @@ class SemanticMemory:
         
         return [row[0] for row in cursor.fetchall()]
     
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about semantic memory.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        cursor = self.storage.conn.execute('SELECT COUNT(*), COUNT(DISTINCT subject) FROM facts')
+        total_facts, total_subjects = cursor.fetchone()
+        return {
+            "total_facts": total_facts,
+            "total_subjects": total_subjects,
+            "cache": self.storage.cache.get_stats() if self.storage.cache is not None else None,
+            "pending_accesses": len(self.storage._pending_access)
+        }
+    
+    def complete_subjects(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Autocomplete a subject name.
+        
+        Args:
+            prefix: The beginning of the subject (case-insensitive)
+            limit: Maximum number of subjects to return
+            
+        Returns:
+            Subjects starting with the prefix, in alphabetical order
+        """
+        return self.storage.complete_subjects(prefix, limit)
+    
     def create_facts_from_memory(
         self,
         memory_id: str,
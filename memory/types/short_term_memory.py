@@ -6,10 +6,11 @@ forgets memories after a configurable time period.
 """
 
 import logging
+import heapq
 import threading
 import time
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, KeysView
 
 from ..core.memory_system import MemorySystem
 from ..core.memory_item import MemoryItem
@@ -24,6 +25,15 @@ class ShortTermMemory:
     
     This class provides a memory store with automatic forgetting based on
     time, capacity limits, and access frequency.
+    
+    Tracked memories are kept in a few small structures so no operation
+    has to look at every tracked memory:
+    
+    - an expiry heap ordered by creation time, from which expired entries
+      are popped lazily whenever the memory is used
+    - an LRU ordering (most recently used last) used to evict when over capacity
+    - the creation order of the tracked memories and a per-source index,
+      so recent/by-source lookups only touch the entries they return
     """
     
     def __init__(
@@ -40,7 +50,8 @@ class ShortTermMemory:
             memory_system: The central memory system to integrate with
             retention_minutes: How long memories should be retained (in minutes)
             capacity: Maximum number of memories to keep before forcing forgetting
-            cleanup_interval_seconds: How often to run the cleanup process
+            cleanup_interval_seconds: Kept for compatibility; expired memories are
+                                     now swept lazily on every access
         """
         self.memory_system = memory_system
         self.storage = InMemoryStorage()
@@ -48,84 +59,107 @@ class ShortTermMemory:
         self.capacity = capacity
         self.cleanup_interval = cleanup_interval_seconds
         
-        # Instead of registering with the memory system, just maintain our own cache of memory IDs
-        self.memory_ids = set()
+        self._lock = threading.RLock()
         
-        # Setup cleanup thread
-        self._stop_cleanup = threading.Event()
-        self._cleanup_thread = threading.Thread(
-            target=self._cleanup_task,
-            daemon=True,
-            name="ShortTermMemory-Cleanup"
-        )
-        self._cleanup_thread.start()
+        # Creation time and source of each tracked memory, in creation order
+        self._created: Dict[str, float] = {}
+        self._sources: Dict[str, str] = {}
+        # Tracked IDs by source, in creation order
+        self._by_source: Dict[str, Dict[str, None]] = {}
+        # Tracked IDs from least to most recently used
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        # (created timestamp, ID) min-heap; entries of untracked IDs are skipped lazily
+        self._expiry: List[Tuple[float, str]] = []
         
         logger.info(
             f"Initialized short-term memory with retention={retention_minutes}m, "
-            f"capacity={capacity}, cleanup_interval={cleanup_interval_seconds}s"
+            f"capacity={capacity}"
         )
     
-    def _cleanup_task(self) -> None:
-        """
-        Background task to periodically clean up old memories.
+    @property
+    def memory_ids(self) -> KeysView:
+        """The IDs of the tracked memories."""
+        return self._created.keys()
+    
+    def __len__(self) -> int:
+        """Get the number of tracked memories."""
+        with self._lock:
+            self._sweep()
+            return len(self._created)
+    
+    def _untrack(self, memory_id: str) -> bool:
         """
-        while not self._stop_cleanup.is_set():
-            try:
-                self._perform_cleanup()
-            except Exception as e:
-                logger.error(f"Error during short-term memory cleanup: {e}")
+        Stop tracking a memory (caller holds the lock).
+        
+        Args:
+            memory_id: The ID of the memory
             
-            # Sleep for the cleanup interval or until stopped
-            self._stop_cleanup.wait(self.cleanup_interval)
+        Returns:
+            True if the memory was tracked, False otherwise
+        """
+        if self._created.pop(memory_id, None) is None:
+            return False
+        
+        self._lru.pop(memory_id, None)
+        source = self._sources.pop(memory_id)
+        source_ids = self._by_source.get(source)
+        if source_ids is not None:
+            source_ids.pop(memory_id, None)
+            if not source_ids:
+                del self._by_source[source]
+        return True
     
-    def _perform_cleanup(self) -> None:
+    def _sweep(self) -> None:
         """
-        Perform the actual cleanup operation.
+        Forget expired memories (caller holds the lock).
+        
+        Only the expired entries at the top of the heap are touched, so the
+        cost is amortized over the memories that actually expire.
         """
-        cutoff_time = datetime.now() - timedelta(minutes=self.retention_minutes)
+        cutoff = time.time() - self.retention_minutes * 60
+        expiry = self._expiry
+        forgotten = 0
         
-        # Get all memories in our tracked set
-        memories = []
-        to_forget = []
-        
-        for memory_id in list(self.memory_ids):
-            memory = self.memory_system.get_memory(memory_id)
-            if memory:
-                memories.append(memory)
-                # Check if memory is older than the retention period
-                if memory.created_at < cutoff_time:
-                    to_forget.append(memory.id)
-            else:
-                # Memory no longer exists in the base system
-                to_forget.append(memory_id)
-        
-        # If we're still over capacity after time-based forgetting,
-        # forget the least recently accessed memories
-        if len(memories) - len(to_forget) > self.capacity:
-            # Sort by last accessed time (oldest first)
-            remaining = [m for m in memories if m.id not in to_forget]
-            remaining.sort(key=lambda m: m.last_accessed)
-            
-            # Add enough to the forget list to get down to capacity
-            extra_to_forget = len(remaining) - self.capacity
-            if extra_to_forget > 0:
-                to_forget.extend([m.id for m in remaining[:extra_to_forget]])
+        while expiry and expiry[0][0] < cutoff:
+            created, memory_id = heapq.heappop(expiry)
+            if self._created.get(memory_id) == created and self._untrack(memory_id):
+                forgotten += 1
+        
+        # Entries of memories removed early linger until they expire; compact
+        # the heap when they outnumber the live ones
+        if len(expiry) > 2 * len(self._created) + 64:
+            self._expiry = [(created, memory_id) for memory_id, created in self._created.items()]
+            heapq.heapify(self._expiry)
         
-        # Forget all identified memories
-        for memory_id in to_forget:
-            if memory_id in self.memory_ids:
-                self.memory_ids.remove(memory_id)
+        if forgotten:
+            logger.debug(f"Short-term memory cleanup: forgot {forgotten} memories")
+    
+    def _evict(self) -> None:
+        """Forget the least recently used memories beyond capacity (caller holds the lock)."""
+        evicted = 0
+        while len(self._created) > self.capacity and self._lru:
+            memory_id = next(iter(self._lru))
+            self._untrack(memory_id)
+            evicted += 1
         
-        if to_forget:
-            logger.debug(f"Short-term memory cleanup: forgot {len(to_forget)} memories")
+        if evicted:
+            logger.debug(f"Short-term memory over capacity: forgot {evicted} memories")
+    
+    def _perform_cleanup(self) -> None:
+        """
+        Perform the cleanup operation: forget expired memories, then the least
+        recently used ones while over capacity.
+        """
+        with self._lock:
+            self._sweep()
+            self._evict()
     
     def stop(self) -> None:
         """
-        Stop the cleanup thread and shut down the short-term memory.
+        Shut down the short-term memory.
+        
+        Cleanup runs lazily, so there is no background thread left to stop.
         """
-        self._stop_cleanup.set()
-        if self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5.0)
         logger.info("Short-term memory stopped")
     
     def add(
@@ -150,7 +184,7 @@ class ShortTermMemory:
         # Add metadata about short-term memory
         full_metadata = metadata or {}
         full_metadata["source"] = source
-
+        
         # Create memory in the base system
         memory_id = self.memory_system.add_memory(
             content=content,
@@ -160,10 +194,66 @@ class ShortTermMemory:
         )
         
         # Track this memory ID in our short-term memory
-        self.memory_ids.add(memory_id)
+        memory = self.memory_system.storage.retrieve(memory_id)
+        created = memory.created_timestamp if memory else time.time()
+        
+        with self._lock:
+            self._untrack(memory_id)
+            self._created[memory_id] = created
+            self._sources[memory_id] = source
+            self._by_source.setdefault(source, {})[memory_id] = None
+            self._lru[memory_id] = None
+            heapq.heappush(self._expiry, (created, memory_id))
+            
+            self._sweep()
+            self._evict()
         
         return memory_id
     
+    def touch(self, memory_id: str) -> bool:
+        """
+        Mark a tracked memory as recently used, protecting it from eviction.
+        
+        Args:
+            memory_id: The ID of the memory
+            
+        Returns:
+            True if the memory is tracked, False otherwise
+        """
+        with self._lock:
+            if memory_id not in self._lru:
+                return False
+            self._lru.move_to_end(memory_id)
+            return True
+    
+    def _collect(self, memory_ids: Any, limit: int) -> List[MemoryItem]:
+        """
+        Get the memories of up to limit IDs, dropping IDs deleted from the base system.
+        
+        Args:
+            memory_ids: Iterator of candidate IDs, in the order to return them
+            limit: Maximum number of memories to return
+            
+        Returns:
+            The memory items found
+        """
+        memories = []
+        missing = []
+        if limit > 0:
+            for memory_id in memory_ids:
+                memory = self.memory_system.storage.retrieve(memory_id)
+                if memory:
+                    memories.append(memory)
+                    if len(memories) >= limit:
+                        break
+                else:
+                    # Memory no longer exists in the base system
+                    missing.append(memory_id)
+        
+        for memory_id in missing:
+            self._untrack(memory_id)
+        return memories
+    
     def get_recent(self, limit: int = 10) -> List[MemoryItem]:
         """
         Get the most recent memories from short-term memory.
@@ -174,23 +264,21 @@ class ShortTermMemory:
         Returns:
             A list of recent memory items
         """
-        # Get all memories tracked in our short-term memory
-        memories = []
-        for memory_id in self.memory_ids:
-            memory = self.memory_system.get_memory(memory_id)
-            if memory:
-                memories.append(memory)
-        
-        # Sort by recency (created_at) and return the most recent
-        memories.sort(key=lambda m: m.created_at, reverse=True)
-        return memories[:limit]
+        with self._lock:
+            self._sweep()
+            return self._collect(reversed(self._created), limit)
     
     def clear(self) -> None:
         """
         Clear all memories from short-term memory.
         """
         # Note: We don't delete memories from the base system, just stop tracking them
-        self.memory_ids.clear()
+        with self._lock:
+            self._created.clear()
+            self._sources.clear()
+            self._by_source.clear()
+            self._lru.clear()
+            self._expiry = []
         logger.info("Short-term memory cleared")
     
     def get_by_source(self, source: str, limit: int = 10) -> List[MemoryItem]:
@@ -204,19 +292,9 @@ class ShortTermMemory:
         Returns:
             A list of memory items from the specified source
         """
-        # Get all memories tracked in our short-term memory
-        all_memories = []
-        for memory_id in self.memory_ids:
-            memory = self.memory_system.get_memory(memory_id)
-            if memory:
-                all_memories.append(memory)
-        
-        # Filter by source
-        filtered = [m for m in all_memories if m.metadata.get("source") == source]
-        
-        # Sort by recency and limit
-        filtered.sort(key=lambda m: m.created_at, reverse=True)
-        return filtered[:limit]
+        with self._lock:
+            self._sweep()
+            return self._collect(reversed(self._by_source.get(source, {})), limit)
     
     def get_all_item_ids(self) -> List[str]:
         """
@@ -225,7 +303,9 @@ class ShortTermMemory:
         Returns:
             A list of memory IDs
         """
-        return list(self.memory_ids)
+        with self._lock:
+            self._sweep()
+            return list(self._created)
     
     def remove_item(self, memory_id: str) -> bool:
         """
@@ -237,7 +317,22 @@ class ShortTermMemory:
         Returns:
             True if the memory was removed, False if it wasn't tracked
         """
-        if memory_id in self.memory_ids:
-            self.memory_ids.remove(memory_id)
-            return True
-        return False 
\ No newline at end of file
+        with self._lock:
+            return self._untrack(memory_id)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about short-term memory.
+        
+        Returns:
+            A dictionary of statistics
+        """
+        with self._lock:
+            self._sweep()
+            return {
+                "total": len(self._created),
+                "capacity": self.capacity,
+                "retention_minutes": self.retention_minutes,
+                "sources": len(self._by_source),
+                "expiry_entries": len(self._expiry)
+            }